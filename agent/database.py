@@ -10,11 +10,231 @@ SQLite 데이터베이스 관리
 - 발송 완료 처리
 """
 
+import functools
+import hashlib
+import os
 import sqlite3
+import threading
+import time
+import zlib
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import json
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# 다른 연결이 쓰는 중일 때 기다리는 최대 시간 (초)
+DB_BUSY_TIMEOUT = float(os.getenv("KAFKA_DB_BUSY_TIMEOUT", 10))
+
+
+def get_content_codec() -> str:
+    """
+    원문 저장 압축 방식 (환경 변수 KAFKA_CONTENT_CODEC, 기본: zlib)
+
+    zstd는 zstandard 패키지가 설치되어 있을 때만 사용 (없으면 zlib)
+    """
+    codec = os.getenv("KAFKA_CONTENT_CODEC", "zlib").strip().lower()
+    return "zstd" if codec == "zstd" and zstandard is not None else "zlib"
+
+
+def _compress_text(text: str, codec: str) -> bytes:
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress_text(data: bytes, codec: str) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd로 저장된 원문입니다. pip install zstandard 후 다시 시도하세요.")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+# 스케줄 변경 리스너 (schedule_id를 인자로 호출)
+# 웹 서버의 퀴즈 캐시처럼 스케줄 내용을 캐싱하는 쪽에서 무효화에 사용
+# (같은 프로세스의 변경만 전달됨 - 다른 프로세스의 변경은 quiz_versions로 확인)
+_schedule_listeners: List[Callable[[int], None]] = []
+
+
+def add_schedule_listener(listener: Callable[[int], None]):
+    """
+    스케줄이 저장/변경될 때 호출할 함수 등록
+
+    Args:
+        listener: listener(schedule_id) 형태의 함수
+    """
+    if listener not in _schedule_listeners:
+        _schedule_listeners.append(listener)
+
+
+def remove_schedule_listener(listener: Callable[[int], None]):
+    """등록한 스케줄 변경 리스너 해제"""
+    if listener in _schedule_listeners:
+        _schedule_listeners.remove(listener)
+
+
+def _notify_schedule_changed(schedule_id: int):
+    """스케줄 변경을 리스너에 알림 (리스너 오류는 DB 작업에 영향 주지 않음)"""
+    for listener in list(_schedule_listeners):
+        try:
+            listener(schedule_id)
+        except Exception as e:
+            print(f"⚠️  스케줄 변경 리스너 오류: {e}")
+
+
+# 쿼리 시간 관찰자 (웹 서버 /metrics의 요청별 DB 시간 집계용)
+# observer(seconds, is_statement): execute는 is_statement=True, fetch는 False
+_query_observer: Optional[Callable[[float, bool], None]] = None
+
+
+def set_query_observer(observer: Optional[Callable[[float, bool], None]]):
+    """
+    DB 쿼리 시간 관찰자 등록 (None이면 해제 - 시간 측정 자체를 하지 않음)
+
+    Args:
+        observer: observer(seconds, is_statement) 형태의 함수 (빠르게 반환해야 함)
+    """
+    global _query_observer
+    _query_observer = observer
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """execute/fetch 시간을 관찰자에 전달하는 커서 (관찰자가 없으면 그대로 실행)"""
+
+    def _timed(self, method, is_statement: bool, *args):
+        observer = _query_observer
+        if observer is None:
+            return method(*args)
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            observer(time.perf_counter() - start, is_statement)
+
+    def execute(self, *args):
+        return self._timed(super().execute, True, *args)
+
+    def executemany(self, *args):
+        return self._timed(super().executemany, True, *args)
+
+    def fetchone(self):
+        return self._timed(super().fetchone, False)
+
+    def fetchmany(self, *args):
+        return self._timed(super().fetchmany, False, *args)
+
+    def fetchall(self):
+        return self._timed(super().fetchall, False)
+
+
+class _TimedConnection(sqlite3.Connection):
+    """conn.cursor() / conn.execute()가 _TimedCursor를 쓰도록 하는 연결"""
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+
+def _serialized_write(method):
+    """
+    쓰기 메서드를 ScheduleDB._tx_lock 안에서 실행
+
+    이유:
+    - 연결 1개를 여러 스레드(웹 서버 요청, 스케줄러)가 같이 쓰므로
+      한 스레드의 COMMIT/ROLLBACK이 다른 스레드가 연 트랜잭션을 끝내거나,
+      다른 스레드의 문장이 그 트랜잭션에 섞이지 않도록 쓰기를 1개씩 실행
+    - 중간에 실패한 쓰기는 롤백 (열린 트랜잭션을 다음 쓰기에 남기지 않음, 호출 전부터 열려 있던 것은 건드리지 않음)
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._tx_lock:
+            already_open = self.conn.in_transaction
+            try:
+                return method(self, *args, **kwargs)
+            except Exception:
+                if self.conn.in_transaction and not already_open:
+                    self.conn.rollback()
+                raise
+    return wrapper
+
+
+# 오늘 발송 대상(정규 알림 + 재발송)을 사용자별 우선순위로 정렬하는 공통 CTE
+#
+# 우선순위:
+# 1. 재발송/이월 알림 (retry_schedules) - 오답 복습과 어제 밀린 알림이 먼저
+# 2. 정규 알림 - 앞 차수(복습 간격이 짧은 것)부터
+#
+# daily_rank = 사용자별 순위 + 오늘 이미 발송된 알림 수
+# → daily_rank <= 일일 한도인 것만 오늘 발송, 나머지는 다음 날로 이월
+_RANKED_DUE_CTE = '''
+    WITH due AS (
+        SELECT
+            s.id AS schedule_id,
+            s.user_id,
+            CAST(d.key AS INTEGER) + 1 AS notification_index,
+            NULL AS retry_id,
+            NULL AS retry_count,
+            1 AS priority,
+            s.created_at AS queued_at
+        FROM schedules s, json_each(s.schedule_dates) d
+        WHERE s.status = 'pending'
+        AND d.value = :date
+        AND NOT EXISTS (
+            SELECT 1 FROM notifications n
+            WHERE n.schedule_id = s.id
+            AND n.notification_index = CAST(d.key AS INTEGER) + 1
+            AND n.is_success = 1
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM retry_schedules r
+            WHERE r.schedule_id = s.id
+            AND r.notification_index = CAST(d.key AS INTEGER) + 1
+        )
+        
+        UNION ALL
+        
+        SELECT
+            r.schedule_id,
+            s.user_id,
+            r.notification_index,
+            r.id,
+            r.retry_count,
+            0,
+            r.created_at
+        FROM retry_schedules r
+        JOIN schedules s ON s.id = r.schedule_id
+        WHERE r.retry_date = :date AND r.status = 'pending'
+    ),
+    sent_today AS (
+        SELECT s.user_id, COUNT(*) AS sent
+        FROM notifications n
+        JOIN schedules s ON s.id = n.schedule_id
+        WHERE n.scheduled_date = :date AND n.is_success = 1
+        GROUP BY s.user_id
+    ),
+    ranked AS (
+        SELECT
+            due.*,
+            ROW_NUMBER() OVER (
+                PARTITION BY due.user_id
+                ORDER BY due.priority, due.notification_index, due.queued_at, due.schedule_id
+            ) + COALESCE(sent_today.sent, 0) AS daily_rank
+        FROM due
+        LEFT JOIN sent_today ON sent_today.user_id = due.user_id
+    )
+'''
+
 
 class ScheduleDB:
     """
@@ -34,8 +254,20 @@ class ScheduleDB:
             db_path: DB 파일 경로 (기본: data/kafka.db)
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            timeout=DB_BUSY_TIMEOUT,
+            factory=_TimedConnection
+        )
         self.conn.row_factory = sqlite3.Row  # Dict처럼 접근 가능
+        # 쓰기 메서드(@_serialized_write)는 모두 이 락 안에서 실행 (같은 연결을 쓰는 다른 스레드와 섞이지 않도록)
+        self._tx_lock = threading.RLock()
+        
+        # WAL 모드: 웹 서버 워커/스케줄러가 동시에 읽고 쓸 수 있도록
+        # (쓰기는 여전히 1개씩이지만 읽기가 쓰기를 기다리지 않음)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         self._create_tables()
     
     def _create_tables(self):
@@ -56,7 +288,9 @@ class ScheduleDB:
                 persona_count INTEGER,
                 questions TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'pending'
+                status TEXT DEFAULT 'pending',
+                canonical_url TEXT,
+                content_id INTEGER
             )
         ''')
         
@@ -68,6 +302,33 @@ class ScheduleDB:
             # 이미 존재하면 무시
             pass
         
+        # 정규화된 URL 컬럼 (같은 링크 재처리 방지, 기존 행은 python3 -m agent.migrate로 채움)
+        try:
+            cursor.execute("ALTER TABLE schedules ADD COLUMN canonical_url TEXT")
+            print("✅ schedules 테이블에 canonical_url 컬럼 추가됨")
+        except sqlite3.OperationalError:
+            pass
+        
+        # 원문 참조 컬럼 (기존 행의 url에 들어 있는 텍스트 입력은 python3 -m agent.migrate로 옮김)
+        try:
+            cursor.execute("ALTER TABLE schedules ADD COLUMN content_id INTEGER REFERENCES contents(id)")
+            print("✅ schedules 테이블에 content_id 컬럼 추가됨")
+        except sqlite3.OperationalError:
+            pass
+        
+        # 원문 저장소 (기사 본문/자막/입력 텍스트, 해시로 중복 제거 + 압축)
+        # → schedules 행에는 ID만 두어 발송/퀴즈 조회가 읽는 페이지를 작게 유지
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS contents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hash TEXT NOT NULL UNIQUE,
+                codec TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         # 알림 발송 이력 테이블
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS notifications (
@@ -97,6 +358,73 @@ class ScheduleDB:
             )
         ''')
         
+        # 기존 테이블에 question_idx 컬럼 추가 (시도한 문제 번호, 문제별 정답률 집계용)
+        try:
+            cursor.execute("ALTER TABLE quiz_attempts ADD COLUMN question_idx INTEGER")
+        except sqlite3.OperationalError:
+            # 이미 존재하면 무시
+            pass
+        
+        # 퀴즈 문제 테이블 (스케줄별 문제 1개 = 1행, idx는 1부터)
+        # 이유: 문제 1개를 보려고 questions JSON 전체를 읽고 파싱하지 않도록
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS quiz_questions (
+                schedule_id INTEGER NOT NULL,
+                idx INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                options TEXT NOT NULL,
+                answer TEXT,
+                PRIMARY KEY (schedule_id, idx),
+                FOREIGN KEY (schedule_id) REFERENCES schedules(id)
+            )
+        ''')
+        
+        # 퀴즈 데이터 버전 (스케줄별, 퀴즈 페이지/채점에 쓰는 값이 바뀔 때마다 트리거로 증가)
+        # - schedules: 화면/채점에 쓰는 컬럼 수정, 삭제
+        # - quiz_questions: 문제 행 추가/수정/삭제 (마이그레이션 backfill 포함)
+        # 이유: 웹 서버 워커마다 있는 퀴즈 캐시가 다른 프로세스(다른 워커, 마이그레이션, 스케줄러)의
+        #       변경도 알아챌 수 있도록 (캐시 항목의 버전과 비교, 행이 없으면 0)
+        #       updated_at은 퀴즈 페이지 Last-Modified에 사용 (created_at은 바뀌지 않음)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS quiz_versions (
+                schedule_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL,
+                updated_at TIMESTAMP
+            )
+        ''')
+        try:
+            cursor.execute("ALTER TABLE quiz_versions ADD COLUMN updated_at TIMESTAMP")
+        except sqlite3.OperationalError:
+            # 이미 존재하면 무시
+            pass
+
+        # updated_at을 쓰지 않는 예전 트리거만 다시 만듦 (매번 DROP하면 그 사이의 변경을 놓칠 수 있음)
+        quiz_version_triggers = {
+            'trg_schedules_quiz_version':
+                ('AFTER UPDATE OF user_id, category, summary, styled_content, questions ON schedules', 'NEW.id'),
+            'trg_schedules_quiz_version_delete': ('AFTER DELETE ON schedules', 'OLD.id'),
+            'trg_quiz_questions_version_insert': ('AFTER INSERT ON quiz_questions', 'NEW.schedule_id'),
+            'trg_quiz_questions_version_update': ('AFTER UPDATE ON quiz_questions', 'NEW.schedule_id'),
+            'trg_quiz_questions_version_delete': ('AFTER DELETE ON quiz_questions', 'OLD.schedule_id'),
+        }
+        for name, (event, schedule_id) in quiz_version_triggers.items():
+            existing = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+            ).fetchone()
+            if existing and 'updated_at' in existing[0]:
+                continue
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'''
+                CREATE TRIGGER {name}
+                {event}
+                BEGIN
+                    INSERT INTO quiz_versions (schedule_id, version, updated_at)
+                    VALUES ({schedule_id}, 1, CURRENT_TIMESTAMP)
+                    ON CONFLICT(schedule_id) DO UPDATE
+                    SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+                END
+            ''')
+        
         # 오답 재발송 스케줄 테이블
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS retry_schedules (
@@ -111,9 +439,139 @@ class ScheduleDB:
             )
         ''')
         
+        # 사용자별 알림 발송 시간대 테이블
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS delivery_windows (
+                user_id TEXT PRIMARY KEY,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # 파이프라인 결과 캐시 (본문 + 파이프라인 버전 해시 → 요약/퀴즈/페르소나 결과 JSON)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pipeline_results (
+                cache_key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                hits INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pipeline_results_used
+            ON pipeline_results (last_used_at)
+        ''')
+        
+        # 근사 중복 본문 색인 (MinHash 서명 + LSH 버킷, agent/utils/minhash.py)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS content_fingerprints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                schedule_id INTEGER NOT NULL,
+                signature BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (schedule_id) REFERENCES schedules(id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS content_lsh (
+                bucket INTEGER NOT NULL,
+                fingerprint_id INTEGER NOT NULL,
+                PRIMARY KEY (bucket, fingerprint_id)
+            ) WITHOUT ROWID
+        ''')
+        
+        # 발송 대상 조회(get_due_notifications)와 중복 발송 체크용 인덱스
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notifications_schedule
+            ON notifications (schedule_id, notification_index)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notifications_date
+            ON notifications (scheduled_date)
+        ''')
+        self._ensure_retry_key_index(cursor)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_retry_schedules_date
+            ON retry_schedules (retry_date, status)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_quiz_attempts_question
+            ON quiz_attempts (schedule_id, question_idx)
+        ''')
+        
+        # 사용자별 복습할 퀴즈 조회(get_due_quizzes)용 인덱스
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_schedules_user
+            ON schedules (user_id, category)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_quiz_attempts_passed
+            ON quiz_attempts (schedule_id, notification_index, is_passed)
+        ''')
+        
+        # 이미 처리한 URL 조회(find_processed_schedule)용 인덱스
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_schedules_canonical_url
+            ON schedules (canonical_url)
+        ''')
+        
         self.conn.commit()
         print(f"✅ 데이터베이스 초기화 완료: {self.db_path}")
     
+    def _ensure_retry_key_index(self, cursor: sqlite3.Cursor):
+        """
+        retry_schedules (schedule_id, notification_index) 유니크 인덱스 생성
+        
+        동작:
+            기존 DB에 같은 알림의 재발송 행이 여러 개 있으면 1행만 남김
+            (대기 중인 최신 행 우선, retry_count는 가장 큰 값)
+        
+        이유:
+            - 알림 1개당 재발송 행 1개 → 오답 제출 시 UPSERT 1문장으로 예약
+            - 동시에 제출해도 행이 중복되지 않음
+        """
+        exists = cursor.execute('''
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'index' AND name = 'idx_retry_schedules_key'
+        ''').fetchone()
+        if exists:
+            return
+        
+        cursor.execute('''
+            UPDATE retry_schedules
+            SET retry_count = (
+                SELECT MAX(r.retry_count) FROM retry_schedules r
+                WHERE r.schedule_id = retry_schedules.schedule_id
+                AND r.notification_index = retry_schedules.notification_index
+            )
+        ''')
+        cursor.execute('''
+            DELETE FROM retry_schedules
+            WHERE id NOT IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY schedule_id, notification_index
+                        ORDER BY status = 'pending' DESC, id DESC
+                    ) AS rn
+                    FROM retry_schedules
+                )
+                WHERE rn = 1
+            )
+        ''')
+        if cursor.rowcount > 0:
+            print(f"🔧 중복된 재발송 스케줄 {cursor.rowcount}개 정리")
+        
+        cursor.execute('DROP INDEX IF EXISTS idx_retry_schedules_schedule')
+        cursor.execute('''
+            CREATE UNIQUE INDEX idx_retry_schedules_key
+            ON retry_schedules (schedule_id, notification_index)
+        ''')
+    
+    @_serialized_write
     def save_schedule(
         self,
         user_id: str,
@@ -124,7 +582,9 @@ class ScheduleDB:
         url: str = None,
         summary: str = None,
         category: str = "지식형",
-        questions: List[dict] = None
+        questions: List[dict] = None,
+        canonical_url: str = None,
+        content: str = None
     ) -> int:
         """
         새로운 스케줄 저장
@@ -139,6 +599,8 @@ class ScheduleDB:
             summary: 3줄 요약 (선택)
             category: 콘텐츠 유형 (지식형/일반형)
             questions: 퀴즈 문제 리스트 (선택) - JSON 형태로 저장
+            canonical_url: 정규화된 URL (선택, agent.utils.canonicalize_url)
+            content: 원문 (선택, 기사 본문/자막/입력 텍스트 - contents 테이블에 압축 저장)
         
         Returns:
             생성된 스케줄 ID
@@ -151,16 +613,24 @@ class ScheduleDB:
         # 퀴즈 문제를 JSON으로 변환
         questions_json = json.dumps(questions, ensure_ascii=False) if questions else None
         
+        # 원문은 contents 테이블에 (같은 트랜잭션)
+        content_id = self._insert_content(content)
+        
         cursor.execute('''
             INSERT INTO schedules 
             (user_id, url, summary, category, schedule_dates, 
-             styled_content, persona_style, persona_count, questions)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+             styled_content, persona_style, persona_count, questions, canonical_url, content_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (user_id, url, summary, category, dates_json, 
-              styled_content, persona_style, persona_count, questions_json))
+              styled_content, persona_style, persona_count, questions_json, canonical_url, content_id))
+        schedule_id = cursor.lastrowid
+        
+        # 문제별 행 저장 (같은 트랜잭션)
+        if questions:
+            self._insert_quiz_questions(schedule_id, questions)
         
         self.conn.commit()
-        schedule_id = cursor.lastrowid
+        _notify_schedule_changed(schedule_id)
         
         print(f"📦 스케줄 저장 완료 (ID: {schedule_id})")
         return schedule_id
@@ -228,15 +698,19 @@ class ScheduleDB:
         
         return schedules
     
-    def get_schedule_by_id(self, schedule_id: int) -> Optional[Dict]:
+    def get_schedule_by_id(self, schedule_id: int, include_content: bool = False) -> Optional[Dict]:
         """
         특정 스케줄 조회
         
         Args:
             schedule_id: 스케줄 ID
+            include_content: 원문도 압축을 풀어 content에 담기 (기본: 안 함 → content_id만)
         
         Returns:
-            스케줄 정보 또는 None
+            스케줄 정보 또는 None (include_content=True면 content: 원문 또는 None)
+        
+        이유: 퀴즈/알림 조회는 원문을 쓰지 않으므로 contents JOIN과 압축 해제를 하지 않음
+              (필요할 때만 include_content=True 또는 get_content(content_id))
         """
         cursor = self.conn.cursor()
         cursor.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,))
@@ -245,9 +719,554 @@ class ScheduleDB:
         if row:
             schedule = dict(row)
             schedule['schedule_dates'] = json.loads(schedule['schedule_dates'])
+            if include_content:
+                schedule['content'] = self.get_content(schedule['content_id'])
             return schedule
         return None
+
+    @_serialized_write
+    def save_content(self, text: str) -> Optional[int]:
+        """
+        원문 저장 (같은 내용은 기존 행 재사용)
+        
+        Args:
+            text: 원문 (비어 있으면 저장하지 않음)
+        
+        Returns:
+            contents ID 또는 None
+        """
+        content_id = self._insert_content(text)
+        self.conn.commit()
+        return content_id
+
+    def _insert_content(self, text: Optional[str]) -> Optional[int]:
+        """save_content의 commit 없는 버전 (다른 저장과 같은 트랜잭션에서 사용)"""
+        if not text:
+            return None
+        
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        row = self.conn.execute('SELECT id FROM contents WHERE hash = ?', (digest,)).fetchone()
+        if row:
+            return row[0]
+        
+        codec = get_content_codec()
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO contents (hash, codec, size_bytes, data)
+            VALUES (?, ?, ?, ?)
+        ''', (digest, codec, len(text.encode("utf-8")), _compress_text(text, codec)))
+        return cursor.lastrowid
+
+    def get_content(self, content_id: Optional[int]) -> Optional[str]:
+        """
+        원문 조회 (저장할 때의 압축 방식으로 풀어서 반환)
+        
+        Returns:
+            원문 또는 None (content_id가 없거나 행이 없으면)
+        """
+        if content_id is None:
+            return None
+        row = self.conn.execute('SELECT codec, data FROM contents WHERE id = ?', (content_id,)).fetchone()
+        if row is None:
+            return None
+        return _decompress_text(row['data'], row['codec'])
+
+    def find_processed_schedule(self, canonical_url: str) -> Optional[Dict]:
+        """
+        같은 정규화 URL로 이미 처리한 가장 최근 스케줄 조회
+        
+        Args:
+            canonical_url: 정규화된 URL
+        
+        Returns:
+            {id, url, summary, category, styled_content, persona_style, persona_count,
+             questions(리스트)} 또는 None (처리 결과가 비어 있는 스케줄은 제외)
+        
+        이유:
+            - 같은 기사/영상을 다시 보내면 요약·퀴즈·페르소나 LLM 호출 없이 결과를 재사용
+        """
+        return self._find_processed('canonical_url = ?', (canonical_url,))
+
+    def get_processed_schedule(self, schedule_id: int) -> Optional[Dict]:
+        """
+        처리 결과 재사용용 스케줄 조회 (find_processed_schedule과 같은 형태)
+        
+        Returns:
+            {id, url, summary, category, styled_content, persona_style, persona_count,
+             questions(리스트)} 또는 None
+        """
+        return self._find_processed('id = ?', (schedule_id,))
+
+    def _find_processed(self, condition: str, params: tuple) -> Optional[Dict]:
+        """조건에 맞는 가장 최근 스케줄 (처리 결과가 비어 있는 스케줄은 제외)"""
+        row = self.conn.execute(f'''
+            SELECT id, url, summary, category, styled_content,
+                   persona_style, persona_count, questions
+            FROM schedules
+            WHERE {condition}
+            AND styled_content != ''
+            ORDER BY id DESC
+            LIMIT 1
+        ''', params).fetchone()
+        if row is None:
+            return None
+        
+        schedule = dict(row)
+        try:
+            schedule['questions'] = json.loads(schedule['questions'] or '[]')
+        except json.JSONDecodeError:
+            schedule['questions'] = []
+        return schedule
+
+    @_serialized_write
+    def save_content_fingerprint(self, schedule_id: int, signature: bytes, buckets: List[int]) -> int:
+        """
+        본문 MinHash 서명과 LSH 버킷 저장 (1회 commit)
+        
+        Args:
+            schedule_id: 본문을 처리한 스케줄 ID
+            signature: agent.utils.minhash.pack_signature() 결과
+            buckets: agent.utils.minhash.band_buckets() 결과
+        
+        Returns:
+            지문 ID
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO content_fingerprints (schedule_id, signature)
+            VALUES (?, ?)
+        ''', (schedule_id, signature))
+        fingerprint_id = cursor.lastrowid
+        cursor.executemany('''
+            INSERT OR IGNORE INTO content_lsh (bucket, fingerprint_id)
+            VALUES (?, ?)
+        ''', [(bucket, fingerprint_id) for bucket in buckets])
+        self.conn.commit()
+        return fingerprint_id
     
+    def get_fingerprint_candidates(self, buckets: List[int]) -> List[Dict]:
+        """
+        LSH 버킷이 하나라도 같은 지문 조회 (근사 중복 후보)
+        
+        Args:
+            buckets: 찾을 본문의 band_buckets() 결과
+        
+        Returns:
+            [{fingerprint_id, schedule_id, signature(bytes)}, ...]
+        
+        이유:
+            - (bucket, fingerprint_id) 기본 키 인덱스로 버킷 수만큼만 탐색
+              → 저장된 본문 수와 관계없이 후보 몇 개만 읽음
+        """
+        placeholders = ', '.join('?' * len(buckets))
+        rows = self.conn.execute(f'''
+            SELECT f.id AS fingerprint_id, f.schedule_id, f.signature
+            FROM content_fingerprints f
+            WHERE f.id IN (
+                SELECT fingerprint_id FROM content_lsh
+                WHERE bucket IN ({placeholders})
+            )
+        ''', buckets).fetchall()
+        return [dict(row) for row in rows]
+    
+    @_serialized_write
+    def get_pipeline_result(self, cache_key: str) -> Optional[Dict]:
+        """
+        파이프라인 결과 캐시 조회 (찾으면 마지막 사용 시각/적중 수 갱신)
+        
+        Args:
+            cache_key: agent.utils.result_cache.result_cache_key(input_text)
+        
+        Returns:
+            저장한 결과 딕셔너리 또는 None
+        """
+        row = self.conn.execute('''
+            UPDATE pipeline_results
+            SET last_used_at = CURRENT_TIMESTAMP, hits = hits + 1
+            WHERE cache_key = ?
+            RETURNING result
+        ''', (cache_key,)).fetchone()
+        self.conn.commit()
+        return json.loads(row['result']) if row else None
+    
+    @_serialized_write
+    def save_pipeline_result(
+        self,
+        cache_key: str,
+        result: Dict,
+        max_age_days: float,
+        max_bytes: int
+    ) -> int:
+        """
+        파이프라인 결과 저장 후 오래되거나 넘치는 항목 삭제 (1회 commit)
+        
+        Args:
+            cache_key: 결과 캐시 키
+            result: 저장할 상태 값 (JSON 직렬화 가능)
+            max_age_days: 마지막 사용 후 이 기간이 지난 항목 삭제
+            max_bytes: 전체 크기가 넘으면 오래 안 쓴 항목부터 삭제
+        
+        Returns:
+            삭제된 항목 수
+        """
+        payload = json.dumps(result, ensure_ascii=False)
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO pipeline_results (cache_key, result, size_bytes)
+            VALUES (?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                result = excluded.result,
+                size_bytes = excluded.size_bytes,
+                last_used_at = CURRENT_TIMESTAMP
+        ''', (cache_key, payload, len(payload.encode('utf-8'))))
+        evicted = self._evict_pipeline_results(cursor, max_age_days, max_bytes)
+        self.conn.commit()
+        return evicted
+    
+    def _evict_pipeline_results(self, cursor: sqlite3.Cursor, max_age_days: float, max_bytes: int) -> int:
+        """
+        결과 캐시 정리 (commit은 호출한 쪽에서)
+        
+        동작:
+            1. last_used_at이 max_age_days보다 오래된 항목 삭제
+            2. 최근 사용 순 누적 크기가 max_bytes를 넘는 항목 삭제 (LRU, 윈도 함수 1문장)
+        """
+        changes_before = self.conn.total_changes
+        cursor.execute('''
+            DELETE FROM pipeline_results
+            WHERE last_used_at < datetime('now', ?)
+        ''', (f'-{max_age_days} days',))
+        cursor.execute('''
+            DELETE FROM pipeline_results
+            WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key, SUM(size_bytes) OVER (
+                        ORDER BY last_used_at DESC, rowid DESC
+                    ) AS running_bytes
+                    FROM pipeline_results
+                )
+                WHERE running_bytes > ?
+            )
+        ''', (max_bytes,))
+        return self.conn.total_changes - changes_before
+    
+    def get_schedules_without_canonical_url(self, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        """
+        URL은 있지만 canonical_url이 비어 있는 스케줄 조회 (마이그레이션용)
+
+        Returns:
+            [{id, url}, ...] (ID 오름차순)
+        """
+        rows = self.conn.execute('''
+            SELECT id, url
+            FROM schedules
+            WHERE canonical_url IS NULL
+            AND url LIKE 'http%'
+            AND id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    @_serialized_write
+    def set_canonical_urls(self, updates: List[Dict]):
+        """
+        canonical_url 일괄 저장 (1회 commit)
+
+        Args:
+            updates: [{schedule_id, canonical_url}, ...]
+        """
+        self.conn.executemany(
+            'UPDATE schedules SET canonical_url = ? WHERE id = ?',
+            [(update['canonical_url'], update['schedule_id']) for update in updates]
+        )
+        self.conn.commit()
+
+    def get_schedules_with_inline_content(self, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        """
+        url 컬럼에 입력 텍스트가 그대로 들어 있는 스케줄 조회 (마이그레이션용)
+
+        Returns:
+            [{id, url}, ...] (ID 오름차순)
+        """
+        rows = self.conn.execute('''
+            SELECT id, url
+            FROM schedules
+            WHERE content_id IS NULL
+            AND url != ''
+            AND url NOT LIKE 'http%'
+            AND id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    @_serialized_write
+    def move_inline_contents(self, updates: List[Dict]):
+        """
+        url 컬럼의 텍스트를 contents 테이블로 옮기고 url은 비움 (1회 commit)
+
+        Args:
+            updates: [{schedule_id, content}, ...]
+        """
+        self.conn.executemany(
+            'UPDATE schedules SET content_id = ?, url = NULL WHERE id = ?',
+            [(self._insert_content(update['content']), update['schedule_id']) for update in updates]
+        )
+        self.conn.commit()
+
+    def get_schedules_without_questions(self, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        """
+        questions 컬럼이 비어 있는 지식형 스케줄 조회 (레거시 데이터 마이그레이션용)
+
+        Args:
+            after_id: 이 ID보다 큰 스케줄부터 (배치 순회용)
+            limit: 최대 개수
+
+        Returns:
+            [{id, summary, styled_content}, ...] (ID 오름차순)
+        """
+        rows = self.conn.execute('''
+            SELECT id, summary, styled_content
+            FROM schedules
+            WHERE category = '지식형'
+            AND (questions IS NULL OR questions = '')
+            AND id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    @_serialized_write
+    def backfill_questions(self, updates: List[Dict]):
+        """
+        추출한 퀴즈를 questions 컬럼에 저장 (1회 commit)
+
+        Args:
+            updates: [{schedule_id, questions(리스트), summary(선택)}, ...]
+                     summary는 기존 요약이 비어 있을 때만 채움
+        """
+        self.conn.executemany('''
+            UPDATE schedules
+            SET questions = ?,
+                summary = COALESCE(NULLIF(summary, ''), ?)
+            WHERE id = ?
+        ''', [(json.dumps(update['questions'], ensure_ascii=False),
+               update.get('summary') or None,
+               update['schedule_id'])
+              for update in updates])
+        for update in updates:
+            self._insert_quiz_questions(update['schedule_id'], update['questions'])
+        self.conn.commit()
+
+        for update in updates:
+            _notify_schedule_changed(update['schedule_id'])
+
+    def _insert_quiz_questions(self, schedule_id: int, questions: List[dict]):
+        """
+        문제 목록을 quiz_questions에 저장 (commit은 호출한 쪽에서)
+
+        - 기존 행은 교체 (idx는 1부터)
+        - 형식이 잘못된 문제(dict가 아님)는 건너뜀
+        """
+        self.conn.execute('DELETE FROM quiz_questions WHERE schedule_id = ?', (schedule_id,))
+        self.conn.executemany('''
+            INSERT INTO quiz_questions (schedule_id, idx, text, options, answer)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(schedule_id, idx, question.get('text', ''),
+               json.dumps(question.get('options', []), ensure_ascii=False),
+               question.get('answer'))
+              for idx, question in enumerate(
+                  (q for q in questions if isinstance(q, dict)), 1)])
+
+    def get_quiz_question(self, schedule_id: int, notification_index: int) -> Optional[Dict]:
+        """
+        퀴즈 페이지/채점에 필요한 문제 1개 조회 (1행)
+
+        Args:
+            schedule_id: 스케줄 ID
+            notification_index: 알림 차수 (문제가 부족하면 마지막 문제)
+
+        Returns:
+            {
+                "schedule_id", "user_id", "category", "summary", "created_at",
+                "message": 힐링형 본문 (지식형은 None),
+                "question": {"idx", "text", "options", "answer"} 또는 None (퀴즈 없음),
+                "version": 읽은 시점의 퀴즈 데이터 버전 (get_quiz_version과 비교),
+                "updated_at": 퀴즈 데이터가 마지막으로 바뀐 시각 (바뀐 적 없으면 None)
+            }
+            스케줄이 없으면 None
+        """
+        row = self.conn.execute('''
+            SELECT
+                s.id, s.user_id, s.category, s.summary, s.created_at,
+                CASE WHEN s.category = '지식형' THEN NULL ELSE s.styled_content END AS message,
+                q.idx, q.text, q.options, q.answer,
+                COALESCE(v.version, 0) AS version, v.updated_at
+            FROM schedules s
+            LEFT JOIN quiz_versions v ON v.schedule_id = s.id
+            LEFT JOIN quiz_questions q ON q.schedule_id = s.id AND q.idx = (
+                SELECT idx FROM quiz_questions
+                WHERE schedule_id = s.id AND idx <= MAX(?, 1)
+                ORDER BY idx DESC
+                LIMIT 1
+            )
+            WHERE s.id = ?
+        ''', (notification_index, schedule_id)).fetchone()
+
+        if not row:
+            return None
+
+        question = None
+        if row['idx'] is not None:
+            question = {
+                'idx': row['idx'],
+                'text': row['text'],
+                'options': json.loads(row['options']),
+                'answer': row['answer']
+            }
+
+        return {
+            'schedule_id': row['id'],
+            'user_id': row['user_id'],
+            'category': row['category'],
+            'summary': row['summary'] or '',
+            'created_at': row['created_at'],
+            'message': row['message'],
+            'question': question,
+            'version': row['version'],
+            'updated_at': row['updated_at']
+        }
+
+    def get_quiz_version(self, schedule_id: int) -> int:
+        """
+        스케줄의 퀴즈 데이터 버전 (한 번도 바뀌지 않았으면 0)
+
+        이유: 캐시된 문제가 다른 프로세스에서 바뀌었는지 기본 키 조회 1번으로 확인
+        """
+        row = self.conn.execute(
+            'SELECT version FROM quiz_versions WHERE schedule_id = ?', (schedule_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_schedules_without_question_rows(self, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        """
+        questions JSON은 있지만 quiz_questions 행이 없는 스케줄 조회 (마이그레이션용)
+
+        Returns:
+            [{id, questions}, ...] (ID 오름차순)
+        """
+        rows = self.conn.execute('''
+            SELECT s.id, s.questions
+            FROM schedules s
+            WHERE s.questions IS NOT NULL AND s.questions NOT IN ('', '[]')
+            AND s.id > ?
+            AND NOT EXISTS (SELECT 1 FROM quiz_questions q WHERE q.schedule_id = s.id)
+            ORDER BY s.id
+            LIMIT ?
+        ''', (after_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    @_serialized_write
+    def save_quiz_question_rows(self, rows: List[Dict]):
+        """
+        여러 스케줄의 문제 행 저장 (1회 commit)
+
+        Args:
+            rows: [{schedule_id, questions(리스트)}, ...]
+        """
+        for row in rows:
+            self._insert_quiz_questions(row['schedule_id'], row['questions'])
+        self.conn.commit()
+
+        for row in rows:
+            _notify_schedule_changed(row['schedule_id'])
+
+    @_serialized_write
+    def backfill_attempt_question_idx(self) -> int:
+        """
+        기존 퀴즈 시도 기록에 문제 번호(question_idx) 채우기
+
+        Returns:
+            갱신된 시도 기록 수
+        """
+        cursor = self.conn.execute('''
+            UPDATE quiz_attempts
+            SET question_idx = (
+                SELECT MAX(q.idx) FROM quiz_questions q
+                WHERE q.schedule_id = quiz_attempts.schedule_id
+                AND q.idx <= MAX(quiz_attempts.notification_index, 1)
+            )
+            WHERE question_idx IS NULL
+            AND EXISTS (SELECT 1 FROM quiz_questions q WHERE q.schedule_id = quiz_attempts.schedule_id)
+        ''')
+        self.conn.commit()
+        return cursor.rowcount
+
+    def get_question_accuracy(self, schedule_id: int = None) -> List[Dict]:
+        """
+        문제별 정답률 (SQL 집계, JSON 파싱 없음)
+
+        Args:
+            schedule_id: 특정 스케줄만 (없으면 전체)
+
+        Returns:
+            [{schedule_id, idx, text, attempts, correct, accuracy(%, 시도 없으면 None)}, ...]
+        """
+        rows = self.conn.execute('''
+            SELECT
+                q.schedule_id,
+                q.idx,
+                q.text,
+                COUNT(a.id) AS attempts,
+                COALESCE(SUM(a.is_passed), 0) AS correct,
+                ROUND(AVG(a.is_passed) * 100, 1) AS accuracy
+            FROM quiz_questions q
+            LEFT JOIN quiz_attempts a
+                ON a.schedule_id = q.schedule_id AND a.question_idx = q.idx
+            WHERE (:schedule_id IS NULL OR q.schedule_id = :schedule_id)
+            GROUP BY q.schedule_id, q.idx
+            ORDER BY q.schedule_id, q.idx
+        ''', {'schedule_id': schedule_id}).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_due_quizzes(self, user_id: str, limit: int = 20) -> List[Dict]:
+        """
+        사용자가 풀어야 할 퀴즈 목록 (알림은 받았지만 아직 맞히지 못한 것)
+
+        Args:
+            user_id: 사용자 ID
+            limit: 최대 개수
+
+        Returns:
+            [{"schedule_id", "notification_index", "sent_at"}, ...] (알림 받은 순)
+
+        이유:
+            - 웹 UI가 현재 문제를 푸는 동안 다음 문제를 미리 가져오도록
+            - 인덱스(idx_schedules_user, idx_notifications_schedule, idx_quiz_attempts_passed)만 사용
+        """
+        rows = self.conn.execute('''
+            SELECT
+                n.schedule_id,
+                n.notification_index,
+                MAX(n.sent_at) AS sent_at
+            FROM schedules s
+            JOIN notifications n ON n.schedule_id = s.id AND n.is_success = 1
+            WHERE s.user_id = ? AND s.category = '지식형'
+            AND EXISTS (SELECT 1 FROM quiz_questions q WHERE q.schedule_id = s.id)
+            AND NOT EXISTS (
+                SELECT 1 FROM quiz_attempts a
+                WHERE a.schedule_id = n.schedule_id
+                AND a.notification_index = n.notification_index
+                AND a.is_passed = 1
+            )
+            GROUP BY n.schedule_id, n.notification_index
+            ORDER BY sent_at, n.schedule_id, n.notification_index
+            LIMIT ?
+        ''', (user_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    @_serialized_write
     def mark_as_completed(self, schedule_id: int):
         """
         스케줄 완료 처리
@@ -262,8 +1281,10 @@ class ScheduleDB:
             WHERE id = ?
         ''', (schedule_id,))
         self.conn.commit()
+        _notify_schedule_changed(schedule_id)
         print(f"✅ 스케줄 완료 처리: ID {schedule_id}")
     
+    @_serialized_write
     def log_notification(
         self,
         schedule_id: int,
@@ -291,7 +1312,30 @@ class ScheduleDB:
         ''', (schedule_id, notification_index, scheduled_date,
               datetime.now(), is_success, error_message))
         self.conn.commit()
-    
+
+    @_serialized_write
+    def log_notifications(self, records: List[Dict]):
+        """
+        알림 발송 이력 여러 건을 한 번에 기록 (1회 commit)
+
+        Args:
+            records: [{schedule_id, notification_index, scheduled_date,
+                       is_success, error_message(선택)}, ...]
+
+        이유:
+        - 다이제스트 알림 1건에 묶인 알림들을 건별 commit 없이 기록
+        """
+        sent_at = datetime.now()
+        self.conn.executemany('''
+            INSERT INTO notifications
+            (schedule_id, notification_index, scheduled_date,
+             sent_at, is_success, error_message)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(record['schedule_id'], record['notification_index'], record['scheduled_date'],
+               sent_at, record['is_success'], record.get('error_message'))
+              for record in records])
+        self.conn.commit()
+
     def get_statistics(self) -> Dict:
         """
         통계 조회
@@ -324,6 +1368,7 @@ class ScheduleDB:
             'total_notifications_sent': sent
         }
     
+    @_serialized_write
     def save_quiz_attempt(
         self,
         schedule_id: int,
@@ -331,7 +1376,8 @@ class ScheduleDB:
         user_answers: List[str],
         correct_answers: List[str],
         score: int,
-        is_passed: bool
+        is_passed: bool,
+        question_idx: int = None
     ) -> int:
         """
         퀴즈 시도 기록 저장
@@ -343,30 +1389,127 @@ class ScheduleDB:
             correct_answers: 정답 리스트
             score: 점수 (0-100)
             is_passed: 합격 여부 (60점 이상)
+            question_idx: 푼 문제 번호 (없으면 notification_index로 quiz_questions에서 계산)
         
         Returns:
             생성된 시도 기록 ID
         """
         cursor = self.conn.cursor()
+        attempt_id = self._insert_quiz_attempt(
+            cursor, schedule_id, notification_index, user_answers, correct_answers,
+            score, is_passed, question_idx
+        )
+        self.conn.commit()
         
+        print(f"📝 퀴즈 시도 기록 저장 완료 (ID: {attempt_id}, 점수: {score}점)")
+        return attempt_id
+    
+    def _insert_quiz_attempt(
+        self,
+        cursor: sqlite3.Cursor,
+        schedule_id: int,
+        notification_index: int,
+        user_answers: List[str],
+        correct_answers: List[str],
+        score: int,
+        is_passed: bool,
+        question_idx: int = None
+    ) -> int:
+        """quiz_attempts INSERT (commit은 호출하는 쪽에서)"""
         cursor.execute('''
             INSERT INTO quiz_attempts
-            (schedule_id, notification_index, user_answers, correct_answers, score, is_passed)
-            VALUES (?, ?, ?, ?, ?, ?)
+            (schedule_id, notification_index, user_answers, correct_answers, score, is_passed,
+             question_idx)
+            VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, (
+                SELECT MAX(idx) FROM quiz_questions
+                WHERE schedule_id = ? AND idx <= MAX(?, 1)
+            )))
         ''', (
             schedule_id,
             notification_index,
             json.dumps(user_answers),
             json.dumps(correct_answers),
             score,
-            is_passed
+            is_passed,
+            question_idx,
+            schedule_id,
+            notification_index
         ))
+        return cursor.lastrowid
+    
+    @_serialized_write
+    def record_quiz_submission(
+        self,
+        schedule_id: int,
+        notification_index: int,
+        user_answer: str,
+        correct_answer: str,
+        question_idx: int,
+        retry_date: str,
+        max_retries: int = 3
+    ) -> Dict:
+        """
+        퀴즈 답안 제출 기록 (시도 기록 + 오답 재발송 예약을 트랜잭션 1개로)
         
-        self.conn.commit()
-        attempt_id = cursor.lastrowid
+        Args:
+            schedule_id: 스케줄 ID
+            notification_index: 알림 차수
+            user_answer: 사용자 답
+            correct_answer: 정답
+            question_idx: 푼 문제 번호
+            retry_date: 오답일 때 재발송 날짜 (YYYY-MM-DD)
+            max_retries: 최대 재시도 횟수 (이미 이만큼 재발송했으면 예약하지 않음)
         
-        print(f"📝 퀴즈 시도 기록 저장 완료 (ID: {attempt_id}, 점수: {score}점)")
-        return attempt_id
+        Returns:
+            {"attempt_id", "is_correct", "retry_count": 예약된 재시도 횟수 또는 None (예약 안 함)}
+        
+        동작:
+            BEGIN IMMEDIATE → 시도 기록 INSERT → 오답이면 재발송 UPSERT → COMMIT 1번
+            재발송 행은 알림당 1개 (유니크 인덱스):
+            없으면 retry_count = 1로 추가, 있으면 retry_count + 1 (max_retries 미만일 때만)
+        
+        이유:
+            - 제출 1번에 commit 1번, 재시도 횟수 조회(COUNT) 없이 UPSERT ... RETURNING으로 판단
+            - 쓰기 잠금을 먼저 잡으므로 동시에 제출해도 재시도 횟수가 어긋나지 않음
+            - 같은 연결의 다른 쓰기는 _tx_lock을 기다리므로 이 트랜잭션을 커밋/롤백하거나 끼어들 수 없음
+        
+        Raises:
+            RuntimeError: 연결에 이미 열린 트랜잭션이 있을 때 (그 트랜잭션에 섞이지 않도록)
+        """
+        is_correct = user_answer == correct_answer
+        
+        cursor = self.conn.cursor()
+        if self.conn.in_transaction:
+            raise RuntimeError("이미 열린 트랜잭션이 있어 답안 제출을 기록할 수 없습니다")
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            attempt_id = self._insert_quiz_attempt(
+                cursor, schedule_id, notification_index, [user_answer], [correct_answer],
+                100 if is_correct else 0, is_correct, question_idx
+            )
+            
+            retry_count = None
+            if not is_correct:
+                row = cursor.execute('''
+                    INSERT INTO retry_schedules
+                    (schedule_id, notification_index, retry_date, retry_count)
+                    VALUES (?, ?, ?, 1)
+                    ON CONFLICT(schedule_id, notification_index) DO UPDATE SET
+                        retry_date = excluded.retry_date,
+                        retry_count = retry_schedules.retry_count + 1,
+                        status = 'pending',
+                        created_at = CURRENT_TIMESTAMP
+                    WHERE retry_schedules.retry_count < ?
+                    RETURNING retry_count
+                ''', (schedule_id, notification_index, retry_date, max_retries)).fetchone()
+                retry_count = row[0] if row else None
+            
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        return {'attempt_id': attempt_id, 'is_correct': is_correct, 'retry_count': retry_count}
     
     def get_quiz_attempts(self, schedule_id: int) -> List[Dict]:
         """특정 스케줄의 퀴즈 시도 기록 조회"""
@@ -379,6 +1522,7 @@ class ScheduleDB:
         
         return [dict(row) for row in cursor.fetchall()]
     
+    @_serialized_write
     def add_retry_schedule(
         self,
         schedule_id: int,
@@ -387,7 +1531,7 @@ class ScheduleDB:
         retry_count: int = 1
     ) -> int:
         """
-        오답 재발송 스케줄 추가
+        오답 재발송 스케줄 추가 (같은 알림의 재발송 행이 있으면 날짜/횟수 갱신)
         
         Args:
             schedule_id: 스케줄 ID
@@ -396,27 +1540,35 @@ class ScheduleDB:
             retry_count: 재시도 횟수
         
         Returns:
-            생성된 재발송 스케줄 ID
+            재발송 스케줄 ID
         """
         cursor = self.conn.cursor()
         
-        cursor.execute('''
+        retry_id = cursor.execute('''
             INSERT INTO retry_schedules
             (schedule_id, notification_index, retry_date, retry_count)
             VALUES (?, ?, ?, ?)
-        ''', (schedule_id, notification_index, retry_date, retry_count))
+            ON CONFLICT(schedule_id, notification_index) DO UPDATE SET
+                retry_date = excluded.retry_date,
+                retry_count = excluded.retry_count,
+                status = 'pending'
+            RETURNING id
+        ''', (schedule_id, notification_index, retry_date, retry_count)).fetchone()[0]
         
         self.conn.commit()
-        retry_id = cursor.lastrowid
         
         print(f"🔄 재발송 스케줄 추가 완료 (ID: {retry_id}, 날짜: {retry_date})")
         return retry_id
     
     def get_retry_count(self, schedule_id: int, notification_index: int) -> int:
-        """특정 알림의 재시도 횟수 조회"""
+        """
+        특정 알림의 재시도 횟수 조회
+        
+        일일 한도로 이월된 알림(retry_count = 0)은 재시도로 세지 않습니다.
+        """
         cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT COUNT(*) FROM retry_schedules
+            SELECT COALESCE(MAX(retry_count), 0) FROM retry_schedules
             WHERE schedule_id = ? AND notification_index = ?
         ''', (schedule_id, notification_index))
         
@@ -433,6 +1585,99 @@ class ScheduleDB:
         
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_due_notifications(self, date: str, daily_cap: int) -> List[Dict]:
+        """
+        특정 날짜에 발송할 알림 조회 (사용자별 일일 한도 적용)
+        
+        Args:
+            date: 날짜 (YYYY-MM-DD)
+            daily_cap: 사용자별 일일 최대 알림 수
+        
+        Returns:
+            발송할 알림 리스트 (사용자별 우선순위 순)
+            [{"schedule_id", "user_id", "notification_index", "retry_id", "retry_count",
+              "daily_rank", "category", "styled_content", "schedule_dates"}, ...]
+            retry_id가 None이면 정규 알림, 아니면 재발송/이월 알림
+        
+        이유:
+            - 정규 알림과 재발송을 한 번의 쿼리로 조회
+            - 윈도우 함수(ROW_NUMBER)로 사용자별 한도를 SQL에서 적용
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(_RANKED_DUE_CTE + '''
+            SELECT
+                ranked.schedule_id,
+                ranked.user_id,
+                ranked.notification_index,
+                ranked.retry_id,
+                ranked.retry_count,
+                ranked.daily_rank,
+                s.category,
+                s.styled_content,
+                s.schedule_dates
+            FROM ranked
+            JOIN schedules s ON s.id = ranked.schedule_id
+            WHERE ranked.daily_rank <= :cap
+            ORDER BY ranked.user_id, ranked.daily_rank
+        ''', {'date': date, 'cap': daily_cap})
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    @_serialized_write
+    def defer_overflow_notifications(self, date: str, next_date: str, daily_cap: int) -> int:
+        """
+        일일 한도를 넘는 알림을 다음 날로 이월
+        
+        Args:
+            date: 오늘 날짜 (YYYY-MM-DD)
+            next_date: 이월할 날짜 (YYYY-MM-DD)
+            daily_cap: 사용자별 일일 최대 알림 수
+        
+        Returns:
+            이월된 알림 수
+        
+        동작:
+            1. 한도를 넘은 재발송은 retry_date만 다음 날로 변경
+            2. 한도를 넘은 정규 알림은 retry_schedules에 retry_count = 0으로 추가
+            → 다음 날에는 재발송 우선순위로 먼저 발송됨 (계속 밀리지 않음)
+        
+        이유:
+            - 사용자별 루프 없이 SQL 두 문장으로 처리
+            - 이미 이월된 알림은 오늘 대상에서 빠지므로 여러 번 호출해도 안전
+            - 재발송이 한도를 넘었다면 정규 알림은 모두 한도 밖이므로
+              UPDATE → INSERT 순서로 실행해도 순위가 바뀌지 않음
+        """
+        params = {'date': date, 'next_date': next_date, 'cap': daily_cap}
+        cursor = self.conn.cursor()
+        # WITH로 시작하는 DML은 cursor.rowcount가 -1이므로 total_changes로 계산
+        changes_before = self.conn.total_changes
+        
+        cursor.execute(_RANKED_DUE_CTE + '''
+            UPDATE retry_schedules
+            SET retry_date = :next_date
+            WHERE id IN (
+                SELECT retry_id FROM ranked
+                WHERE daily_rank > :cap AND retry_id IS NOT NULL
+            )
+        ''', params)
+        
+        cursor.execute(_RANKED_DUE_CTE + '''
+            INSERT INTO retry_schedules
+            (schedule_id, notification_index, retry_date, retry_count)
+            SELECT schedule_id, notification_index, :next_date, 0
+            FROM ranked
+            WHERE daily_rank > :cap AND retry_id IS NULL
+            ON CONFLICT(schedule_id, notification_index) DO NOTHING
+        ''', params)
+        
+        self.conn.commit()
+        deferred = self.conn.total_changes - changes_before
+        
+        if deferred:
+            print(f"⏭️  일일 한도({daily_cap}회) 초과 알림 {deferred}개를 {next_date}로 이월")
+        return deferred
+    
+    @_serialized_write
     def mark_retry_as_completed(self, retry_id: int):
         """재발송 스케줄 완료 처리"""
         cursor = self.conn.cursor()
@@ -443,6 +1688,39 @@ class ScheduleDB:
         ''', (retry_id,))
         self.conn.commit()
         
+    @_serialized_write
+    def set_delivery_window(self, user_id: str, start_time: str, end_time: str):
+        """
+        사용자별 알림 발송 시간대 설정
+        
+        Args:
+            user_id: 사용자 ID
+            start_time: 시작 시각 (HH:MM, 예: "07:30")
+            end_time: 끝 시각 (HH:MM, 예: "08:30", 포함하지 않음)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO delivery_windows (user_id, start_time, end_time, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                start_time = excluded.start_time,
+                end_time = excluded.end_time,
+                updated_at = excluded.updated_at
+        ''', (user_id, start_time, end_time, datetime.now()))
+        self.conn.commit()
+        print(f"⏰ 발송 시간대 설정: {user_id} ({start_time}-{end_time})")
+    
+    def get_delivery_windows(self) -> Dict[str, str]:
+        """
+        사용자별 알림 발송 시간대 전체 조회
+        
+        Returns:
+            {user_id: "HH:MM-HH:MM"}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT user_id, start_time, end_time FROM delivery_windows')
+        return {row['user_id']: f"{row['start_time']}-{row['end_time']}" for row in cursor.fetchall()}
+    
     def get_similar_recommendations(self, category: str, limit: int = 3) -> List[Dict]:
         """
         동일한 카테고리의 다른 추천 콘텐츠 조회
@@ -469,18 +1747,40 @@ class ScheduleDB:
         print("🔒 데이터베이스 연결 종료")
 
 
-# 전역 DB 인스턴스 (싱글톤)
+# 전역 DB 인스턴스 (싱글톤, 프로세스별)
 _db_instance = None
+_db_pid = None
 
 def get_db() -> ScheduleDB:
     """
     전역 DB 인스턴스 반환
     
+    DB 경로는 환경 변수 KAFKA_DB_PATH로 바꿀 수 있습니다 (기본: data/kafka.db).
+    
     이유:
     - 여러 곳에서 동일한 DB 연결 사용
     - 연결 중복 방지
+    - fork된 프로세스(웹 서버 워커)는 부모의 연결을 쓰지 않고 새로 연결
     """
-    global _db_instance
+    global _db_instance, _db_pid
+    if _db_instance is not None and _db_pid not in (None, os.getpid()):
+        # 다른 프로세스에서 만든 연결 (fork로 물려받음) → 버리고 새로 연결
+        _db_instance = None
     if _db_instance is None:
-        _db_instance = ScheduleDB()
+        _db_instance = ScheduleDB(os.getenv("KAFKA_DB_PATH", "data/kafka.db"))
+        _db_pid = os.getpid()
     return _db_instance
+
+
+def reset_db(close: bool = True):
+    """
+    전역 DB 인스턴스 초기화 (다음 get_db() 호출 때 새로 연결)
+    
+    Args:
+        close: 기존 연결 닫기 (fork 직후에는 부모의 연결이므로 False)
+    """
+    global _db_instance, _db_pid
+    if close and _db_instance is not None and _db_pid == os.getpid():
+        _db_instance.close()
+    _db_instance = None
+    _db_pid = None
@@ -2,7 +2,11 @@ from langgraph.graph import StateGraph, END
 from agent.schemas import AgentState
 from agent.nodes import (
     input_url_node, #URL 검증 노드
+    reuse_processed_node, # 이미 처리한 URL 결과 재사용
     extract_content_node, #URL text 추출 및 콘텐츠 검증
+    cache_lookup_node, # 같은 본문 처리 결과 조회
+    cache_store_node, # 처리 결과 저장
+    near_duplicate_node, # 거의 같은 본문 처리 결과 조회
     classify_node,
     synthesize_node,
     verify_node,
@@ -19,7 +23,11 @@ def build_graph():
     g = StateGraph(AgentState)
     # 기획서상 1, 2번 노드 등록
     g.add_node("input_url", input_url_node)
+    g.add_node("reuse_processed", reuse_processed_node)
     g.add_node("extract_content", extract_content_node)
+    g.add_node("cache_lookup", cache_lookup_node)
+    g.add_node("cache_store", cache_store_node)
+    g.add_node("near_duplicate", near_duplicate_node)
     g.add_node("classify", classify_node)
     g.add_node("synthesize", synthesize_node)
     g.add_node("verify", verify_node)
@@ -49,11 +57,24 @@ def build_graph():
         "input_url",
         route_after_input,
         {
-            "valid": "extract_content",  # 유효한 URL이면 다음 노드로 이동
+            "valid": "reuse_processed",  # 유효하면 처리 이력 확인 후 다음 노드로 이동
             "invalid": END  # 유효하지 않은 URL이면 서비스X
         }
     )
 
+    def route_after_reuse(state: AgentState):
+        """이미 처리한 URL이면 LLM 단계를 모두 건너뛰고 새 스케줄만 만듭니다."""
+        return "reuse" if state.get("reused_from") else "new"
+
+    g.add_conditional_edges(
+        "reuse_processed",
+        route_after_reuse,
+        {
+            "reuse": "schedule",  # 저장된 요약/퀴즈/페르소나로 스케줄 생성
+            "new": "extract_content"
+        }
+    )
+
     # 라우터 함수 추가
     def route_after_extract(state: AgentState):
         """extract_content_node에서 추출된 내용이 안전한지 판단하여 분기
@@ -67,11 +88,37 @@ def build_graph():
         "extract_content",
         route_after_extract,
         {
-            "SAFE": "classify",  # 안전하면 분류 노드로
+            "SAFE": "cache_lookup",  # 안전하면 결과 캐시 확인 후 분류 노드로
             "UNSAFE": END  # 유해하면 종료
         }
     )
 
+    def route_after_cache(state: AgentState):
+        """같은 본문의 결과가 있으면 LLM 단계를 건너뛰고 스케줄만 만듭니다."""
+        return "hit" if state.get("cache_hit") else "miss"
+
+    g.add_conditional_edges(
+        "cache_lookup",
+        route_after_cache,
+        {
+            "hit": "schedule",
+            "miss": "near_duplicate"
+        }
+    )
+
+    def route_after_near_duplicate(state: AgentState):
+        """거의 같은 본문의 결과를 재사용하기로 했으면 스케줄만 만듭니다."""
+        return "reuse" if state.get("near_duplicate_of") else "new"
+
+    g.add_conditional_edges(
+        "near_duplicate",
+        route_after_near_duplicate,
+        {
+            "reuse": "schedule",
+            "new": "classify"
+        }
+    )
+
     g.add_edge("classify", "synthesize")
     g.add_edge("synthesize", "verify")
     g.add_edge("verify", "judge")
@@ -91,9 +138,10 @@ def build_graph():
     g.add_edge("improve", "verify")
     g.add_edge("augment", "quiz") # 보강 후 퀴즈 생성
     
-    # 🆕 워크플로우 연장: quiz → persona → schedule → END
+    # 🆕 워크플로우 연장: quiz → persona → (결과 저장) → schedule → END
     g.add_edge("quiz", "persona")
-    g.add_edge("persona", "schedule")
+    g.add_edge("persona", "cache_store")
+    g.add_edge("cache_store", "schedule")
     g.add_edge("schedule", END)
 
     return g.compile()
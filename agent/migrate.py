@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# agent/migrate.py
+"""
+데이터 마이그레이션 명령
+
+1. 레거시 스케줄(questions 컬럼이 비어 있고 퀴즈가 styled_content 본문에만 있는 것)의
+   퀴즈를 한 번 파싱해서 questions 컬럼과 quiz_questions 테이블에 저장
+2. questions JSON만 있는 스케줄을 quiz_questions 테이블(문제당 1행)로 복사
+3. 기존 퀴즈 시도 기록에 문제 번호(question_idx) 채우기
+4. URL로 만든 스케줄에 정규화 URL(canonical_url) 채우기 (같은 링크 재처리 방지)
+5. url 컬럼에 그대로 저장된 입력 텍스트를 contents 테이블(압축)로 옮기고 VACUUM
+   (옮긴 텍스트는 근사 중복 색인(content_fingerprints)에도 추가)
+
+사용법:
+    python3 -m agent.migrate              # 마이그레이션 실행
+    python3 -m agent.migrate --dry-run    # 저장 없이 결과만 확인
+
+이유:
+- 웹 서버가 요청마다 정규식으로 styled_content를 파싱하지 않도록
+  (마이그레이션 후 웹 서버는 quiz_questions 테이블에서 문제 1행만 읽음)
+- 파싱에 실패한 스케줄은 빈 목록([])으로 저장해 다시 스캔하지 않고, 개수를 보고
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.database import ScheduleDB, get_db
+from agent.utils.minhash import band_buckets, minhash_signature, pack_signature
+from agent.utils.quiz_parser import extract_quiz_from_content
+from agent.utils.url import canonicalize_url
+
+
+def backfill_quiz_questions(db: ScheduleDB, batch_size: int = 500, dry_run: bool = False) -> Dict:
+    """
+    레거시 스케줄의 퀴즈를 questions 컬럼으로 옮김
+
+    Args:
+        db: 대상 DB
+        batch_size: 한 번에 읽고 저장할 스케줄 수 (배치당 1회 commit)
+        dry_run: True면 저장하지 않음
+
+    Returns:
+        {"scanned": 스캔한 수, "migrated": 저장한 수, "failed": 파싱 실패 수,
+         "failed_ids": 파싱 실패 스케줄 ID 목록}
+    """
+    stats = {"scanned": 0, "migrated": 0, "failed": 0, "failed_ids": []}
+    last_id = 0
+
+    while True:
+        rows = db.get_schedules_without_questions(after_id=last_id, limit=batch_size)
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            quiz_data = extract_quiz_from_content(row['styled_content'] or "")
+
+            if quiz_data['questions']:
+                stats["migrated"] += 1
+            else:
+                stats["failed"] += 1
+                stats["failed_ids"].append(row['id'])
+
+            # 실패한 스케줄도 빈 목록으로 저장 (다음 실행 때 다시 파싱하지 않음)
+            updates.append({
+                'schedule_id': row['id'],
+                'questions': quiz_data['questions'],
+                'summary': quiz_data['summary']
+            })
+
+        stats["scanned"] += len(rows)
+        last_id = rows[-1]['id']
+
+        if not dry_run:
+            db.backfill_questions(updates)
+
+    return stats
+
+
+def backfill_question_rows(db: ScheduleDB, batch_size: int = 500, dry_run: bool = False) -> Dict:
+    """
+    questions JSON → quiz_questions 행 (문제당 1행)
+
+    Returns:
+        {"scanned": 스캔한 수, "migrated": 저장한 수, "failed": JSON 오류 수,
+         "failed_ids": JSON 오류 스케줄 ID 목록}
+    """
+    stats = {"scanned": 0, "migrated": 0, "failed": 0, "failed_ids": []}
+    last_id = 0
+
+    while True:
+        rows = db.get_schedules_without_question_rows(after_id=last_id, limit=batch_size)
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            try:
+                questions = json.loads(row['questions'])
+            except json.JSONDecodeError:
+                questions = None
+
+            if isinstance(questions, list) and questions:
+                stats["migrated"] += 1
+                updates.append({'schedule_id': row['id'], 'questions': questions})
+            else:
+                stats["failed"] += 1
+                stats["failed_ids"].append(row['id'])
+
+        stats["scanned"] += len(rows)
+        last_id = rows[-1]['id']
+
+        if not dry_run and updates:
+            db.save_quiz_question_rows(updates)
+
+    return stats
+
+
+def backfill_canonical_urls(db: ScheduleDB, batch_size: int = 500, dry_run: bool = False) -> Dict:
+    """
+    url → canonical_url
+
+    Returns:
+        {"scanned": 스캔한 수, "migrated": 저장한 수, "failed": 정규화 실패 수,
+         "failed_ids": 정규화 실패 스케줄 ID 목록}
+    """
+    stats = {"scanned": 0, "migrated": 0, "failed": 0, "failed_ids": []}
+    last_id = 0
+
+    while True:
+        rows = db.get_schedules_without_canonical_url(after_id=last_id, limit=batch_size)
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            try:
+                canonical_url = canonicalize_url(row['url'])
+                stats["migrated"] += 1
+            except ValueError:
+                # 빈 문자열로 저장 (다음 실행 때 다시 스캔하지 않음)
+                canonical_url = ""
+                stats["failed"] += 1
+                stats["failed_ids"].append(row['id'])
+            updates.append({'schedule_id': row['id'], 'canonical_url': canonical_url})
+
+        stats["scanned"] += len(rows)
+        last_id = rows[-1]['id']
+
+        if not dry_run:
+            db.set_canonical_urls(updates)
+
+    return stats
+
+
+def backfill_contents(db: ScheduleDB, batch_size: int = 500, dry_run: bool = False) -> Dict:
+    """
+    url 컬럼의 입력 텍스트 → contents 테이블 (url은 비움) + 근사 중복 색인
+
+    이유: 텍스트가 저장되면서 기존 스케줄도 near_duplicate_node가 찾을 수 있게 됨
+          (MinHash 서명을 만들 수 없는 짧은 텍스트는 색인하지 않음)
+
+    Returns:
+        {"scanned": 스캔한 수, "migrated": 옮긴 수, "fingerprinted": 색인한 수, "failed": 0, "failed_ids": []}
+    """
+    stats = {"scanned": 0, "migrated": 0, "fingerprinted": 0, "failed": 0, "failed_ids": []}
+    last_id = 0
+
+    while True:
+        rows = db.get_schedules_with_inline_content(after_id=last_id, limit=batch_size)
+        if not rows:
+            break
+
+        stats["scanned"] += len(rows)
+        stats["migrated"] += len(rows)
+        last_id = rows[-1]['id']
+
+        signatures = [(row['id'], minhash_signature(row['url'])) for row in rows]
+        stats["fingerprinted"] += sum(1 for _, signature in signatures if signature is not None)
+
+        if not dry_run:
+            db.move_inline_contents([{'schedule_id': row['id'], 'content': row['url']} for row in rows])
+            for schedule_id, signature in signatures:
+                if signature is not None:
+                    db.save_content_fingerprint(schedule_id, pack_signature(signature), band_buckets(signature))
+
+    return stats
+
+
+def _print_stats(title: str, stats: Dict):
+    """마이그레이션 단계별 결과 출력"""
+    print(f"\n📋 {title}")
+    print(f"   스캔: {stats['scanned']}개, ✅ 성공: {stats['migrated']}개, ❌ 실패: {stats['failed']}개")
+    if stats["failed_ids"]:
+        preview = ", ".join(str(schedule_id) for schedule_id in stats["failed_ids"][:20])
+        more = " ..." if len(stats["failed_ids"]) > 20 else ""
+        print(f"   실패한 스케줄 ID: {preview}{more}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카프카 레거시 퀴즈 마이그레이션")
+    parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 결과만 출력')
+    parser.add_argument('--batch-size', type=int, default=500, help='배치 크기 (기본: 500)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔧 레거시 퀴즈 마이그레이션" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 60)
+
+    db = get_db()
+
+    # 1. styled_content 본문 → questions 컬럼 (+ quiz_questions)
+    stats = backfill_quiz_questions(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    _print_stats("레거시 퀴즈 (styled_content)", stats)
+    if stats["failed_ids"]:
+        print("   (퀴즈 없음으로 저장됨 - 웹에서는 '퀴즈를 찾을 수 없습니다'로 표시)")
+
+    # 2. questions JSON → quiz_questions
+    rows_stats = backfill_question_rows(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    _print_stats("문제별 행 (quiz_questions)", rows_stats)
+
+    # 3. 기존 시도 기록의 문제 번호
+    if not args.dry_run:
+        updated = db.backfill_attempt_question_idx()
+        print(f"\n📝 시도 기록 문제 번호 채움: {updated}개")
+
+    # 4. url → canonical_url
+    url_stats = backfill_canonical_urls(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    _print_stats("정규화 URL (canonical_url)", url_stats)
+
+    # 5. url 컬럼의 입력 텍스트 → contents (옮긴 만큼 파일 크기 회수)
+    content_stats = backfill_contents(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    _print_stats("원문 저장소 (contents)", content_stats)
+    print(f"   근사 중복 색인 추가: {content_stats['fingerprinted']}개")
+    if content_stats["migrated"] and not args.dry_run:
+        db.conn.execute("VACUUM")
+        print("🧹 VACUUM 완료")
+
+
+if __name__ == "__main__":
+    main()
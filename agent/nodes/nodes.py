@@ -2,6 +2,8 @@
 import os
 import json
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict
 from dotenv import load_dotenv
 from langchain_upstage import ChatUpstage
@@ -15,6 +17,7 @@ except ImportError:
 from agent.prompts import (
     SAFETY_PROMPT, #extract_content 노드에서 콘텐츠 안전도 검사하는 프롬프트 추가
     SUMMARY_DRAFT_PROMPT,
+    SECTION_NOTES_PROMPT,
     QUIZ_FROM_SUMMARY_PROMPT,
     JUDGE_PROMPT,
     IMPROVE_DRAFT_PROMPT,
@@ -33,7 +36,34 @@ from agent.utils import (
     extract_youtube_video_id,
     get_youtube_transcript,
     get_article_content,
-    calculate_ebbinghaus_dates
+    calculate_ebbinghaus_dates,
+    canonicalize_url,
+    result_cache_key
+)
+from agent.utils.result_cache import get_max_age_days, get_max_bytes, is_result_cache_enabled
+from agent.utils.compress import (
+    compress_for_prompt,
+    extract_key_sentences,
+    get_node_budget,
+    record_compression,
+    strip_boilerplate,
+)
+from agent.utils.tokens import (
+    estimate_tokens,
+    get_input_budget,
+    get_llm_concurrency,
+    get_section_tokens,
+    split_by_tokens,
+)
+from agent.utils.safety import order_for_screening, split_for_screening
+from agent.utils.minhash import (
+    band_buckets,
+    estimate_similarity,
+    get_near_dup_policy,
+    get_near_dup_threshold,
+    minhash_signature,
+    pack_signature,
+    unpack_signature,
 )
 from agent.rag import verify_summary_with_rag
 from agent.database import get_db
@@ -115,9 +145,10 @@ def input_url_node(state):
     # 1. URL 형태인지 확인
     if user_input.startswith(("http://", "https://")):
         if is_valid_url(user_input):
-            # 유효한 URL인 경우
+            # 유효한 URL인 경우 (utm_*, m., youtu.be 등을 정리한 키도 함께 저장)
             return {
                 "url": user_input,
+                "canonical_url": canonicalize_url(user_input),
                 "is_valid": True,
                 "messages": "URL 확인 완료! 본문을 추출하러 갑니다."
             }
@@ -144,6 +175,53 @@ def input_url_node(state):
         "messages": "입력된 내용이 없습니다."
     }
 
+def reuse_processed_node(state):
+    """
+    이미 처리한 URL이면 저장된 요약/퀴즈/페르소나 결과를 불러옵니다.
+
+    동작:
+    1. input_url_node가 만든 canonical_url로 DB에서 가장 최근 스케줄 조회
+    2. 있으면 요약/퀴즈/페르소나 메시지를 상태에 채우고 reused_from에 원본 스케줄 ID 기록
+       → 그래프가 추출/안전성 검사/요약/퀴즈/페르소나를 건너뛰고 schedule 노드로 이동
+    3. 없거나(텍스트 입력 포함) 조회에 실패하면 그대로 통과
+
+    이유:
+    - 같은 기사를 공유 링크/모바일 주소로 다시 보내도 LLM 호출 없이 새 복습 일정만 만들기 위해
+    """
+    canonical_url = state.get("canonical_url")
+    if not canonical_url:
+        return {"reused_from": None}
+
+    try:
+        previous = get_db().find_processed_schedule(canonical_url)
+    except Exception as e:
+        print(f"⚠️  처리 이력 조회 실패 (새로 처리합니다): {e}")
+        return {"reused_from": None}
+
+    if previous is None:
+        return {"reused_from": None}
+
+    print(f"♻️  이미 처리한 링크입니다 (스케줄 ID: {previous['id']}) → 저장된 결과를 재사용합니다.")
+    return {
+        **_restore_processed(previous),
+        "reused_from": previous["id"],
+        "is_safe": True,
+        "messages": "이미 처리한 링크입니다. 저장된 요약과 퀴즈로 새 복습 일정을 만듭니다."
+    }
+
+
+def _restore_processed(previous):
+    """저장된 스케줄(find_processed_schedule 결과)을 분류~페르소나 노드 출력 형태로 변환"""
+    return {
+        "category": previous["category"] or "지식형",
+        "summary": json.dumps({"Summary": previous["summary"] or ""}, ensure_ascii=False),
+        "quiz": json.dumps({"questions": previous["questions"]}, ensure_ascii=False),
+        "styled_content": previous["styled_content"],
+        "persona_style": previous["persona_style"] or "",
+        "persona_count": previous["persona_count"] or 0,
+    }
+
+
 def extract_content_node(state):
     """
     2) 콘텐츠 확보 및 LLM 유해성 검증 노드
@@ -153,7 +231,7 @@ def extract_content_node(state):
        - URL이 있으면 YouTube/아티클에서 본문 추출
        - 이미 input_text가 있으면 추출 단계 건너뜀 (직접 입력/파일 대응)
     2. 콘텐츠 검증:
-       - 추출되거나 입력된 텍스트 상위 2,000자를 바탕으로 LLM Safety 검사 수행
+       - 본문 전체를 구간으로 나눠 LLM Safety 검사 수행 (_screen_safety)
     3. 상태 업데이트:
        - 검증 결과에 따라 is_safe 플래그 설정 및 최종 본문 저장
     """
@@ -185,11 +263,7 @@ def extract_content_node(state):
 
     # 4. Safety Check (LLM활용)
     try:
-        check_text = content[:2000]
-        safety_llm = llm.invoke(SAFETY_PROMPT + "\n\n[CONTENT]\n" + check_text)
-        safety_response = (safety_llm.content or "").strip().upper()
-
-        if "UNSAFE" in safety_response:
+        if _screen_safety(content):
             return {
                 "input_text": "Error: 유해 콘텐츠 감지",
                 "is_valid": False,
@@ -208,11 +282,179 @@ def extract_content_node(state):
     except Exception as e:
         return {"is_valid": False, "is_safe": False, "messages": f"Safety Check 에러: {str(e)}"}
 
+
+def _screen_safety(content: str) -> bool:
+    """
+    본문 전체 안전성 검사 (UNSAFE로 판단된 검사가 하나라도 있으면 True)
+
+    동작:
+    - 압축본(compress_for_prompt) 1개: 광고/스팸처럼 문서 단위로 봐야 하는 위반 확인 (짧은 본문은 이것만)
+    - 긴 본문은 구간으로 나눠 모든 구간을 추가로 검사 (utils/safety.py)
+      로컬 사전 필터에 걸린 구간을 먼저 보냄 (KAFKA_SAFETY_PREFILTER=1이면 걸린 구간만)
+    - KAFKA_LLM_CONCURRENCY개씩 동시에 보내고, UNSAFE가 나오면 시작하지 않은 요청은 취소하고
+      이미 보낸 요청이 끝날 때까지 기다린 뒤 반환 (백그라운드에 요청을 남기지 않음)
+    """
+    targets = [compress_for_prompt(content, "safety")]
+    chunks = split_for_screening(content)
+    if len(chunks) > 1:
+        screened = order_for_screening(chunks)
+        targets.extend(screened)
+        print(f"   - 안전성 검사: {len(chunks)}개 구간 중 {len(screened)}개 LLM 검사"
+              + (f" ({len(chunks) - len(screened)}개는 사전 필터로 생략)" if len(screened) < len(chunks) else ""))
+    if len(targets) == 1:
+        return _is_unsafe(targets[0])
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(get_llm_concurrency(), len(targets)),
+        thread_name_prefix="kafka-safety"
+    )
+    try:
+        futures = [executor.submit(_is_unsafe, text) for text in targets]
+        for checked, future in enumerate(as_completed(futures), 1):
+            if future.result():
+                print(f"   - UNSAFE 감지: {checked}/{len(targets)}개 검사 후 중단")
+                return True
+        return False
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _is_unsafe(text: str) -> bool:
+    """구간 1개를 SAFETY_PROMPT로 검사 (응답에 UNSAFE가 있으면 True)"""
+    resp = llm.invoke(SAFETY_PROMPT + "\n\n[CONTENT]\n" + text)
+    return "UNSAFE" in (resp.content or "").strip().upper()
+
+# 결과 캐시에 저장/복원하는 상태 필드 (분류 ~ 페르소나 노드의 출력)
+CACHED_RESULT_FIELDS = (
+    "category", "summary", "quiz", "thought_questions", "augmentation_info",
+    "judge_score", "persona_style", "persona_count", "styled_content",
+)
+
+
+def cache_lookup_node(state):
+    """
+    같은 본문을 이미 처리했으면 저장된 분류~페르소나 결과를 불러옵니다.
+
+    동작:
+    1. 정규화한 input_text + 파이프라인 버전(모델/프롬프트)으로 키 계산
+    2. pipeline_results에 있으면 결과를 상태에 채우고 cache_hit=True
+       → 그래프가 schedule 노드로 바로 이동
+    3. 없으면 키만 기록하고 통과 (cache_store_node가 같은 키로 저장)
+
+    이유:
+    - 텍스트/파일 입력은 URL이 없어 reuse_processed_node로 중복을 찾을 수 없음
+    """
+    if not is_result_cache_enabled():
+        return {"cache_hit": False}
+
+    cache_key = result_cache_key(state.get("input_text", ""))
+    try:
+        cached = get_db().get_pipeline_result(cache_key)
+    except Exception as e:
+        print(f"⚠️  결과 캐시 조회 실패 (새로 처리합니다): {e}")
+        return {"cache_key": cache_key, "cache_hit": False}
+
+    if cached is None:
+        return {"cache_key": cache_key, "cache_hit": False}
+
+    print("♻️  같은 본문의 처리 결과가 있습니다 → 분류~페르소나 단계를 건너뜁니다.")
+    restored = {field: cached[field] for field in CACHED_RESULT_FIELDS if field in cached}
+    return {
+        **restored,
+        "cache_key": cache_key,
+        "cache_hit": True,
+        "messages": "이미 처리한 본문입니다. 저장된 결과로 새 복습 일정을 만듭니다."
+    }
+
+
+def cache_store_node(state):
+    """
+    분류~페르소나 결과를 결과 캐시에 저장합니다. (저장 실패해도 그래프는 계속 진행)
+
+    저장할 때마다 오래된 항목(KAFKA_RESULT_CACHE_MAX_AGE_DAYS)과
+    크기 초과분(KAFKA_RESULT_CACHE_MAX_MB, 오래 안 쓴 것부터)을 삭제합니다.
+    """
+    cache_key = state.get("cache_key")
+    if not cache_key:
+        return state
+
+    try:
+        evicted = get_db().save_pipeline_result(
+            cache_key,
+            {field: state[field] for field in CACHED_RESULT_FIELDS if field in state},
+            max_age_days=get_max_age_days(),
+            max_bytes=get_max_bytes()
+        )
+        if evicted:
+            print(f"🧹 결과 캐시 정리: {evicted}개 삭제")
+    except Exception as e:
+        print(f"⚠️  결과 캐시 저장 실패: {e}")
+    return state
+
+
+def near_duplicate_node(state):
+    """
+    거의 같은 본문(통신사 기사 재배포, 옮겨 온 글 등)을 처리한 적이 있는지 확인합니다.
+
+    동작:
+    1. input_text의 MinHash 서명 계산 → content_signature (schedule_node가 색인에 저장)
+    2. LSH 버킷이 같은 후보만 DB에서 읽어 유사도 계산, KAFKA_NEAR_DUP_THRESHOLD 이상 중 가장 비슷한 것 선택
+    3. KAFKA_NEAR_DUP_POLICY에 따라
+       - reuse: 저장된 결과를 불러오고 near_duplicate_of에 원본 스케줄 ID 기록 → schedule 노드로 이동
+       - ask: 터미널이면 재사용 여부를 물어봄 (터미널이 아니면 알리기만 하고 새로 처리)
+       - ignore: 확인하지 않음
+
+    이유:
+    - 결과 캐시(cache_lookup_node)는 글자가 하나만 달라도 다른 키라서
+      제목/바이라인/광고 문구만 다른 같은 기사를 찾지 못함
+    """
+    signature = minhash_signature(state.get("input_text", ""))
+    if signature is None:
+        return {"content_signature": None, "near_duplicate_of": None}
+
+    policy = get_near_dup_policy()
+    if policy == "ignore":
+        return {"content_signature": signature, "near_duplicate_of": None}
+
+    try:
+        db = get_db()
+        best_id, best_similarity = None, get_near_dup_threshold()
+        for candidate in db.get_fingerprint_candidates(band_buckets(signature)):
+            similarity = estimate_similarity(signature, unpack_signature(candidate["signature"]))
+            if similarity >= best_similarity:
+                best_id, best_similarity = candidate["schedule_id"], similarity
+        previous = db.get_processed_schedule(best_id) if best_id is not None else None
+    except Exception as e:
+        print(f"⚠️  근사 중복 조회 실패 (새로 처리합니다): {e}")
+        return {"content_signature": signature, "near_duplicate_of": None}
+
+    if previous is None:
+        return {"content_signature": signature, "near_duplicate_of": None}
+
+    print(f"🔁 거의 같은 콘텐츠를 처리한 적이 있습니다 "
+          f"(스케줄 ID: {previous['id']}, 유사도 {best_similarity:.0%}, URL: {(previous['url'] or '')[:50]})")
+    if policy == "ask":
+        if not sys.stdin.isatty():
+            print("   새로 처리합니다. (자동 재사용: KAFKA_NEAR_DUP_POLICY=reuse)")
+            return {"content_signature": signature, "near_duplicate_of": None}
+        answer = input("   저장된 결과를 재사용할까요? [Y/n]: ").strip().lower()
+        if answer not in ("", "y", "yes", "ㅇ", "예"):
+            return {"content_signature": signature, "near_duplicate_of": None}
+
+    return {
+        **_restore_processed(previous),
+        "content_signature": signature,
+        "near_duplicate_of": previous["id"],
+        "similarity": best_similarity,
+        "messages": "거의 같은 콘텐츠의 처리 결과로 새 복습 일정을 만듭니다."
+    }
+
+
 def classify_node(state):
     """3) 콘텐츠 성격을 분석하여 '지식형' 또는 '힐링형'으로 분류 (CoT 적용)"""
     print("\n[Node] classify_node: 콘텐츠 분류 중...")
-    article = state["input_text"]
-    resp = llm.invoke(CLASSIFY_PROMPT + "\n\n[CONTENT]\n" + article[:2000])
+    article = compress_for_prompt(state["input_text"], "classify")
+    resp = llm.invoke(CLASSIFY_PROMPT + "\n\n[CONTENT]\n" + article)
     raw_output = (resp.content or "").strip()
     
     # "Category: [지식형]" 또는 "Category: [힐링형]"에서 추출
@@ -228,9 +470,25 @@ def classify_node(state):
 
 
 def synthesize_node(state):
-    """4) 기사 원문으로 요약 초안(draft_summary)만 생성 (RAG 사용 X)"""
+    """
+    4) 기사 원문으로 요약 초안(draft_summary)만 생성 (RAG 사용 X)
+
+    보일러플레이트를 뺀 본문이
+    - 모델 입력 예산(tokens.get_input_budget)을 넘으면 map-reduce:
+      구간별 노트를 병렬로 만들고(map) 노트를 이어 붙인 것으로 요약(reduce)
+    - 요약 예산(KAFKA_COMPRESS_TOKENS_SYNTHESIZE)을 넘으면 핵심 문장만 추출해서 요약
+    - 그보다 짧으면 그대로 한 번에 요약
+    """
     print("[Node] synthesize_node: 요약 초안 생성 중...")
-    article = state["input_text"]
+    original = state["input_text"]
+    article = strip_boilerplate(original)
+
+    budget = get_input_budget(SUMMARY_DRAFT_PROMPT)
+    if estimate_tokens(article) > budget:
+        article = _condense_to_budget(article, budget)
+    elif estimate_tokens(article) > get_node_budget("synthesize"):
+        article = extract_key_sentences(article, get_node_budget("synthesize"))
+    record_compression("synthesize", original, article)
 
     resp = llm.invoke(SUMMARY_DRAFT_PROMPT + "\n\n[ARTICLE]\n" + article)
     draft = (resp.content or "").strip()
@@ -239,6 +497,33 @@ def synthesize_node(state):
     return state
 
 
+def _condense_to_budget(text: str, budget: int) -> str:
+    """
+    긴 본문 → 구간 노트 (예산 안에 들 때까지 반복, 보통 1번)
+
+    이유:
+    - 90분 영상 자막처럼 컨텍스트를 넘거나 한 번 호출이 너무 느린 본문도 요약할 수 있도록
+    - 구간 요청은 llm.batch로 KAFKA_LLM_CONCURRENCY개씩 동시에 보냄 (순서 유지)
+    """
+    section_tokens = min(get_section_tokens(), get_input_budget(SECTION_NOTES_PROMPT))
+    while estimate_tokens(text) > budget:
+        sections = split_by_tokens(text, section_tokens)
+        print(f"   - 긴 본문 ({estimate_tokens(text):,} 토큰) → {len(sections)}개 구간 병렬 요약")
+        prompts = [
+            SECTION_NOTES_PROMPT.format(index=i, total=len(sections)) + "\n\n[SECTION]\n" + section
+            for i, section in enumerate(sections, 1)
+        ]
+        responses = llm.batch(prompts, config={"max_concurrency": get_llm_concurrency()})
+        text = "\n\n".join(
+            f"[{i}/{len(sections)}]\n{(resp.content or '').strip()}"
+            for i, resp in enumerate(responses, 1)
+        )
+        # 구간이 하나뿐이었으면 더 줄일 수 없음 (노트가 예산을 넘는 경우는 거의 없음)
+        if len(sections) == 1:
+            break
+    return text
+
+
 def verify_node(state):
     """5) 요약 초안을 RAG로 검증(근거 문맥 구성/문장 검증 결과 저장)"""
     print("[Node] verify_node: RAG 검증 및 벡터 DB 생성 중 (시간이 소요될 수 있습니다)...")
@@ -550,8 +835,8 @@ def schedule_node(state):
         
         db = get_db()
         
-        # URL 추출 (input_text 또는 별도 url 필드)
-        url = state.get("url", "") or state.get("input_text", "")
+        # URL 추출 (텍스트 입력은 URL 없음 - 본문은 content로 따로 저장)
+        url = state.get("url") or None
         
         # 요약 추출 (summary는 JSON 문자열일 수 있음)
         summary_raw = state.get("summary", "")
@@ -563,8 +848,14 @@ def schedule_node(state):
             summary_text = str(summary_raw)
         
         # 퀴즈 문제 추출 (questions는 리스트 형태)
-        questions = state.get("questions", [])
-        
+        # quiz_node는 state["quiz"]에 {"questions": [...]} JSON 문자열을 저장함
+        questions = state.get("questions") or []
+        if not questions and state.get("quiz"):
+            try:
+                questions = json.loads(state["quiz"]).get("questions", [])
+            except (json.JSONDecodeError, AttributeError):
+                questions = []
+
         schedule_id = db.save_schedule(
             user_id="default_user",  # 향후 실제 사용자 ID로 대체
             schedule_dates=schedule_dates,
@@ -574,9 +865,16 @@ def schedule_node(state):
             url=url,
             summary=summary_text,
             category=state.get("category", "지식형"),
-            questions=questions  # ✅ 퀴즈 문제 DB에 저장
+            questions=questions,  # ✅ 퀴즈 문제 DB에 저장
+            canonical_url=state.get("canonical_url"),
+            content=state.get("input_text")  # 원문은 contents 테이블에 압축 저장
         )
         print(f"💾 데이터베이스 저장 완료 (Schedule ID: {schedule_id})")
+
+        # 새로 처리한 본문만 근사 중복 색인에 추가 (재사용한 결과는 원본이 이미 색인됨)
+        signature = state.get("content_signature")
+        if signature and not (state.get("reused_from") or state.get("cache_hit") or state.get("near_duplicate_of")):
+            db.save_content_fingerprint(schedule_id, pack_signature(signature), band_buckets(signature))
         print(f"   - URL: {url[:50] if url else '(텍스트 입력)'}...")
         print(f"   - 요약: {summary_text[:50] if summary_text else '(없음)'}...")
         print(f"   - 퀴즈: {len(questions)}개 문제 저장됨" if questions else "   - 퀴즈: (없음)")
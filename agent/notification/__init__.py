@@ -1,6 +1,10 @@
 from .popup import send_popup_notification, schedule_popup_notifications
+from .backends import NotifierBackend, get_notifier, register_notifier
 
 __all__ = [
     "send_popup_notification",
     "schedule_popup_notifications",
+    "NotifierBackend",
+    "get_notifier",
+    "register_notifier",
 ]
@@ -0,0 +1,187 @@
+# agent/notification/backends.py
+"""
+알림 백엔드 (Notifier Backend) 레지스트리
+
+알림을 실제로 어디로 보낼지 설정으로 선택합니다.
+
+지원 백엔드:
+- desktop: 데스크톱 팝업 (pync / winotify / plyer, 기본값)
+- jsonl: JSON Lines 파일에 기록 (서버/헤드리스 환경)
+- webhook: HTTP 웹훅으로 전송 (자체 게이트웨이)
+- null: 아무것도 하지 않음 (벤치마크/테스트)
+
+설정:
+- KAFKA_NOTIFIER: 백엔드 이름 (기본: desktop)
+
+이유:
+- 서버(Linux)에서는 데스크톱 알림 라이브러리가 없어 모든 발송이 print로 끝남
+- 백엔드는 처음 사용할 때만 import (사용하지 않는 라이브러리는 로드하지 않음)
+- send_batch()로 여러 알림을 한 번에 전달할 수 있어 서버 배포 시 처리량 확보
+"""
+
+import importlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_NOTIFIER = "desktop"
+
+# 백엔드 이름 → "모듈:클래스" (lazy loading을 위해 문자열로 등록)
+NOTIFIER_BACKENDS = {
+    "desktop": "agent.notification.backends:DesktopNotifier",
+    "jsonl": "agent.notification.backends:JsonlNotifier",
+    "webhook": "agent.notification.webhook:WebhookNotifier",
+    "null": "agent.notification.backends:NullNotifier",
+}
+
+_instances: Dict[str, "NotifierBackend"] = {}
+_instances_lock = threading.Lock()
+
+
+class NotifierBackend:
+    """
+    알림 백엔드 기본 클래스
+
+    알림(notification)은 다음 키를 가진 딕셔너리입니다:
+        schedule_id, notification_index, user_id, target_date,
+        title, message, url, timeout
+    """
+
+    name = "base"
+
+    def send(self, notification: Dict):
+        """알림 1건 발송 (실패 시 예외 발생)"""
+        raise NotImplementedError
+
+    def send_batch(self, notifications: List[Dict]) -> List[Optional[Exception]]:
+        """
+        알림 여러 건 발송
+
+        Returns:
+            알림별 결과 리스트 (성공: None, 실패: 예외)
+            기본 구현은 send()를 순서대로 호출합니다.
+        """
+        results = []
+        for notification in notifications:
+            try:
+                self.send(notification)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        """백엔드 자원 정리 (필요한 경우에만 구현)"""
+        pass
+
+
+class DesktopNotifier(NotifierBackend):
+    """데스크톱 팝업 알림 (macOS: pync, Windows: winotify, 기타: plyer)"""
+
+    name = "desktop"
+
+    def send(self, notification: Dict):
+        from .popup import send_popup_notification
+
+        send_popup_notification(
+            title=notification["title"],
+            message=notification["message"],
+            timeout=notification.get("timeout", 10),
+            url=notification.get("url")
+        )
+
+
+class JsonlNotifier(NotifierBackend):
+    """
+    JSON Lines 파일 싱크
+
+    설정:
+    - KAFKA_NOTIFIER_JSONL_PATH: 기록할 파일 경로 (기본: data/notifications.jsonl)
+
+    이유:
+    - 헤드리스 서버에서 발송 내역을 다른 시스템이 읽어가도록 파일로 남김
+    - 배치 단위로 한 번에 기록
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("KAFKA_NOTIFIER_JSONL_PATH", "data/notifications.jsonl")
+        self._lock = threading.Lock()
+
+    def send(self, notification: Dict):
+        self.send_batch([notification])
+
+    def send_batch(self, notifications: List[Dict]) -> List[Optional[Exception]]:
+        sent_at = datetime.now().isoformat(timespec="seconds")
+        lines = "".join(
+            json.dumps(dict(notification, sent_at=sent_at), ensure_ascii=False) + "\n"
+            for notification in notifications
+        )
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except Exception as e:
+            return [e] * len(notifications)
+        return [None] * len(notifications)
+
+
+class NullNotifier(NotifierBackend):
+    """아무것도 하지 않는 백엔드 (발송 건수만 셈)"""
+
+    name = "null"
+
+    def __init__(self):
+        self.sent = 0
+
+    def send(self, notification: Dict):
+        self.sent += 1
+
+    def send_batch(self, notifications: List[Dict]) -> List[Optional[Exception]]:
+        self.sent += len(notifications)
+        return [None] * len(notifications)
+
+
+def register_notifier(name: str, target: str):
+    """
+    알림 백엔드 등록
+
+    Args:
+        name: 백엔드 이름 (KAFKA_NOTIFIER 값)
+        target: "모듈:클래스" 경로 (처음 사용할 때 import)
+    """
+    NOTIFIER_BACKENDS[name] = target
+    with _instances_lock:
+        _instances.pop(name, None)
+
+
+def get_notifier(name: str = None) -> NotifierBackend:
+    """
+    설정된 알림 백엔드 반환 (이름별로 1개 인스턴스 재사용)
+
+    Args:
+        name: 백엔드 이름 (기본: KAFKA_NOTIFIER 또는 desktop)
+
+    Raises:
+        ValueError: 등록되지 않은 백엔드 이름
+    """
+    name = name or os.getenv("KAFKA_NOTIFIER", DEFAULT_NOTIFIER)
+
+    with _instances_lock:
+        if name not in _instances:
+            if name not in NOTIFIER_BACKENDS:
+                raise ValueError(
+                    f"알 수 없는 알림 백엔드입니다: {name} "
+                    f"(사용 가능: {', '.join(sorted(NOTIFIER_BACKENDS))})"
+                )
+            module_name, class_name = NOTIFIER_BACKENDS[name].split(":")
+            backend_class = getattr(importlib.import_module(module_name), class_name)
+            _instances[name] = backend_class()
+        return _instances[name]
+
+
+def get_batch_size() -> int:
+    """한 번에 백엔드로 넘길 알림 수 (환경 변수 KAFKA_NOTIFIER_BATCH_SIZE, 기본: 100)"""
+    return max(1, int(os.getenv("KAFKA_NOTIFIER_BATCH_SIZE", 100)))
@@ -19,30 +19,56 @@ import subprocess
 # 플랫폼 감지
 OS_TYPE = platform.system()
 
-# macOS용 클릭 가능한 알림
-try:
-    import pync
-    PYNC_AVAILABLE = True
-except ImportError:
-    PYNC_AVAILABLE = False
-
-# Windows용 클릭 가능한 알림 (안정적)
-try:
-    from winotify import Notification, audio
-    WINOTIFY_AVAILABLE = True
-except ImportError:
-    WINOTIFY_AVAILABLE = False
-
-# 기본 알림 (클릭 불가)
-try:
-    from plyer import notification
-    PLYER_AVAILABLE = True
-except ImportError:
-    PLYER_AVAILABLE = False
-    print("⚠️  알림 라이브러리가 설치되지 않았습니다.")
-    print("   macOS: pip3 install pync")
-    print("   Windows: pip install winotify")
-    print("   기타: pip3 install plyer")
+# 알림 라이브러리는 처음 발송할 때 현재 플랫폼에 맞는 것만 로드
+_desktop_libraries = None
+
+
+def _load_desktop_libraries() -> dict:
+    """
+    데스크톱 알림 라이브러리 지연 로드 (1회)
+    
+    Returns:
+        {"pync": 모듈, "winotify": (Notification, audio), "plyer": notification} 중 로드된 것
+    
+    이유:
+    - 서버 등 데스크톱 알림을 쓰지 않는 환경에서 import 비용과 경고 출력을 피함
+    """
+    global _desktop_libraries
+    if _desktop_libraries is not None:
+        return _desktop_libraries
+    
+    libraries = {}
+    
+    # macOS용 클릭 가능한 알림
+    if OS_TYPE == 'Darwin':
+        try:
+            import pync
+            libraries['pync'] = pync
+        except ImportError:
+            pass
+    
+    # Windows용 클릭 가능한 알림 (안정적)
+    if OS_TYPE == 'Windows':
+        try:
+            from winotify import Notification, audio
+            libraries['winotify'] = (Notification, audio)
+        except ImportError:
+            pass
+    
+    # 기본 알림 (클릭 불가)
+    try:
+        from plyer import notification
+        libraries['plyer'] = notification
+    except ImportError:
+        if not libraries:
+            print("⚠️  알림 라이브러리가 설치되지 않았습니다.")
+            print("   macOS: pip3 install pync")
+            print("   Windows: pip install winotify")
+            print("   기타: pip3 install plyer")
+            print("   서버: KAFKA_NOTIFIER=jsonl 또는 webhook 사용")
+    
+    _desktop_libraries = libraries
+    return libraries
 
 
 def send_popup_notification(
@@ -72,6 +98,8 @@ def send_popup_notification(
         - 수동으로 URL 복사할 필요 없음
         - 사용자 경험 개선
     """
+    libraries = _load_desktop_libraries()
+    
     try:
         platform_name = {
             'Darwin': 'macOS',
@@ -80,8 +108,8 @@ def send_popup_notification(
         }.get(OS_TYPE, OS_TYPE)
         
         # macOS: pync 사용 (클릭 시 URL 열기)
-        if OS_TYPE == 'Darwin' and PYNC_AVAILABLE and url:
-            pync.notify(
+        if OS_TYPE == 'Darwin' and 'pync' in libraries and url:
+            libraries['pync'].notify(
                 message,
                 title=title,
                 open=url,  # 클릭 시 이 URL 열기
@@ -93,7 +121,8 @@ def send_popup_notification(
             print(f"   클릭 시 열림: {url}")
         
         # Windows: winotify 사용 (클릭 시 URL 열기 - 안정적)
-        elif OS_TYPE == 'Windows' and WINOTIFY_AVAILABLE and url:
+        elif OS_TYPE == 'Windows' and 'winotify' in libraries and url:
+            Notification, audio = libraries['winotify']
             toast = Notification(
                 app_id="카프카 AI",
                 title=title,
@@ -116,8 +145,8 @@ def send_popup_notification(
             print(f"   클릭 시 열림: {url}")
         
         # 기타 플랫폼 또는 라이브러리 없을 때: plyer 사용
-        elif PLYER_AVAILABLE:
-            notification.notify(
+        elif 'plyer' in libraries:
+            libraries['plyer'].notify(
                 title=title,
                 message=message,
                 app_name='카프카',
@@ -203,15 +232,23 @@ def schedule_popup_notifications(
         else:
             display_message = styled_content
     
-    send_popup_notification(
-        title=title,
-        message=display_message,
-        timeout=30,  # URL 확인 시간 필요
-        url=quiz_url  # ✅ 클릭 시 웹페이지 열림
-    )
+    # 설정된 알림 백엔드로 발송 (KAFKA_NOTIFIER, 기본: 데스크톱 팝업)
+    from .backends import get_notifier
+    
+    get_notifier().send({
+        'schedule_id': schedule_id,
+        'notification_index': 1,
+        'user_id': None,
+        'target_date': schedule_dates[0] if schedule_dates else None,
+        'title': title,
+        'message': display_message,
+        'url': quiz_url,  # ✅ 클릭 시 웹페이지 열림
+        'timeout': 30,  # URL 확인 시간 필요
+        'total_notifications': len(schedule_dates)
+    })
     
     print(f"\n{'='*60}")
-    print(f"✅ 테스트 알림이 화면에 표시되었습니다!")
+    print(f"✅ 테스트 알림이 발송되었습니다!")
     if quiz_url:
         print(f"🔗 클릭하면 웹 퀴즈가 열립니다: {quiz_url}")
     print(f"{'='*60}\n")
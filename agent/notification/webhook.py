@@ -0,0 +1,179 @@
+# agent/notification/webhook.py
+"""
+HTTP 웹훅 알림 백엔드
+
+알림을 JSON으로 자체 게이트웨이에 POST 합니다.
+
+설정:
+- KAFKA_WEBHOOK_URL: 알림을 받을 URL (필수)
+- KAFKA_WEBHOOK_TIMEOUT: 요청 타임아웃 (초, 기본: 10)
+- KAFKA_WEBHOOK_BATCH_SIZE: 요청 1건에 담을 알림 수 (기본: 50)
+- KAFKA_WEBHOOK_MAX_IN_FLIGHT: 동시에 보내는 최대 요청 수 (기본: 4)
+- KAFKA_WEBHOOK_MAX_RETRIES: 실패 시 재시도 횟수 (기본: 3)
+- KAFKA_WEBHOOK_BACKOFF: 재시도 대기 기본값 (초, 기본: 0.5 → 0.5, 1, 2, ...)
+- KAFKA_WEBHOOK_MAX_RETRY_WAIT: 재시도 1번당 최대 대기 시간 (초, 기본: 30)
+  게이트웨이가 Retry-After로 더 긴 시간을 보내도 이 값까지만 기다림
+
+이유:
+- 요청마다 새 연결을 맺지 않도록 keep-alive 세션(커넥션 풀)을 재사용
+- 알림을 묶어서 보내 요청 수를 줄이고, 동시 요청 수를 제한해 게이트웨이 과부하 방지
+- 같은 알림은 항상 같은 Idempotency-Key로 보내므로 재시도해도 중복 발송되지 않음
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .backends import NotifierBackend
+
+# 재시도할 HTTP 상태 코드 (요청 한도 초과, 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def idempotency_key(notification: Dict) -> str:
+    """
+    알림 1건의 멱등성 키
+
+    (schedule_id, notification_index)에 발송 날짜를 더해
+    오답 재발송(같은 차수, 다른 날짜)은 별도 알림으로 구분합니다.
+    다이제스트 알림은 묶인 알림들의 키로 만듭니다.
+    """
+    if "items" in notification:
+        return "digest:" + ",".join(sorted(idempotency_key(item) for item in notification["items"]))
+    return f"{notification['schedule_id']}:{notification['notification_index']}:{notification.get('target_date', '')}"
+
+
+def batch_idempotency_key(notifications: List[Dict]) -> str:
+    """배치 요청의 멱등성 키 (같은 알림 묶음이면 항상 같은 값)"""
+    keys = "\n".join(sorted(idempotency_key(n) for n in notifications))
+    return hashlib.sha256(keys.encode("utf-8")).hexdigest()[:32]
+
+
+class WebhookNotifier(NotifierBackend):
+    """
+    HTTP 웹훅 알림 백엔드
+
+    요청:
+        POST KAFKA_WEBHOOK_URL
+        Idempotency-Key: <배치 키>
+        {"notifications": [{..., "idempotency_key": "12:1:2026-02-13"}, ...]}
+
+    응답:
+        2xx → 배치 전체 성공
+        429/5xx, 연결 오류 → 대기 후 같은 키로 재시도
+        그 외 4xx → 재시도 없이 실패
+    """
+
+    name = "webhook"
+
+    def __init__(
+        self,
+        url: str = None,
+        timeout: float = None,
+        batch_size: int = None,
+        max_in_flight: int = None,
+        max_retries: int = None,
+        backoff: float = None,
+        max_retry_wait: float = None
+    ):
+        self.url = url or os.getenv("KAFKA_WEBHOOK_URL")
+        if not self.url:
+            raise ValueError("KAFKA_WEBHOOK_URL 환경 변수가 설정되지 않았습니다.")
+        self.timeout = timeout or float(os.getenv("KAFKA_WEBHOOK_TIMEOUT", 10))
+        self.batch_size = max(1, batch_size or int(os.getenv("KAFKA_WEBHOOK_BATCH_SIZE", 50)))
+        self.max_in_flight = max(1, max_in_flight or int(os.getenv("KAFKA_WEBHOOK_MAX_IN_FLIGHT", 4)))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("KAFKA_WEBHOOK_MAX_RETRIES", 3))
+        self.backoff = backoff if backoff is not None else float(os.getenv("KAFKA_WEBHOOK_BACKOFF", 0.5))
+        self.max_retry_wait = (
+            max_retry_wait if max_retry_wait is not None
+            else float(os.getenv("KAFKA_WEBHOOK_MAX_RETRY_WAIT", 30))
+        )
+
+        # keep-alive 커넥션 풀 (동시 요청 수만큼 연결 유지)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # 동시 요청 수 제한 (여러 스레드가 같은 백엔드를 써도 전체 상한 유지)
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight,
+            thread_name_prefix="kafka-webhook"
+        )
+
+    def send(self, notification: Dict):
+        error = self.send_batch([notification])[0]
+        if error:
+            raise error
+
+    def send_batch(self, notifications: List[Dict]) -> List[Optional[Exception]]:
+        """알림을 batch_size 단위로 나눠 동시에(최대 max_in_flight) 전송"""
+        chunks = [
+            notifications[start:start + self.batch_size]
+            for start in range(0, len(notifications), self.batch_size)
+        ]
+
+        results = []
+        for chunk, error in zip(chunks, self._executor.map(self._post_with_retry, chunks)):
+            results.extend([error] * len(chunk))
+        return results
+
+    def _post_with_retry(self, notifications: List[Dict]) -> Optional[Exception]:
+        """
+        배치 1건 전송 (실패 시 지수 백오프로 재시도)
+
+        Returns:
+            성공 시 None, 최종 실패 시 마지막 예외
+        """
+        body = {
+            "notifications": [
+                dict(notification, idempotency_key=idempotency_key(notification))
+                for notification in notifications
+            ]
+        }
+        headers = {"Idempotency-Key": batch_idempotency_key(notifications)}
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._retry_delay(attempt, error))
+
+            try:
+                with self._in_flight:
+                    response = self.session.post(self.url, json=body, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                continue
+
+            if response.status_code < 400:
+                return None
+
+            error = requests.HTTPError(
+                f"웹훅 응답 오류: {response.status_code} {response.reason}",
+                response=response
+            )
+            if response.status_code not in RETRY_STATUS_CODES:
+                break
+
+        return error
+
+    def _retry_delay(self, attempt: int, error: Optional[Exception]) -> float:
+        """재시도 대기 시간 (Retry-After 헤더가 있으면 우선, 최대 max_retry_wait초)"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = self.backoff * (2 ** (attempt - 1))
+        return min(delay, self.max_retry_wait)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
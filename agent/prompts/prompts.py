@@ -46,6 +46,18 @@ Rules:
 Return ONLY plain Korean text (no JSON, no markdown).
 """
 
+# 긴 본문(map-reduce) 구간 요약: 구간 노트를 이어 붙여 SUMMARY_DRAFT_PROMPT로 최종 요약
+SECTION_NOTES_PROMPT = """You are Kafka AI note taker.
+
+Task:
+- The SECTION is one part ({index}/{total}) of a long article or video transcript.
+- Write concise Korean notes (at most 6 bullet points) of the key facts, figures, names and claims in this SECTION.
+Rules:
+- Use ONLY the SECTION. Do not guess.
+- Skip greetings, ads, and filler talk.
+Return ONLY the Korean bullet points (no headings, no markdown other than "- ").
+"""
+
 IMPROVE_DRAFT_PROMPT = """You are Kafka AI fixer.
 
 Given:
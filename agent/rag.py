@@ -15,6 +15,7 @@ except Exception:
     from langchain_text_splitters import CharacterTextSplitter  # 최신 분리 패키지
 
 from agent.prompts import QUERY_REWRITE_PROMPT, RERANK_PROMPT
+from agent.utils.compress import compress_for_prompt
 
 
 # -----------------------------
@@ -44,8 +45,8 @@ def build_vectorstore(text: str) -> FAISS:
 
 
 def rewrite_query(llm: ChatUpstage, article_text: str) -> str:
-    """기사 일부를 바탕으로 검색 최적화 쿼리를 1문장으로 재작성합니다."""
-    snippet = (article_text or "")[:1800]
+    """기사 핵심 문장(compress_for_prompt)을 바탕으로 검색 최적화 쿼리를 1문장으로 재작성합니다."""
+    snippet = compress_for_prompt(article_text or "", "rewrite_query")
     prompt = QUERY_REWRITE_PROMPT.strip() + "\n\n" + snippet
 
     resp = llm.invoke(prompt)
@@ -0,0 +1,170 @@
+# agent/scheduler/delivery.py
+"""
+알림 발송 시간대(Delivery Window) 분산
+
+모든 알림을 오전 8시 정각에 한꺼번에 보내지 않고,
+설정된 시간대(예: 07:30-08:30) 안의 버킷(time bucket)에 고르게 나눠 발송합니다.
+
+동작:
+- 시간대는 "HH:MM-HH:MM" 형식 (끝 시각은 포함하지 않음)
+- 버킷은 자정 기준 bucket_minutes 간격 격자에 정렬
+- (schedule_id, notification_index)를 해시하여 버킷을 결정 (재시작해도 항상 같은 버킷)
+
+이유:
+- 같은 초에 모든 알림이 몰리면 알림 시스템과 퀴즈 웹 서버에 부하가 집중됨
+- 결정적(deterministic) 배정이라 같은 알림이 두 버킷에서 중복 발송되지 않음
+"""
+
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 기본값: 기존과 동일하게 오전 8시 한 번만 발송
+DEFAULT_DELIVERY_WINDOW = "08:00-08:00"
+DEFAULT_BUCKET_MINUTES = 5
+
+
+def parse_window(window: str) -> Tuple[int, int]:
+    """
+    "HH:MM-HH:MM" 형식의 시간대를 자정 기준 분(minute)으로 변환
+
+    Args:
+        window: 발송 시간대 (예: "07:30-08:30")
+
+    Returns:
+        (시작 분, 끝 분) 예: (450, 510)
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 끝 시각이 시작 시각보다 빠를 때
+    """
+    try:
+        start_text, end_text = window.strip().split("-")
+        start = _parse_hhmm(start_text)
+        end = _parse_hhmm(end_text)
+    except (AttributeError, ValueError):
+        raise ValueError(f"잘못된 발송 시간대 형식입니다 (HH:MM-HH:MM): {window}")
+
+    if end < start:
+        raise ValueError(f"발송 시간대는 자정을 넘길 수 없습니다: {window}")
+
+    return start, end
+
+
+def _parse_hhmm(text: str) -> int:
+    """"HH:MM" → 자정 기준 분"""
+    hour, minute = text.strip().split(":")
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(text)
+    return hour * 60 + minute
+
+
+def _format_hhmm(minutes: int) -> str:
+    """자정 기준 분 → "HH:MM" """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def validate_bucket_minutes(bucket_minutes: int) -> int:
+    """
+    버킷 크기 검증
+
+    이유:
+    - 매시간 같은 격자가 반복되도록 60의 약수만 허용
+    """
+    if bucket_minutes <= 0 or 60 % bucket_minutes != 0:
+        raise ValueError(f"버킷 크기는 60의 약수(분)여야 합니다: {bucket_minutes}")
+    return bucket_minutes
+
+
+def window_slots(window: str, bucket_minutes: int = DEFAULT_BUCKET_MINUTES) -> List[str]:
+    """
+    시간대 안의 버킷 시작 시각 목록
+
+    Args:
+        window: 발송 시간대 (예: "07:30-08:30")
+        bucket_minutes: 버킷 크기 (분)
+
+    Returns:
+        ["07:30", "07:35", ..., "08:25"]
+
+        시간대가 버킷 하나보다 좁으면 시작 시각 이후 첫 버킷 1개만 반환
+        (예: "08:00-08:00" → ["08:00"])
+    """
+    validate_bucket_minutes(bucket_minutes)
+    start, end = parse_window(window)
+
+    # 시작 시각 이후 첫 격자점
+    first = -(-start // bucket_minutes) * bucket_minutes
+    slots = list(range(first, end, bucket_minutes))
+    if not slots:
+        slots = [first]
+
+    return [_format_hhmm(m) for m in slots]
+
+
+def assign_slot(
+    schedule_id: int,
+    notification_index: int,
+    window: str,
+    bucket_minutes: int = DEFAULT_BUCKET_MINUTES
+) -> str:
+    """
+    알림 1건을 시간대 안의 버킷에 결정적으로 배정
+
+    Args:
+        schedule_id: 스케줄 ID
+        notification_index: 알림 차수
+        window: 사용자의 발송 시간대
+        bucket_minutes: 버킷 크기 (분)
+
+    Returns:
+        배정된 버킷 시작 시각 ("HH:MM")
+
+    이유:
+    - Python hash()는 프로세스마다 달라지므로 crc32 사용
+    """
+    slots = window_slots(window, bucket_minutes)
+    key = f"{schedule_id}:{notification_index}".encode()
+    return slots[zlib.crc32(key) % len(slots)]
+
+
+def current_slot(bucket_minutes: int = DEFAULT_BUCKET_MINUTES, now: datetime = None) -> str:
+    """
+    현재 시각이 속한 버킷 시작 시각
+
+    Args:
+        bucket_minutes: 버킷 크기 (분)
+        now: 기준 시각 (기본: 현재)
+    """
+    validate_bucket_minutes(bucket_minutes)
+    now = now or datetime.now()
+    minutes = now.hour * 60 + now.minute
+    return _format_hhmm(minutes - minutes % bucket_minutes)
+
+
+def collect_slots(windows: Iterable[str], bucket_minutes: int = DEFAULT_BUCKET_MINUTES) -> List[str]:
+    """
+    여러 시간대(전역 + 사용자별)의 버킷을 합친 정렬된 목록
+
+    스케줄러는 이 목록의 각 시각에 한 번씩 깨어납니다.
+    """
+    slots = set()
+    for window in windows:
+        slots.update(window_slots(window, bucket_minutes))
+    return sorted(slots)
+
+
+def get_default_window() -> str:
+    """전역 발송 시간대 (환경 변수 KAFKA_DELIVERY_WINDOW, 기본: 08:00-08:00)"""
+    return os.getenv("KAFKA_DELIVERY_WINDOW", DEFAULT_DELIVERY_WINDOW)
+
+
+def get_default_bucket_minutes() -> int:
+    """버킷 크기 (환경 변수 KAFKA_DELIVERY_BUCKET_MINUTES, 기본: 5)"""
+    return int(os.getenv("KAFKA_DELIVERY_BUCKET_MINUTES", DEFAULT_BUCKET_MINUTES))
+
+
+def resolve_window(user_id: str, user_windows: Dict[str, str], default_window: Optional[str] = None) -> str:
+    """사용자별 시간대가 있으면 그것을, 없으면 전역 시간대를 반환"""
+    return user_windows.get(user_id) or default_window or get_default_window()
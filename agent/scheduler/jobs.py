@@ -5,72 +5,158 @@
 실제로 실행될 작업(Job)들을 정의합니다.
 """
 
-from datetime import datetime, date
-from typing import List, Dict
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Optional
 import json
+import os
 
+from agent.notification.backends import get_batch_size, get_notifier
+from .delivery import (
+    assign_slot,
+    current_slot,
+    get_default_bucket_minutes,
+    get_default_window,
+    resolve_window,
+)
 
-def send_daily_notifications():
+# 사용자별 일일 최대 알림 수 (기획서: 일일 최대 4회)
+DEFAULT_DAILY_CAP = 4
+
+
+def send_daily_notifications(
+    slot: Optional[str] = None,
+    delivery_window: Optional[str] = None,
+    bucket_minutes: Optional[int] = None,
+    daily_cap: Optional[int] = None,
+    digest: Optional[bool] = None
+):
     """
-    매일 오전 8시에 실행되는 메인 작업 
+    매일 발송 시간대에 실행되는 메인 작업 
+    
+    Args:
+        slot: 이번에 발송할 버킷 시작 시각 ("HH:MM", 없으면 오늘 알림 전체 발송)
+        delivery_window: 전역 발송 시간대 (기본: KAFKA_DELIVERY_WINDOW)
+        bucket_minutes: 버킷 크기 (분, 기본: KAFKA_DELIVERY_BUCKET_MINUTES)
+        daily_cap: 사용자별 일일 최대 알림 수 (기본: KAFKA_DAILY_NOTIFICATION_CAP 또는 4)
+        digest: 사용자별 알림을 1건으로 묶어 발송 (기본: KAFKA_NOTIFICATION_DIGEST)
     
     동작:
-    1. DB에서 오늘 발송할 스케줄 조회
-    2. 각 스케줄에 대해 알림 발송
-    3. 발송 결과를 DB에 기록
+    1. 사용자별 일일 한도를 넘는 알림을 다음 날로 이월
+    2. DB에서 오늘 발송할 알림(정규 + 재발송) 조회 (한도 적용)
+    3. slot이 주어지면 해당 버킷에 배정된 알림만 선별
+    4. 다이제스트 모드면 사용자별로 묶음 알림 1건 생성
+    5. 각 알림 발송 및 결과를 DB에 기록
     
     이유:
     - 에빙하우스 망각 곡선에 따라 정해진 날짜에 복습 알림 발송
     - 오전 8시 출근길 시간대는 인지 부하가 적어 학습에 효과적
+    - 버킷 단위로 나눠 보내 알림/웹 서버 부하를 시간대 전체에 분산
+    - 일일 최대 4회 (알림 스트레스 방지)
     """
     from agent.database import get_db
     
     today = date.today().isoformat()
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    daily_cap = daily_cap or get_daily_cap()
+    digest = is_digest_enabled() if digest is None else digest
+    
     print(f"\n{'='*60}")
-    print(f"📅 일일 알림 발송 작업 시작: {today}")
+    print(f"📅 일일 알림 발송 작업 시작: {today}" + (f" (버킷 {slot})" if slot else ""))
     print(f"{'='*60}\n")
     
     db = get_db()
     
     try:
-        # 오늘 발송할 스케줄 조회
-        schedules = db.get_schedules_for_date(today)
-        
-        # 오늘 재발송할 스케줄 조회
-        retry_schedules = db.get_retry_schedules_for_date(today)
+        # 한도 초과분 이월 후 오늘 발송할 알림 조회
+        db.defer_overflow_notifications(today, tomorrow, daily_cap)
+        due = db.get_due_notifications(today, daily_cap)
         
-        total_count = len(schedules) + len(retry_schedules)
+        # 버킷 단위 발송: 이번 버킷에 배정된 알림만 남김
+        if slot:
+            due = _filter_for_slot(
+                db, due, slot,
+                delivery_window or get_default_window(),
+                bucket_minutes or get_default_bucket_minutes(),
+                by_user=digest
+            )
         
-        if total_count == 0:
+        if not due:
             print(f"📭 오늘 발송할 알림이 없습니다.")
             return
         
-        print(f"📬 발송 대상: {len(schedules)}개 스케줄, {len(retry_schedules)}개 재발송\n")
+        retry_count = sum(1 for item in due if item['retry_id'] is not None)
+        print(f"📬 발송 대상: {len(due) - retry_count}개 스케줄, {retry_count}개 재발송\n")
         
         success_count = 0
         fail_count = 0
         
-        # 정규 스케줄 발송
-        for schedule in schedules:
-            try:
-                send_notification_for_schedule(schedule, today)
+        # 1. 발송할 알림 준비 (중복 발송 체크 포함)
+        prepared = []
+        for item in due:
+            schedule = {
+                'id': item['schedule_id'],
+                'user_id': item['user_id'],
+                'category': item['category'],
+                'styled_content': item['styled_content'],
+                'schedule_dates': item['schedule_dates']
+            }
+            
+            if item['retry_id'] is not None:
+                print(f"🔄 재발송: 스케줄 {item['schedule_id']}, {item['notification_index']}차 (시도 {item['retry_count']}회)")
+            
+            notification = _prepare_notification(
+                db, schedule, today,
+                notification_index=item['notification_index'],
+                is_retry=(item['retry_count'] or 0) > 0
+            )
+            
+            if notification is None:
+                # 이미 발송된 알림은 건너뛰고 성공으로 처리
+                if item['retry_id'] is not None:
+                    db.mark_retry_as_completed(item['retry_id'])
                 success_count += 1
-            except Exception as e:
-                print(f"❌ 스케줄 {schedule['id']} 발송 실패: {e}")
-                fail_count += 1
+                continue
+            
+            prepared.append(([item], notification))
         
-        # 재발송 스케줄 처리
-        for retry in retry_schedules:
+        # 2. 다이제스트 모드: 사용자별 알림을 1건으로 묶음
+        if digest:
+            prepared = _coalesce_by_user(prepared, today)
+            print(f"📚 다이제스트 모드: {len(prepared)}개 알림으로 묶음")
+        
+        # 3. 알림 백엔드로 배치 발송 후 결과 기록
+        notifier = get_notifier()
+        batch_size = get_batch_size()
+        
+        for start in range(0, len(prepared), batch_size):
+            batch = prepared[start:start + batch_size]
+            print(f"📤 {len(batch)}개 알림 발송 중... ({notifier.name})")
+            
             try:
-                schedule = db.get_schedule_by_id(retry['schedule_id'])
-                if schedule:
-                    print(f"🔄 재발송: 스케줄 {retry['schedule_id']}, {retry['notification_index']}차 (시도 {retry['retry_count']}회)")
-                    send_notification_for_schedule(schedule, today, notification_index=retry['notification_index'])
-                    db.mark_retry_as_completed(retry['id'])
-                    success_count += 1
+                errors = notifier.send_batch([notification for _, notification in batch])
             except Exception as e:
-                print(f"❌ 재발송 실패 (retry_id: {retry['id']}): {e}")
-                fail_count += 1
+                errors = [e] * len(batch)
+            
+            for (items, notification), error in zip(batch, errors):
+                try:
+                    _record_result(db, notification, error)
+                    if error is None:
+                        for item in items:
+                            if item['retry_id'] is not None:
+                                db.mark_retry_as_completed(item['retry_id'])
+                except Exception as e:
+                    error = error or e
+                
+                if error is None:
+                    success_count += len(items)
+                    continue
+                
+                fail_count += len(items)
+                for item in items:
+                    if item['retry_id'] is not None:
+                        print(f"❌ 재발송 실패 (retry_id: {item['retry_id']}): {error}")
+                    else:
+                        print(f"❌ 스케줄 {item['schedule_id']} 발송 실패: {error}")
         
         print(f"\n{'='*60}")
         print(f"✅ 발송 완료: {success_count}개 성공, {fail_count}개 실패")
@@ -82,7 +168,141 @@ def send_daily_notifications():
         traceback.print_exc()
 
 
-def send_notification_for_schedule(schedule: Dict, target_date: str, notification_index: int = None):
+def get_daily_cap() -> int:
+    """사용자별 일일 최대 알림 수 (환경 변수 KAFKA_DAILY_NOTIFICATION_CAP, 기본: 4)"""
+    return int(os.getenv("KAFKA_DAILY_NOTIFICATION_CAP", DEFAULT_DAILY_CAP))
+
+
+def is_digest_enabled() -> bool:
+    """다이제스트 모드 여부 (환경 변수 KAFKA_NOTIFICATION_DIGEST, 기본: 꺼짐)"""
+    return os.getenv("KAFKA_NOTIFICATION_DIGEST", "").lower() in ("1", "true", "yes", "on")
+
+
+def send_bucket_notifications(
+    delivery_window: Optional[str] = None,
+    bucket_minutes: Optional[int] = None,
+    slot: Optional[str] = None
+):
+    """
+    버킷에 배정된 알림 발송 (스케줄러가 버킷마다 1회 호출)
+    
+    Args:
+        delivery_window: 전역 발송 시간대
+        bucket_minutes: 버킷 크기 (분)
+        slot: 발송할 버킷 시작 시각 ("HH:MM", 스케줄러가 작업마다 지정, 없으면 현재 버킷)
+    
+    늦게 실행돼도 slot 버킷을 발송합니다 (현재 시각의 버킷이 아니라).
+    """
+    bucket_minutes = bucket_minutes or get_default_bucket_minutes()
+    now_slot = current_slot(bucket_minutes)
+    if slot and slot != now_slot:
+        print(f"⏰ 버킷 {slot} 지연 실행 (현재 {now_slot})")
+    send_daily_notifications(
+        slot=slot or now_slot,
+        delivery_window=delivery_window,
+        bucket_minutes=bucket_minutes
+    )
+
+
+def _filter_for_slot(
+    db,
+    due: List[Dict],
+    slot: str,
+    delivery_window: str,
+    bucket_minutes: int,
+    by_user: bool = False
+) -> List[Dict]:
+    """
+    오늘 발송 대상 중 slot 버킷에 배정된 것만 반환
+    
+    Args:
+        due: get_due_notifications() 결과
+        by_user: 사용자 단위로 버킷 배정 (다이제스트 모드: 한 사용자의 알림이 같은 버킷에 모이도록)
+    """
+    user_windows = db.get_delivery_windows()
+    
+    def slot_key(item: Dict):
+        if by_user:
+            return item['user_id'], 0
+        return item['schedule_id'], item['notification_index']
+    
+    def in_slot(item: Dict) -> bool:
+        window = resolve_window(item['user_id'], user_windows, delivery_window)
+        try:
+            return assign_slot(*slot_key(item), window, bucket_minutes) == slot
+        except ValueError as e:
+            # 잘못 저장된 사용자 시간대는 전역 시간대로 대체
+            print(f"⚠️  {item['user_id']}: {e}")
+            return assign_slot(*slot_key(item), delivery_window, bucket_minutes) == slot
+    
+    return [item for item in due if in_slot(item)]
+
+
+def _coalesce_by_user(prepared: List, target_date: str) -> List:
+    """
+    사용자별 알림을 다이제스트 1건으로 묶음
+    
+    Args:
+        prepared: [([due item], notification), ...]
+    
+    Returns:
+        [([due items], notification), ...] (알림이 1개뿐인 사용자는 그대로 유지)
+    """
+    by_user = {}
+    for items, notification in prepared:
+        by_user.setdefault(notification['user_id'], []).append((items, notification))
+    
+    coalesced = []
+    for user_id, entries in by_user.items():
+        if len(entries) == 1:
+            coalesced.append(entries[0])
+            continue
+        
+        items = [item for entry_items, _ in entries for item in entry_items]
+        coalesced.append((items, build_digest_notification(
+            user_id, target_date, [notification for _, notification in entries]
+        )))
+    
+    return coalesced
+
+
+def build_digest_notification(user_id: str, target_date: str, notifications: List[Dict]) -> Dict:
+    """
+    여러 알림을 묶은 다이제스트 알림 생성
+    
+    Returns:
+        알림 딕셔너리 (items: 묶인 알림 목록, url: 통합 퀴즈 페이지)
+    """
+    quiz_count = sum(1 for notification in notifications if notification['url'])
+    items_param = ",".join(
+        f"{notification['schedule_id']}:{notification['notification_index']}"
+        for notification in notifications
+    )
+    
+    if quiz_count:
+        message = f"📝 오늘 복습할 퀴즈 {quiz_count}개가 모였습니다!\n\n한 번에 풀러 가세요 (클릭하면 자동으로 열립니다)"
+    else:
+        message = f"💭 오늘의 복습 {len(notifications)}개가 도착했습니다!\n\n클릭해서 한 번에 확인하세요"
+    
+    return {
+        'schedule_id': None,
+        'notification_index': None,
+        'user_id': user_id,
+        'target_date': target_date,
+        'title': f"📚 카프카 오늘의 복습 {len(notifications)}개",
+        'message': message,
+        'url': f"http://localhost:8080/digest?items={items_param}",
+        'timeout': 30,
+        'items': notifications
+    }
+
+
+def send_notification_for_schedule(
+    schedule: Dict,
+    target_date: str,
+    notification_index: int = None,
+    is_retry: bool = False
+):
     """
     특정 스케줄에 대해 알림 발송
     
@@ -90,102 +310,189 @@ def send_notification_for_schedule(schedule: Dict, target_date: str, notificatio
         schedule: 스케줄 정보 딕셔너리
         target_date: 발송 대상 날짜 (YYYY-MM-DD)
         notification_index: 알림 차수 (재발송 시 직접 지정, 선택)
+        is_retry: 오답 재발송 여부 (이미 보낸 차수를 다시 보내므로 중복 체크 생략)
     
     동작:
     1. schedule_dates에서 몇 번째 알림인지 확인
     2. 중복 발송 방지 체크
-    3. 팝업 알림 발송
+    3. 알림 백엔드로 발송 (KAFKA_NOTIFIER, 기본: 데스크톱 팝업)
     4. DB에 발송 기록
     5. 마지막 알림이면 완료 처리
     """
-    from agent.notification.popup import send_popup_notification
     from agent.database import get_db
     
+    db = get_db()
+    
+    notification = _prepare_notification(db, schedule, target_date, notification_index, is_retry)
+    if notification is None:
+        return
+    
+    print(f"📤 스케줄 {notification['schedule_id']}: {notification['notification_index']}차 알림 발송 중...")
+    
+    try:
+        get_notifier().send(notification)
+    except Exception as e:
+        _record_result(db, notification, e)
+        raise
+    
+    _record_result(db, notification)
+
+
+def build_notification(schedule: Dict, target_date: str, notification_index: int) -> Dict:
+    """
+    스케줄 1건의 알림 내용 생성
+    
+    Returns:
+        알림 딕셔너리 (schedule_id, notification_index, user_id, target_date,
+        title, message, url, timeout, total_notifications)
+    """
+    schedule_id = schedule['id']
+    category = schedule.get('category', '지식형')
+    styled_content = schedule.get('styled_content', '')
+    
+    # 페르소나를 notification_index에 맞게 선택
+    persona_map = {
+        1: "친근한 친구",
+        2: "다정한 선배",
+        3: "엄격한 교수",
+        4: "유머러스한 코치",
+        5: "밈 마스터"  # 예비 (재발송 시)
+    }
+    persona_style = persona_map.get(notification_index, "친근한 친구")
+    
+    emoji = "🎓" if category == "지식형" else "💭"
+    title = f"{emoji} 카프카 {notification_index}차 복습 알림 ({persona_style})"
+    
+    # 메시지 및 URL 생성
+    quiz_url = None
+    if category == "지식형":
+        # 정보형: 퀴즈 URL 포함
+        quiz_url = f"http://localhost:8080/quiz/{schedule_id}/{notification_index}"
+        message = f"📝 오늘의 퀴즈가 준비되었습니다!\n\n{notification_index}번째 문제를 풀러 가세요 (클릭하면 자동으로 열립니다)"
+    else:
+        # 힐링형: 기존 방식
+        if len(styled_content) > 200:
+            message = styled_content[:197] + "..."
+        else:
+            message = styled_content
+    
+    return {
+        'schedule_id': schedule_id,
+        'notification_index': notification_index,
+        'user_id': schedule.get('user_id'),
+        'target_date': target_date,
+        'title': title,
+        'message': message,
+        'url': quiz_url,  # 정보형일 때만 URL 전달 (클릭 시 웹페이지 열림)
+        'timeout': 30,  # 30초 표시
+        'total_notifications': len(_parse_schedule_dates(schedule))
+    }
+
+
+def _parse_schedule_dates(schedule: Dict) -> List[str]:
+    """schedule_dates를 리스트로 반환 (get_schedule_by_id()는 이미 파싱된 값을 반환함)"""
+    schedule_dates = schedule['schedule_dates']
+    if isinstance(schedule_dates, str):
+        schedule_dates = json.loads(schedule_dates)
+    return schedule_dates
+
+
+def _prepare_notification(
+    db,
+    schedule: Dict,
+    target_date: str,
+    notification_index: int = None,
+    is_retry: bool = False
+) -> Optional[Dict]:
+    """
+    발송할 알림 생성 (발송하지 않아야 하면 None)
+    
+    - 차수를 알 수 없거나 이미 발송된 알림은 None
+    """
     schedule_id = schedule['id']
-    schedule_dates = json.loads(schedule['schedule_dates'])
     
     # 몇 번째 알림인지 확인 (재발송 시에는 직접 전달받음)
     if notification_index is None:
         try:
-            notification_index = schedule_dates.index(target_date) + 1  # 1부터 시작
+            notification_index = _parse_schedule_dates(schedule).index(target_date) + 1  # 1부터 시작
         except ValueError:
             print(f"⚠️  스케줄 {schedule_id}: 날짜 {target_date}를 찾을 수 없음")
-            return
-    
-    db = get_db()
+            return None
     
     # 중복 발송 방지
-    if is_already_sent(db, schedule_id, notification_index):
+    if not is_retry and is_already_sent(db, schedule_id, notification_index):
         print(f"⏭️  스케줄 {schedule_id}: {notification_index}차 알림 이미 발송됨 (스킵)")
+        return None
+    
+    return build_notification(schedule, target_date, notification_index)
+
+
+def _record_result(db, notification: Dict, error: Exception = None):
+    """
+    발송 결과를 DB에 기록
+    
+    - 성공: 발송 로그 + 마지막 알림이면 완료 처리
+    - 실패: 실패 로그 (에러 메시지 포함)
+    """
+    if 'items' in notification:
+        _record_digest_result(db, notification, error)
         return
     
-    print(f"📤 스케줄 {schedule_id}: {notification_index}차 알림 발송 중...")
+    schedule_id = notification['schedule_id']
+    notification_index = notification['notification_index']
     
-    try:
-        # 알림 제목 및 내용 생성
-        category = schedule.get('category', '지식형')
-        styled_content = schedule.get('styled_content', '')
-        
-        # 페르소나를 notification_index에 맞게 선택
-        persona_map = {
-            1: "친근한 친구",
-            2: "다정한 선배",
-            3: "엄격한 교수",
-            4: "유머러스한 코치",
-            5: "밈 마스터"  # 예비 (재발송 시)
-        }
-        persona_style = persona_map.get(notification_index, "친근한 친구")
-        
-        emoji = "🎓" if category == "지식형" else "💭"
-        title = f"{emoji} 카프카 {notification_index}차 복습 알림 ({persona_style})"
-        
-        # 메시지 및 URL 생성
-        quiz_url = None
-        if category == "지식형":
-            # 정보형: 퀴즈 URL 포함
-            quiz_url = f"http://localhost:8080/quiz/{schedule_id}/{notification_index}"
-            message = f"📝 오늘의 퀴즈가 준비되었습니다!\n\n{notification_index}번째 문제를 풀러 가세요 (클릭하면 자동으로 열립니다)"
-        else:
-            # 힐링형: 기존 방식
-            if len(styled_content) > 200:
-                message = styled_content[:197] + "..."
-            else:
-                message = styled_content
-        
-        # 팝업 발송 (클릭 시 자동으로 웹페이지 열림)
-        send_popup_notification(
-            title=title,
-            message=message,
-            timeout=30,  # 30초 표시
-            url=quiz_url  # 정보형일 때만 URL 전달
-        )
-        
-        # 발송 성공 로그
-        db.log_notification(
-            schedule_id=schedule_id,
-            notification_index=notification_index,
-            scheduled_date=target_date,
-            is_success=True
-        )
-        
-        print(f"✅ 스케줄 {schedule_id}: {notification_index}차 알림 발송 완료")
-        
-        # 마지막 알림이면 완료 처리
-        if notification_index == len(schedule_dates):
-            db.mark_as_completed(schedule_id)
-            print(f"🎉 스케줄 {schedule_id}: 모든 알림 발송 완료 (상태: completed)")
-        
-    except Exception as e:
+    if error is not None:
         # 발송 실패 로그
         db.log_notification(
             schedule_id=schedule_id,
             notification_index=notification_index,
-            scheduled_date=target_date,
+            scheduled_date=notification['target_date'],
             is_success=False,
-            error_message=str(e)
+            error_message=str(error)
         )
-        print(f"❌ 스케줄 {schedule_id}: {notification_index}차 알림 발송 실패 - {e}")
-        raise
+        print(f"❌ 스케줄 {schedule_id}: {notification_index}차 알림 발송 실패 - {error}")
+        return
+    
+    # 발송 성공 로그
+    db.log_notification(
+        schedule_id=schedule_id,
+        notification_index=notification_index,
+        scheduled_date=notification['target_date'],
+        is_success=True
+    )
+    
+    print(f"✅ 스케줄 {schedule_id}: {notification_index}차 알림 발송 완료")
+    
+    # 마지막 알림이면 완료 처리
+    if notification_index == notification['total_notifications']:
+        db.mark_as_completed(schedule_id)
+        print(f"🎉 스케줄 {schedule_id}: 모든 알림 발송 완료 (상태: completed)")
+
+
+def _record_digest_result(db, digest: Dict, error: Exception = None):
+    """다이제스트에 묶인 알림들의 발송 결과를 한 번에 기록"""
+    items = digest['items']
+    db.log_notifications([
+        {
+            'schedule_id': item['schedule_id'],
+            'notification_index': item['notification_index'],
+            'scheduled_date': item['target_date'],
+            'is_success': error is None,
+            'error_message': str(error) if error is not None else None
+        }
+        for item in items
+    ])
+    
+    if error is not None:
+        print(f"❌ {digest['user_id']}: 다이제스트 알림 발송 실패 ({len(items)}개) - {error}")
+        return
+    
+    print(f"✅ {digest['user_id']}: 다이제스트 알림 발송 완료 ({len(items)}개)")
+    
+    for item in items:
+        if item['notification_index'] == item['total_notifications']:
+            db.mark_as_completed(item['schedule_id'])
+            print(f"🎉 스케줄 {item['schedule_id']}: 모든 알림 발송 완료 (상태: completed)")
 
 
 def is_already_sent(db, schedule_id: int, notification_index: int) -> bool:
@@ -5,6 +5,8 @@
 APScheduler를 사용하여 지정된 시간에 자동으로 알림을 발송합니다.
 """
 
+from apscheduler.events import EVENT_JOB_MISSED
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
@@ -12,13 +14,18 @@ from datetime import datetime
 import time
 import atexit
 
+# 버킷 작업이 늦게 시작돼도 (앞 버킷이 오래 걸리거나 프로세스가 잠시 멈춘 경우) 이 시간 안이면 발송
+# (APScheduler 기본값 1초로는 늦은 버킷을 버려서, 그 버킷 사용자는 그날 알림을 못 받음)
+MISFIRE_GRACE_SECONDS = 3 * 60 * 60
+
 
 class KafkaScheduler:
     """
     카프카 실시간 스케줄러
     
     기능:
-    - 매일 오전 8시에 자동으로 알림 발송
+    - 매일 발송 시간대(기본: 오전 8시)에 자동으로 알림 발송
+    - 시간대 안의 버킷마다 1회씩 깨어나 해당 버킷의 알림만 발송
     - 백그라운드에서 24/7 실행
     - 프로그램 종료 시 안전하게 정리
     
@@ -27,17 +34,33 @@ class KafkaScheduler:
     - 사용자가 수동으로 실행하지 않아도 자동으로 알림 발송
     """
     
-    def __init__(self, test_mode: bool = False, interval_seconds: int = None):
+    def __init__(
+        self,
+        test_mode: bool = False,
+        interval_seconds: int = None,
+        delivery_window: str = None,
+        bucket_minutes: int = None
+    ):
         """
         스케줄러 초기화
         
         Args:
             test_mode: 테스트 모드 (즉시 실행)
             interval_seconds: 실행 간격 (초 단위, 디버깅용)
+            delivery_window: 전역 발송 시간대 (예: "07:30-08:30", 기본: KAFKA_DELIVERY_WINDOW)
+            bucket_minutes: 버킷 크기 (분, 기본: KAFKA_DELIVERY_BUCKET_MINUTES)
         """
-        self.scheduler = BackgroundScheduler()
+        from .delivery import get_default_window, get_default_bucket_minutes, parse_window, validate_bucket_minutes
+        
+        # 버킷 작업은 1개씩 순서대로 실행 (같은 DB 연결을 쓰는 발송 작업이 겹치지 않도록)
+        # → 앞 버킷이 늦어지면 다음 버킷은 대기했다가 자기 버킷 시각(kwargs slot)으로 실행
+        self.scheduler = BackgroundScheduler(executors={'default': ThreadPoolExecutor(max_workers=1)})
+        self.scheduler.add_listener(self._on_job_missed, EVENT_JOB_MISSED)
         self.test_mode = test_mode
         self.interval_seconds = interval_seconds
+        self.delivery_window = delivery_window or get_default_window()
+        self.bucket_minutes = validate_bucket_minutes(bucket_minutes or get_default_bucket_minutes())
+        parse_window(self.delivery_window)  # 형식 검증 (잘못되면 ValueError)
         self.is_running = False
         
         # 프로그램 종료 시 스케줄러도 함께 종료
@@ -50,9 +73,9 @@ class KafkaScheduler:
         동작:
         - test_mode: 즉시 1회 실행
         - interval_seconds: 지정된 간격마다 실행 (디버깅용)
-        - 기본: 매일 오전 8시 실행 (프로덕션)
+        - 기본: 매일 발송 시간대의 버킷마다 실행 (프로덕션)
         """
-        from .jobs import send_daily_notifications
+        from .jobs import send_daily_notifications, send_bucket_notifications
         
         if self.test_mode:
             print("🧪 테스트 모드: 즉시 알림 발송 실행\n")
@@ -70,15 +93,11 @@ class KafkaScheduler:
                 replace_existing=True
             )
         else:
-            # 프로덕션 모드: 매일 오전 8시
-            print("🚀 프로덕션 모드: 매일 오전 8시에 자동 실행\n")
-            self.scheduler.add_job(
-                send_daily_notifications,
-                CronTrigger(hour=8, minute=0),
-                id='daily_notifications',
-                name='일일 알림 발송 (오전 8시)',
-                replace_existing=True
-            )
+            # 프로덕션 모드: 발송 시간대의 버킷마다 1회 실행
+            slots = self._collect_slots()
+            print(f"🚀 프로덕션 모드: 매일 {self.delivery_window} 시간대에 자동 실행 "
+                  f"({self.bucket_minutes}분 버킷 {len(slots)}개)\n")
+            self._add_bucket_jobs(slots)
         
         # 스케줄러 시작
         self.scheduler.start()
@@ -87,15 +106,71 @@ class KafkaScheduler:
         print("✅ 스케줄러 시작됨!")
         self._print_next_run_time()
     
+    def _add_bucket_jobs(self, slots):
+        """
+        버킷마다 작업 1개 등록 (버킷 시각을 실행 시점이 아니라 작업 인자로 전달)
+
+        이유:
+        - 실행 시각으로 버킷을 계산하면 늦게 시작된 작업이 다음 버킷을 발송하고
+          원래 버킷에 배정된 사용자는 그날 알림을 못 받음
+        - misfire_grace_time: 늦은 실행도 MISFIRE_GRACE_SECONDS 안이면 발송
+        - coalesce: 같은 버킷의 밀린 실행(여러 날)은 1번으로 (발송 대상은 실행 날짜 기준으로 조회)
+        """
+        from .jobs import send_bucket_notifications
+
+        for slot in slots:
+            self.scheduler.add_job(
+                send_bucket_notifications,
+                CronTrigger(hour=int(slot[:2]), minute=int(slot[3:])),
+                kwargs={
+                    'slot': slot,
+                    'delivery_window': self.delivery_window,
+                    'bucket_minutes': self.bucket_minutes
+                },
+                id=f'daily_notifications_{slot}',
+                name=f'일일 알림 발송 ({slot} 버킷)',
+                replace_existing=True,
+                misfire_grace_time=MISFIRE_GRACE_SECONDS,
+                coalesce=True
+            )
+
+    def _on_job_missed(self, event):
+        """유예 시간을 넘겨 실행하지 못한 작업 기록 (조용히 사라지지 않도록)"""
+        print(f"⚠️  작업 누락: {event.job_id} (예정 {event.scheduled_run_time:%Y-%m-%d %H:%M}, "
+              f"유예 {MISFIRE_GRACE_SECONDS // 60}분 초과)")
+
+    def _collect_slots(self):
+        """
+        전역 시간대 + 사용자별 시간대의 모든 버킷 시각
+        
+        주의: 사용자별 시간대를 새로 추가하면 스케줄러를 재시작해야 반영됩니다.
+        """
+        from .delivery import collect_slots, parse_window
+        from agent.database import get_db
+        
+        windows = [self.delivery_window]
+        try:
+            windows.extend(get_db().get_delivery_windows().values())
+        except Exception as e:
+            print(f"⚠️  사용자별 발송 시간대 조회 실패 (전역 시간대만 사용): {e}")
+        
+        valid_windows = []
+        for window in windows:
+            try:
+                parse_window(window)
+                valid_windows.append(window)
+            except ValueError as e:
+                print(f"⚠️  {e}")
+        
+        return collect_slots(valid_windows, self.bucket_minutes)
+    
     def _print_next_run_time(self):
-        """다음 실행 시간 출력"""
-        jobs = self.scheduler.get_jobs()
+        """다음 실행 시간 출력 (버킷 작업이 여러 개면 가장 이른 것)"""
+        jobs = [job for job in self.scheduler.get_jobs() if job.next_run_time]
         if jobs:
-            for job in jobs:
-                next_run = job.next_run_time
-                if next_run:
-                    print(f"📅 다음 실행 예정: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
-                    print(f"   작업 이름: {job.name}\n")
+            job = min(jobs, key=lambda job: job.next_run_time)
+            print(f"📅 다음 실행 예정: {job.next_run_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"   작업 이름: {job.name}\n")
     
     def shutdown(self):
         """스케줄러 종료"""
@@ -172,7 +247,13 @@ class KafkaScheduler:
 
 
 # 편의 함수
-def start_scheduler(daemon: bool = True, test: bool = False, interval: int = None):
+def start_scheduler(
+    daemon: bool = True,
+    test: bool = False,
+    interval: int = None,
+    window: str = None,
+    bucket_minutes: int = None
+):
     """
     스케줄러를 간단하게 시작하는 헬퍼 함수
     
@@ -180,6 +261,8 @@ def start_scheduler(daemon: bool = True, test: bool = False, interval: int = Non
         daemon: 데몬 모드 (영구 실행)
         test: 테스트 모드 (즉시 1회 실행)
         interval: 실행 간격 (초, 디버깅용)
+        window: 전역 발송 시간대 (예: "07:30-08:30")
+        bucket_minutes: 버킷 크기 (분)
     
     Example:
         # 프로덕션 모드
@@ -190,10 +273,15 @@ def start_scheduler(daemon: bool = True, test: bool = False, interval: int = Non
         
         # 디버깅 모드 (1분마다)
         start_scheduler(daemon=True, interval=60)
+        
+        # 07:30~08:30에 5분 버킷으로 분산 발송
+        start_scheduler(daemon=True, window="07:30-08:30", bucket_minutes=5)
     """
     scheduler = KafkaScheduler(
         test_mode=test,
-        interval_seconds=interval
+        interval_seconds=interval,
+        delivery_window=window,
+        bucket_minutes=bucket_minutes
     )
     
     if test:
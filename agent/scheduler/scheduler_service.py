@@ -13,6 +13,9 @@
     # 디버깅 모드 (10초마다 실행)
     python3 scheduler_service.py --interval 10
     
+    # 07:30~08:30 사이에 5분 버킷으로 분산 발송
+    python3 scheduler_service.py --window 07:30-08:30 --bucket-minutes 5
+    
     # 데몬 모드 (백그라운드 영구 실행)
     python3 scheduler_service.py --daemon
 """
@@ -40,6 +43,12 @@ def main():
   디버깅 모드 (1분마다):
     $ python3 scheduler_service.py --interval 60
   
+  발송 시간대 분산 (07:30~08:30, 5분 버킷):
+    $ python3 scheduler_service.py --window 07:30-08:30 --bucket-minutes 5
+  
+  다이제스트 모드 (사용자별 알림을 1건으로 묶음):
+    $ python3 scheduler_service.py --digest
+  
   백그라운드 실행:
     $ nohup python3 scheduler_service.py &
         """
@@ -58,6 +67,26 @@ def main():
         help='실행 간격 (초 단위, 디버깅용)'
     )
     
+    parser.add_argument(
+        '--window',
+        type=str,
+        metavar='HH:MM-HH:MM',
+        help='전역 알림 발송 시간대 (기본: KAFKA_DELIVERY_WINDOW 또는 08:00-08:00)'
+    )
+    
+    parser.add_argument(
+        '--bucket-minutes',
+        type=int,
+        metavar='MINUTES',
+        help='발송 시간대를 나누는 버킷 크기 (분, 60의 약수, 기본: 5)'
+    )
+    
+    parser.add_argument(
+        '--digest',
+        action='store_true',
+        help='사용자별 알림을 통합 퀴즈 페이지 링크 1건으로 묶어 발송 (KAFKA_NOTIFICATION_DIGEST=1과 동일)'
+    )
+    
     parser.add_argument(
         '--daemon',
         action='store_true',
@@ -75,6 +104,9 @@ def main():
         print("   .env 파일에 UPSTAGE_API_KEY를 추가하세요.")
         sys.exit(1)
     
+    if args.digest:
+        os.environ["KAFKA_NOTIFICATION_DIGEST"] = "1"
+    
     # DB 파일 존재 확인
     if not os.path.exists('data/kafka.db'):
         print("⚠️  경고: data/kafka.db 파일이 없습니다.")
@@ -97,7 +129,7 @@ def main():
             start_scheduler(daemon=True, interval=args.interval)
         else:
             # 프로덕션 모드
-            start_scheduler(daemon=True)
+            start_scheduler(daemon=True, window=args.window, bucket_minutes=args.bucket_minutes)
     except KeyboardInterrupt:
         print("\n\n👋 사용자가 중지했습니다.")
     except Exception as e:
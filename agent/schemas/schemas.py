@@ -6,6 +6,13 @@ class AgentState(TypedDict, total=False):
     user_input: str # 사용자가 입력한 원본 내용 (URL, 파일명, 또는 일반 텍스트)
     input_text: str  # 추출되거나 읽어온 실제 본문 내용
     url: str  # 원본 URL (있는 경우)
+    canonical_url: str  # 정규화된 URL (utm_*, m., youtu.be 등 정리 - 중복 처리 확인용)
+    reused_from: int  # 이미 처리한 URL이면 결과를 재사용한 스케줄 ID (아니면 None)
+    cache_key: str  # 결과 캐시 키 (정규화한 본문 + 파이프라인 버전 해시)
+    cache_hit: bool  # 결과 캐시에서 분류~페르소나 결과를 불러왔는지
+    content_signature: List[int]  # 본문 MinHash 서명 (근사 중복 색인용, 짧은 글은 None)
+    near_duplicate_of: int  # 거의 같은 본문의 결과를 재사용한 스케줄 ID (아니면 None)
+    similarity: float  # near_duplicate_of 본문과의 유사도 추정값 (0~1)
     is_valid: bool  # input_url_node에서 URL 검증(False일 경우 서비스 중단)
     messages: str  # 사용자에게 URL 또는 text 검증 후 피드백(예: 유효하지 않은 URL, 요약 시작 메시지 전송)
     is_safe: bool  # extract_content_node에서 콘텐츠 안정성 여부 피드백(False일 경우 서비스 중단)
@@ -1 +1,7 @@
 from .utils import *
+from .quiz_parser import extract_quiz_from_content
+from .http import ContentTooLargeError, fetch_text, get_session
+from .fetch_cache import FetchCache, get_fetch_cache
+from .url import canonicalize_url
+from .result_cache import result_cache_key
+from .minhash import minhash_signature
@@ -0,0 +1,297 @@
+# agent/utils/compress.py
+"""
+LLM 호출 전 본문 압축 (보일러플레이트 제거 + TextRank 핵심 문장 추출, 로컬 계산)
+
+동작:
+    1. strip_boilerplate: Jina 마크다운의 머리말(URL Source 등), 이미지/대체 텍스트, 메뉴·관련 기사 링크 줄,
+       저작권/구독/공유 문구, 구분선, 반복되는 줄 제거 (링크는 글자만 남김)
+    2. 노드별 토큰 예산보다 길면 TextRank로 핵심 문장만 남김
+       - 문장 벡터: 단어 + 한글 단어 앞 2글자(어근)의 TF-IDF, 해시로 고정 차원 (NumPy)
+       - 문장 유사도 그래프에서 PageRank → 점수 높은 문장부터 예산까지 선택, 원래 순서로 이어 붙임
+       - 첫 문장(제목/리드)은 항상 포함
+    3. 노드별 원래/보낸 토큰 수를 누적 (get_compression_stats)
+
+설정 (노드별 토큰 예산, KAFKA_COMPRESS_TOKENS_<노드>):
+- KAFKA_COMPRESS_TOKENS_SAFETY: 안전성 검사 (기본: 1500)
+- KAFKA_COMPRESS_TOKENS_CLASSIFY: 분류 (기본: 800)
+- KAFKA_COMPRESS_TOKENS_REWRITE_QUERY: RAG 검색 쿼리 작성 (기본: 600)
+- KAFKA_COMPRESS_TOKENS_SYNTHESIZE: 요약 초안 (기본: 6000, 더 긴 본문은 map-reduce 후 적용)
+
+이유:
+- 앞 2,000자 자르기는 Jina 출력의 메뉴/이미지 링크로 대부분 채워지고 본문 뒷부분을 버림
+- 같은 예산이면 글 전체에서 고른 핵심 문장이 분류/요약에 더 유리
+"""
+
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from agent.utils.tokens import estimate_tokens
+
+NODE_TOKEN_BUDGETS = {
+    "safety": 1500,
+    "classify": 800,
+    "rewrite_query": 600,
+    "synthesize": 6000,
+}
+
+# TextRank 설정
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+HASH_DIMENSIONS = 4096
+
+# 문장부호 없는 자막 등은 이 단어 수마다 끊어서 문장으로 취급
+WORDS_PER_UNIT = 30
+
+_JINA_HEADER = re.compile(r"^(URL Source|Published Time|Markdown Content|Warning):", re.IGNORECASE)
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]*)\]\((?:[^()\s]|\([^)]*\))*(?:\s+\"[^\"]*\")?\)")
+_BARE_URL = re.compile(r"^\s*<?https?://\S+>?\s*$")
+_RULE = re.compile(r"^[\s\-=*_|:#>]*$")
+_MARKUP = re.compile(r"^\s*(?:#{1,6}\s+|[*+\-]\s+|>\s*|\d+\.\s+)|\*\*|__")
+_HEADING = re.compile(r"^\s*#{1,6}\s")
+_TITLE_PREFIX = re.compile(r"^Title:\s*")
+# 저작권 표기: 짧은 줄이면 제거
+_COPYRIGHT = re.compile(
+    r"\u00a9|\u24d2|copyright|all rights reserved|무단\s*전재|재배포\s*금지|저작권자",
+    re.IGNORECASE,
+)
+# 버튼/메뉴 문구: 짧고 문장으로 끝나지 않는 줄이면 제거 (본문 문장 "광고 시장이 커졌다."는 유지)
+_UI_LABEL = re.compile(
+    r"구독|좋아요|공유하기|댓글|로그인|회원가입|기사\s*제보|광고|"
+    r"subscribe|sign up|log in|cookie|advertisement|share this",
+    re.IGNORECASE,
+)
+_SENTENCE_LIKE = re.compile(r"[.!?]['\"\u2019\u201d)]?$")
+_SENTENCE_END = re.compile(r"(?<=[.!?。…])\s+")
+_WORD = re.compile(r"\w+")
+_HANGUL_WORD = re.compile(r"^[\uac00-\ud7a3]{3,}$")
+
+# 저작권 표기/버튼 문구는 이보다 짧은 줄에서만 제거
+_COPYRIGHT_MAX_CHARS = 120
+_UI_LABEL_MAX_CHARS = 40
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def get_node_budget(node: str) -> int:
+    """노드 토큰 예산 (환경 변수 KAFKA_COMPRESS_TOKENS_<노드>, 기본: NODE_TOKEN_BUDGETS)"""
+    return int(os.getenv(f"KAFKA_COMPRESS_TOKENS_{node.upper()}", NODE_TOKEN_BUDGETS.get(node, 1500)))
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    본문이 아닌 줄 제거 (Jina 마크다운 / 추출 결과 모두)
+
+    예:
+        "* [홈](https://a.com/) * [경제](https://a.com/eco)" → 제거 (링크만 있는 메뉴)
+        "자세한 내용은 [보도자료](https://a.com/p)에서" → "자세한 내용은 보도자료에서"
+    """
+    kept: List[str] = []
+    headings = set()  # kept 안의 제목 줄 위치
+    seen = set()
+    for line in text.splitlines():
+        if _JINA_HEADER.match(line) or _BARE_URL.match(line):
+            continue
+
+        is_heading = bool(_HEADING.match(line))
+        line = _IMAGE.sub("", line)
+        link_chars = sum(len(match.group(1)) for match in _LINK.finditer(line))
+        line = _LINK.sub(r"\1", line)
+        line = _MARKUP.sub("", line).strip()
+
+        if not line or _RULE.match(line):
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        # 링크 글자가 대부분인 줄 = 메뉴/관련 기사 목록
+        if link_chars > 0.5 * len(line) and len(line) < 200:
+            continue
+        if len(line) < _COPYRIGHT_MAX_CHARS and _COPYRIGHT.search(line):
+            continue
+        if len(line) < _UI_LABEL_MAX_CHARS and _UI_LABEL.search(line) and not _SENTENCE_LIKE.search(line):
+            continue
+        # "Title: 제목"과 본문의 "# 제목"은 같은 줄로 취급
+        key = _TITLE_PREFIX.sub("", line)
+        if key in seen:
+            continue
+        seen.add(key)
+        if is_heading:
+            headings.add(len(kept))
+        kept.append(line)
+
+    # 내용이 모두 제거된 제목 ("### 관련 기사" 아래 링크 목록만 있던 경우)
+    for index in sorted(headings, reverse=True):
+        following = next((line for line in kept[index + 1:] if line), None)
+        if following is None or kept.index(following, index + 1) in headings:
+            kept[index] = ""
+
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+
+
+def _split_units(text: str) -> List[Tuple[int, str]]:
+    """(문단 번호, 문장) 목록 - 문장부호가 없으면 WORDS_PER_UNIT 단어씩"""
+    units = []
+    paragraphs = [line.strip() for line in text.splitlines() if line.strip()]
+    for paragraph_index, paragraph in enumerate(paragraphs):
+        for sentence in _SENTENCE_END.split(paragraph):
+            words = sentence.split()
+            if len(words) <= WORDS_PER_UNIT * 2:
+                units.append((paragraph_index, sentence))
+                continue
+            for start in range(0, len(words), WORDS_PER_UNIT):
+                units.append((paragraph_index, " ".join(words[start:start + WORDS_PER_UNIT])))
+    return units
+
+
+def _terms(sentence: str) -> List[str]:
+    """단어 + 한글 단어 앞 2글자 (조사/어미가 달라도 같은 어근으로 묶임)"""
+    words = [word.lower() for word in _WORD.findall(sentence)]
+    return words + [word[:2] for word in words if _HANGUL_WORD.match(word)]
+
+
+def textrank_scores(sentences: List[str]) -> np.ndarray:
+    """
+    문장별 TextRank 점수 (합 1)
+
+    TF-IDF 행렬은 해시 차원(HASH_DIMENSIONS)으로 고정 → 문장이 많아도 메모리 n × 4096
+    """
+    n = len(sentences)
+    if n <= 2:
+        return np.full(n, 1.0 / max(n, 1))
+
+    rows, cols, counts = [], [], []
+    for i, sentence in enumerate(sentences):
+        for term, count in Counter(_terms(sentence)).items():
+            rows.append(i)
+            cols.append(zlib.crc32(term.encode("utf-8")) % HASH_DIMENSIONS)
+            counts.append(count)
+
+    matrix = np.zeros((n, HASH_DIMENSIONS), dtype=np.float32)
+    np.add.at(matrix, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), counts)
+
+    # 로그 TF × IDF, 행 정규화 → 내적 = 코사인 유사도
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + n) / (1 + document_frequency)) + 1
+    matrix = np.log1p(matrix) * idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    # 다른 문장과 겹치는 단어가 없는 문장은 모든 문장으로 균등하게 이동
+    transition = np.where(row_sums > 0, similarity / np.where(row_sums == 0, 1, row_sums), 1.0 / n)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+    return scores / scores.sum()
+
+
+@lru_cache(maxsize=4)
+def _ranked_units(text: str) -> Tuple[List[Tuple[int, str]], List[int], np.ndarray]:
+    """
+    (문장 목록, 문장별 토큰 수, TextRank 점수) - 같은 본문은 다시 계산하지 않음
+
+    이유: 안전성 검사/분류/쿼리 작성/요약이 같은 본문을 예산만 달리해서 압축
+          (긴 자막은 순위 계산에 수백 ms)
+    """
+    units = _split_units(text)
+    sentences = [sentence for _, sentence in units]
+    return units, [estimate_tokens(sentence) for sentence in sentences], textrank_scores(sentences)
+
+
+def extract_key_sentences(text: str, max_tokens: int) -> str:
+    """
+    TextRank 점수가 높은 문장을 max_tokens까지 골라 원래 순서로 반환 (첫 문장은 항상 포함)
+    """
+    units, tokens, scores = _ranked_units(text)
+    if not units:
+        return ""
+
+    selected = {0} if tokens[0] <= max_tokens else set()
+    used = sum(tokens[i] for i in selected)
+    for i in np.argsort(-scores, kind="stable"):
+        i = int(i)
+        if i not in selected and used + tokens[i] <= max_tokens:
+            selected.add(i)
+            used += tokens[i]
+
+    parts: List[str] = []
+    previous_paragraph = None
+    for i in sorted(selected):
+        paragraph_index, sentence = units[i]
+        if parts:
+            parts.append(" " if paragraph_index == previous_paragraph else "\n\n")
+        parts.append(sentence)
+        previous_paragraph = paragraph_index
+    return "".join(parts)
+
+
+def compress_for_prompt(text: str, node: str, max_tokens: int = None) -> str:
+    """
+    노드에 보낼 본문 (보일러플레이트 제거 후 예산을 넘으면 핵심 문장 추출)
+
+    Args:
+        text: 원문
+        node: 노드 이름 (NODE_TOKEN_BUDGETS 키 - 예산과 통계에 사용)
+        max_tokens: 예산 (기본: get_node_budget(node))
+
+    Returns:
+        압축한 본문 (원래/보낸 토큰 수는 get_compression_stats에 누적)
+    """
+    budget = max_tokens or get_node_budget(node)
+    compressed = strip_boilerplate(text)
+    if estimate_tokens(compressed) > budget:
+        compressed = extract_key_sentences(compressed, budget)
+    record_compression(node, text, compressed)
+    return compressed
+
+
+def record_compression(node: str, original: str, sent: str):
+    """노드별 원래/보낸 토큰 수 누적 + 출력 (compress_for_prompt 외의 방식으로 줄인 경우에도 사용)"""
+    original_tokens = estimate_tokens(original)
+    sent_tokens = estimate_tokens(sent)
+
+    with _stats_lock:
+        stats = _stats.setdefault(node, {"calls": 0, "original_tokens": 0, "sent_tokens": 0})
+        stats["calls"] += 1
+        stats["original_tokens"] += original_tokens
+        stats["sent_tokens"] += sent_tokens
+
+    if original_tokens:
+        print(f"✂️  {node}: {original_tokens:,} → {sent_tokens:,} 토큰 "
+              f"(-{100 - sent_tokens * 100 // original_tokens}%)")
+
+
+def get_compression_stats() -> Dict[str, Dict]:
+    """
+    노드별 누적 압축 통계
+
+    Returns:
+        {node: {calls, original_tokens, sent_tokens, reduction(0~1)}, ...}
+    """
+    with _stats_lock:
+        return {
+            node: {**stats, "reduction": round(1 - stats["sent_tokens"] / stats["original_tokens"], 3)
+                   if stats["original_tokens"] else 0.0}
+            for node, stats in _stats.items()
+        }
+
+
+def reset_compression_stats():
+    """누적 통계 초기화 (벤치마크/테스트용)"""
+    with _stats_lock:
+        _stats.clear()
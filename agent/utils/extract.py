@@ -0,0 +1,267 @@
+# agent/utils/extract.py
+"""
+HTML 기사 본문 추출 (readability 방식, BeautifulSoup)
+
+동작:
+    1. script/style/nav/footer 등 본문이 아닌 태그와
+       class/id가 댓글/공유/광고/메뉴 등인 요소 제거 (article/content 등 본문 표시가 있으면 유지)
+    2. 문단(<p>, <br>로 나뉜 텍스트)마다 점수(1 + 쉼표 수 + 길이)를 매겨 부모/조부모 요소에 더함
+    3. 링크 비율만큼 점수를 깎고 가장 높은 요소를 본문으로 선택 (점수가 높은 형제 요소도 포함)
+    4. 제목은 og:title → <title>(사이트 이름 제거) → <h1> 순
+
+설정:
+- KAFKA_ARTICLE_EXTRACTOR: local(기본, 직접 가져와 추출하고 실패하면 Jina) / jina(항상 Jina Reader)
+- KAFKA_EXTRACT_MIN_CHARS: 이보다 짧게 추출되면 실패로 보고 Jina로 재시도 (기본: 200)
+
+이유:
+- 기사마다 r.jina.ai를 거치면 네트워크 왕복이 한 번 더 생기고 외부 서비스 상태에 좌우됨
+- 자바스크립트로 그리는 페이지처럼 로컬 추출이 안 되는 경우만 Jina 사용
+"""
+
+import os
+import re
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+# 통째로 제거하는 태그
+REMOVE_TAGS = (
+    "script", "style", "noscript", "template", "iframe", "svg", "canvas", "form",
+    "button", "select", "input", "textarea", "nav", "footer", "aside", "figcaption",
+)
+
+# class/id 단어 (-, _, 공백으로 나눈 단위)
+NEGATIVE_WORDS = {
+    "ad", "ads", "advert", "advertisement", "banner", "breadcrumb", "breadcrumbs", "comment", "comments",
+    "cookie", "copyright", "footer", "gnb", "lnb", "login", "menu", "nav", "navbar", "newsletter",
+    "popular", "popup", "promo", "ranking", "related", "recommend", "reply", "share", "sidebar", "sns",
+    "social", "sponsor", "subscribe", "tags", "widget",
+}
+POSITIVE_WORDS = {
+    "article", "articlebody", "body", "content", "contents", "entry", "main", "news", "post",
+    "story", "text", "view",
+}
+
+# 본문 텍스트를 만들 때 문단으로 나누는 태그
+BLOCK_TAGS = {
+    "address", "article", "blockquote", "dd", "div", "dl", "dt", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "li", "main", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+
+# 점수를 매기는 문단 최소 길이
+MIN_PARAGRAPH_CHARS = 25
+
+# <title>에서 사이트 이름을 나누는 구분자
+TITLE_SEPARATORS = re.compile(r"\s+[|\-–—:·»]\s+|\s*::\s*")
+
+_WORD_SPLIT = re.compile(r"[\s_\-]+")
+_SPACES = re.compile(r"[ \t\r\f\v\xa0\u200b]+")
+
+
+def get_article_extractor() -> str:
+    """기사 추출 방식 (환경 변수 KAFKA_ARTICLE_EXTRACTOR, 기본: local)"""
+    return os.getenv("KAFKA_ARTICLE_EXTRACTOR", "local").strip().lower()
+
+
+def get_min_chars() -> int:
+    """로컬 추출 성공으로 보는 최소 본문 길이 (환경 변수 KAFKA_EXTRACT_MIN_CHARS, 기본: 200)"""
+    return int(os.getenv("KAFKA_EXTRACT_MIN_CHARS", 200))
+
+
+def _words(node: Tag) -> set:
+    """class와 id를 단어로 나눈 집합 (소문자)"""
+    classes = node.get("class") or []
+    if isinstance(classes, str):
+        classes = [classes]
+    value = " ".join(classes) + " " + (node.get("id") or "")
+    return {word for word in _WORD_SPLIT.split(value.lower()) if word}
+
+
+def _class_weight(node: Tag) -> int:
+    words = _words(node)
+    weight = 0
+    if words & NEGATIVE_WORDS:
+        weight -= 25
+    if words & POSITIVE_WORDS:
+        weight += 25
+    return weight
+
+
+def _is_unlikely(node: Tag) -> bool:
+    """본문이 아닐 것 같은 요소 (부정 단어만 있고 긍정 단어는 없음)"""
+    if node.name in ("html", "body", "article", "main"):
+        return False
+    words = _words(node)
+    return bool(words & NEGATIVE_WORDS) and not (words & POSITIVE_WORDS)
+
+
+def _text(node) -> str:
+    return _SPACES.sub(" ", node.get_text(" ", strip=True))
+
+
+def _link_density(node: Tag) -> float:
+    """요소 텍스트 중 링크 텍스트 비율"""
+    length = len(_text(node))
+    if not length:
+        return 0.0
+    return sum(len(_text(a)) for a in node.find_all("a")) / length
+
+
+def _paragraph_score(text: str) -> float:
+    return 1 + text.count(",") + text.count("，") + min(len(text) // 100, 3)
+
+
+def _direct_text(node: Tag) -> str:
+    """자식 요소를 제외한 직접 텍스트 (<div>본문<br>본문</div> 형태의 기사)"""
+    return _SPACES.sub(" ", " ".join(
+        str(child) for child in node.children
+        if isinstance(child, NavigableString) and not isinstance(child, PreformattedString)
+    )).strip()
+
+
+def _clean(soup: BeautifulSoup):
+    """본문이 아닌 요소 제거"""
+    for node in soup.find_all(REMOVE_TAGS):
+        node.decompose()
+    for node in soup.find_all(True):
+        if node.decomposed:
+            continue
+        if _is_unlikely(node) or node.get("hidden") is not None or node.get("aria-hidden") == "true":
+            node.decompose()
+
+
+def _score_candidates(soup: BeautifulSoup) -> Dict[Tag, float]:
+    """문단 점수를 부모(전부)/조부모(절반) 요소에 더한 후보 점수"""
+    scores: Dict[Tag, float] = {}
+
+    def add(node: Optional[Tag], score: float):
+        if node is None or not isinstance(node, Tag) or node.name in ("html", "[document]"):
+            return
+        if node not in scores:
+            base = {"article": 10, "main": 5, "div": 5, "section": 3, "td": 3, "blockquote": 3}.get(node.name, 0)
+            scores[node] = base + _class_weight(node)
+        scores[node] += score
+
+    for node in soup.find_all(("p", "pre", "td", "div", "section")):
+        if node.name in ("p", "pre"):
+            text, container = _text(node), node.parent
+        else:
+            text, container = _direct_text(node), node
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = _paragraph_score(text)
+        add(container, score)
+        if container is not None:
+            add(container.parent, score / 2)
+
+    return {node: score * (1 - _link_density(node)) for node, score in scores.items()}
+
+
+def _render(node: Tag) -> str:
+    """요소 텍스트를 문단 단위로 (블록 태그/<br>마다 줄바꿈, 문단 사이 빈 줄)"""
+    parts = []
+
+    def walk(element: Tag):
+        for child in element.children:
+            if isinstance(child, NavigableString):
+                if not isinstance(child, PreformattedString):
+                    parts.append(str(child))
+            elif child.name == "br":
+                parts.append("\n")
+            elif child.name in BLOCK_TAGS:
+                parts.append("\n")
+                walk(child)
+                parts.append("\n")
+            else:
+                walk(child)
+
+    walk(node)
+    lines = (_SPACES.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n\n".join(line for line in lines if line)
+
+
+def _prune(node: Tag):
+    """본문 요소 안의 링크 목록/짧은 잡음 블록 제거 (관련 기사 목록 등)"""
+    for child in node.find_all(("ul", "ol", "div", "section", "table")):
+        if child.decomposed:
+            continue
+        text = _text(child)
+        if len(text) < 200 and _link_density(child) > 0.5:
+            child.decompose()
+
+
+def extract_title(soup: BeautifulSoup) -> str:
+    """
+    기사 제목
+
+    Returns:
+        og:title → twitter:title → <title>(사이트 이름 제거) → 첫 <h1> (없으면 빈 문자열)
+    """
+    for attrs in ({"property": "og:title"}, {"name": "twitter:title"}):
+        meta = soup.find("meta", attrs=attrs)
+        if meta and meta.get("content", "").strip():
+            return _SPACES.sub(" ", meta["content"]).strip()
+
+    if soup.title and soup.title.string:
+        title = _SPACES.sub(" ", soup.title.string).strip()
+        parts = TITLE_SEPARATORS.split(title)
+        # "기사 제목 - 사이트" → 가장 긴 부분 (사이트 이름이 앞에 오는 경우도 처리)
+        best = max(parts, key=len).strip()
+        if len(parts) > 1 and len(best) >= 10:
+            return best
+        if title:
+            return title
+
+    h1 = soup.find("h1")
+    return _text(h1) if h1 else ""
+
+
+def extract_article(html: str) -> Dict[str, str]:
+    """
+    HTML에서 기사 제목과 본문 추출
+
+    Args:
+        html: 기사 페이지 HTML
+
+    Returns:
+        {"title": 제목, "text": 본문 (문단은 빈 줄로 구분, 못 찾으면 빈 문자열)}
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = extract_title(soup)
+    _clean(soup)
+
+    scores = _score_candidates(soup)
+    if not scores:
+        body = soup.body or soup
+        return {"title": title, "text": _render(body)}
+
+    top = max(scores, key=scores.get)
+    threshold = max(10.0, scores[top] * 0.2)
+
+    # 본문이 여러 형제 블록으로 나뉜 경우 (본문 1 / 광고 / 본문 2)
+    blocks = []
+    siblings = top.parent.find_all(True, recursive=False) if top.parent else [top]
+    for sibling in siblings:
+        if sibling is top or scores.get(sibling, 0) >= threshold:
+            blocks.append(sibling)
+        elif sibling.name == "p":
+            text = _text(sibling)
+            if len(text) >= 80 and _link_density(sibling) < 0.25:
+                blocks.append(sibling)
+
+    for block in blocks:
+        _prune(block)
+    text = "\n\n".join(rendered for rendered in (_render(block) for block in blocks) if rendered)
+
+    # 본문 앞에 같은 제목이 반복되면 제거
+    if title and text.startswith(title):
+        text = text[len(title):].lstrip()
+    return {"title": title, "text": text}
+
+
+def format_article(article: Dict[str, str]) -> str:
+    """추출 결과를 Jina Reader와 같은 "Title: ..." 머리말이 붙은 텍스트로"""
+    if article["title"]:
+        return f"Title: {article['title']}\n\n{article['text']}"
+    return article["text"]
@@ -0,0 +1,196 @@
+# agent/utils/fetch_cache.py
+"""
+콘텐츠 수집 디스크 캐시 (기사 본문 / 유튜브 자막)
+
+저장 형식:
+    <캐시 폴더>/<키 해시 앞 2자리>/<키 해시>.json.gz
+    {"key", "text", "fetched_at", "expires_at", "etag", "last_modified"}
+
+키:
+- 기사: "article:<canonicalize_url(URL)>" (유효 기간 KAFKA_FETCH_CACHE_TTL, 지나면 ETag/Last-Modified로 재검증)
+- 자막: "youtube:<video_id>" (영구 보관 - 자막은 바뀌지 않음)
+
+설정:
+- KAFKA_FETCH_CACHE: 0이면 캐시 사용 안 함 (기본: 1)
+- KAFKA_FETCH_CACHE_DIR: 캐시 폴더 (기본: data/fetch_cache)
+- KAFKA_FETCH_CACHE_TTL: 기사 캐시 유효 기간 (초, 기본: 86400 = 1일)
+
+이유:
+- 여러 사용자가 같은 URL을 보내도 Jina / YouTube에서 다시 가져오지 않음
+- 적중/미스/재검증 횟수를 stats.json에 기록해 적중률 확인
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+DEFAULT_CACHE_DIR = "data/fetch_cache"
+DEFAULT_TTL = 24 * 60 * 60
+
+STATS_FILE = "stats.json"
+STAT_EVENTS = ("hits", "misses", "revalidated")
+
+# fetcher(조건부 요청 헤더) → {"status": 200/304, "text", "etag", "last_modified"}
+Fetcher = Callable[[Dict[str, str]], Dict]
+
+
+def is_fetch_cache_enabled() -> bool:
+    """캐시 사용 여부 (환경 변수 KAFKA_FETCH_CACHE, 기본: 사용)"""
+    return os.getenv("KAFKA_FETCH_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_article_ttl() -> int:
+    """기사 캐시 유효 기간 (환경 변수 KAFKA_FETCH_CACHE_TTL, 기본: 1일)"""
+    return int(os.getenv("KAFKA_FETCH_CACHE_TTL", DEFAULT_TTL))
+
+
+class FetchCache:
+    """
+    gzip 압축 JSON 파일 캐시 (프로세스/스레드 간 공유 가능)
+
+    파일은 임시 파일에 쓴 뒤 os.replace로 바꾸므로 읽는 쪽이 쓰다 만 파일을 보지 않습니다.
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or os.getenv("KAFKA_FETCH_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self._stats_lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json.gz")
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, key: str) -> Optional[Dict]:
+        """캐시 항목 읽기 (없거나 깨졌으면 None)"""
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("key") == key else None
+
+    def store(self, key: str, text: str, ttl: Optional[int], etag: str = None,
+              last_modified: str = None) -> Dict:
+        """
+        캐시 항목 저장
+
+        Args:
+            ttl: 유효 기간 (초, None이면 영구)
+            etag, last_modified: 만료 후 재검증에 쓸 응답 헤더
+        """
+        now = time.time()
+        entry = {
+            "key": key,
+            "text": text,
+            "fetched_at": now,
+            "expires_at": None if ttl is None else now + ttl,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        data = gzip.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"), compresslevel=6)
+        self._write_atomic(self._path(key), data)
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: Dict) -> bool:
+        return entry["expires_at"] is None or entry["expires_at"] > time.time()
+
+    def get_or_fetch(self, key: str, fetcher: Fetcher, ttl: Optional[int]) -> str:
+        """
+        캐시에 있으면 반환, 없으면 fetcher로 가져와 저장
+
+        동작:
+            1. 유효 기간 안 → 네트워크 없이 반환 (hits)
+            2. 만료 + ETag/Last-Modified 있음 → 조건부 요청, 304면 기간만 연장 (revalidated)
+            3. 그 외 → 새로 가져와 저장 (misses)
+
+        Args:
+            key: 캐시 키
+            fetcher: fetcher(조건부 요청 헤더) → {"status", "text", "etag", "last_modified"}
+            ttl: 유효 기간 (초, None이면 영구)
+
+        Returns:
+            본문 텍스트 (빈 본문은 저장하지 않음)
+        """
+        entry = self.load(key)
+        if entry and self.is_fresh(entry):
+            self.record("hits")
+            return entry["text"]
+
+        validators = {}
+        if entry:
+            if entry.get("etag"):
+                validators["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                validators["If-Modified-Since"] = entry["last_modified"]
+
+        result = fetcher(validators)
+
+        if result.get("status") == 304 and entry:
+            self.store(key, entry["text"], ttl, entry.get("etag"), entry.get("last_modified"))
+            self.record("revalidated")
+            return entry["text"]
+
+        text = result.get("text") or ""
+        if text.strip():
+            self.store(key, text, ttl, result.get("etag"), result.get("last_modified"))
+        self.record("misses")
+        return text
+
+    def record(self, event: str):
+        """적중/미스/재검증 횟수를 stats.json에 누적 (프로세스 간 동시 갱신 시 일부 누락 가능)"""
+        with self._stats_lock:
+            stats = self.stats()
+            stats[event] = stats.get(event, 0) + 1
+            counts = {name: stats.get(name, 0) for name in STAT_EVENTS}
+            self._write_atomic(os.path.join(self.directory, STATS_FILE),
+                               json.dumps(counts).encode("utf-8"))
+
+    def stats(self) -> Dict:
+        """
+        누적 통계
+
+        Returns:
+            {"hits", "misses", "revalidated", "hit_rate": 네트워크 없이 처리한 비율 (%), 기록 없으면 None}
+        """
+        try:
+            with open(os.path.join(self.directory, STATS_FILE), encoding="utf-8") as f:
+                counts = json.load(f)
+        except (OSError, ValueError):
+            counts = {}
+
+        stats = {name: int(counts.get(name, 0)) for name in STAT_EVENTS}
+        total = sum(stats.values())
+        stats["hit_rate"] = round(stats["hits"] / total * 100, 1) if total else None
+        return stats
+
+
+_cache: Optional[FetchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_fetch_cache() -> Optional[FetchCache]:
+    """공유 캐시 (KAFKA_FETCH_CACHE=0이면 None)"""
+    global _cache
+    if not is_fetch_cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = FetchCache()
+        return _cache
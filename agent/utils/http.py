@@ -0,0 +1,251 @@
+# agent/utils/http.py
+"""
+콘텐츠 수집용 공유 HTTP 세션 (커넥션 풀 + 재시도 + 다운로드 크기 제한)
+
+설정 (환경 변수):
+- KAFKA_HTTP_TIMEOUT: 연결/읽기 제한 시간 (초, 기본: 10)
+- KAFKA_HTTP_POOL_MAXSIZE: 호스트당 최대 동시 연결 수 (기본: 4)
+- KAFKA_HTTP_MAX_RETRIES: 연결 오류/429/5xx 재시도 횟수 (기본: 3)
+- KAFKA_HTTP_BACKOFF: 재시도 대기 시간 계수 (초, 기본: 0.5 → 0.5, 1, 2초...)
+- KAFKA_HTTP_MAX_RETRY_WAIT: 재시도 1번당 최대 대기 시간 (초, 기본: 30)
+  서버가 Retry-After로 더 긴 시간을 보내도 이 값까지만 기다림
+- KAFKA_HTTP_MAX_BYTES: 응답 본문 최대 크기 (바이트, 기본: 5MB)
+
+이유:
+- URL마다 새 연결을 만들지 않고 keep-alive 연결을 재사용 (배치 수집 시 TCP/TLS 핸드셰이크 절약)
+- 일시적인 타임아웃/서버 오류 1번으로 그래프 실행 전체가 실패하지 않도록 재시도
+- 큰 페이지를 메모리에 통째로 올리지 않도록 스트리밍으로 읽으면서 크기 제한
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 스트리밍으로 읽는 단위
+CHUNK_SIZE = 64 * 1024
+
+# 풀을 유지할 최대 호스트 수
+POOL_HOSTS = 16
+
+# HTML 앞부분의 <meta charset="..."> / <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([a-zA-Z0-9_-]+)""", re.IGNORECASE)
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+class ContentTooLargeError(ValueError):
+    """응답 본문이 최대 크기(KAFKA_HTTP_MAX_BYTES)를 넘음"""
+
+
+def get_timeout() -> float:
+    """요청 제한 시간 (환경 변수 KAFKA_HTTP_TIMEOUT, 기본: 10초)"""
+    return float(os.getenv("KAFKA_HTTP_TIMEOUT", 10))
+
+
+def get_max_bytes() -> int:
+    """응답 본문 최대 크기 (환경 변수 KAFKA_HTTP_MAX_BYTES, 기본: 5MB)"""
+    return int(os.getenv("KAFKA_HTTP_MAX_BYTES", 5 * 1024 * 1024))
+
+
+def get_max_retry_wait() -> float:
+    """재시도 1번당 최대 대기 시간 (환경 변수 KAFKA_HTTP_MAX_RETRY_WAIT, 기본: 30초)"""
+    return max(0.0, float(os.getenv("KAFKA_HTTP_MAX_RETRY_WAIT", 30)))
+
+
+class CappedRetry(Retry):
+    """
+    Retry-After 대기 시간에 상한을 둔 Retry
+
+    이유:
+    - urllib3는 Retry-After 값을 상한 없이 그대로 기다림 (backoff_max는 지수 백오프에만 적용)
+    - 서버가 "Retry-After: 86400"을 보내면 수집 스레드가 하루 동안 멈춤
+    """
+
+    def __init__(self, *args, max_retry_wait: float = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_wait = max_retry_wait if max_retry_wait is not None else get_max_retry_wait()
+
+    def new(self, **kwargs) -> "CappedRetry":
+        # 재시도할 때마다 새 객체가 만들어지므로 상한을 넘겨줌
+        retry = super().new(**kwargs)
+        retry.max_retry_wait = self.max_retry_wait
+        return retry
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_wait)
+
+
+def create_session(
+    pool_maxsize: int = None,
+    max_retries: int = None,
+    backoff: float = None,
+    max_retry_wait: float = None
+) -> requests.Session:
+    """
+    커넥션 풀과 재시도가 설정된 세션 생성
+
+    Args:
+        pool_maxsize: 호스트당 최대 동시 연결 수 (넘으면 연결이 반납될 때까지 대기)
+        max_retries: 연결 오류/읽기 타임아웃/429/5xx 재시도 횟수 (GET/HEAD만)
+        backoff: 재시도 대기 시간 계수 (Retry-After 헤더가 있으면 그 값 우선)
+        max_retry_wait: 재시도 1번당 최대 대기 시간 (Retry-After/지수 백오프 모두 적용)
+    """
+    pool_maxsize = max(1, pool_maxsize or int(os.getenv("KAFKA_HTTP_POOL_MAXSIZE", 4)))
+    max_retries = max_retries if max_retries is not None else int(os.getenv("KAFKA_HTTP_MAX_RETRIES", 3))
+    backoff = backoff if backoff is not None else float(os.getenv("KAFKA_HTTP_BACKOFF", 0.5))
+    max_retry_wait = max_retry_wait if max_retry_wait is not None else get_max_retry_wait()
+
+    retry = CappedRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        backoff_factor=backoff,
+        backoff_max=max_retry_wait,
+        respect_retry_after_header=True,
+        max_retry_wait=max_retry_wait,
+        raise_on_status=False  # 재시도 후에도 실패하면 마지막 응답을 그대로 반환 (raise_for_status로 처리)
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    프로세스 공유 세션 반환 (처음 호출할 때 생성)
+
+    fork된 자식 프로세스에서는 부모의 연결을 쓰지 않도록 새로 만듦
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = create_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def close_session():
+    """공유 세션 닫기 (다음 get_session() 호출 때 새로 생성)"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def fetch(
+    url: str,
+    headers: Dict[str, str] = None,
+    timeout: float = None,
+    max_bytes: int = None,
+    session: requests.Session = None
+) -> Dict:
+    """
+    URL 본문 가져오기 (스트리밍, 크기 제한, 조건부 요청 지원)
+
+    Args:
+        url: 가져올 URL
+        headers: 추가 요청 헤더 (If-None-Match / If-Modified-Since 포함 가능)
+        timeout: 제한 시간 (기본: KAFKA_HTTP_TIMEOUT)
+        max_bytes: 최대 본문 크기 (기본: KAFKA_HTTP_MAX_BYTES)
+        session: 사용할 세션 (기본: 공유 세션)
+
+    Returns:
+        {"status": 200 또는 304, "text": 본문 (304면 None), "etag", "last_modified", "content_type"}
+        본문은 Content-Type의 charset → (HTML이면) <meta charset> → UTF-8 순으로 디코딩
+
+    Raises:
+        ContentTooLargeError: 본문이 max_bytes를 넘음 (넘는 순간 읽기 중단)
+        requests.RequestException: 재시도 후에도 연결 실패/타임아웃/오류 응답
+    """
+    session = session or get_session()
+    timeout = timeout or get_timeout()
+    max_bytes = max_bytes or get_max_bytes()
+
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        result = {
+            "status": response.status_code,
+            "text": None,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type", "").split(";")[0].strip().lower(),
+        }
+        if response.status_code == 304:
+            return result
+
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > max_bytes:
+            raise ContentTooLargeError(f"응답이 너무 큽니다: {int(length):,}바이트 (최대 {max_bytes:,}바이트)")
+
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            received += len(chunk)
+            if received > max_bytes:
+                raise ContentTooLargeError(f"응답이 너무 큽니다: {max_bytes:,}바이트 초과")
+            chunks.append(chunk)
+
+        body = b"".join(chunks)
+        if "charset=" in response.headers.get("Content-Type", "").lower():
+            encoding = response.encoding
+        else:
+            encoding = _sniff_html_charset(body) if "html" in result["content_type"] else None
+        result["text"] = _decode(body, encoding or "utf-8")
+        return result
+
+
+def _sniff_html_charset(body: bytes) -> Optional[str]:
+    """HTML 앞부분(2KB)의 <meta> 태그에 선언된 인코딩 (국내 뉴스 사이트의 EUC-KR 등)"""
+    match = _META_CHARSET.search(body[:2048])
+    return match.group(1).decode("ascii") if match else None
+
+
+def _decode(body: bytes, encoding: str) -> str:
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:  # 알 수 없는 인코딩 이름
+        return body.decode("utf-8", errors="replace")
+
+
+def fetch_text(url: str, **kwargs) -> str:
+    """
+    URL 본문을 텍스트로 가져오기 (fetch()와 같은 인자)
+
+    Raises:
+        ContentTooLargeError, requests.RequestException
+    """
+    return fetch(url, **kwargs)["text"]
+
+
+def is_timeout(error: Exception) -> bool:
+    """타임아웃으로 실패했는지 (재시도 후 읽기 타임아웃은 ConnectionError로 감싸져 옴)"""
+    if isinstance(error, requests.Timeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return "timed out" in str(reason or "").lower() or "timeout" in type(reason).__name__.lower()
@@ -0,0 +1,104 @@
+# agent/utils/minhash.py
+"""
+MinHash + LSH (거의 같은 본문 찾기)
+
+동작:
+    1. 본문을 소문자 단어로 나눠 연속 3단어 묶음(shingle) 집합을 만듦
+    2. 해시 함수 64개마다 집합의 최솟값 → 서명(signature, 64개 정수)
+       두 서명에서 같은 자리 값이 같은 비율 ≈ 두 shingle 집합의 자카드 유사도
+    3. 서명을 4개씩 16개 밴드로 나눠 밴드마다 버킷 값 1개 → DB 인덱스(content_lsh)에 저장
+       밴드 하나라도 같으면 후보, 후보만 서명을 비교해 유사도 계산
+
+    유사도 0.7인 글이 후보로 잡힐 확률 1-(1-0.7^4)^16 ≈ 99.6%, 0.3인 글은 ≈ 12% (비교 후 제외)
+
+설정:
+- KAFKA_NEAR_DUP_POLICY: ask(기본, 터미널이면 재사용 여부를 물어봄) / reuse(항상 재사용) / ignore(확인 안 함)
+- KAFKA_NEAR_DUP_THRESHOLD: 같은 콘텐츠로 볼 최소 유사도 (기본: 0.7)
+
+이유:
+- 통신사 기사 재배포, 다른 사이트에 옮긴 글, 잡음이 다른 자막처럼
+  조금씩 다른 본문은 정확한 해시(결과 캐시)로 찾을 수 없음
+"""
+
+import hashlib
+import os
+import random
+import re
+import struct
+from typing import List, Optional
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+# 이보다 단어 묶음이 적은 짧은 글은 유사도가 불안정하므로 확인하지 않음
+MIN_SHINGLES = 20
+
+# 해시 함수 h(x) = (a*x + b) mod p (고정 시드 - 저장된 서명과 계속 비교할 수 있도록)
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20260219)
+_COEFFICIENTS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_TOKEN = re.compile(r"\w+")
+_MASK32 = 0xFFFFFFFF
+
+
+def get_near_dup_policy() -> str:
+    """근사 중복 처리 방식 (환경 변수 KAFKA_NEAR_DUP_POLICY, 기본: ask)"""
+    policy = os.getenv("KAFKA_NEAR_DUP_POLICY", "ask").strip().lower()
+    return policy if policy in ("ask", "reuse", "ignore") else "ask"
+
+
+def get_near_dup_threshold() -> float:
+    """같은 콘텐츠로 볼 최소 유사도 (환경 변수 KAFKA_NEAR_DUP_THRESHOLD, 기본: 0.7)"""
+    return float(os.getenv("KAFKA_NEAR_DUP_THRESHOLD", 0.7))
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """
+    본문의 MinHash 서명
+
+    Returns:
+        NUM_PERM개 32비트 정수, 단어 묶음이 MIN_SHINGLES보다 적으면 None
+    """
+    tokens = _TOKEN.findall(text.lower())
+    shingles = {
+        int.from_bytes(hashlib.blake2b(" ".join(tokens[i:i + SHINGLE_SIZE]).encode("utf-8"),
+                                       digest_size=8).digest(), "big")
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+    if len(shingles) < MIN_SHINGLES:
+        return None
+
+    # 32비트만 저장 (서명 크기 절반, 우연히 같을 확률 2^-32)
+    return [min((a * x + b) % _PRIME for x in shingles) & _MASK32 for a, b in _COEFFICIENTS]
+
+
+def estimate_similarity(a: List[int], b: List[int]) -> float:
+    """두 서명의 자카드 유사도 추정값 (0~1)"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def band_buckets(signature: List[int]) -> List[int]:
+    """
+    LSH 버킷 값 (밴드마다 1개)
+
+    밴드 번호를 함께 해시하므로 다른 밴드끼리는 같은 버킷이 되지 않음
+    (SQLite INTEGER에 맞게 63비트 양수)
+    """
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<B{ROWS}I", band, *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big") >> 1)
+    return buckets
+
+
+def pack_signature(signature: List[int]) -> bytes:
+    """DB 저장용 (NUM_PERM × 4바이트, 리틀 엔디언)"""
+    return struct.pack(f"<{NUM_PERM}I", *signature)
+
+
+def unpack_signature(blob: bytes) -> List[int]:
+    return list(struct.unpack(f"<{NUM_PERM}I", blob))
@@ -0,0 +1,88 @@
+# agent/utils/quiz_parser.py
+"""
+styled_content 텍스트에서 퀴즈 추출 (레거시 데이터용)
+
+questions 컬럼이 생기기 전에 저장된 스케줄은 퀴즈가 styled_content 본문에만 들어 있습니다.
+이 파서는 마이그레이션(python3 -m agent.migrate)에서 한 번만 실행하고,
+웹 서버는 요청 처리 중에 사용하지 않습니다.
+"""
+
+import json
+import re
+from typing import Dict
+
+# 정규식은 모듈 로드 시 1번만 컴파일
+SUMMARY_PATTERN = re.compile(r'\[요약\](.*?)(?:\[퀴즈\]|$)', re.DOTALL)
+QUIZ_JSON_PATTERN = re.compile(r'\{"questions":\s*\[(.*?)\]\}', re.DOTALL)
+# 질문 블록은 다음 질문 전까지 (문제별 "정답: X"까지 포함해야 정답을 읽을 수 있음)
+QUESTION_PATTERN = re.compile(r'Q(\d+)\.\s*(.*?)(?=Q\d+\.|$)', re.DOTALL)
+OPTION_PATTERN = re.compile(r'([A-D]\).*?)(?=[A-D]\)|정답:|Q\d+\.|$)', re.DOTALL)
+ANSWER_PATTERN = re.compile(r'정답:\s*([A-D])')
+OPTION_SPLIT_PATTERN = re.compile(r'[A-D]\)')
+
+
+def extract_quiz_from_content(styled_content: str) -> Dict:
+    """
+    styled_content에서 퀴즈 정보 추출
+
+    Args:
+        styled_content: 페르소나가 적용된 콘텐츠
+
+    Returns:
+        {
+            "summary": "요약 내용",
+            "questions": [
+                {
+                    "text": "질문 내용",
+                    "options": ["A) ...", "B) ...", "C) ...", "D) ..."],
+                    "answer": "A"
+                },
+                ...
+            ]
+        }
+    """
+    # 요약 부분 추출
+    summary_match = SUMMARY_PATTERN.search(styled_content)
+    summary = summary_match.group(1).strip() if summary_match else ""
+
+    # 퀴즈 JSON 추출 시도
+    quiz_json_match = QUIZ_JSON_PATTERN.search(styled_content)
+
+    if quiz_json_match:
+        try:
+            # JSON 파싱
+            quiz_json = '{"questions": [' + quiz_json_match.group(1) + ']}'
+            quiz_data = json.loads(quiz_json)
+            return {
+                "summary": summary,
+                "questions": quiz_data.get("questions", [])
+            }
+        except json.JSONDecodeError:
+            pass
+
+    # JSON 파싱 실패 시 텍스트 파싱
+    questions = []
+
+    # Q1, Q2... 형식으로 질문 찾기
+    for num, q_text in QUESTION_PATTERN.findall(styled_content):
+        # 옵션 추출 (A), B), C), D) 형식)
+        options = [opt.strip() for opt in OPTION_PATTERN.findall(q_text) if opt.strip()]
+
+        # 정답 추출
+        answer_match = ANSWER_PATTERN.search(q_text)
+        answer = answer_match.group(1) if answer_match else "A"
+
+        # 질문 텍스트 정리
+        question_text = OPTION_SPLIT_PATTERN.split(q_text)[0].strip()
+
+        if options:
+            questions.append({
+                "text": question_text,
+                "options": options,
+                "answer": answer
+            })
+
+    return {
+        "summary": summary,
+        "questions": questions[:5]  # 최대 5개
+    }
@@ -0,0 +1,80 @@
+# agent/utils/result_cache.py
+"""
+파이프라인 결과 캐시 키 (정규화한 본문 + 파이프라인 설정 버전의 해시)
+
+키 = sha256(파이프라인 버전 + "\\n" + 정규화한 input_text)
+- 정규화: 유니코드 NFKC, 줄 끝 공백 제거, 연속 공백/빈 줄 정리
+- 파이프라인 버전: PIPELINE_VERSION + 모델 이름(KAFKA_MODEL) + 프롬프트 전체의 해시
+  → 프롬프트나 모델을 바꾸면 이전 결과를 쓰지 않음 (노드 로직을 바꾸면 PIPELINE_VERSION을 올림)
+
+설정:
+- KAFKA_RESULT_CACHE: 0이면 사용 안 함 (기본: 1)
+- KAFKA_RESULT_CACHE_MAX_AGE_DAYS: 마지막 사용 후 보관 기간 (일, 기본: 30)
+- KAFKA_RESULT_CACHE_MAX_MB: 전체 최대 크기 (MB, 기본: 50, 넘으면 오래 안 쓴 것부터 삭제)
+
+이유:
+- 텍스트/파일 입력은 URL이 없어 정규화 URL로 중복을 찾을 수 없음
+- 같은 글을 다시 붙여넣으면 분류~페르소나 LLM 호출을 다시 하지 않음
+"""
+
+import hashlib
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+# 노드 로직(상태 필드, 파싱 방식 등)을 바꾸면 올림
+PIPELINE_VERSION = "1"
+
+_SPACES = re.compile(r"[ \t\f\v\xa0\u200b]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def is_result_cache_enabled() -> bool:
+    """결과 캐시 사용 여부 (환경 변수 KAFKA_RESULT_CACHE, 기본: 사용)"""
+    return os.getenv("KAFKA_RESULT_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_max_age_days() -> float:
+    """마지막 사용 후 보관 기간 (환경 변수 KAFKA_RESULT_CACHE_MAX_AGE_DAYS, 기본: 30일)"""
+    return float(os.getenv("KAFKA_RESULT_CACHE_MAX_AGE_DAYS", 30))
+
+
+def get_max_bytes() -> int:
+    """전체 최대 크기 (환경 변수 KAFKA_RESULT_CACHE_MAX_MB, 기본: 50MB)"""
+    return int(float(os.getenv("KAFKA_RESULT_CACHE_MAX_MB", 50)) * 1024 * 1024)
+
+
+def normalize_input_text(text: str) -> str:
+    """
+    해시용 본문 정규화
+
+    예:
+        "  AI는\\r\\n\\n\\n\\n인공지능 " → "AI는\\n\\n인공지능"
+    """
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+@lru_cache(maxsize=None)
+def _prompts_digest() -> str:
+    """프롬프트 모듈의 대문자 상수 전체 해시 (프로세스당 1번 계산)"""
+    from agent import prompts
+
+    digest = hashlib.sha256()
+    for name in sorted(name for name in dir(prompts) if name.isupper()):
+        digest.update(f"{name}={getattr(prompts, name)!r}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_pipeline_version() -> str:
+    """파이프라인 설정 버전 (PIPELINE_VERSION + 모델 + 프롬프트)"""
+    config = f"{PIPELINE_VERSION}|{os.getenv('KAFKA_MODEL', 'solar-pro2')}|{_prompts_digest()}"
+    return hashlib.sha256(config.encode("utf-8")).hexdigest()[:16]
+
+
+def result_cache_key(input_text: str) -> str:
+    """본문 + 파이프라인 버전 해시 (결과 캐시 키)"""
+    payload = f"{get_pipeline_version()}\n{normalize_input_text(input_text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,99 @@
+# agent/utils/safety.py
+"""
+본문 전체 안전성 검사용 구간 나누기 + 로컬 키워드 사전 필터 (LLM 호출 전, 로컬 계산)
+
+동작:
+    1. split_for_screening: 보일러플레이트를 뺀 본문을 KAFKA_SAFETY_CHUNK_TOKENS 이하 구간으로 나눔
+    2. prefilter_hits: 안전 정책(S1~S4)별 위험 키워드/정규식에 걸리는지 확인
+       - 걸린 구간을 먼저 LLM으로 검사 (UNSAFE가 있으면 일찍 나오도록)
+       - 걸렸다고 UNSAFE는 아님 (뉴스의 "폭력 예방" 등), 안 걸렸다고 안전한 것도 아님
+         → 기본값은 모든 구간을 LLM으로 검사 (사전 필터는 순서만 정함)
+
+설정:
+- KAFKA_SAFETY_CHUNK_TOKENS: 검사 구간 크기 (기본: 1500)
+- KAFKA_SAFETY_PREFILTER: 1이면 사전 필터에 걸리지 않은 구간은 LLM 검사 생략 (기본: 0)
+  호출 수는 줄지만 키워드 없이 돌려 말한 위반은 놓칠 수 있음
+
+이유:
+- 앞부분만 검사하면 긴 본문(영상 자막 등)의 뒷부분은 검사되지 않음
+- 전체를 한 번에 보내면 느림 → 구간으로 나눠 동시에 검사
+- 광고/스팸(S3)처럼 문서 단위로 봐야 하는 위반은 노드에서 압축본 검사로 따로 확인
+"""
+
+import os
+import re
+from typing import List
+
+from agent.utils.compress import strip_boilerplate
+from agent.utils.tokens import split_by_tokens
+
+# 안전 정책별 위험 키워드 (prompts.SAFETY_PROMPT의 S1~S4와 같은 분류)
+PREFILTER_PATTERNS = {
+    "S1": re.compile(
+        r"살해|살인|죽여|죽이|학살|테러|폭행|폭력|혐오|증오|칼부림|총기|"
+        r"\b(?:kill(?:ing|ed)?|murder|massacre|genocide|terror(?:ism|ist)?|hate|violen(?:ce|t))\b",
+        re.IGNORECASE,
+    ),
+    "S2": re.compile(
+        r"성인|음란|야동|포르노|성관계|성행위|섹스|알몸|"
+        r"\b(?:porn\w*|nsfw|sex(?:ual)?|nude|naked|explicit|xxx)\b",
+        re.IGNORECASE,
+    ),
+    "S3": re.compile(
+        r"카지노|도박|바카라|토토|대출|수익\s*보장|무료\s*증정|당첨|텔레그램|카톡\s*상담|"
+        r"비밀번호|인증\s*번호|계좌|입금|"
+        r"\b(?:casino|betting|gambl\w*|loan|click here|giveaway|verify your account|password|wallet|"
+        r"bitcoin|crypto)\b",
+        re.IGNORECASE,
+    ),
+    "S4": re.compile(
+        r"마약|필로폰|대마|코카인|폭탄|폭발물|제조법|해킹|자살|자해|무기|"
+        r"\b(?:drugs?|cocaine|meth|heroin|bomb|explosives?|hack(?:ing)?|suicide|self-harm|weapons?)\b",
+        re.IGNORECASE,
+    ),
+}
+
+
+def get_safety_chunk_tokens() -> int:
+    """검사 구간 크기 (환경 변수 KAFKA_SAFETY_CHUNK_TOKENS, 기본: 1500)"""
+    return max(1, int(os.getenv("KAFKA_SAFETY_CHUNK_TOKENS", 1500)))
+
+
+def is_prefilter_enabled() -> bool:
+    """사전 필터로 LLM 검사를 생략할지 (환경 변수 KAFKA_SAFETY_PREFILTER, 기본: 생략 안 함)"""
+    return os.getenv("KAFKA_SAFETY_PREFILTER", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def split_for_screening(content: str) -> List[str]:
+    """보일러플레이트를 뺀 본문 → 검사 구간 목록 (순서 유지, 짧은 본문은 1개)"""
+    return split_by_tokens(strip_boilerplate(content), get_safety_chunk_tokens())
+
+
+def prefilter_hits(text: str) -> List[str]:
+    """
+    구간에서 걸린 안전 정책 코드 목록 (빈 목록이면 LLM 검사 생략 가능)
+
+    예:
+        "오늘 날씨는 맑겠습니다." → []
+        "폭탄 제조법을 알려 드립니다" → ["S4"]
+    """
+    return [policy for policy, pattern in PREFILTER_PATTERNS.items() if pattern.search(text)]
+
+
+def needs_llm_screening(text: str) -> bool:
+    """이 구간을 LLM으로 검사해야 하는지 (KAFKA_SAFETY_PREFILTER=1일 때만 False가 될 수 있음)"""
+    return not is_prefilter_enabled() or bool(prefilter_hits(text))
+
+
+def order_for_screening(chunks: List[str]) -> List[str]:
+    """
+    LLM으로 검사할 구간 목록 (사전 필터에 걸린 구간 먼저, 각각은 원래 순서)
+
+    KAFKA_SAFETY_PREFILTER=1이면 걸리지 않은 구간은 빠짐
+    """
+    flagged, others = [], []
+    for chunk in chunks:
+        (flagged if prefilter_hits(chunk) else others).append(chunk)
+    if is_prefilter_enabled():
+        return flagged
+    return flagged + others
@@ -0,0 +1,155 @@
+# agent/utils/tokens.py
+"""
+토큰 수 추정 + 입력 예산 + 토큰 단위 분할 (긴 입력 map-reduce 요약용)
+
+토큰 수:
+- Solar 토크나이저(tokenizer.json)가 Hugging Face 로컬 캐시에 있으면 정확히 셈
+- 없으면 보수적으로 추정 (한글/한자/가나 1글자 = 1토큰, 그 외 공백 아닌 글자 4개 = 1토큰)
+  → 실제보다 많게 잡아 컨텍스트 한도를 넘지 않도록
+  (토크나이저를 내려받지 않음 - 오프라인이면 요청마다 수십 초 대기)
+
+설정:
+- KAFKA_CONTEXT_TOKENS: 모델 컨텍스트 크기 (기본: KAFKA_MODEL에 맞춘 값, MODEL_CONTEXT_TOKENS)
+- KAFKA_MAX_INPUT_TOKENS: 한 번에 보낼 본문 최대 토큰 (기본: 컨텍스트 - 프롬프트 - 응답 예약분)
+  더 작게 잡으면 긴 본문을 일찍 나눠 병렬로 요약 (한 번의 느린 호출 대신)
+- KAFKA_SECTION_TOKENS: map 단계 구간 크기 (기본: 8000)
+- KAFKA_LLM_CONCURRENCY: 동시에 보낼 LLM 요청 수 (기본: 4)
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import List
+
+# 모델별 컨텍스트 크기 (토큰)
+MODEL_CONTEXT_TOKENS = {
+    "solar-pro3": 131072,
+    "solar-pro2": 65536,
+    "solar-pro": 32768,
+    "solar-mini": 32768,
+}
+DEFAULT_CONTEXT_TOKENS = 32768
+
+# 응답(요약) 생성용으로 남겨 둘 토큰
+RESPONSE_RESERVE_TOKENS = 2048
+
+# langchain_upstage.ChatUpstage와 같은 토크나이저
+SOLAR_TOKENIZERS = {
+    "solar-pro3": "upstage/solar-pro3-tokenizer",
+    "solar-pro2": "upstage/solar-pro2-tokenizer",
+    "solar-mini": "upstage/solar-1-mini-tokenizer",
+}
+
+_WIDE_CHARS = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7a3\uf900-\ufaff]")
+_NON_SPACE = re.compile(r"\S")
+_PARAGRAPHS = re.compile(r"\n\s*\n")
+_LINES = re.compile(r"\n")
+_SENTENCES = re.compile(r"(?<=[.!?。])\s+")
+
+
+def _model_name() -> str:
+    return os.getenv("KAFKA_MODEL", "solar-pro2")
+
+
+def get_context_tokens() -> int:
+    """모델 컨텍스트 크기 (환경 변수 KAFKA_CONTEXT_TOKENS, 기본: 모델별 값)"""
+    configured = os.getenv("KAFKA_CONTEXT_TOKENS")
+    if configured:
+        return int(configured)
+    return MODEL_CONTEXT_TOKENS.get(_model_name(), DEFAULT_CONTEXT_TOKENS)
+
+
+def get_section_tokens() -> int:
+    """map 단계 구간 크기 (환경 변수 KAFKA_SECTION_TOKENS, 기본: 8000)"""
+    return int(os.getenv("KAFKA_SECTION_TOKENS", 8000))
+
+
+def get_llm_concurrency() -> int:
+    """동시에 보낼 LLM 요청 수 (환경 변수 KAFKA_LLM_CONCURRENCY, 기본: 4)"""
+    return max(1, int(os.getenv("KAFKA_LLM_CONCURRENCY", 4)))
+
+
+@lru_cache(maxsize=None)
+def _load_tokenizer(model: str):
+    """로컬 캐시에 있는 Solar 토크나이저 (없거나 불러오지 못하면 None, 프로세스당 1번)"""
+    name = SOLAR_TOKENIZERS.get(model)
+    if not name:
+        return None
+    try:
+        from huggingface_hub import try_to_load_from_cache
+        from tokenizers import Tokenizer
+
+        path = try_to_load_from_cache(name, "tokenizer.json")
+        return Tokenizer.from_file(path) if isinstance(path, str) else None
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    본문 토큰 수 (토크나이저가 있으면 정확한 값, 없으면 보수적 추정값)
+
+    예:
+        "인공지능" → 4, "machine learning" → 4 (추정)
+    """
+    if not text:
+        return 0
+    tokenizer = _load_tokenizer(_model_name())
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+    wide = len(_WIDE_CHARS.findall(text))
+    other = len(_NON_SPACE.findall(text)) - wide
+    return wide + (other + 3) // 4
+
+
+def get_input_budget(prompt: str = "") -> int:
+    """
+    prompt와 함께 한 번에 보낼 수 있는 본문 최대 토큰
+
+    = 컨텍스트 - 프롬프트 - 응답 예약분 (KAFKA_MAX_INPUT_TOKENS가 더 작으면 그 값)
+    """
+    budget = get_context_tokens() - estimate_tokens(prompt) - RESPONSE_RESERVE_TOKENS
+    configured = os.getenv("KAFKA_MAX_INPUT_TOKENS")
+    if configured:
+        budget = min(budget, int(configured))
+    return max(budget, 1)
+
+
+def split_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """
+    본문을 max_tokens 이하 구간으로 나눔 (문단 → 줄 → 문장 경계 순서로, 순서 유지)
+
+    경계 없이 한 덩어리가 max_tokens를 넘으면 글자 수로 자름
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text] if text.strip() else []
+
+    sections: List[str] = []
+    for pattern, joiner in ((_PARAGRAPHS, "\n\n"), (_LINES, "\n"), (_SENTENCES, " ")):
+        pieces = [piece for piece in pattern.split(text) if piece.strip()]
+        if len(pieces) > 1:
+            break
+    else:
+        # 경계가 없는 덩어리: 추정값 비율로 글자 수를 잡아 자름
+        size = max(1, len(text) * max_tokens // estimate_tokens(text))
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    current: List[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if piece_tokens > max_tokens:
+            if current:
+                sections.append(joiner.join(current))
+                current, current_tokens = [], 0
+            sections.extend(split_by_tokens(piece, max_tokens))
+            continue
+        if current and current_tokens + piece_tokens > max_tokens:
+            sections.append(joiner.join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        sections.append(joiner.join(current))
+    return sections
@@ -0,0 +1,130 @@
+# agent/utils/url.py
+"""
+URL 정규화 (같은 콘텐츠를 가리키는 링크를 하나의 키로)
+
+규칙:
+- scheme은 https, host는 소문자 + 앞의 www. / m. / mobile. 제거, 기본 포트(80/443) 제거
+- #fragment 제거, 경로 끝의 / 제거 (루트 제외)
+- 추적용 쿼리 파라미터(utm_*, fbclid, gclid 등) 제거, 나머지는 이름순 정렬
+  - ref/si/spm처럼 사이트에 따라 콘텐츠를 가리킬 수도 있는 이름은 추적용으로 알려진 host에서만 제거
+- 유튜브: youtu.be / watch / shorts / embed / live / m.youtube.com → https://youtube.com/watch?v=<id>
+
+이유:
+- 공유 버튼/모바일/단축 링크로 받은 같은 기사·영상을 새 콘텐츠로 처리하지 않도록
+  (요약/퀴즈/페르소나 LLM 호출을 다시 하지 않음, 수집 캐시 키로도 사용)
+"""
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 어느 사이트에서든 제거할 쿼리 파라미터 (소문자, 광고/분석 도구 전용 이름만)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl",
+    "pk_campaign", "pk_kwd", "pk_source", "pk_medium", "pk_content",
+    "mtm_campaign", "mtm_kwd", "mtm_source", "mtm_medium", "mtm_content", "mtm_cid", "mtm_group",
+    "mtm_placement",
+}
+TRACKING_PREFIXES = ("utm_", "hsa_")
+
+# host별로만 제거할 쿼리 파라미터 (다른 사이트에서는 ?ref=<브랜치>, ?si=<페이지>처럼 의미가 있을 수 있음)
+# 서브도메인도 같은 규칙 적용 (예: open.spotify.com)
+HOST_TRACKING_PARAMS = {
+    "twitter.com": {"ref_src", "ref_url"},
+    "x.com": {"ref_src", "ref_url"},
+    "youtube.com": {"si", "feature"},
+    "spotify.com": {"si"},
+    "instagram.com": {"igsh"},
+    "aliexpress.com": {"spm"},
+    "taobao.com": {"spm"},
+    "tmall.com": {"spm"},
+}
+
+# host 앞에서 제거할 서브도메인
+STRIP_SUBDOMAINS = ("www.", "m.", "mobile.")
+
+YOUTUBE_HOSTS = {"youtube.com", "youtu.be", "youtube-nocookie.com", "music.youtube.com"}
+_YOUTUBE_PATH_ID = re.compile(r"^/(?:shorts|embed|live|v)/([a-zA-Z0-9_-]{11})")
+_YOUTUBE_ID = re.compile(r"^[a-zA-Z0-9_-]{11}$")
+
+
+def _strip_subdomains(host: str) -> str:
+    changed = True
+    while changed:
+        changed = False
+        for prefix in STRIP_SUBDOMAINS:
+            # "m.com"처럼 남는 부분이 도메인 하나뿐이면 그대로 둠
+            if host.startswith(prefix) and "." in host[len(prefix):]:
+                host = host[len(prefix):]
+                changed = True
+    return host
+
+
+def _youtube_video_id(host: str, path: str, query: str):
+    """유튜브 링크면 video_id, 아니면 None"""
+    if host not in YOUTUBE_HOSTS:
+        return None
+    if host == "youtu.be":
+        candidate = path.strip("/").split("/")[0]
+        return candidate if _YOUTUBE_ID.match(candidate) else None
+    if path.rstrip("/") == "/watch":
+        candidate = dict(parse_qsl(query)).get("v", "")
+        return candidate if _YOUTUBE_ID.match(candidate) else None
+    match = _YOUTUBE_PATH_ID.match(path)
+    return match.group(1) if match else None
+
+
+def _host_tracking_params(host: str) -> set:
+    """host(와 상위 도메인)에 등록된 추적용 파라미터 이름"""
+    labels = host.split(".")
+    names = set()
+    for start in range(len(labels) - 1):
+        names |= HOST_TRACKING_PARAMS.get(".".join(labels[start:]), set())
+    return names
+
+
+def _is_tracking_param(name: str, host_params: set) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name in host_params or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    URL을 정규 형태로 변환
+
+    Args:
+        url: 원본 URL (scheme이 없으면 https로 간주, 예: www.example.com/a)
+
+    Returns:
+        정규화된 URL (비교/저장용 키)
+
+    예시:
+        https://m.Example.com/news/1/?utm_source=x#top → https://example.com/news/1
+        https://youtu.be/dQw4w9WgXcQ?si=abc          → https://youtube.com/watch?v=dQw4w9WgXcQ
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    host = _strip_subdomains((parts.hostname or "").lower().rstrip("."))
+
+    video_id = _youtube_video_id(host, parts.path, parts.query)
+    if video_id:
+        return f"https://youtube.com/watch?v={video_id}"
+
+    netloc = host
+    if parts.port and parts.port not in (80, 443):
+        netloc = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    host_params = _host_tracking_params(host)
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name, host_params)
+    )
+    return urlunsplit(("https", netloc, path, urlencode(query), ""))
@@ -1,4 +1,5 @@
 import re
+import threading
 import requests
 from urllib.parse import urlparse
 from datetime import datetime, timedelta
@@ -9,6 +10,25 @@ from youtube_transcript_api._errors import (
     TranscriptsDisabled,
 )
 
+from .http import ContentTooLargeError, create_session, fetch, is_timeout
+from .fetch_cache import get_article_ttl, get_fetch_cache
+from .extract import extract_article, format_article, get_article_extractor, get_min_chars
+from .url import canonicalize_url
+
+# 자막 API 클라이언트 (커넥션 풀 재사용, 처음 호출할 때 생성)
+_youtube_api = None
+_youtube_api_lock = threading.Lock()
+
+# 기사 URL 앞에 붙여 본문을 받아오는 Jina Reader 주소 (로컬 추출 실패 시)
+JINA_READER_URL = "https://r.jina.ai/"
+
+# 기사 페이지를 직접 가져올 때 보내는 헤더 (기본 python-requests UA를 막는 사이트 대응)
+ARTICLE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; KafkaReader/1.0)",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko,en;q=0.8",
+}
+
 def is_valid_url(url: str) -> bool:
     """
     URL이 유효한 형식(http/https 포함)인지 확인합니다.
@@ -54,10 +74,22 @@ def extract_youtube_video_id(url: str) -> str:
 def get_youtube_transcript(video_id: str) -> str:
     """
     유튜브 video_id로부터 자막을 가져와 하나의 텍스트로 반환
+
+    자막은 바뀌지 않으므로 수집 캐시에 영구 보관 (KAFKA_FETCH_CACHE=0이면 매번 수집)
     """
+    cache = get_fetch_cache()
+    if cache is None:
+        return _fetch_youtube_transcript(video_id)
+    return cache.get_or_fetch(
+        f"youtube:{video_id}",
+        lambda validators: {"status": 200, "text": _fetch_youtube_transcript(video_id)},
+        ttl=None
+    )
+
+def _fetch_youtube_transcript(video_id: str) -> str:
+    """자막 API 호출 (캐시 없이)"""
     try:
-        ytt_api = YouTubeTranscriptApi()
-        transcript = ytt_api.fetch(video_id, languages=["ko", "en"])
+        transcript = _get_youtube_api().fetch(video_id, languages=["ko", "en"])
     except TranscriptsDisabled:
         raise ValueError("Transcripts are disabled for this video.")
     except NoTranscriptFound:
@@ -68,31 +100,84 @@ def get_youtube_transcript(video_id: str) -> str:
     full_text = " ".join([item.text for item in transcript])
     return full_text
 
+def _get_youtube_api() -> YouTubeTranscriptApi:
+    """
+    자막 API 클라이언트 (풀/재시도가 설정된 전용 세션 사용)
+
+    자막 API가 세션 헤더를 바꾸므로 기사 수집용 공유 세션과 분리
+    """
+    global _youtube_api
+    with _youtube_api_lock:
+        if _youtube_api is None:
+            _youtube_api = YouTubeTranscriptApi(http_client=create_session())
+        return _youtube_api
+
 def get_article_content(url: str) -> str:
     """
-    Jina Reader(r.jina.ai)를 사용하여 뉴스 기사 제목과 본문을 추출합니다.
+    뉴스 기사 제목과 본문을 추출합니다.
+
+    페이지를 직접 가져와 로컬에서 추출하고(extract_article), 실패하면 Jina Reader(r.jina.ai)를 사용합니다.
+    (KAFKA_ARTICLE_EXTRACTOR=jina이면 항상 Jina Reader)
+    수집 캐시에 KAFKA_FETCH_CACHE_TTL 동안 보관하고, 만료되면 ETag/Last-Modified로 재검증합니다.
     """
     if not is_valid_url(url):
         raise ValueError(f"유효하지 않은 URL 형식입니다: {url}")
 
-    jina_url = f"https://r.jina.ai/{url}"
+    use_local = get_article_extractor() != "jina"
+
+    def _fetch(validators):
+        # 공유 세션 (keep-alive, 429/5xx/타임아웃 재시도, 최대 크기 제한)
+        if use_local:
+            try:
+                result = _fetch_article_locally(url, validators)
+                if result is not None:
+                    return result
+                print("⚠️ 로컬 본문 추출 실패 → Jina Reader 사용")
+            except (requests.RequestException, ContentTooLargeError) as e:
+                print(f"⚠️ 기사 페이지 요청 실패 ({e.__class__.__name__}) → Jina Reader 사용")
+            # 저장된 검증 값은 원본 페이지의 것이므로 Jina에는 보내지 않음
+            validators = {}
+        return fetch(f"{JINA_READER_URL}{url}", headers=validators or None)
+
     try:
-        # 타임아웃 10초 설정
-        response = requests.get(jina_url, timeout=10)
-        response.raise_for_status()
-        
-        content = response.text
+        cache = get_fetch_cache()
+        if cache is None:
+            content = _fetch({})["text"]
+        else:
+            content = cache.get_or_fetch(f"article:{canonicalize_url(url)}", _fetch, get_article_ttl())
         # 본문이 너무 짧으면 뉴스 기사가 아닐 확률이 높음
         ########### 이 부분은 잠시 주석처리 했습니다!!!!!! 본문 짧을 경우를 생각해보고 글자수 제한할거임
         # if len(content.strip()) < 150:
         #     raise ValueError("추출된 본문 내용이 너무 짧습니다. 유효한 뉴스 기사 링크인지 확인해주세요.")
             
         return content
-    except requests.exceptions.Timeout:
-        raise ValueError("뉴스 기사를 가져오는 중 타임아웃이 발생했습니다. 다시 시도해주세요.")
+    except requests.RequestException as e:
+        if is_timeout(e):
+            raise ValueError("뉴스 기사를 가져오는 중 타임아웃이 발생했습니다. 다시 시도해주세요.")
+        raise ValueError(f"뉴스 기사를 가져오는 데 실패했습니다: {str(e)}")
     except Exception as e:
         raise ValueError(f"뉴스 기사를 가져오는 데 실패했습니다: {str(e)}")
 
+def _fetch_article_locally(url: str, validators: dict):
+    """
+    기사 페이지를 직접 가져와 본문 추출
+
+    Returns:
+        fetch() 결과 (text는 "Title: ..." 머리말이 붙은 본문, 304면 None)
+        HTML이 아니거나 본문이 KAFKA_EXTRACT_MIN_CHARS보다 짧으면 None
+    """
+    result = fetch(url, headers={**ARTICLE_HEADERS, **validators})
+    if result["status"] == 304:
+        return result
+    if result["content_type"] and "html" not in result["content_type"]:
+        return None
+
+    article = extract_article(result["text"])
+    if len(article["text"]) < get_min_chars():
+        return None
+    result["text"] = format_article(article)
+    return result
+
 # ============================================================
 # 🆕 에빙하우스 망각 곡선 날짜 계산
 # ============================================================
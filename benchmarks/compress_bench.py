@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# benchmarks/compress_bench.py
+"""
+LLM 입력 압축 벤치마크 (보일러플레이트 제거 + TextRank, 오프라인)
+
+입력:
+- benchmarks/fixtures/jina/<이름>.md: Jina Reader 형식 마크다운 (정답 본문: <이름>.txt)
+- benchmarks/fixtures/articles/*.txt: 로컬 추출 결과 형식의 깨끗한 본문
+- transcript: fixtures 본문을 문장부호/줄바꿈 없이 이어 붙인 긴 자막 흉내 (--transcript-repeat배)
+
+노드별(safety / classify / rewrite_query / synthesize)로 비교:
+- before: 예전 방식 (앞 2,000자 / 1,800자 자르기, synthesize는 원문 전체)
+- after: compress_for_prompt (synthesize는 KAFKA_COMPRESS_TOKENS_SYNTHESIZE 예산으로 추출)
+
+측정 항목:
+- tokens_before / tokens_after / reduction: 노드에 보낸 토큰 수와 감소율
+- body_precision: 보낸 글 중 정답 본문 단어 비율 (보일러플레이트가 적을수록 1에 가까움, 정답이 있는 입력만)
+- compress_ms: 압축 시간 p50 (밀리초)
+
+사용법:
+    python3 benchmarks/compress_bench.py
+    python3 benchmarks/compress_bench.py --repeat 20 --output bench_output.txt
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.utils.compress import compress_for_prompt
+from agent.utils.tokens import estimate_tokens
+from benchmarks.extract_bench import overlap
+from benchmarks.scheduler_bench import git_revision, peak_rss_kb
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 예전 방식: 노드별 앞 N자 (None이면 원문 전체)
+LEGACY_SLICES = {"safety": 2000, "classify": 2000, "rewrite_query": 1800, "synthesize": None}
+
+
+def load_inputs(transcript_repeat: int) -> List[Dict]:
+    """[{name, text, expected(정답 본문 또는 None)}, ...]"""
+    inputs = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "jina", "*.md"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        with open(os.path.join(FIXTURE_DIR, "jina", name + ".txt"), encoding="utf-8") as f:
+            expected = f.read().partition("\n\n")[2]
+        inputs.append({"name": f"jina/{name}", "text": text, "expected": expected})
+
+    bodies = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "articles", "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        bodies.append(text)
+        inputs.append({"name": f"articles/{os.path.basename(path)[:-4]}", "text": text, "expected": text})
+
+    # 자동 생성 자막처럼 문장부호/줄바꿈 없는 긴 본문
+    words = " ".join(bodies).replace(".", " ").split()
+    inputs.append({"name": "transcript", "text": " ".join(words * transcript_repeat), "expected": None})
+    return inputs
+
+
+def run(args) -> Dict:
+    """벤치마크 1회 실행 후 결과 딕셔너리 반환"""
+    rows = {}
+    for item in load_inputs(args.transcript_repeat):
+        for node, limit in LEGACY_SLICES.items():
+            before = item["text"][:limit] if limit else item["text"]
+
+            samples = []
+            # 노드별 압축 로그(✂️)는 결과(JSON)와 섞이지 않도록 숨김
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    after = compress_for_prompt(item["text"], node)
+                    samples.append(time.perf_counter() - start)
+
+            tokens_before, tokens_after = estimate_tokens(before), estimate_tokens(after)
+            row = {
+                "tokens_before": tokens_before,
+                "tokens_after": tokens_after,
+                "reduction": round(1 - tokens_after / tokens_before, 3) if tokens_before else 0.0,
+                "compress_ms": round(statistics.median(samples) * 1000, 2),
+            }
+            if item["expected"]:
+                row["body_precision_before"] = overlap(before, item["expected"])["precision"]
+                row["body_precision_after"] = overlap(after, item["expected"])["precision"]
+            rows[f"{item['name']}:{node}"] = row
+
+    by_node = {}
+    for node in LEGACY_SLICES:
+        node_rows = [row for key, row in rows.items() if key.endswith(":" + node)]
+        before = sum(row["tokens_before"] for row in node_rows)
+        after = sum(row["tokens_after"] for row in node_rows)
+        by_node[node] = {"tokens_before": before, "tokens_after": after,
+                         "reduction": round(1 - after / before, 3) if before else 0.0}
+
+    return {
+        "benchmark": "compress",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "nodes": by_node,
+        "inputs": rows,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카프카 LLM 입력 압축 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="입력별 반복 횟수 (기본: 5)")
+    parser.add_argument("--transcript-repeat", type=int, default=40,
+                        help="긴 자막 흉내 입력의 반복 배수 (기본: 40)")
+    parser.add_argument("--output", type=str, help="결과를 JSON Lines로 누적할 파일")
+    args = parser.parse_args()
+
+    result = run(args)
+    line = json.dumps(result, ensure_ascii=False)
+
+    # stdout: JSON 한 줄 (기계 판독용), stderr: 요약
+    print(line)
+    for node, row in result["nodes"].items():
+        print(f"📊 {node}: {row['tokens_before']:,} → {row['tokens_after']:,} 토큰 "
+              f"({-row['reduction']:+.0%})", file=sys.stderr)
+    for key, row in result["inputs"].items():
+        if "body_precision_before" in row:
+            print(f"   {key}: 본문 비율 {row['body_precision_before']:.2f} → {row['body_precision_after']:.2f}, "
+                  f"{row['compress_ms']}ms", file=sys.stderr)
+        else:
+            print(f"   {key}: {row['tokens_before']:,} → {row['tokens_after']:,} 토큰, "
+                  f"{row['compress_ms']}ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
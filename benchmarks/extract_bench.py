@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# benchmarks/extract_bench.py
+"""
+기사 본문 추출 벤치마크 (저장된 HTML, 오프라인)
+
+benchmarks/fixtures/articles/<이름>.html 마다 정답 <이름>.txt (첫 줄: 제목, 빈 줄 뒤: 본문)와 비교합니다.
+
+추출기:
+- local: agent.utils.extract.extract_article (readability 방식)
+- naive: <body> 전체 텍스트 (기준선)
+- jina: --jina 옵션을 주면 --url로 지정한 실제 기사를 Jina Reader와 로컬 추출로 각각 가져와 비교 (네트워크 필요)
+
+측정 항목:
+- latency_ms: 추출 시간 p50 / max (밀리초, --repeat회 반복)
+- precision / recall / f1: 정답 본문과의 단어 겹침 (중복 포함)
+- title_ok: 제목 일치 여부
+
+사용법:
+    python3 benchmarks/extract_bench.py
+    python3 benchmarks/extract_bench.py --repeat 50 --output bench_output.txt
+
+    # 실제 기사에서 로컬 추출과 Jina Reader 비교 (Jina 결과를 정답으로 사용)
+    python3 benchmarks/extract_bench.py --jina --url https://example.com/article
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from agent.utils.extract import extract_article
+from benchmarks.scheduler_bench import git_revision, peak_rss_kb
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "articles")
+
+_TOKEN = re.compile(r"\w+")
+
+
+def naive_extract(html: str) -> Dict[str, str]:
+    """기준선: <body>의 모든 텍스트"""
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    body = soup.body or soup
+    return {"title": title, "text": body.get_text("\n", strip=True)}
+
+
+def overlap(predicted: str, expected: str) -> Dict[str, float]:
+    """단어 겹침 precision / recall / f1"""
+    pred = Counter(_TOKEN.findall(predicted.lower()))
+    gold = Counter(_TOKEN.findall(expected.lower()))
+    common = sum((pred & gold).values())
+    precision = common / sum(pred.values()) if pred else 0.0
+    recall = common / sum(gold.values()) if gold else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def load_fixtures() -> List[Dict]:
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        with open(os.path.join(FIXTURE_DIR, name + ".txt"), encoding="utf-8") as f:
+            title, _, text = f.read().partition("\n\n")
+        fixtures.append({"name": name, "html": html, "title": title.strip(), "text": text.strip()})
+    return fixtures
+
+
+def measure(extractor: Callable[[str], Dict], html: str, repeat: int) -> Dict:
+    """추출 repeat회 반복 → 시간 + 마지막 결과"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        article = extractor(html)
+        samples.append(time.perf_counter() - start)
+    return {
+        "article": article,
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def run_fixtures(repeat: int) -> Dict:
+    """저장된 HTML에서 local / naive 비교"""
+    extractors = {"local": extract_article, "naive": naive_extract}
+    results = {name: {"fixtures": {}} for name in extractors}
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        raise SystemExit(f"❌ HTML 파일이 없습니다: {FIXTURE_DIR}")
+
+    for fixture in fixtures:
+        for name, extractor in extractors.items():
+            measured = measure(extractor, fixture["html"], repeat)
+            article = measured.pop("article")
+            results[name]["fixtures"][fixture["name"]] = {
+                **measured,
+                **overlap(article["text"], fixture["text"]),
+                "title_ok": article["title"] == fixture["title"],
+                "chars": len(article["text"]),
+            }
+
+    for name, result in results.items():
+        rows = list(result["fixtures"].values())
+        result["mean_f1"] = round(statistics.mean(row["f1"] for row in rows), 4)
+        result["mean_p50_ms"] = round(statistics.mean(row["p50_ms"] for row in rows), 3)
+        result["titles_ok"] = sum(row["title_ok"] for row in rows)
+    return results
+
+
+def run_live(urls: List[str]) -> Dict:
+    """실제 기사에서 로컬(직접 요청 + 추출)과 Jina Reader 비교 (Jina 본문을 정답으로)"""
+    from agent.utils.http import fetch
+    from agent.utils.utils import ARTICLE_HEADERS, JINA_READER_URL
+
+    rows = {}
+    for url in urls:
+        start = time.perf_counter()
+        page = fetch(url, headers=ARTICLE_HEADERS)
+        local = extract_article(page["text"])
+        local_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        jina = fetch(f"{JINA_READER_URL}{url}")["text"]
+        jina_s = time.perf_counter() - start
+
+        rows[url] = {
+            "local_ms": round(local_s * 1000, 1),
+            "jina_ms": round(jina_s * 1000, 1),
+            "local_chars": len(local["text"]),
+            "jina_chars": len(jina),
+            **overlap(local["text"], jina),
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카프카 기사 본문 추출 벤치마크")
+    parser.add_argument("--repeat", type=int, default=20, help="HTML마다 추출 반복 횟수 (기본: 20)")
+    parser.add_argument("--jina", action="store_true", help="--url 기사로 로컬 추출과 Jina Reader 비교 (네트워크)")
+    parser.add_argument("--url", action="append", default=[], help="--jina 비교에 쓸 기사 URL (여러 번 지정 가능)")
+    parser.add_argument("--output", type=str, help="결과를 JSON Lines로 누적할 파일")
+    args = parser.parse_args()
+
+    if args.jina and not args.url:
+        parser.error("--jina에는 --url이 필요합니다")
+
+    result = {
+        "benchmark": "extract",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "extractors": run_fixtures(args.repeat),
+    }
+    if args.jina:
+        result["live"] = run_live(args.url)
+    result["peak_rss_kb"] = peak_rss_kb()
+
+    line = json.dumps(result, ensure_ascii=False)
+
+    # stdout: JSON 한 줄 (기계 판독용), stderr: 요약
+    print(line)
+    for name, summary in result["extractors"].items():
+        print(f"📊 {name}: F1 {summary['mean_f1']}, 제목 {summary['titles_ok']}/{len(summary['fixtures'])}, "
+              f"p50 {summary['mean_p50_ms']}ms", file=sys.stderr)
+    for url, row in result.get("live", {}).items():
+        print(f"🌐 {url}: local {row['local_ms']}ms / jina {row['jina_ms']}ms, F1 {row['f1']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# benchmarks/near_dup_bench.py
+"""
+근사 중복 조회 벤치마크 (MinHash + LSH 색인)
+
+임시 ScheduleDB에 합성 서명 N개(기본 100,000개)를 색인한 뒤
+near_duplicate_node와 같은 방식(후보 조회 + 서명 비교)으로 조회 시간을 측정합니다.
+
+측정 항목:
+- lookup_p50_us / lookup_p99_us: 조회 1회 시간 (µs, 목표: 1ms 미만)
+  - 절반은 색인된 서명의 변형(유사도 약 0.8, 찾아야 함), 절반은 처음 보는 서명
+- recall: 변형 서명 중 원본을 찾은 비율
+- signature_ms: 본문(fixtures 기사) 서명 계산 시간
+- seed_s / db_mb: 색인 생성 시간과 DB 크기
+
+사용법:
+    python3 benchmarks/near_dup_bench.py
+    python3 benchmarks/near_dup_bench.py --fingerprints 100000 --queries 2000 --output bench_output.txt
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.utils.minhash import (
+    NUM_PERM,
+    band_buckets,
+    estimate_similarity,
+    get_near_dup_threshold,
+    minhash_signature,
+    pack_signature,
+    unpack_signature,
+)
+from benchmarks.scheduler_bench import git_revision, peak_rss_kb
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "articles")
+
+
+def _random_signature(rng: random.Random) -> list:
+    return [rng.getrandbits(32) for _ in range(NUM_PERM)]
+
+
+def _variant(signature: list, rng: random.Random, keep: float = 0.8) -> list:
+    """자리의 keep 비율만 원본과 같은 서명 (유사도 ≈ keep)"""
+    return [value if rng.random() < keep else rng.getrandbits(32) for value in signature]
+
+
+def seed(conn: sqlite3.Connection, count: int, rng: random.Random) -> list:
+    """합성 서명 count개 색인 (한 트랜잭션), 서명 목록 반환"""
+    signatures = [_random_signature(rng) for _ in range(count)]
+    conn.executemany(
+        "INSERT INTO content_fingerprints (id, schedule_id, signature) VALUES (?, ?, ?)",
+        ((i, i, pack_signature(sig)) for i, sig in enumerate(signatures, 1))
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO content_lsh (bucket, fingerprint_id) VALUES (?, ?)",
+        ((bucket, i) for i, sig in enumerate(signatures, 1) for bucket in band_buckets(sig))
+    )
+    conn.commit()
+    return signatures
+
+
+def lookup(db, signature: list, threshold: float):
+    """near_duplicate_node와 같은 조회 (가장 비슷한 schedule_id 또는 None)"""
+    best_id, best_similarity = None, threshold
+    for candidate in db.get_fingerprint_candidates(band_buckets(signature)):
+        similarity = estimate_similarity(signature, unpack_signature(candidate["signature"]))
+        if similarity >= best_similarity:
+            best_id, best_similarity = candidate["schedule_id"], similarity
+    return best_id
+
+
+def signature_ms() -> float:
+    """fixtures 기사 본문 서명 계산 시간 중앙값 (ms)"""
+    timings = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        start = time.perf_counter()
+        minhash_signature(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings) if timings else 0.0
+
+
+def run(args) -> dict:
+    """벤치마크 1회 실행 후 결과 딕셔너리 반환"""
+    workdir = tempfile.mkdtemp(prefix="kafka_bench_")
+    path = os.path.join(workdir, "bench.db")
+    rng = random.Random(args.seed)
+    threshold = get_near_dup_threshold()
+
+    # DB 초기화 시 출력되는 안내 메시지는 결과(JSON)와 섞이지 않도록 숨김
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        from agent.database import ScheduleDB
+        db = ScheduleDB(path)
+
+    start = time.perf_counter()
+    signatures = seed(db.conn, args.fingerprints, rng)
+    seed_s = time.perf_counter() - start
+
+    timings, found, expected = [], 0, 0
+    for i in range(args.queries):
+        if i % 2 == 0:
+            index = rng.randrange(len(signatures))
+            query, target = _variant(signatures[index], rng), index + 1
+        else:
+            query, target = _random_signature(rng), None
+
+        start = time.perf_counter()
+        result = lookup(db, query, threshold)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+        if target is not None:
+            expected += 1
+            found += result == target
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        db.close()
+    db_mb = os.path.getsize(path) / (1024 * 1024)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    timings.sort()
+    return {
+        "benchmark": "near_dup",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "fingerprints": args.fingerprints,
+        "queries": args.queries,
+        "threshold": threshold,
+        "seed_s": round(seed_s, 2),
+        "db_mb": round(db_mb, 1),
+        "lookup_p50_us": round(timings[len(timings) // 2], 1),
+        "lookup_p99_us": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 1),
+        "recall": round(found / expected, 3) if expected else None,
+        "signature_ms": round(signature_ms(), 2),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카프카 근사 중복 조회 벤치마크")
+    parser.add_argument("--fingerprints", type=int, default=100000, help="색인할 합성 서명 수 (기본: 100000)")
+    parser.add_argument("--queries", type=int, default=2000, help="조회 횟수 (기본: 2000)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본: 42)")
+    parser.add_argument("--output", type=str, help="결과를 JSON Lines로 누적할 파일")
+    args = parser.parse_args()
+
+    result = run(args)
+    line = json.dumps(result, ensure_ascii=False)
+
+    # stdout: JSON 한 줄 (기계 판독용), stderr: 요약
+    print(line)
+    print(f"📊 서명 {result['fingerprints']}개 | 조회 p50 {result['lookup_p50_us']}µs, "
+          f"p99 {result['lookup_p99_us']}µs, recall {result['recall']} | "
+          f"서명 계산 {result['signature_ms']}ms, DB {result['db_mb']}MB", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# benchmarks/scheduler_bench.py
+"""
+스케줄러 부하 테스트 (합성 데이터 벤치마크)
+
+임시 ScheduleDB에 합성 스케줄/재발송/발송 이력을 채운 뒤
+send_daily_notifications()를 no-op 알림 백엔드(KAFKA_NOTIFIER=null)로 1회 실행하여 측정합니다.
+
+측정 항목:
+- query_s: 발송 대상 조회 시간 (이월 + 한도 적용 쿼리)
+- dispatch_s: 알림 발송 및 기록 시간 (job_s - query_s)
+- commits: 작업 중 DB commit 횟수
+- peak_rss_kb: 최대 메모리 사용량
+
+사용법:
+    python3 benchmarks/scheduler_bench.py --schedules 10000
+    python3 benchmarks/scheduler_bench.py --schedules 100000 --retries 5000 --history 200000
+
+    # 실제 백엔드 비용까지 포함해 측정
+    KAFKA_NOTIFIER=jsonl python3 benchmarks/scheduler_bench.py --schedules 10000
+
+    # 결과를 JSON Lines 파일에 누적 (변경 전후 비교용)
+    python3 benchmarks/scheduler_bench.py --schedules 10000 --output bench_output.txt
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 에빙하우스 주기 (agent.utils.calculate_ebbinghaus_dates와 동일)
+INTERVALS = [1, 4, 7, 11]
+
+
+class _CountingConnection:
+    """commit 횟수를 세는 sqlite3 연결 프록시"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+        return self._conn.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _timed(func, bucket: dict, key: str):
+    """함수 실행 시간을 bucket[key]에 누적하는 래퍼"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            bucket[key] = bucket.get(key, 0.0) + time.perf_counter() - start
+    return wrapper
+
+
+def seed(conn: sqlite3.Connection, args, today: date) -> dict:
+    """
+    합성 데이터 생성
+
+    - 스케줄: 기준일을 0~11일 전으로 분산 → 약 1/3이 오늘 발송 대상
+    - 재발송: 오늘 날짜의 pending 재발송 (겹치는 알림은 1개만)
+    - 발송 이력: 과거 날짜의 성공 기록
+    """
+    rng = random.Random(args.seed)
+    users = max(1, args.schedules // args.schedules_per_user)
+    content = "야! 어제 배운 내용 기억나? " * 8
+
+    def schedule_rows():
+        for i in range(args.schedules):
+            base = today - timedelta(days=rng.randrange(0, 12))
+            dates = [(base + timedelta(days=d)).isoformat() for d in INTERVALS]
+            category = "지식형" if rng.random() < 0.8 else "힐링형"
+            yield (f"user_{i % users}", None, "요약", category, json.dumps(dates),
+                   content, "친근한 친구", 0, None)
+
+    conn.executemany('''
+        INSERT INTO schedules
+        (user_id, url, summary, category, schedule_dates,
+         styled_content, persona_style, persona_count, questions)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', schedule_rows())
+
+    today_text = today.isoformat()
+    # 알림 1개당 재발송 행 1개 (유니크 인덱스) → 무작위로 겹친 것은 건너뜀
+    conn.executemany('''
+        INSERT OR IGNORE INTO retry_schedules (schedule_id, notification_index, retry_date, retry_count)
+        VALUES (?, ?, ?, ?)
+    ''', ((rng.randint(1, args.schedules), rng.randint(1, 4), today_text, rng.randint(1, 3))
+          for _ in range(args.retries)))
+
+    conn.executemany('''
+        INSERT INTO notifications
+        (schedule_id, notification_index, scheduled_date, sent_at, is_success)
+        VALUES (?, ?, ?, ?, 1)
+    ''', ((rng.randint(1, args.schedules), rng.randint(1, 4),
+           (today - timedelta(days=rng.randint(1, 11))).isoformat(), datetime.now())
+          for _ in range(args.history)))
+
+    conn.commit()
+    return {"users": users}
+
+
+def peak_rss_kb() -> int:
+    """최대 RSS (KB). macOS는 바이트 단위로 반환하므로 변환"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if platform.system() == "Darwin" else rss
+
+
+def git_revision() -> str:
+    """현재 커밋 해시 (없으면 빈 문자열)"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return ""
+
+
+def run(args) -> dict:
+    """벤치마크 1회 실행 후 결과 딕셔너리 반환"""
+    workdir = tempfile.mkdtemp(prefix="kafka_bench_")
+    os.environ["KAFKA_DB_PATH"] = os.path.join(workdir, "bench.db")
+    # no-op 알림 백엔드 (팝업 대신 발송 건수만 셈)
+    os.environ.setdefault("KAFKA_NOTIFIER", "null")
+
+    today = date.today()
+
+    # 모듈 import/DB 초기화 시 출력되는 안내 메시지는 결과(JSON)와 섞이지 않도록 숨김
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        import agent.database as database
+        from agent.scheduler.jobs import send_daily_notifications
+
+        db = database.get_db()
+
+    start = time.perf_counter()
+    meta = seed(db.conn, args, today)
+    seed_s = time.perf_counter() - start
+
+    # 조회 시간 측정 및 commit 횟수 집계
+    timings = {}
+    db.get_due_notifications = _timed(db.get_due_notifications, timings, "query_s")
+    db.defer_overflow_notifications = _timed(db.defer_overflow_notifications, timings, "query_s")
+    db.conn = _CountingConnection(db.conn)
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        start = time.perf_counter()
+        send_daily_notifications(daily_cap=args.cap)
+        job_s = time.perf_counter() - start
+
+    sent = db.conn.execute(
+        "SELECT COUNT(*) FROM notifications WHERE scheduled_date = ? AND is_success = 1",
+        (today.isoformat(),)
+    ).fetchone()[0]
+    deferred = db.conn.execute(
+        "SELECT COUNT(*) FROM retry_schedules WHERE retry_date > ?",
+        (today.isoformat(),)
+    ).fetchone()[0]
+
+    commits = db.conn.commits
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        db.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    query_s = timings.get("query_s", 0.0)
+    return {
+        "benchmark": "scheduler",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "schedules": args.schedules,
+        "users": meta["users"],
+        "retries": args.retries,
+        "history": args.history,
+        "cap": args.cap,
+        "notifier": os.environ["KAFKA_NOTIFIER"],
+        "sent": sent,
+        "deferred": deferred,
+        "seed_s": round(seed_s, 4),
+        "query_s": round(query_s, 4),
+        "dispatch_s": round(job_s - query_s, 4),
+        "job_s": round(job_s, 4),
+        "commits": commits,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카프카 스케줄러 합성 부하 벤치마크")
+    parser.add_argument("--schedules", type=int, default=10000, help="합성 스케줄 수 (기본: 10000)")
+    parser.add_argument("--schedules-per-user", type=int, default=5, help="사용자당 스케줄 수 (기본: 5)")
+    parser.add_argument("--retries", type=int, default=None, help="오늘 재발송 수 (기본: 스케줄의 5%%)")
+    parser.add_argument("--history", type=int, default=None, help="과거 발송 이력 수 (기본: 스케줄의 2배)")
+    parser.add_argument("--cap", type=int, default=4, help="사용자별 일일 알림 한도 (기본: 4)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본: 42)")
+    parser.add_argument("--output", type=str, help="결과를 JSON Lines로 누적할 파일")
+    args = parser.parse_args()
+
+    if args.retries is None:
+        args.retries = args.schedules // 20
+    if args.history is None:
+        args.history = args.schedules * 2
+
+    result = run(args)
+    line = json.dumps(result, ensure_ascii=False)
+
+    # stdout: JSON 한 줄 (기계 판독용), stderr: 요약
+    print(line)
+    print(f"📊 {result['schedules']}개 스케줄 → {result['sent']}개 발송, {result['deferred']}개 이월 | "
+          f"query {result['query_s']}s, dispatch {result['dispatch_s']}s, "
+          f"commits {result['commits']}, RSS {result['peak_rss_kb'] // 1024}MB", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
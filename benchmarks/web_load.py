@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# benchmarks/web_load.py
+"""
+퀴즈 웹 서버 부하 테스트 (합성 데이터, 오프라인)
+
+임시 DB에 합성 스케줄/문제를 채운 뒤 퀴즈 페이지(show_quiz)와 답안 제출(submit_quiz)을
+여러 스레드에서 동시에 요청하여 측정합니다.
+
+모드:
+- client (기본): Flask 테스트 클라이언트로 같은 프로세스에서 요청 (앱/DB 코드 비용)
+- server: 로컬 웹 서버를 띄우고 HTTP로 요청 (--workers > 0이면 gunicorn 운영 모드)
+
+측정 항목:
+- latency_ms: 엔드포인트별/전체 p50, p95, p99 (밀리초)
+- throughput_rps: 초당 처리 요청 수
+- lock_errors: SQLite 잠금 대기 오류 수 ("database is locked")
+- errors: 그 밖의 실패 수 (5xx, 연결 오류)
+
+사용법:
+    python3 benchmarks/web_load.py --schedules 5000 --requests 5000 --concurrency 8
+    python3 benchmarks/web_load.py --mode server --workers 4 --threads 4 --concurrency 32
+
+    # 결과를 JSON Lines 파일에 누적 (릴리스 간 비교용)
+    python3 benchmarks/web_load.py --output bench_output.txt
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.scheduler_bench import INTERVALS, git_revision, peak_rss_kb
+
+QUESTIONS_PER_SCHEDULE = 4
+ANSWERS = "ABCD"
+
+
+def seed(db_path: str, args) -> dict:
+    """
+    합성 데이터 생성 (스케줄 + 문제별 행)
+
+    - 스케줄은 모두 지식형, 사용자당 args.schedules_per_user개
+    - 스케줄마다 4지선다 문제 QUESTIONS_PER_SCHEDULE개 (정답은 무작위)
+    """
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        from agent.database import ScheduleDB
+        db = ScheduleDB(db_path)
+
+    rng = random.Random(args.seed)
+    users = max(1, args.schedules // args.schedules_per_user)
+    base = date.today() - timedelta(days=1)
+    dates = json.dumps([(base + timedelta(days=d)).isoformat() for d in INTERVALS])
+    summary = "요약: 어제 배운 내용을 다시 떠올려 보세요. " * 4
+
+    db.conn.executemany('''
+        INSERT INTO schedules
+        (user_id, summary, category, schedule_dates, styled_content, persona_style, persona_count)
+        VALUES (?, ?, '지식형', ?, '', '친근한 친구', 0)
+    ''', ((f"user_{i % users}", summary, dates) for i in range(args.schedules)))
+
+    options = json.dumps(["A) 보기 1", "B) 보기 2", "C) 보기 3", "D) 보기 4"], ensure_ascii=False)
+    db.conn.executemany('''
+        INSERT INTO quiz_questions (schedule_id, idx, text, options, answer)
+        VALUES (?, ?, ?, ?, ?)
+    ''', ((schedule_id, idx, f"{schedule_id}번 스케줄의 {idx}번 문제는?", options, rng.choice(ANSWERS))
+          for schedule_id in range(1, args.schedules + 1)
+          for idx in range(1, QUESTIONS_PER_SCHEDULE + 1)))
+
+    db.conn.commit()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        db.close()
+    return {"users": users}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """지연 시간(초) 목록 → {count, p50, p95, p99, max} (밀리초)"""
+    values = sorted(samples)
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50) * 1000, 3),
+        "p95": round(percentile(values, 95) * 1000, 3),
+        "p99": round(percentile(values, 99) * 1000, 3),
+        "max": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+def plan_requests(args) -> List[Tuple[str, int, int, str]]:
+    """요청 목록 미리 생성: (endpoint, schedule_id, notification_index, answer)"""
+    rng = random.Random(args.seed + 1)
+    plan = []
+    for _ in range(args.requests):
+        schedule_id = rng.randint(1, args.schedules)
+        notification_index = rng.randint(1, 4)
+        endpoint = "submit_quiz" if rng.random() < args.submit_ratio else "show_quiz"
+        plan.append((endpoint, schedule_id, notification_index, rng.choice(ANSWERS)))
+    return plan
+
+
+def _is_lock_error(error: BaseException) -> bool:
+    return isinstance(error, sqlite3.OperationalError) and "locked" in str(error)
+
+
+def drive(plan: List[Tuple], concurrency: int, make_sender: Callable) -> Dict:
+    """
+    요청 목록을 concurrency개 스레드로 나눠 실행
+
+    Args:
+        make_sender: 스레드마다 호출 → send(endpoint, schedule_id, notification_index, answer)
+                     send는 HTTP 상태 코드를 반환하고, 실패하면 예외를 던짐
+
+    Returns:
+        {"latencies": {endpoint: [초, ...]}, "statuses": {code: 수}, "errors", "lock_errors", "elapsed_s"}
+    """
+    latencies = {"show_quiz": [], "submit_quiz": []}
+    statuses: Dict[str, int] = {}
+    counters = {"errors": 0, "lock_errors": 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker(chunk):
+        send = make_sender()
+        local_latencies = {"show_quiz": [], "submit_quiz": []}
+        local_statuses: Dict[str, int] = {}
+        local_counters = {"errors": 0, "lock_errors": 0}
+        barrier.wait()
+
+        for endpoint, schedule_id, notification_index, answer in chunk:
+            start = time.perf_counter()
+            try:
+                status = send(endpoint, schedule_id, notification_index, answer)
+            except Exception as e:
+                local_counters["lock_errors" if _is_lock_error(e) else "errors"] += 1
+                continue
+            local_latencies[endpoint].append(time.perf_counter() - start)
+            local_statuses[str(status)] = local_statuses.get(str(status), 0) + 1
+            if status >= 500:
+                local_counters["errors"] += 1
+
+        with lock:
+            for endpoint, values in local_latencies.items():
+                latencies[endpoint].extend(values)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+            for name, count in local_counters.items():
+                counters[name] += count
+
+    threads = [threading.Thread(target=worker, args=(plan[i::concurrency],)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {"latencies": latencies, "statuses": statuses, "elapsed_s": elapsed, **counters}
+
+
+def run_client(plan: List[Tuple], args) -> Dict:
+    """Flask 테스트 클라이언트로 실행 (같은 프로세스, 스레드별 클라이언트)"""
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        from web.app import app
+
+    # 처리되지 않은 예외(잠금 오류 등)를 500 대신 그대로 받아서 분류
+    app.config["PROPAGATE_EXCEPTIONS"] = True
+
+    def make_sender():
+        client = app.test_client()
+
+        def send(endpoint, schedule_id, notification_index, answer):
+            if endpoint == "show_quiz":
+                return client.get(f"/quiz/{schedule_id}/{notification_index}").status_code
+            return client.post(f"/quiz/{schedule_id}/{notification_index}/submit",
+                               json={"answer": answer}).status_code
+        return send
+
+    # 제출마다 출력되는 안내 메시지는 결과와 섞이지 않도록 숨김
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        return drive(plan, args.concurrency, make_sender)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_server(plan: List[Tuple], args, workdir: str) -> Dict:
+    """로컬 웹 서버를 띄우고 HTTP로 실행 (서버 로그의 잠금 오류도 셈)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    port = _free_port()
+    command = [sys.executable, os.path.join(ROOT, "web", "web_server.py"),
+               "--host", "127.0.0.1", "--port", str(port), "--no-debug"]
+    if args.workers > 0:
+        command += ["--production", "--workers", str(args.workers), "--threads", str(args.threads)]
+
+    log_path = os.path.join(workdir, "server.log")
+    with open(log_path, "w") as log:
+        server = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, env=os.environ.copy())
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                if requests.get(base_url + "/", timeout=1).status_code == 200:
+                    break
+            except requests.ConnectionError:
+                pass
+            if server.poll() is not None or time.time() > deadline:
+                raise RuntimeError(f"웹 서버 시작 실패 (로그: {log_path})")
+            time.sleep(0.2)
+
+        def make_sender():
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+            def send(endpoint, schedule_id, notification_index, answer):
+                url = f"{base_url}/quiz/{schedule_id}/{notification_index}"
+                if endpoint == "show_quiz":
+                    return session.get(url, timeout=args.timeout).status_code
+                return session.post(url + "/submit", json={"answer": answer},
+                                    timeout=args.timeout).status_code
+            return send
+
+        result = drive(plan, args.concurrency, make_sender)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    # 서버에서 난 잠금 오류는 500으로 응답되므로 로그에서 세어 분리
+    with open(log_path, encoding="utf-8", errors="replace") as f:
+        server_lock_errors = sum(line.count("database is locked") for line in f)
+    result["lock_errors"] += server_lock_errors
+    result["errors"] = max(0, result["errors"] - server_lock_errors)
+    return result
+
+
+def run(args) -> dict:
+    """부하 테스트 1회 실행 후 결과 딕셔너리 반환"""
+    workdir = tempfile.mkdtemp(prefix="kafka_web_load_")
+    os.environ["KAFKA_DB_PATH"] = os.path.join(workdir, "web_load.db")
+
+    try:
+        start = time.perf_counter()
+        meta = seed(os.environ["KAFKA_DB_PATH"], args)
+        seed_s = time.perf_counter() - start
+
+        plan = plan_requests(args)
+        if args.mode == "server":
+            result = run_server(plan, args, workdir)
+        else:
+            result = run_client(plan, args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    all_latencies = result["latencies"]["show_quiz"] + result["latencies"]["submit_quiz"]
+    completed = len(all_latencies)
+    return {
+        "benchmark": "web_load",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "server" else 0,
+        "threads": args.threads if args.mode == "server" and args.workers > 0 else 0,
+        "concurrency": args.concurrency,
+        "schedules": args.schedules,
+        "users": meta["users"],
+        "requests": args.requests,
+        "submit_ratio": args.submit_ratio,
+        "completed": completed,
+        "seed_s": round(seed_s, 4),
+        "elapsed_s": round(result["elapsed_s"], 4),
+        "throughput_rps": round(completed / result["elapsed_s"], 1) if result["elapsed_s"] else 0.0,
+        "latency_ms": {
+            "all": summarize(all_latencies),
+            "show_quiz": summarize(result["latencies"]["show_quiz"]),
+            "submit_quiz": summarize(result["latencies"]["submit_quiz"]),
+        },
+        "statuses": dict(sorted(result["statuses"].items())),
+        "errors": result["errors"],
+        "lock_errors": result["lock_errors"],
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카프카 퀴즈 웹 서버 합성 부하 테스트")
+    parser.add_argument("--mode", choices=["client", "server"], default="client",
+                        help="client: 테스트 클라이언트 (기본), server: 로컬 웹 서버에 HTTP 요청")
+    parser.add_argument("--schedules", type=int, default=5000, help="합성 스케줄 수 (기본: 5000)")
+    parser.add_argument("--schedules-per-user", type=int, default=5, help="사용자당 스케줄 수 (기본: 5)")
+    parser.add_argument("--requests", type=int, default=5000, help="총 요청 수 (기본: 5000)")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 스레드 수 (기본: 8)")
+    parser.add_argument("--submit-ratio", type=float, default=0.3, help="답안 제출 비율 (기본: 0.3)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="server 모드 gunicorn 워커 수 (0이면 개발 서버, 기본: 0)")
+    parser.add_argument("--threads", type=int, default=4, help="server 모드 워커당 스레드 수 (기본: 4)")
+    parser.add_argument("--timeout", type=float, default=30, help="server 모드 요청 제한 시간 (초, 기본: 30)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본: 42)")
+    parser.add_argument("--output", type=str, help="결과를 JSON Lines로 누적할 파일")
+    args = parser.parse_args()
+
+    result = run(args)
+    line = json.dumps(result, ensure_ascii=False)
+
+    # stdout: JSON 한 줄 (기계 판독용), stderr: 요약
+    print(line)
+    overall = result["latency_ms"]["all"]
+    print(f"📊 {result['mode']} × {result['concurrency']} → {result['completed']}/{result['requests']}개 요청, "
+          f"{result['throughput_rps']} req/s | p50 {overall['p50']}ms, p95 {overall['p95']}ms, "
+          f"p99 {overall['p99']}ms | 오류 {result['errors']}, 잠금 {result['lock_errors']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
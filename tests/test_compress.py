@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+LLM 입력 압축 (보일러플레이트 제거 + TextRank) 테스트 스크립트
+
+사용법:
+    python3 tests/test_compress.py
+"""
+
+import os
+
+from agent.utils.compress import (
+    compress_for_prompt,
+    extract_key_sentences,
+    get_compression_stats,
+    reset_compression_stats,
+    strip_boilerplate,
+)
+from agent.utils.tokens import estimate_tokens
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+
+
+def _read(*parts: str) -> str:
+    with open(os.path.join(FIXTURES, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_strip_boilerplate():
+    """메뉴/이미지/관련 기사/저작권 줄은 제거, 본문 문단과 본문 속 링크 글자는 유지"""
+    print("🧪 테스트 1: 보일러플레이트 제거")
+    markdown = _read("jina", "ko_news.md")
+    body = _read("jina", "ko_news.txt").partition("\n\n")[2]
+    stripped = strip_boilerplate(markdown)
+
+    for paragraph in body.strip().split("\n\n"):
+        assert paragraph in stripped, paragraph[:30]
+    for noise in ("https://", "](", "관련 기사", "무단 전재", "좋아요", "로그인", "URL Source"):
+        assert noise not in stripped, noise
+    assert stripped.count("'MAI 뉴스 에이전트' 선보인다") == 1  # Title: 줄과 # 제목 중복 제거
+
+    kept = strip_boilerplate("자세한 내용은 [보도자료](https://a.com/p)에서 확인할 수 있다.\n\n광고 시장이 커졌다.\n\n광고")
+    assert kept == "자세한 내용은 보도자료에서 확인할 수 있다.\n\n광고 시장이 커졌다."
+    print(f"✅ {estimate_tokens(markdown)} → {estimate_tokens(stripped)} 토큰")
+
+
+def test_extract_key_sentences():
+    """예산 안에서 핵심 문장을 원래 순서로 (첫 문장 포함), 문장부호 없는 자막도 처리"""
+    print("\n🧪 테스트 2: TextRank 핵심 문장")
+    article = _read("articles", "ko_news_paragraphs.txt")
+    sentences = [s for s in article.replace("\n\n", " ").split(". ") if s]
+    summary = extract_key_sentences(article, 250)
+
+    assert estimate_tokens(summary) <= 250
+    assert summary.startswith("매일경제, 세계 언론사 최초")
+    assert "MAI 뉴스 에이전트" in summary
+    positions = [article.index(part) for part in summary.replace("\n\n", " ").split(". ") if part in article]
+    assert positions == sorted(positions) and len(positions) > 2
+
+    transcript = " ".join(article.replace(".", " ").split() * 20)
+    compressed = extract_key_sentences(transcript, 300)
+    assert 0 < estimate_tokens(compressed) <= 300
+    print(f"✅ {len(sentences)}문장 중 {len(positions)}개 선택, 자막 {estimate_tokens(transcript)} → "
+          f"{estimate_tokens(compressed)} 토큰")
+
+
+def test_compression_stats():
+    """노드별 원래/보낸 토큰 누적"""
+    print("\n🧪 테스트 3: 노드별 통계")
+    reset_compression_stats()
+    markdown = _read("jina", "ko_news.md")
+    compress_for_prompt(markdown, "classify", max_tokens=300)
+    compress_for_prompt(markdown, "classify", max_tokens=300)
+
+    stats = get_compression_stats()["classify"]
+    assert stats["calls"] == 2
+    assert stats["sent_tokens"] <= 600 and stats["reduction"] > 0.5
+    reset_compression_stats()
+    print(f"✅ classify 감소율 {stats['reduction']:.0%}")
+
+
+def main():
+    """메인 실행 함수"""
+    test_strip_boilerplate()
+    test_extract_key_sentences()
+    test_compression_stats()
+    print("\n🎉 입력 압축 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
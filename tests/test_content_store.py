@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+원문 저장소 (contents 테이블, 해시 중복 제거 + 압축) 테스트 스크립트
+
+사용법:
+    python3 tests/test_content_store.py
+"""
+
+import os
+import tempfile
+
+import agent.database as database
+from agent.database import ScheduleDB
+from agent.migrate import backfill_contents
+from agent.utils.minhash import band_buckets, minhash_signature
+
+ARTICLE = "인공지능은 인간의 학습 능력을 컴퓨터로 구현한 기술입니다.\n\n" * 50
+# 근사 중복 색인에 들어갈 만큼 단어 묶음이 다양한 입력 텍스트
+LEGACY_TEXT = " ".join(f"{i}번째 문단은 인공지능 학습의 다른 측면을 설명합니다." for i in range(30))
+
+
+def _temp_db(name: str) -> ScheduleDB:
+    return ScheduleDB(os.path.join(tempfile.mkdtemp(), name))
+
+
+def test_save_and_read():
+    """같은 원문은 1행만 저장, 압축해서 저장하고 조회 시 자동으로 풀림"""
+    print("🧪 테스트 1: 저장/조회")
+    db = _temp_db("test_contents.db")
+
+    try:
+        first = db.save_schedule("u1", ["2026-02-13"], "메시지", "친근한 친구", 0,
+                                 url="https://example.com/a", content=ARTICLE)
+        second = db.save_schedule("u2", ["2026-02-13"], "메시지", "친근한 친구", 0, content=ARTICLE)
+        text_only = db.save_schedule("u1", ["2026-02-13"], "메시지", "친근한 친구", 0)
+
+        row = db.conn.execute("SELECT COUNT(*), MAX(codec), SUM(size_bytes), SUM(LENGTH(data)) FROM contents").fetchone()
+        count, codec, size, stored = row
+        assert count == 1 and codec == database.get_content_codec()
+        assert size == len(ARTICLE.encode("utf-8")) and stored < size // 10
+
+        assert db.get_schedule_by_id(first, include_content=True)["content"] == ARTICLE
+        assert db.get_schedule_by_id(second)["content_id"] == db.get_schedule_by_id(first)["content_id"]
+        assert db.get_schedule_by_id(text_only, include_content=True)["content"] is None
+
+        # 기본 조회는 원문을 풀지 않음 (퀴즈/알림 경로)
+        assert "content" not in db.get_schedule_by_id(first)
+        assert db.get_content(db.get_schedule_by_id(first)["content_id"]) == ARTICLE
+    finally:
+        db.close()
+
+    print(f"✅ {size}바이트 → {stored}바이트 ({codec}), 2개 스케줄이 1행 공유")
+
+
+def test_migrate_inline_contents():
+    """url 컬럼에 들어 있던 입력 텍스트를 contents로 옮기고 url은 비움 (링크는 그대로)"""
+    print("\n🧪 테스트 2: 마이그레이션")
+    db = _temp_db("test_contents_migrate.db")
+
+    try:
+        legacy_id = db.save_schedule("u1", ["2026-02-13"], "메시지", "친근한 친구", 0, url=LEGACY_TEXT)
+        link_id = db.save_schedule("u1", ["2026-02-13"], "메시지", "친근한 친구", 0, url="https://example.com/a")
+
+        assert backfill_contents(db, dry_run=True)["migrated"] == 1
+        assert db.get_schedule_by_id(legacy_id)["url"] == LEGACY_TEXT
+
+        stats = backfill_contents(db)
+        legacy = db.get_schedule_by_id(legacy_id, include_content=True)
+        assert (stats["scanned"], stats["migrated"], stats["fingerprinted"]) == (1, 1, 1), stats
+        assert legacy["url"] is None and legacy["content"] == LEGACY_TEXT
+
+        # 옮긴 텍스트는 근사 중복 색인에서도 찾을 수 있음
+        candidates = db.get_fingerprint_candidates(band_buckets(minhash_signature(LEGACY_TEXT)))
+        assert [candidate["schedule_id"] for candidate in candidates] == [legacy_id]
+        assert db.get_schedule_by_id(link_id)["url"] == "https://example.com/a"
+        assert backfill_contents(db)["scanned"] == 0
+    finally:
+        db.close()
+
+    print(f"✅ 스케줄 {legacy_id}의 입력 텍스트 이동")
+
+
+def main():
+    """메인 실행 함수"""
+    test_save_and_read()
+    test_migrate_inline_contents()
+    print("\n🎉 원문 저장소 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+사용자별 일일 알림 한도 테스트 스크립트
+
+사용법:
+    python3 tests/test_daily_cap.py
+"""
+
+import os
+import tempfile
+
+from agent.database import ScheduleDB
+
+TODAY = "2026-02-13"
+TOMORROW = "2026-02-14"
+
+
+def _make_db() -> ScheduleDB:
+    """테스트용 임시 DB"""
+    path = os.path.join(tempfile.mkdtemp(), "test_cap.db")
+    return ScheduleDB(path)
+
+
+def test_cap_ranks_retries_first_and_defers_overflow():
+    """한도 초과분은 다음 날로 이월되고, 재발송이 먼저 발송됨"""
+    print("🧪 테스트 1: 일일 한도 및 이월")
+    db = _make_db()
+
+    heavy = [
+        db.save_schedule("heavy", [TODAY, "2026-02-16"], "내용", "친근한 친구", 0)
+        for _ in range(6)
+    ]
+    light = db.save_schedule("light", [TODAY], "내용", "친근한 친구", 0)
+    retry_id = db.add_retry_schedule(heavy[0], 2, TODAY, retry_count=1)
+
+    deferred = db.defer_overflow_notifications(TODAY, TOMORROW, daily_cap=4)
+    assert deferred == 3
+
+    # 여러 번 호출해도 추가 이월 없음
+    assert db.defer_overflow_notifications(TODAY, TOMORROW, daily_cap=4) == 0
+
+    due = db.get_due_notifications(TODAY, daily_cap=4)
+    heavy_due = [item for item in due if item["user_id"] == "heavy"]
+    assert len(heavy_due) == 4
+    assert heavy_due[0]["retry_id"] == retry_id
+    assert [item["schedule_id"] for item in due if item["user_id"] == "light"] == [light]
+
+    # 이월된 정규 알림은 다음 날 재발송 우선순위로 조회됨
+    tomorrow_due = db.get_due_notifications(TOMORROW, daily_cap=4)
+    assert len(tomorrow_due) == 3
+    assert all(item["retry_count"] == 0 for item in tomorrow_due)
+
+    # 이월은 오답 재시도 횟수로 세지 않음
+    assert db.get_retry_count(tomorrow_due[0]["schedule_id"], 1) == 0
+
+    db.close()
+    print(f"✅ 오늘 {len(due)}개 발송, {deferred}개 이월")
+
+
+def test_sent_notifications_count_toward_cap():
+    """오늘 이미 발송한 알림도 한도에 포함"""
+    print("\n🧪 테스트 2: 이미 발송된 알림 반영")
+    db = _make_db()
+
+    ids = [db.save_schedule("u1", [TODAY], "내용", "친근한 친구", 0) for _ in range(5)]
+    for schedule_id in ids[:3]:
+        db.log_notification(schedule_id, 1, TODAY, is_success=True)
+
+    due = db.get_due_notifications(TODAY, daily_cap=4)
+    assert len(due) == 1
+    assert due[0]["daily_rank"] == 4
+
+    db.close()
+    print("✅ 발송 완료 3개 + 남은 한도 1개")
+
+
+def main():
+    """메인 실행 함수"""
+    test_cap_ranks_retries_first_and_defers_overflow()
+    test_sent_notifications_count_toward_cap()
+    print("\n🎉 일일 한도 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+알림 발송 시간대(버킷 분산) 테스트 스크립트
+
+사용법:
+    python3 tests/test_delivery.py
+"""
+
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import agent.scheduler.jobs as jobs
+
+from agent.scheduler.delivery import (
+    assign_slot,
+    collect_slots,
+    current_slot,
+    parse_window,
+    window_slots,
+)
+
+
+def test_window_slots():
+    """시간대 → 버킷 목록"""
+    print("🧪 테스트 1: 시간대 버킷 계산")
+
+    assert parse_window("07:30-08:30") == (450, 510)
+    slots = window_slots("07:30-08:30", 5)
+    assert slots[0] == "07:30" and slots[-1] == "08:25"
+    assert len(slots) == 12
+
+    # 기본값(08:00-08:00)은 기존처럼 08:00 한 번
+    assert window_slots("08:00-08:00", 5) == ["08:00"]
+
+    # 격자에 맞지 않는 시작 시각은 다음 격자로
+    assert window_slots("07:32-07:50", 5)[0] == "07:35"
+
+    for bad in ["0730-0830", "09:00-08:00", "25:00-26:00"]:
+        try:
+            parse_window(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+    print(f"✅ {len(slots)}개 버킷: {slots[0]} ~ {slots[-1]}")
+
+
+def test_assign_slot_is_deterministic_and_spread():
+    """같은 알림은 항상 같은 버킷, 전체적으로는 고르게 분산"""
+    print("\n🧪 테스트 2: 결정적 배정 및 분산")
+
+    window = "07:30-08:30"
+    assert assign_slot(42, 1, window) == assign_slot(42, 1, window)
+
+    counts = Counter(assign_slot(sid, idx, window) for sid in range(1, 3001) for idx in range(1, 5))
+    assert set(counts) == set(window_slots(window))
+
+    expected = 12000 / 12
+    assert max(counts.values()) < expected * 1.2
+    assert min(counts.values()) > expected * 0.8
+
+    print(f"✅ 버킷당 {min(counts.values())}~{max(counts.values())}건 (기대값 {expected:.0f})")
+
+
+def test_current_and_collected_slots():
+    """현재 버킷 계산 및 사용자별 시간대 합치기"""
+    print("\n🧪 테스트 3: 현재 버킷 / 버킷 합치기")
+
+    assert current_slot(5, datetime(2026, 2, 13, 7, 34, 59)) == "07:30"
+    assert current_slot(15, datetime(2026, 2, 13, 8, 0, 1)) == "08:00"
+
+    slots = collect_slots(["08:00-08:00", "07:50-08:10"], 10)
+    assert slots == ["07:50", "08:00"]
+
+    print(f"✅ 합쳐진 버킷: {slots}")
+
+
+def test_delayed_bucket_sends_its_own_slot():
+    """버킷 작업마다 자기 버킷을 인자로 받고, 늦게 실행돼도 그 버킷을 발송"""
+    print("\n🧪 테스트 4: 늦게 실행된 버킷")
+    from agent.scheduler.scheduler import MISFIRE_GRACE_SECONDS, KafkaScheduler
+
+    scheduler = KafkaScheduler(delivery_window="07:30-08:30", bucket_minutes=15)
+    scheduler._add_bucket_jobs(window_slots("07:30-08:30", 15))
+    bucket_jobs = scheduler.scheduler.get_jobs()
+    assert sorted(job.kwargs["slot"] for job in bucket_jobs) == ["07:30", "07:45", "08:00", "08:15"]
+    assert all(job.misfire_grace_time == MISFIRE_GRACE_SECONDS for job in bucket_jobs)
+
+    # 07:30 버킷이 10분 늦게 시작된 상황 (기본 유예 1초였다면 버려졌을 실행)
+    sent = []
+    ran = threading.Event()
+    saved_send = jobs.send_daily_notifications
+
+    def fake_send(**kwargs):
+        sent.append(kwargs)
+        ran.set()
+
+    jobs.send_daily_notifications = fake_send
+    try:
+        scheduler.scheduler.start(paused=True)
+        scheduler.is_running = True
+        late = datetime.now().astimezone() - timedelta(minutes=10)
+        for job in bucket_jobs:
+            job.modify(next_run_time=late if job.kwargs["slot"] == "07:30" else None)
+        scheduler.scheduler.resume()
+        assert ran.wait(5)
+    finally:
+        scheduler.shutdown()
+        jobs.send_daily_notifications = saved_send
+
+    assert [call["slot"] for call in sent] == ["07:30"]
+    assert sent[0]["bucket_minutes"] == 15
+    print(f"✅ 10분 늦은 실행 → 버킷 {sent[0]['slot']} 발송")
+
+
+def main():
+    """메인 실행 함수"""
+    test_window_slots()
+    test_assign_slot_is_deterministic_and_spread()
+    test_current_and_collected_slots()
+    test_delayed_bucket_sends_its_own_slot()
+    print("\n🎉 발송 시간대 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+다이제스트 알림 테스트 스크립트
+
+사용법:
+    python3 tests/test_digest.py
+"""
+
+import json
+import os
+import tempfile
+from datetime import date
+
+import agent.database as database
+from agent.database import ScheduleDB
+from agent.notification.backends import register_notifier
+
+QUESTIONS = [
+    {"text": f"질문 {i}", "options": ["A) 가", "B) 나", "C) 다", "D) 라"], "answer": "B"}
+    for i in range(1, 5)
+]
+
+
+def _use_temp_db() -> ScheduleDB:
+    """get_db()가 임시 DB를 반환하도록 교체"""
+    db = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_digest.db"))
+    database._db_instance = db
+    return db
+
+
+def test_digest_groups_user_notifications():
+    """사용자별 알림 여러 개 → 다이제스트 1건, 발송 기록은 알림별로 남음"""
+    print("🧪 테스트 1: 사용자별 다이제스트 발송")
+    from agent.scheduler.jobs import send_daily_notifications
+
+    previous = database._db_instance
+    db = _use_temp_db()
+    today = date.today().isoformat()
+    path = os.path.join(tempfile.mkdtemp(), "digest.jsonl")
+    os.environ["KAFKA_NOTIFIER_JSONL_PATH"] = path
+    register_notifier("digest-test", "agent.notification.backends:JsonlNotifier")
+    os.environ["KAFKA_NOTIFIER"] = "digest-test"
+
+    try:
+        ids = [
+            db.save_schedule("reader", [today, "2099-01-01"], "내용", "친근한 친구", 0,
+                             summary="요약", questions=QUESTIONS)
+            for _ in range(3)
+        ]
+        single = db.save_schedule("solo", [today], "생각해보기", "친근한 친구", 0, category="힐링형")
+
+        send_daily_notifications(digest=True)
+
+        with open(path, encoding="utf-8") as f:
+            sent = [json.loads(line) for line in f]
+
+        assert len(sent) == 2
+        digest = next(n for n in sent if n["user_id"] == "reader")
+        assert [item["schedule_id"] for item in digest["items"]] == ids
+        assert digest["url"].endswith("/digest?items=" + ",".join(f"{sid}:1" for sid in ids))
+        assert next(n for n in sent if n["user_id"] == "solo")["schedule_id"] == single
+
+        logged = db.conn.execute(
+            "SELECT COUNT(*) FROM notifications WHERE is_success = 1"
+        ).fetchone()[0]
+        assert logged == 4
+        assert db.get_schedule_by_id(single)["status"] == "completed"
+    finally:
+        os.environ.pop("KAFKA_NOTIFIER")
+        os.environ.pop("KAFKA_NOTIFIER_JSONL_PATH")
+        database._db_instance = previous
+        db.conn.close()
+
+    print(f"✅ 알림 4개 → {len(sent)}건 발송")
+
+
+def test_digest_page():
+    """다이제스트 페이지에 퀴즈 폼이 항목별로 표시됨"""
+    print("\n🧪 테스트 2: 다이제스트 페이지")
+    from web.app import app, parse_digest_items
+
+    previous = database._db_instance
+    db = _use_temp_db()
+
+    try:
+        first = db.save_schedule("reader", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                 summary="요약", questions=QUESTIONS)
+        second = db.save_schedule("reader", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                  summary="요약", questions=QUESTIONS)
+
+        assert parse_digest_items(f"{first}:1,{second}:3,{first}:1") == [(first, 1), (second, 3)]
+
+        client = app.test_client()
+        response = client.get(f"/digest?items={first}:1,{second}:3")
+        html = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert html.count('class="quiz-form"') == 2
+        assert "질문 3" in html
+
+        assert client.get("/digest?items=abc").status_code == 400
+        assert client.get("/digest?items=9999:1").status_code == 404
+    finally:
+        database._db_instance = previous
+        db.conn.close()
+
+    print("✅ 퀴즈 2개 표시")
+
+
+def main():
+    """메인 실행 함수"""
+    test_digest_groups_user_notifications()
+    test_digest_page()
+    print("\n🎉 다이제스트 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
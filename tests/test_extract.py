@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+기사 본문 추출 테스트 스크립트
+
+저장된 HTML에서 본문/제목 추출, 로컬 HTTP 서버로 직접 수집 → Jina Reader 대체 경로를 확인합니다.
+
+사용법:
+    python3 tests/test_extract.py
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agent.utils import utils
+from agent.utils.extract import extract_article
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "benchmarks", "fixtures", "articles")
+
+
+def _fixture(name: str):
+    with open(os.path.join(FIXTURE_DIR, name + ".html"), encoding="utf-8") as f:
+        html = f.read()
+    with open(os.path.join(FIXTURE_DIR, name + ".txt"), encoding="utf-8") as f:
+        title, _, text = f.read().partition("\n\n")
+    return html, title.strip(), text.strip()
+
+
+class _Site:
+    """기사 페이지(/article, EUC-KR), 빈 페이지(/empty), 가짜 Jina Reader(/jina/...)"""
+
+    def __init__(self, article_html: str):
+        self.paths = []
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                site.paths.append(self.path)
+                if self.path.startswith("/jina/"):
+                    body, content_type = "Title: Jina\n\nJina 본문".encode("utf-8"), "text/plain; charset=utf-8"
+                elif self.path == "/article":
+                    # Content-Type에 charset이 없고 <meta>에만 선언된 옛날 사이트
+                    html = article_html.replace('<meta charset="utf-8">', '<meta charset="euc-kr">')
+                    body, content_type = html.encode("euc-kr"), "text/html"
+                else:
+                    body, content_type = b"<html><body><div id='app'></div></body></html>", "text/html"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_extract_fixtures():
+    """메뉴/광고/관련 기사/댓글을 빼고 본문과 제목만 추출"""
+    print("🧪 테스트 1: 저장된 HTML 추출")
+    for name in ("ko_news_paragraphs", "en_blog"):
+        html, title, text = _fixture(name)
+        article = extract_article(html)
+        assert article["title"] == title, article["title"]
+        assert article["text"] == text, article["text"][:300]
+
+    # <br>로 나뉜 본문: 문단은 모두 포함하고 사이드바 인기 기사는 제외
+    html, title, text = _fixture("ko_news_br")
+    article = extract_article(html)
+    assert article["title"] == title
+    assert article["text"].startswith(text)
+    assert "인기 기사" not in article["text"]
+    print("✅ 3개 HTML 본문/제목 추출")
+
+
+def test_local_then_jina_fallback():
+    """직접 수집이 되면 Jina를 거치지 않고, 본문이 없는 페이지만 Jina로 대체"""
+    print("\n🧪 테스트 2: 로컬 추출 → Jina 대체")
+    html, title, text = _fixture("ko_news_paragraphs")
+    site = _Site(html)
+    saved = utils.JINA_READER_URL, os.environ.get("KAFKA_FETCH_CACHE")
+    utils.JINA_READER_URL = f"{site.url}/jina/"
+    os.environ["KAFKA_FETCH_CACHE"] = "0"
+
+    try:
+        content = utils.get_article_content(f"{site.url}/article")
+        assert content == f"Title: {title}\n\n{text}", content[:200]
+        assert site.paths == ["/article"], site.paths
+
+        content = utils.get_article_content(f"{site.url}/empty")
+        assert content == "Title: Jina\n\nJina 본문"
+        assert site.paths[1:] == ["/empty", f"/jina/{site.url}/empty"], site.paths
+    finally:
+        utils.JINA_READER_URL = saved[0]
+        if saved[1] is None:
+            os.environ.pop("KAFKA_FETCH_CACHE", None)
+        else:
+            os.environ["KAFKA_FETCH_CACHE"] = saved[1]
+        site.close()
+
+    print(f"✅ 요청 경로 {site.paths}")
+
+
+def main():
+    """메인 실행 함수"""
+    test_extract_fixtures()
+    test_local_then_jina_fallback()
+    print("\n🎉 본문 추출 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+콘텐츠 수집 캐시 테스트 스크립트
+
+로컬 HTTP 서버로 캐시 적중, 유효 기간 만료 후 ETag 재검증(304), 영구 보관(자막)을 확인합니다.
+
+사용법:
+    python3 tests/test_fetch_cache.py
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agent.utils.fetch_cache import FetchCache
+from agent.utils.http import create_session, fetch
+
+ETAG = '"v1"'
+
+
+class _Site:
+    """ETag를 주고 If-None-Match가 맞으면 304로 답하는 테스트 사이트"""
+
+    def __init__(self):
+        self.statuses = []
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.headers.get("If-None-Match") == ETAG:
+                    site.statuses.append(304)
+                    self.send_response(304)
+                    self.send_header("ETag", ETAG)
+                    self.end_headers()
+                    return
+
+                body = "카프카 기사 본문".encode("utf-8")
+                site.statuses.append(200)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", ETAG)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/article"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_hit_and_revalidate():
+    """첫 요청은 수집, 유효 기간 안은 네트워크 없이, 만료 후에는 304 재검증"""
+    print("🧪 테스트 1: 캐시 적중 + ETag 재검증")
+    directory = tempfile.mkdtemp()
+    site = _Site()
+    session = create_session(max_retries=0)
+    cache = FetchCache(directory)
+    fetcher = lambda validators: fetch(site.url, headers=validators, session=session)
+
+    try:
+        assert cache.get_or_fetch("article:x", fetcher, ttl=60) == "카프카 기사 본문"
+        assert cache.get_or_fetch("article:x", fetcher, ttl=60) == "카프카 기사 본문"
+        assert site.statuses == [200], site.statuses
+
+        # 유효 기간 만료 → If-None-Match 전송 → 304 → 저장된 본문 사용
+        cache.store("article:x", "카프카 기사 본문", ttl=-1, etag=ETAG)
+        assert cache.get_or_fetch("article:x", fetcher, ttl=60) == "카프카 기사 본문"
+        assert site.statuses == [200, 304], site.statuses
+        assert cache.is_fresh(cache.load("article:x"))
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["revalidated"]) == (1, 1, 1), stats
+        assert stats["hit_rate"] == 33.3, stats
+    finally:
+        session.close()
+        site.close()
+        shutil.rmtree(directory)
+
+    print(f"✅ 요청 {site.statuses}, 통계 {stats}")
+
+
+def test_permanent_entry():
+    """영구 항목(자막)은 다시 가져오지 않고, 빈 본문은 저장하지 않음"""
+    print("\n🧪 테스트 2: 영구 보관 + 빈 본문")
+    directory = tempfile.mkdtemp()
+    calls = []
+
+    def fetcher(validators):
+        calls.append(validators)
+        return {"status": 200, "text": "자막 텍스트"}
+
+    try:
+        cache = FetchCache(directory)
+        cache.get_or_fetch("youtube:abcdefghijk", fetcher, ttl=None)
+        # 새 인스턴스(다른 프로세스)에서도 디스크에서 읽음
+        assert FetchCache(directory).get_or_fetch("youtube:abcdefghijk", fetcher, ttl=None) == "자막 텍스트"
+        assert len(calls) == 1
+        assert cache.load("youtube:abcdefghijk")["expires_at"] is None
+
+        assert cache.get_or_fetch("article:empty", lambda v: {"status": 200, "text": "  "}, ttl=60) == "  "
+        assert cache.load("article:empty") is None
+
+        files = [name for _, _, names in os.walk(directory) for name in names if name.endswith(".gz")]
+        assert len(files) == 1, files
+    finally:
+        shutil.rmtree(directory)
+
+    print("✅ 자막은 1번만 수집, 빈 본문은 저장 안 함")
+
+
+def main():
+    """메인 실행 함수"""
+    test_hit_and_revalidate()
+    test_permanent_entry()
+    print("\n🎉 수집 캐시 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+퀴즈 페이지 HTTP 캐시 / 압축 테스트 스크립트
+
+사용법:
+    python3 tests/test_http_cache.py
+"""
+
+import gzip
+import os
+import re
+import tempfile
+
+import agent.database as database
+from agent.database import ScheduleDB
+
+QUESTIONS = [
+    {"text": f"질문 {i}", "options": ["A) 가", "B) 나"], "answer": "A"}
+    for i in range(1, 4)
+]
+
+
+def test_quiz_page_not_modified():
+    """같은 퀴즈 페이지 재요청 → 렌더링 없이 304"""
+    print("🧪 테스트 1: 퀴즈 페이지 ETag / 304")
+    from web.app import app, quiz_cache
+
+    previous = database._db_instance
+    db = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_http_cache.db"))
+    database._db_instance = db
+
+    try:
+        quiz_cache.clear()
+        schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                       summary="요약 " * 200, questions=QUESTIONS)
+        client = app.test_client()
+
+        first = client.get(f"/quiz/{schedule_id}/1", headers={"Accept-Encoding": "gzip"})
+        assert first.status_code == 200
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert first.headers["Last-Modified"]
+        etag = first.headers["ETag"]
+        assert "질문 1" in gzip.decompress(first.get_data()).decode("utf-8")
+
+        again = client.get(f"/quiz/{schedule_id}/1", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and not again.get_data()
+
+        # 다른 차수(다른 문제)는 다른 ETag
+        other = client.get(f"/quiz/{schedule_id}/2", headers={"If-None-Match": etag})
+        assert other.status_code == 200 and other.headers["ETag"] != etag
+    finally:
+        database._db_instance = previous
+        db.conn.close()
+
+    print(f"✅ ETag {etag} → 304")
+
+
+def test_static_assets_immutable():
+    """정적 파일 URL에 내용 해시 → 1년 immutable 캐시"""
+    print("\n🧪 테스트 2: 정적 파일 캐시")
+    from web.app import app
+
+    with app.test_request_context():
+        from flask import url_for
+        url = url_for("static", filename="js/quiz.js")
+    assert re.search(r"\?v=[0-9a-f]{12}$", url)
+
+    client = app.test_client()
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.cache_control.immutable and response.cache_control.max_age == 365 * 24 * 60 * 60
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert b"quiz-form" in gzip.decompress(response.get_data())
+
+    # 해시가 다르면 (이전 버전 URL) 장기 캐시하지 않음
+    stale = client.get("/static/js/quiz.js?v=000000000000")
+    assert not stale.cache_control.immutable
+
+    print(f"✅ {url}")
+
+
+def test_site_version_checked_periodically():
+    """ETag 계산 때 정적 폴더 검사는 확인 간격마다 1번, 파일이 바뀌면 다음 확인 때 반영"""
+    print("\n🧪 테스트 3: 정적 파일 버전 캐시")
+    from flask import Flask
+    import web.http_cache as http_cache
+
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, "static"))
+    os.makedirs(os.path.join(root, "templates"))
+    for path in ("static/app.js", "templates/page.html"):
+        with open(os.path.join(root, path), "w") as f:
+            f.write("v1")
+    app = Flask("site_version_test", root_path=root)
+
+    walks = []
+    real_walk = os.walk
+
+    def counting_walk(*args, **kwargs):
+        walks.append(args[0])
+        return real_walk(*args, **kwargs)
+
+    http_cache.os.walk = counting_walk
+    os.environ["KAFKA_WEB_ASSET_CHECK_SECONDS"] = "60"
+    try:
+        etags = {http_cache.page_etag(app, "page.html", {"n": 1}) for _ in range(100)}
+        assert len(etags) == 1 and len(walks) == 1
+
+        with open(os.path.join(root, "static", "app.js"), "w") as f:
+            f.write("v2 (크기도 다름)")
+        assert http_cache.page_etag(app, "page.html", {"n": 1}) in etags  # 확인 간격 안
+
+        os.environ["KAFKA_WEB_ASSET_CHECK_SECONDS"] = "0"
+        assert http_cache.page_etag(app, "page.html", {"n": 1}) not in etags
+        assert len(walks) == 2
+    finally:
+        http_cache.os.walk = real_walk
+        del os.environ["KAFKA_WEB_ASSET_CHECK_SECONDS"]
+
+    print("✅ ETag 100번 계산 → 정적 폴더 검사 1번")
+
+
+def test_last_modified_follows_changes():
+    """문제 행/정적 파일이 바뀌면 Last-Modified도 늦어짐 → If-Modified-Since만 보내도 200"""
+    print("\n🧪 테스트 4: Last-Modified")
+    from flask import Flask
+    from web.app import app, quiz_cache
+    import web.http_cache as http_cache
+
+    previous = database._db_instance
+    path = os.path.join(tempfile.mkdtemp(), "test_last_modified.db")
+    db = ScheduleDB(path)
+    database._db_instance = db
+    other = None
+
+    try:
+        quiz_cache.clear()
+        schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                       summary="요약", questions=QUESTIONS)
+        # 예전에 만든 스케줄 (정적 파일보다 오래됨)
+        db.conn.execute("UPDATE schedules SET created_at = '2020-01-01 00:00:00' WHERE id = ?", (schedule_id,))
+        db.conn.execute("UPDATE quiz_versions SET updated_at = '2020-01-01 00:00:00' WHERE schedule_id = ?",
+                        (schedule_id,))
+        db.conn.commit()
+        client = app.test_client()
+
+        first = client.get(f"/quiz/{schedule_id}/1")
+        last_modified = first.headers["Last-Modified"]
+        assert client.get(f"/quiz/{schedule_id}/1",
+                          headers={"If-Modified-Since": last_modified}).status_code == 304
+
+        # 다른 프로세스(마이그레이션 등)가 문제 행을 바꿈
+        other = ScheduleDB(path)
+        changed = [{"text": "바뀐 질문", "options": ["A) 가", "B) 나"], "answer": "B"}]
+        other.save_quiz_question_rows([{"schedule_id": schedule_id, "questions": changed}])
+
+        again = client.get(f"/quiz/{schedule_id}/1", headers={"If-Modified-Since": last_modified})
+        assert again.status_code == 200
+        assert "바뀐 질문" in again.get_data(as_text=True)
+        assert again.headers["Last-Modified"] != last_modified
+    finally:
+        database._db_instance = previous
+        db.conn.close()
+        if other:
+            other.conn.close()
+
+    # 정적 파일 수정 시각도 반영
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, "static"))
+    os.makedirs(os.path.join(root, "templates"))
+    for path in ("static/app.js", "templates/page.html"):
+        with open(os.path.join(root, path), "w") as f:
+            f.write("v1")
+        os.utime(os.path.join(root, path), (1_600_000_000, 1_600_000_000))
+    site = Flask("last_modified_test", root_path=root)
+
+    os.environ["KAFKA_WEB_ASSET_CHECK_SECONDS"] = "0"
+    try:
+        before = http_cache.page_last_modified(site, "page.html", ["2020-01-01 00:00:00"])
+        os.utime(os.path.join(root, "static", "app.js"), (1_700_000_000, 1_700_000_000))
+        after = http_cache.page_last_modified(site, "page.html", ["2020-01-01 00:00:00"])
+    finally:
+        del os.environ["KAFKA_WEB_ASSET_CHECK_SECONDS"]
+    assert before.timestamp() == 1_600_000_000 and after.timestamp() == 1_700_000_000
+
+    print(f"✅ 문제 변경 → {again.headers['Last-Modified']}")
+
+
+def main():
+    """메인 실행 함수"""
+    test_quiz_page_not_modified()
+    test_static_assets_immutable()
+    test_site_version_checked_periodically()
+    test_last_modified_follows_changes()
+    print("\n🎉 HTTP 캐시 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+콘텐츠 수집 HTTP 세션 테스트 스크립트
+
+로컬 HTTP 서버를 띄워 연결 재사용, 429/5xx 재시도, 본문 크기 제한을 확인합니다.
+
+사용법:
+    python3 tests/test_http_fetch.py
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agent.utils.http import ContentTooLargeError, create_session, fetch_text
+
+
+class _Site:
+    """테스트용 사이트 (처음 fail_first개 요청은 503, /big은 큰 본문)"""
+
+    def __init__(self, fail_first: int = 0, retry_after: str = "0"):
+        self.requests = 0
+        self.retry_after = retry_after
+        self.connections = set()
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with site.lock:
+                    site.requests += 1
+                    site.connections.add(self.client_address)
+                    fail = site.requests <= site.fail_first
+
+                if fail:
+                    self.send_response(503)
+                    self.send_header("Retry-After", site.retry_after)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body = ("가" * 100_000 if self.path == "/big" else "카프카 기사 본문").encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")  # charset 없음 → UTF-8
+                if self.path != "/big":
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    # 길이를 모르는 스트리밍 응답 (chunked)
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for start in range(0, len(body), 8192):
+                        chunk = body[start:start + 8192]
+                        self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_keep_alive_and_retry():
+    """503 재시도 후 성공, 이후 요청은 같은 연결 재사용"""
+    print("🧪 테스트 1: 재시도 + 연결 재사용")
+    site = _Site(fail_first=2)
+    session = create_session(max_retries=3, backoff=0)
+
+    try:
+        texts = [fetch_text(f"{site.url}/article/{i}", session=session) for i in range(5)]
+        assert texts == ["카프카 기사 본문"] * 5
+        assert site.requests == 7  # 503 2번 + 성공 5번
+        assert len(site.connections) == 1
+    finally:
+        session.close()
+        site.close()
+
+    print(f"✅ 요청 {site.requests}번, 연결 {len(site.connections)}개")
+
+
+def test_retry_exhausted():
+    """재시도를 다 써도 실패하면 예외"""
+    print("\n🧪 테스트 2: 재시도 소진")
+    site = _Site(fail_first=100)
+    session = create_session(max_retries=2, backoff=0)
+
+    try:
+        fetch_text(f"{site.url}/article", session=session)
+        raise AssertionError("예외가 발생해야 합니다")
+    except Exception as e:
+        assert "503" in str(e)
+    finally:
+        session.close()
+        site.close()
+
+    assert site.requests == 3
+    print(f"✅ 요청 {site.requests}번 후 실패")
+
+
+def test_byte_cap():
+    """본문이 최대 크기를 넘으면 읽기 중단"""
+    print("\n🧪 테스트 3: 본문 크기 제한")
+    site = _Site()
+    session = create_session(max_retries=0)
+
+    try:
+        assert len(fetch_text(f"{site.url}/big", session=session)) == 100_000
+        try:
+            fetch_text(f"{site.url}/big", session=session, max_bytes=50_000)
+            raise AssertionError("ContentTooLargeError가 발생해야 합니다")
+        except ContentTooLargeError:
+            pass
+    finally:
+        session.close()
+        site.close()
+
+    print("✅ 300KB 본문, 50KB 제한 → 중단")
+
+
+def test_retry_after_is_capped():
+    """서버가 Retry-After를 길게 보내도 max_retry_wait까지만 대기"""
+    print("\n🧪 테스트 4: Retry-After 상한")
+    site = _Site(fail_first=1, retry_after="3600")
+    session = create_session(max_retries=2, backoff=0, max_retry_wait=0.2)
+
+    try:
+        started = time.monotonic()
+        assert fetch_text(f"{site.url}/article", session=session) == "카프카 기사 본문"
+        elapsed = time.monotonic() - started
+    finally:
+        session.close()
+        site.close()
+
+    assert site.requests == 2
+    assert 0.2 <= elapsed < 5
+    print(f"✅ Retry-After 3600초 → {elapsed:.2f}초 대기 후 재시도")
+
+
+def main():
+    """메인 실행 함수"""
+    test_keep_alive_and_retry()
+    test_retry_exhausted()
+    test_byte_cap()
+    test_retry_after_is_capped()
+    print("\n🎉 HTTP 수집 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+긴 입력 토큰 예산 + map-reduce 요약 테스트 스크립트 (LLM은 가짜 객체로 대체)
+
+사용법:
+    python3 tests/test_long_input.py
+"""
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+# agent.nodes는 import 시 LLM 클라이언트를 만듦 (이 테스트는 LLM을 호출하지 않음)
+os.environ.setdefault("UPSTAGE_API_KEY", "test")
+
+import agent.nodes.nodes as nodes
+from agent.utils.tokens import estimate_tokens, get_input_budget, split_by_tokens
+
+PARAGRAPH = "인공지능은 데이터에서 규칙을 배우는 기술입니다. Machine learning is a subfield of AI."
+
+
+class FakeLLM:
+    """invoke/batch 호출을 기록하는 가짜 LLM (batch는 동시 실행 수도 기록)"""
+
+    def __init__(self):
+        self.invoked = []
+        self.batched = []
+        self.max_running = 0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        self.invoked.append(prompt)
+        if "[SECTION]" in prompt:
+            with self._lock:
+                self._running += 1
+                self.max_running = max(self.max_running, self._running)
+            time.sleep(0.02)
+            with self._lock:
+                self._running -= 1
+            return SimpleNamespace(content="- 구간 노트")
+        return SimpleNamespace(content="요약 1. 요약 2. 요약 3.")
+
+    def batch(self, prompts, config=None):
+        from langchain_core.runnables import RunnableLambda
+
+        self.batched.append(len(prompts))
+        return RunnableLambda(self.invoke).batch(prompts, config=config)
+
+
+def test_tokens_and_split():
+    """토큰 추정, 입력 예산, 경계 단위 분할 (순서/내용 유지)"""
+    print("🧪 테스트 1: 토큰 추정 + 분할")
+    assert estimate_tokens("인공지능") == 4
+    assert estimate_tokens("machine learning") == 4
+
+    text = "\n\n".join(f"{i}번 문단. {PARAGRAPH}" for i in range(200))
+    sections = split_by_tokens(text, 500)
+    assert len(sections) > 1
+    assert all(estimate_tokens(section) <= 500 for section in sections)
+    assert "\n\n".join(sections) == text
+
+    # 경계가 없는 긴 덩어리도 한도 안으로
+    assert all(estimate_tokens(part) <= 300 for part in split_by_tokens("가" * 1000, 300))
+
+    os.environ["KAFKA_MAX_INPUT_TOKENS"] = "1000"
+    try:
+        assert get_input_budget("프롬프트") == 1000
+    finally:
+        del os.environ["KAFKA_MAX_INPUT_TOKENS"]
+    print(f"✅ {estimate_tokens(text)} 토큰 → {len(sections)}개 구간")
+
+
+def test_map_reduce_synthesize():
+    """짧은 본문은 1회 호출, 예산을 넘는 본문은 구간 병렬 요약 후 최종 1회"""
+    print("\n🧪 테스트 2: map-reduce 요약")
+    saved_llm = nodes.llm
+    fake = nodes.llm = FakeLLM()
+    os.environ.update({"KAFKA_MAX_INPUT_TOKENS": "2000", "KAFKA_SECTION_TOKENS": "500",
+                       "KAFKA_LLM_CONCURRENCY": "3"})
+
+    try:
+        short = nodes.synthesize_node({"input_text": PARAGRAPH})
+        assert short["draft_summary"] == "요약 1. 요약 2. 요약 3."
+        assert (len(fake.invoked), fake.batched) == (1, [])
+
+        fake.invoked.clear()
+        long_text = "\n\n".join(f"{i}번 문단. {PARAGRAPH}" for i in range(300))
+        result = nodes.synthesize_node({"input_text": long_text})
+        sections = fake.batched[0]
+        final_prompt = fake.invoked[-1]
+
+        assert result["draft_summary"] == "요약 1. 요약 2. 요약 3."
+        assert sections > 3 and len(fake.invoked) == sections + 1
+        assert f"[{sections}/{sections}]" in final_prompt and long_text not in final_prompt
+        assert 1 < fake.max_running <= 3
+    finally:
+        nodes.llm = saved_llm
+        for name in ("KAFKA_MAX_INPUT_TOKENS", "KAFKA_SECTION_TOKENS", "KAFKA_LLM_CONCURRENCY"):
+            del os.environ[name]
+
+    print(f"✅ {sections}개 구간 (최대 동시 {fake.max_running}개) → 최종 요약 1회")
+
+
+def main():
+    """메인 실행 함수"""
+    test_tokens_and_split()
+    test_map_reduce_synthesize()
+    print("\n🎉 긴 입력 요약 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
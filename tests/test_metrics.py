@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+웹 서버 요청 지표(/metrics) 테스트 스크립트
+
+사용법:
+    python3 tests/test_metrics.py
+"""
+
+import sys
+import threading
+
+from web.metrics import LATENCY_BUCKETS, RequestMetrics
+
+
+def test_thread_counters_aggregated():
+    """여러 스레드(종료된 스레드 포함)의 카운터가 조회 때 합산됨"""
+    print("🧪 테스트 1: 스레드별 카운터 합산")
+    metrics = RequestMetrics()
+
+    def work():
+        for i in range(100):
+            metrics.add_in_flight(1)
+            metrics.observe_request("/quiz/<id>", "GET", 200, 0.003 * (i % 10), 0.0002, 1)
+            metrics.add_in_flight(-1)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    work()  # 새 스레드가 없어도 현재 스레드 카운터 포함
+    last = threading.Thread(target=lambda: metrics.observe_request("/", "GET", 404, 0.001, 0.0, 0))
+    last.start()
+    last.join()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"][("/quiz/<id>", "GET", "200")] == 900
+    assert snapshot["queries"]["/quiz/<id>"] == 900
+    assert snapshot["in_flight"] == 0
+    assert snapshot["requests"][("/", "GET", "404")] == 1
+
+    row = snapshot["latency"][("/quiz/<id>", "GET")]
+    assert sum(row[:len(LATENCY_BUCKETS) + 1]) == row[-1] == 900
+
+    print(f"✅ 스레드 9개 → 요청 {row[-1]}개")
+
+
+def test_metrics_endpoint():
+    """/metrics Prometheus 텍스트 형식"""
+    print("\n🧪 테스트 2: /metrics 응답")
+    from web.app import app
+
+    client = app.test_client()
+    client.get("/")
+    client.get("/does-not-exist")
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert 'kafka_http_requests_total{route="/",method="GET",status="200"}' in text
+    assert 'route="unmatched",method="GET",status="404"' in text
+    assert 'kafka_http_request_duration_seconds_bucket{route="/",method="GET",le="+Inf"}' in text
+    assert "# TYPE kafka_http_request_db_seconds histogram" in text
+    assert "kafka_quiz_cache_hits_total" in text
+
+    print(f"✅ {len(text.splitlines())}줄")
+
+
+def test_scrape_while_recording():
+    """다른 스레드가 새 라우트를 계속 기록하는 중에 합산해도 에러/반쯤 바뀐 히스토그램 없음"""
+    print("\n🧪 테스트 3: 기록 중 합산")
+    metrics = RequestMetrics()
+
+    def work(worker):
+        for i in range(5000):
+            metrics.observe_request(f"/route/{worker}/{i}", "GET", 200 + i % 3, 0.002, 0.0001, 1)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    saved_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-4)  # 스레드 전환을 잦게 해서 합산 도중 새 라우트가 기록되도록
+    scrapes = 0
+    try:
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            for row in metrics.snapshot()["latency"].values():
+                assert sum(row[:len(LATENCY_BUCKETS) + 1]) == row[-1]
+            scrapes += 1
+    finally:
+        for thread in threads:
+            thread.join()
+        sys.setswitchinterval(saved_interval)
+
+    assert sum(metrics.snapshot()["requests"].values()) == 20000
+    assert "/route/3/4999" in metrics.render()
+    print(f"✅ 기록 중 {scrapes}번 합산")
+
+
+def main():
+    """메인 실행 함수"""
+    test_thread_counters_aggregated()
+    test_metrics_endpoint()
+    test_scrape_while_recording()
+    print("\n🎉 요청 지표 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
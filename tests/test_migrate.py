@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+레거시 퀴즈 마이그레이션 테스트 스크립트
+
+사용법:
+    python3 tests/test_migrate.py
+"""
+
+import json
+import os
+import tempfile
+
+from agent.database import ScheduleDB
+from agent.migrate import backfill_quiz_questions
+
+JSON_CONTENT = (
+    '[요약]\nAI는 인공지능입니다.\n\n[퀴즈]\n'
+    '{"questions": [{"text": "AI란?", "options": ["A) 인공지능", "B) 자연지능"], "answer": "A"}]}'
+)
+TEXT_CONTENT = (
+    '[요약]\n딥러닝 요약\n[퀴즈]\n'
+    'Q1. 딥러닝의 기반은?\nA) 신경망\nB) 결정트리\n정답: A\n'
+    'Q2. 머신러닝은 AI의?\nA) 상위 분야\nB) 하위 분야\n정답: B\n'
+)
+
+
+def test_backfill_quiz_questions():
+    """레거시 스케줄의 퀴즈를 questions 컬럼으로 옮기고 실패 수를 보고"""
+    print("🧪 테스트 1: 레거시 퀴즈 마이그레이션")
+    db = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_migrate.db"))
+
+    json_id = db.save_schedule("u1", ["2026-02-13"], JSON_CONTENT, "친근한 친구", 0)
+    text_id = db.save_schedule("u1", ["2026-02-13"], TEXT_CONTENT, "친근한 친구", 0, summary="기존 요약")
+    broken_id = db.save_schedule("u1", ["2026-02-13"], "퀴즈 없는 본문", "친근한 친구", 0)
+    db.save_schedule("u1", ["2026-02-13"], "힐링", "친근한 친구", 0, category="힐링형")
+
+    # dry-run은 저장하지 않음
+    preview = backfill_quiz_questions(db, batch_size=2, dry_run=True)
+    assert preview["scanned"] == 3
+    assert len(db.get_schedules_without_questions()) == 3
+
+    stats = backfill_quiz_questions(db, batch_size=2)
+    assert (stats["scanned"], stats["migrated"], stats["failed"]) == (3, 2, 1)
+    assert stats["failed_ids"] == [broken_id]
+
+    json_row = db.get_schedule_by_id(json_id)
+    assert json.loads(json_row["questions"])[0]["text"] == "AI란?"
+    assert json_row["summary"] == "AI는 인공지능입니다."
+
+    text_row = db.get_schedule_by_id(text_id)
+    assert [q["answer"] for q in json.loads(text_row["questions"])] == ["A", "B"]
+    assert text_row["summary"] == "기존 요약"
+
+    assert db.get_schedule_by_id(broken_id)["questions"] == "[]"
+
+    # 다시 실행하면 스캔할 스케줄 없음
+    assert backfill_quiz_questions(db)["scanned"] == 0
+
+    db.close()
+    print(f"✅ {stats['migrated']}개 변환, {stats['failed']}개 실패")
+
+
+def main():
+    """메인 실행 함수"""
+    test_backfill_quiz_questions()
+    print("\n🎉 마이그레이션 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
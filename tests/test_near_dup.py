@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+근사 중복 콘텐츠 감지 (MinHash + LSH) 테스트 스크립트
+
+사용법:
+    python3 tests/test_near_dup.py
+"""
+
+import os
+import random
+import tempfile
+
+# agent.nodes는 import 시 LLM 클라이언트를 만듦 (이 테스트는 LLM을 호출하지 않음)
+os.environ.setdefault("UPSTAGE_API_KEY", "test")
+
+import agent.database as database
+import agent.notification.popup as popup
+from agent.database import ScheduleDB
+from agent.nodes import near_duplicate_node, schedule_node
+from agent.utils.minhash import estimate_similarity, minhash_signature
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "benchmarks", "fixtures", "articles")
+
+
+def _article(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _with_noise(text: str, ratio: float) -> str:
+    """단어 ratio 비율을 다른 단어로 바꾼 본문 (재배포 기사의 편집 흔적 흉내)"""
+    rng = random.Random(7)
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(len(words) * ratio)):
+        words[i] = f"편집{i}"
+    return " ".join(words)
+
+
+def test_signature_similarity():
+    """조금 다른 본문은 유사도가 높고, 다른 글은 낮고, 짧은 글은 서명 없음"""
+    print("🧪 테스트 1: 서명 유사도")
+    article = _article("ko_news_paragraphs.txt")
+    signature = minhash_signature(article)
+
+    wire_copy = minhash_signature("[연합뉴스 제공] " + article + "\n무단 전재 및 재배포 금지")
+    noisy = minhash_signature(_with_noise(article, 0.02))
+    other = minhash_signature(_article("en_blog.txt"))
+
+    assert estimate_similarity(signature, wire_copy) >= 0.9
+    assert estimate_similarity(signature, noisy) >= 0.7
+    assert estimate_similarity(signature, other) < 0.2
+    assert minhash_signature("너무 짧은 글") is None
+    print(f"✅ 재배포 {estimate_similarity(signature, wire_copy):.2f}, "
+          f"2% 편집 {estimate_similarity(signature, noisy):.2f}, "
+          f"다른 글 {estimate_similarity(signature, other):.2f}")
+
+
+def test_near_duplicate_node():
+    """처리한 본문을 색인하고, 거의 같은 본문은 policy에 따라 재사용"""
+    print("\n🧪 테스트 2: 색인 + 재사용")
+    saved_db = database._db_instance
+    saved_policy = os.environ.get("KAFKA_NEAR_DUP_POLICY")
+    saved_popup = popup.schedule_popup_notifications
+    popup.schedule_popup_notifications = lambda **kwargs: None  # 실제 팝업 발송 안 함
+    db = database._db_instance = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_near_dup.db"))
+    count = lambda: db.conn.execute("SELECT COUNT(*) FROM content_fingerprints").fetchone()[0]
+
+    try:
+        article = _article("ko_news_paragraphs.txt")
+        os.environ["KAFKA_NEAR_DUP_POLICY"] = "reuse"
+
+        # 처음 보는 본문: 서명만 만들고 통과 → schedule_node가 스케줄 저장 후 색인
+        first = near_duplicate_node({"input_text": article})
+        assert first["near_duplicate_of"] is None and first["content_signature"]
+        schedule_node({**first, "url": "https://a.example.com/1", "summary": '{"Summary": "요약"}',
+                       "styled_content": "페르소나 메시지", "persona_count": 2})
+        source_id = db.conn.execute("SELECT MAX(id) FROM schedules").fetchone()[0]
+        assert count() == 1
+
+        # 다른 사이트에 옮긴 같은 기사 → 저장된 결과 재사용
+        reused = near_duplicate_node({"input_text": "다른 매체 재배포\n\n" + _with_noise(article, 0.02)})
+        assert reused["near_duplicate_of"] == source_id
+        assert reused["styled_content"] == "페르소나 메시지"
+        assert reused["similarity"] >= 0.7
+
+        # ignore면 확인하지 않음, 다른 글은 후보가 없음
+        os.environ["KAFKA_NEAR_DUP_POLICY"] = "ignore"
+        assert near_duplicate_node({"input_text": article})["near_duplicate_of"] is None
+        os.environ["KAFKA_NEAR_DUP_POLICY"] = "reuse"
+        assert near_duplicate_node({"input_text": _article("en_blog.txt")})["near_duplicate_of"] is None
+
+        # 재사용한 결과는 다시 색인하지 않음 (원본이 이미 색인됨)
+        schedule_node(dict(reused))
+        assert count() == 1
+    finally:
+        db.close()
+        database._db_instance = saved_db
+        popup.schedule_popup_notifications = saved_popup
+        if saved_policy is None:
+            os.environ.pop("KAFKA_NEAR_DUP_POLICY", None)
+        else:
+            os.environ["KAFKA_NEAR_DUP_POLICY"] = saved_policy
+
+    print(f"✅ 스케줄 {source_id} 재사용 (유사도 {reused['similarity']:.2f})")
+
+
+def main():
+    """메인 실행 함수"""
+    test_signature_similarity()
+    test_near_duplicate_node()
+    print("\n🎉 근사 중복 감지 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+알림 백엔드 테스트 스크립트
+
+사용법:
+    python3 tests/test_notifier_backends.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from agent.notification.backends import (
+    JsonlNotifier,
+    NotifierBackend,
+    get_notifier,
+    register_notifier,
+)
+
+
+def _notification(schedule_id: int, index: int = 1) -> dict:
+    """테스트용 알림"""
+    return {
+        "schedule_id": schedule_id,
+        "notification_index": index,
+        "user_id": "u1",
+        "target_date": "2026-02-13",
+        "title": "🎓 카프카 1차 복습 알림",
+        "message": "📝 오늘의 퀴즈가 준비되었습니다!",
+        "url": f"http://localhost:8080/quiz/{schedule_id}/{index}",
+        "timeout": 30,
+        "total_notifications": 4,
+    }
+
+
+class _FlakyNotifier(NotifierBackend):
+    """짝수 schedule_id만 실패하는 테스트 백엔드"""
+
+    name = "flaky"
+
+    def send(self, notification):
+        if notification["schedule_id"] % 2 == 0:
+            raise RuntimeError("발송 실패")
+
+
+def test_registry():
+    """이름으로 백엔드 선택, 인스턴스 재사용, 알 수 없는 이름은 ValueError"""
+    print("🧪 테스트 1: 백엔드 레지스트리")
+
+    null = get_notifier("null")
+    assert null is get_notifier("null")
+    assert null.send_batch([_notification(1), _notification(2)]) == [None, None]
+
+    register_notifier("flaky", f"{__name__}:_FlakyNotifier")
+    results = get_notifier("flaky").send_batch([_notification(i) for i in range(1, 5)])
+    assert [error is None for error in results] == [True, False, True, False]
+
+    try:
+        get_notifier("carrier-pigeon")
+        assert False, "ValueError가 발생해야 함"
+    except ValueError:
+        pass
+
+    print("✅ null / 사용자 등록 백엔드 / 잘못된 이름 처리")
+
+
+def test_jsonl_batch():
+    """JSONL 싱크는 배치 전체를 한 번에 기록"""
+    print("\n🧪 테스트 2: JSONL 싱크")
+
+    path = os.path.join(tempfile.mkdtemp(), "notifications.jsonl")
+    notifier = JsonlNotifier(path)
+    assert notifier.send_batch([_notification(i) for i in range(1, 4)]) == [None] * 3
+    notifier.send(_notification(9, 2))
+
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+
+    assert [row["schedule_id"] for row in rows] == [1, 2, 3, 9]
+    assert rows[-1]["notification_index"] == 2
+    assert all("sent_at" in row for row in rows)
+
+    print(f"✅ {len(rows)}줄 기록")
+
+
+def test_popup_import_is_lazy():
+    """알림 모듈 import만으로는 데스크톱 라이브러리를 로드하지 않음"""
+    print("\n🧪 테스트 3: 데스크톱 라이브러리 지연 로딩")
+
+    code = (
+        "import sys, agent.notification, agent.scheduler.jobs; "
+        "print(sorted(m for m in ('plyer', 'pync', 'winotify') if m in sys.modules))"
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        text=True
+    )
+    assert output.strip().splitlines()[-1] == "[]"
+
+    print("✅ import 시 pync/winotify/plyer 미로드")
+
+
+def main():
+    """메인 실행 함수"""
+    test_registry()
+    test_jsonl_batch()
+    test_popup_import_is_lazy()
+    print("\n🎉 알림 백엔드 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+웹 서버 운영 모드 테스트 스크립트
+
+사용법:
+    python3 tests/test_production.py
+"""
+
+import os
+import tempfile
+
+import agent.database as database
+from web.production import build_options
+
+
+def test_build_options():
+    """운영 모드 gunicorn 설정"""
+    print("🧪 테스트 1: gunicorn 설정")
+
+    options = build_options("0.0.0.0", 8080, workers=3, threads=8)
+    assert options["bind"] == "0.0.0.0:8080"
+    assert (options["workers"], options["threads"]) == (3, 8)
+    assert options["worker_class"] == "gthread"
+    assert options["preload_app"] is True
+    assert callable(options["post_fork"]) and callable(options["worker_exit"])
+
+    print(f"✅ 워커 {options['workers']}개 × 스레드 {options['threads']}개")
+
+
+def test_db_reopened_after_fork():
+    """다른 프로세스에서 만든 DB 연결은 재사용하지 않음"""
+    print("\n🧪 테스트 2: 워커별 DB 연결")
+
+    previous = (database._db_instance, database._db_pid)
+    os.environ["KAFKA_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "test_fork.db")
+
+    try:
+        database.reset_db(close=False)
+        first = database.get_db()
+        assert database.get_db() is first
+
+        # fork로 물려받은 상황 흉내 (부모 프로세스 PID)
+        database._db_pid = os.getpid() + 1
+        second = database.get_db()
+        assert second is not first
+        assert database._db_pid == os.getpid()
+
+        journal_mode = second.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+
+        database.reset_db()
+        first.conn.close()
+    finally:
+        os.environ.pop("KAFKA_DB_PATH")
+        database._db_instance, database._db_pid = previous
+
+    print("✅ fork 후 새 연결 (WAL 모드)")
+
+
+def main():
+    """메인 실행 함수"""
+    test_build_options()
+    test_db_reopened_after_fork()
+    print("\n🎉 운영 모드 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
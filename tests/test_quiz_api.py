@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+퀴즈 JSON API 테스트 스크립트
+
+사용법:
+    python3 tests/test_quiz_api.py
+"""
+
+import os
+import tempfile
+
+import agent.database as database
+from agent.database import ScheduleDB
+
+QUESTIONS = [
+    {"text": f"질문 {i}", "options": ["A) 가", "B) 나"], "answer": "B"}
+    for i in range(1, 4)
+]
+
+
+def test_quiz_api():
+    """퀴즈 API: 정답 제외, 없는 스케줄/퀴즈는 404 / 사용자별 복습 목록"""
+    print("🧪 테스트 1: /api/quiz, /api/user/<user_id>/due")
+    from web.app import app, quiz_cache
+
+    previous = database._db_instance
+    db = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_api.db"))
+    database._db_instance = db
+
+    try:
+        quiz_cache.clear()
+        first = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                 summary="요약", questions=QUESTIONS)
+        second = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0, questions=QUESTIONS)
+        healing = db.save_schedule("u1", ["2026-02-13"], "생각", "친근한 친구", 0, category="힐링형")
+        other = db.save_schedule("u2", ["2026-02-13"], "내용", "친근한 친구", 0, questions=QUESTIONS)
+        for schedule_id, notification_index in [(first, 1), (first, 2), (second, 1), (healing, 1), (other, 1)]:
+            db.log_notification(schedule_id, notification_index, "2026-02-13", True)
+        db.log_notification(second, 2, "2026-02-13", False)   # 발송 실패 → 제외
+
+        client = app.test_client()
+
+        quiz = client.get(f"/api/quiz/{first}?n=2").get_json()
+        assert quiz["question"] == {"idx": 2, "text": "질문 2", "options": ["A) 가", "B) 나"]}
+        assert quiz["persona_style"] == "다정한 선배" and quiz["summary"] == "요약"
+        assert client.get(f"/api/quiz/{healing}").status_code == 404
+        assert client.get("/api/quiz/9999").status_code == 404
+
+        # 1차 퀴즈를 맞히면 목록에서 빠짐
+        client.post(f"/quiz/{first}/1/submit", json={"answer": "B"})
+        client.post(f"/quiz/{second}/1/submit", json={"answer": "A"})   # 오답 → 남음
+
+        due = client.get("/api/user/u1/due").get_json()
+        keys = [(item["schedule_id"], item["notification_index"]) for item in due["items"]]
+        assert keys == [(first, 2), (second, 1)]
+        assert due["items"][0]["url"] == f"/quiz/{first}/2"
+        assert client.get("/api/user/nobody/due").get_json()["items"] == []
+
+        # 퀴즈 페이지에 user_id (다음 문제 미리 가져오기용)
+        page = client.get(f"/quiz/{first}/2").get_data(as_text=True)
+        assert 'data-user-id="u1"' in page
+    finally:
+        database._db_instance = previous
+        db.conn.close()
+
+    print(f"✅ 복습 목록 {keys}")
+
+
+def main():
+    """메인 실행 함수"""
+    test_quiz_api()
+    print("\n🎉 퀴즈 API 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
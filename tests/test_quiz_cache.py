@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+퀴즈 데이터 캐시 테스트 스크립트
+
+사용법:
+    python3 tests/test_quiz_cache.py
+"""
+
+import os
+import tempfile
+
+import agent.database as database
+from agent.database import ScheduleDB
+from web.quiz_cache import QuizCache
+
+QUESTIONS = [
+    {"text": f"질문 {i}", "options": ["A) 가", "B) 나", "C) 다", "D) 라"], "answer": "ABCD"[i % 4]}
+    for i in range(4)
+]
+
+
+def test_lru_eviction():
+    """최대 크기를 넘으면 가장 오래 안 쓴 항목부터 제거"""
+    print("🧪 테스트 1: LRU 제거")
+    cache = QuizCache(maxsize=2)
+    loads = []
+
+    def loader(schedule_id, notification_index):
+        loads.append((schedule_id, notification_index))
+        return {"schedule_id": schedule_id}
+
+    cache.get(1, 1, loader)
+    cache.get(2, 1, loader)
+    cache.get(1, 1, loader)   # (1, 1)을 최근 사용으로
+    cache.get(3, 1, loader)   # (2, 1) 제거
+    cache.get(1, 1, loader)
+    cache.get(2, 1, loader)
+
+    assert loads == [(1, 1), (2, 1), (3, 1), (2, 1)]
+    assert cache.stats()["size"] == 2
+    assert cache.get(99, 1, lambda *_: None) is None
+
+    # 스케줄 단위 무효화
+    cache.invalidate(2)
+    cache.get(2, 1, loader)
+    assert loads[-1] == (2, 1) and len(loads) == 5
+
+    print(f"✅ {cache.stats()}")
+
+
+def test_shared_cache_and_invalidation():
+    """페이지/제출이 캐시를 공유하고, 스케줄이 바뀌면 무효화"""
+    print("\n🧪 테스트 2: 페이지/제출 공유 및 무효화")
+    from web.app import app, quiz_cache
+
+    previous = database._db_instance
+    db = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_cache.db"))
+    database._db_instance = db
+
+    calls = []
+    original = db.get_quiz_question
+    db.get_quiz_question = lambda *args: calls.append(args[0]) or original(*args)
+
+    try:
+        quiz_cache.clear()
+        schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                       summary="요약", questions=QUESTIONS)
+        client = app.test_client()
+
+        assert client.get(f"/quiz/{schedule_id}/2").status_code == 200
+        result = client.post(f"/quiz/{schedule_id}/2/submit", json={"answer": "B"}).get_json()
+        assert result["is_correct"] and result["question_text"] == "질문 1"
+        assert calls == [schedule_id]
+
+        # 스케줄 변경 → 다음 요청에서 다시 조회
+        db.mark_as_completed(schedule_id)
+        client.get(f"/quiz/{schedule_id}/2")
+        assert calls == [schedule_id, schedule_id]
+    finally:
+        database._db_instance = previous
+        db.conn.close()
+
+    print(f"✅ DB 조회 {len(calls)}회 (요청 3회)")
+
+
+def test_other_process_update():
+    """다른 프로세스(연결)가 스케줄을 바꾸면 버전이 달라져 다시 조회, 안 바뀌면 캐시 사용"""
+    print("\n🧪 테스트 3: 다른 프로세스의 변경")
+    from web.app import app, quiz_cache
+
+    path = os.path.join(tempfile.mkdtemp(), "test_cache_version.db")
+    previous = database._db_instance
+    db = database._db_instance = ScheduleDB(path)
+    other = ScheduleDB(path)  # 다른 워커/마이그레이션 프로세스 흉내 (리스너 알림 없이 직접 UPDATE)
+
+    try:
+        quiz_cache.clear()
+        schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                       summary="예전 요약", questions=QUESTIONS)
+        client = app.test_client()
+        assert "예전 요약" in client.get(f"/quiz/{schedule_id}/1").get_data(as_text=True)
+        misses = quiz_cache.stats()["misses"]
+
+        other.conn.execute("UPDATE schedules SET summary = '새 요약' WHERE id = ?", (schedule_id,))
+        other.conn.commit()
+        page = client.get(f"/quiz/{schedule_id}/1").get_data(as_text=True)
+        assert "새 요약" in page and "예전 요약" not in page
+
+        client.get(f"/quiz/{schedule_id}/1")
+        assert quiz_cache.stats()["misses"] == misses + 1  # 바뀐 뒤 1번만 다시 조회
+
+        # 퀴즈와 관계없는 컬럼 변경은 버전을 바꾸지 않음
+        version = db.get_quiz_version(schedule_id)
+        other.conn.execute("UPDATE schedules SET status = 'completed' WHERE id = ?", (schedule_id,))
+        other.conn.commit()
+        assert db.get_quiz_version(schedule_id) == version
+    finally:
+        database._db_instance = previous
+        other.conn.close()
+        db.conn.close()
+
+    print(f"✅ 다른 연결의 UPDATE → 버전 {version}, 다시 조회 1번")
+
+
+def main():
+    """메인 실행 함수"""
+    test_lru_eviction()
+    test_shared_cache_and_invalidation()
+    test_other_process_update()
+    print("\n🎉 퀴즈 캐시 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+문제별 퀴즈 테이블(quiz_questions) 테스트 스크립트
+
+사용법:
+    python3 tests/test_quiz_questions.py
+"""
+
+import json
+import os
+import tempfile
+
+import agent.database as database
+from agent.database import ScheduleDB
+from agent.migrate import backfill_question_rows
+
+QUESTIONS = [
+    {"text": f"질문 {i}", "options": ["A) 가", "B) 나"], "answer": "AB"[i % 2]}
+    for i in range(1, 4)
+]
+
+
+def _make_db() -> ScheduleDB:
+    """테스트용 임시 DB"""
+    return ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_questions.db"))
+
+
+def test_question_lookup():
+    """문제 1개 조회 (문제가 부족하면 마지막 문제)"""
+    print("🧪 테스트 1: 문제 1행 조회")
+    db = _make_db()
+    schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0,
+                                   summary="요약", questions=QUESTIONS)
+    healing_id = db.save_schedule("u1", ["2026-02-13"], "생각해보기", "친근한 친구", 0, category="힐링형")
+
+    second = db.get_quiz_question(schedule_id, 2)
+    assert second["question"] == {"idx": 2, "text": "질문 2", "options": ["A) 가", "B) 나"], "answer": "A"}
+    assert second["summary"] == "요약" and second["message"] is None
+
+    assert db.get_quiz_question(schedule_id, 4)["question"]["idx"] == 3
+    assert db.get_quiz_question(healing_id, 1)["question"] is None
+    assert db.get_quiz_question(healing_id, 1)["message"] == "생각해보기"
+    assert db.get_quiz_question(9999, 1) is None
+
+    db.close()
+    print("✅ 2차 → 2번 문제, 4차 → 마지막(3번) 문제")
+
+
+def test_question_accuracy():
+    """문제별 정답률 SQL 집계"""
+    print("\n🧪 테스트 2: 문제별 정답률")
+    db = _make_db()
+    schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0, questions=QUESTIONS)
+
+    db.save_quiz_attempt(schedule_id, 1, ["B"], ["B"], 100, True)
+    db.save_quiz_attempt(schedule_id, 1, ["A"], ["B"], 0, False)
+    db.save_quiz_attempt(schedule_id, 4, ["B"], ["B"], 100, True)   # 4차 → 3번 문제
+
+    accuracy = {row["idx"]: row for row in db.get_question_accuracy(schedule_id)}
+    assert (accuracy[1]["attempts"], accuracy[1]["correct"], accuracy[1]["accuracy"]) == (2, 1, 50.0)
+    assert accuracy[2]["attempts"] == 0 and accuracy[2]["accuracy"] is None
+    assert accuracy[3]["accuracy"] == 100.0
+
+    db.close()
+    print(f"✅ 1번 {accuracy[1]['accuracy']}%, 3번 {accuracy[3]['accuracy']}%")
+
+
+def test_migrate_existing_json():
+    """questions JSON만 있는 기존 스케줄 → quiz_questions 행"""
+    print("\n🧪 테스트 3: 기존 questions JSON 마이그레이션")
+    db = _make_db()
+    schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0)
+    db.conn.execute("UPDATE schedules SET questions = ? WHERE id = ?",
+                    (json.dumps(QUESTIONS, ensure_ascii=False), schedule_id))
+    db.conn.commit()
+    db.save_quiz_attempt(schedule_id, 2, ["A"], ["A"], 100, True)
+
+    assert db.get_quiz_question(schedule_id, 1)["question"] is None
+
+    stats = backfill_question_rows(db)
+    assert (stats["scanned"], stats["migrated"]) == (1, 1)
+    assert db.backfill_attempt_question_idx() == 1
+    assert db.get_quiz_question(schedule_id, 3)["question"]["text"] == "질문 3"
+    assert db.get_question_accuracy(schedule_id)[1]["correct"] == 1
+
+    # 다시 실행하면 스캔할 스케줄 없음
+    assert backfill_question_rows(db)["scanned"] == 0
+
+    db.close()
+    print("✅ 문제 3행 생성, 시도 기록 1개 연결")
+
+
+def test_migrate_in_other_process_refreshes_cache():
+    """다른 프로세스의 마이그레이션이 문제 행을 만들면 웹 캐시가 버전으로 알아채고 다시 조회"""
+    print("\n🧪 테스트 4: 다른 프로세스 마이그레이션 후 캐시")
+    from web.app import get_quiz_question, quiz_cache
+
+    path = os.path.join(tempfile.mkdtemp(), "test_questions_version.db")
+    previous = database._db_instance
+    db = database._db_instance = ScheduleDB(path)
+    migrator = ScheduleDB(path)  # python3 -m agent.migrate 프로세스 흉내
+
+    try:
+        quiz_cache.clear()
+        schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0)
+        db.conn.execute("UPDATE schedules SET questions = ? WHERE id = ?",
+                        (json.dumps(QUESTIONS, ensure_ascii=False), schedule_id))
+        db.conn.commit()
+        assert get_quiz_question(schedule_id, 2)["question"] is None  # 행이 없는 기존 스케줄 (캐시됨)
+
+        assert backfill_question_rows(migrator)["migrated"] == 1
+        assert get_quiz_question(schedule_id, 2)["question"]["text"] == "질문 2"
+
+        # 다른 프로세스가 정답을 고치면 채점도 새 정답으로
+        migrator.conn.execute("UPDATE quiz_questions SET answer = 'B' WHERE schedule_id = ? AND idx = 2",
+                              (schedule_id,))
+        migrator.conn.commit()
+        assert get_quiz_question(schedule_id, 2)["question"]["answer"] == "B"
+    finally:
+        database._db_instance = previous
+        migrator.conn.close()
+        db.conn.close()
+
+    print("✅ 마이그레이션/정답 수정 → 다음 요청에서 새 문제")
+
+
+def main():
+    """메인 실행 함수"""
+    test_question_lookup()
+    test_question_accuracy()
+    test_migrate_existing_json()
+    test_migrate_in_other_process_refreshes_cache()
+    print("\n🎉 quiz_questions 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+퀴즈 답안 제출 트랜잭션 / 재발송 UPSERT 테스트 스크립트
+
+사용법:
+    python3 tests/test_quiz_submit.py
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from agent.database import ScheduleDB
+
+QUESTIONS = [{"text": "질문 1", "options": ["A) 가", "B) 나"], "answer": "A"}]
+
+
+def _db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "test_submit.db")
+
+
+def test_retry_upsert_limit():
+    """오답마다 재발송 행 1개의 retry_count 증가, 최대 횟수에서 멈춤"""
+    print("🧪 테스트 1: 재발송 UPSERT")
+    db = ScheduleDB(_db_path())
+    schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0, questions=QUESTIONS)
+
+    counts = [
+        db.record_quiz_submission(schedule_id, 1, "B", "A", 1, f"2026-02-1{day}")["retry_count"]
+        for day in range(4, 8)
+    ]
+    assert counts == [1, 2, 3, None]
+
+    correct = db.record_quiz_submission(schedule_id, 1, "A", "A", 1, "2026-02-18")
+    assert correct["is_correct"] and correct["retry_count"] is None
+
+    rows = db.conn.execute("SELECT retry_date, retry_count FROM retry_schedules").fetchall()
+    assert [tuple(row) for row in rows] == [("2026-02-16", 3)]
+    assert len(db.get_quiz_attempts(schedule_id)) == 5
+
+    db.close()
+    print(f"✅ 재시도 횟수 {counts}")
+
+
+def test_concurrent_submits():
+    """여러 프로세스(연결)에서 동시에 오답 제출해도 최대 횟수를 넘지 않음"""
+    print("\n🧪 테스트 2: 동시 제출")
+    path = _db_path()
+    db = ScheduleDB(path)
+    schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0, questions=QUESTIONS)
+
+    workers = [ScheduleDB(path) for _ in range(8)]
+    results = []
+
+    def submit(worker):
+        results.append(worker.record_quiz_submission(schedule_id, 1, "B", "A", 1, "2026-02-14"))
+
+    threads = [threading.Thread(target=submit, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    scheduled = sorted(r["retry_count"] for r in results if r["retry_count"] is not None)
+    assert scheduled == [1, 2, 3]
+    assert db.get_retry_count(schedule_id, 1) == 3
+    assert len(db.get_quiz_attempts(schedule_id)) == 8
+
+    for worker in workers:
+        worker.close()
+    db.close()
+    print(f"✅ 8번 제출 → 재발송 예약 {scheduled}")
+
+
+def test_dedupe_existing_rows():
+    """유니크 인덱스 이전 DB의 중복 재발송 행 정리"""
+    print("\n🧪 테스트 3: 기존 중복 행 정리")
+    path = _db_path()
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE retry_schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            schedule_id INTEGER NOT NULL,
+            notification_index INTEGER NOT NULL,
+            retry_date TEXT NOT NULL,
+            retry_count INTEGER DEFAULT 1,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO retry_schedules (schedule_id, notification_index, retry_date, retry_count, status) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, 1, "2026-02-14", 1, "completed"),
+            (1, 1, "2026-02-15", 2, "pending"),
+            (1, 1, "2026-02-16", 3, "completed"),
+            (2, 1, "2026-02-14", 1, "pending"),
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+    db = ScheduleDB(path)
+    rows = db.conn.execute(
+        "SELECT schedule_id, retry_date, retry_count, status FROM retry_schedules ORDER BY schedule_id"
+    ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        (1, "2026-02-15", 3, "pending"),
+        (2, "2026-02-14", 1, "pending"),
+    ]
+
+    try:
+        db.conn.execute("INSERT INTO retry_schedules (schedule_id, notification_index, retry_date) "
+                        "VALUES (2, 1, '2026-02-20')")
+        raise AssertionError("중복 행이 추가됨")
+    except sqlite3.IntegrityError:
+        pass
+
+    db.close()
+    print("✅ 4행 → 2행 (대기 중인 행 유지, 최대 retry_count)")
+
+
+def test_shared_connection_writers_wait():
+    """같은 연결을 쓰는 다른 스레드의 쓰기가 제출 트랜잭션을 커밋하거나 끼어들지 않음"""
+    print("\n🧪 테스트 4: 같은 연결의 다른 쓰기")
+    db = ScheduleDB(_db_path())
+    schedule_id = db.save_schedule("u1", ["2026-02-13"], "내용", "친근한 친구", 0, questions=QUESTIONS)
+
+    # 시도 기록 INSERT 직후 멈췄다가 실패하는 제출 (전체가 롤백되어야 함)
+    inserted = threading.Event()
+    original_insert = db._insert_quiz_attempt
+
+    def insert_then_fail(*args, **kwargs):
+        original_insert(*args, **kwargs)
+        inserted.set()
+        time.sleep(0.2)
+        raise RuntimeError("재발송 예약 실패")
+
+    db._insert_quiz_attempt = insert_then_fail
+    logged = []
+
+    def log_while_submitting():
+        inserted.wait(5)
+        db.log_notification(schedule_id, 1, "2026-02-13", is_success=True)
+        logged.append(time.perf_counter())
+
+    writer = threading.Thread(target=log_while_submitting)
+    writer.start()
+    try:
+        db.record_quiz_submission(schedule_id, 1, "B", "A", 1, "2026-02-14")
+        raise AssertionError("제출이 실패하지 않음")
+    except RuntimeError:
+        failed_at = time.perf_counter()
+    writer.join()
+    del db._insert_quiz_attempt
+
+    assert logged and logged[0] >= failed_at  # 제출 트랜잭션이 끝난 뒤에 기록
+    assert db.get_quiz_attempts(schedule_id) == []  # 다른 스레드의 COMMIT에 섞여 저장되지 않음
+    assert db.conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0] == 1
+
+    # 이미 열린 트랜잭션에는 섞이지 않고 에러 (열린 트랜잭션은 그대로 둠)
+    db.conn.execute("BEGIN")
+    try:
+        db.record_quiz_submission(schedule_id, 1, "A", "A", 1, "2026-02-14")
+        raise AssertionError("열린 트랜잭션 안에서 기록됨")
+    except RuntimeError:
+        assert db.conn.in_transaction
+    db.conn.rollback()
+
+    db.close()
+    print("✅ 실패한 제출은 전부 롤백, 다른 쓰기는 그 뒤에 커밋")
+
+
+def main():
+    """메인 실행 함수"""
+    test_retry_upsert_limit()
+    test_concurrent_submits()
+    test_dedupe_existing_rows()
+    test_shared_connection_writers_wait()
+    print("\n🎉 퀴즈 제출 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
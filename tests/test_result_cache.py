@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+파이프라인 결과 캐시 테스트 스크립트
+
+사용법:
+    python3 tests/test_result_cache.py
+"""
+
+import os
+import tempfile
+
+# agent.nodes는 import 시 LLM 클라이언트를 만듦 (이 테스트는 LLM을 호출하지 않음)
+os.environ.setdefault("UPSTAGE_API_KEY", "test")
+
+import agent.database as database
+from agent.database import ScheduleDB
+from agent.nodes import cache_lookup_node, cache_store_node
+from agent.utils import result_cache
+from agent.utils.result_cache import result_cache_key
+
+TEXT = "AI는 인공지능입니다.\n\n머신러닝은 AI의 하위 분야입니다."
+
+
+def test_cache_key():
+    """공백/줄바꿈만 다른 본문은 같은 키, 파이프라인 버전이 바뀌면 다른 키"""
+    print("🧪 테스트 1: 캐시 키")
+    key = result_cache_key(TEXT)
+    assert result_cache_key("  AI는   인공지능입니다. \r\n\r\n\r\n머신러닝은 AI의 하위 분야입니다.\n") == key
+    assert result_cache_key(TEXT + " 추가") != key
+
+    saved = result_cache.PIPELINE_VERSION
+    result_cache.PIPELINE_VERSION = saved + "-next"
+    try:
+        assert result_cache_key(TEXT) != key
+    finally:
+        result_cache.PIPELINE_VERSION = saved
+    print("✅ 정규화 + 버전 반영")
+
+
+def test_lookup_store_and_evict():
+    """miss → 저장 → hit, 오래된 항목과 크기 초과분 삭제"""
+    print("\n🧪 테스트 2: 조회/저장/정리")
+    saved_db = database._db_instance
+    db = database._db_instance = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_result_cache.db"))
+
+    try:
+        miss = cache_lookup_node({"input_text": TEXT})
+        assert miss["cache_hit"] is False
+
+        state = {**miss, "input_text": TEXT, "category": "지식형", "summary": '{"Summary": "요약"}',
+                 "quiz": '{"questions": []}', "styled_content": "페르소나 메시지", "persona_count": 1}
+        cache_store_node(state)
+
+        hit = cache_lookup_node({"input_text": TEXT + "\n"})
+        assert hit["cache_hit"] is True
+        assert hit["styled_content"] == "페르소나 메시지"
+        assert hit["summary"] == '{"Summary": "요약"}'
+
+        # 나이: 40일 전에 마지막으로 쓴 항목은 다음 저장 때 삭제
+        db.conn.execute("UPDATE pipeline_results SET last_used_at = datetime('now', '-40 days')")
+        db.conn.commit()
+        assert db.save_pipeline_result("new", {"styled_content": "x"}, max_age_days=30, max_bytes=10_000) == 1
+        assert db.get_pipeline_result(miss["cache_key"]) is None
+
+        # 크기: 최근에 쓴 항목부터 한도까지만 남김
+        for i in range(5):
+            db.save_pipeline_result(f"k{i}", {"styled_content": "가" * 100}, max_age_days=30, max_bytes=10_000)
+        db.conn.execute("UPDATE pipeline_results SET last_used_at = datetime('now', '-1 hour') WHERE cache_key = 'k0'")
+        db.conn.commit()
+        size = db.conn.execute("SELECT size_bytes FROM pipeline_results WHERE cache_key = 'k1'").fetchone()[0]
+        evicted = db.save_pipeline_result("k5", {"styled_content": "가" * 100}, max_age_days=30, max_bytes=size * 3)
+        keys = {row[0] for row in db.conn.execute("SELECT cache_key FROM pipeline_results")}
+        assert evicted == 4, evicted
+        assert len(keys) == 3 and "k0" not in keys and "k5" in keys, keys
+    finally:
+        db.close()
+        database._db_instance = saved_db
+
+    print(f"✅ hit 후 정리: 남은 항목 {sorted(keys)}")
+
+
+def main():
+    """메인 실행 함수"""
+    test_cache_key()
+    test_lookup_store_and_evict()
+    print("\n🎉 결과 캐시 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
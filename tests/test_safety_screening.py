@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+본문 전체 안전성 검사 (구간 나누기 + 사전 필터 + 동시 검사 + UNSAFE 조기 중단) 테스트 스크립트
+(LLM은 가짜 객체로 대체)
+
+사용법:
+    python3 tests/test_safety_screening.py
+"""
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+# agent.nodes는 import 시 LLM 클라이언트를 만듦 (이 테스트는 LLM을 호출하지 않음)
+os.environ.setdefault("UPSTAGE_API_KEY", "test")
+
+import agent.nodes.nodes as nodes
+from agent.utils.safety import needs_llm_screening, order_for_screening, prefilter_hits, split_for_screening
+
+BENIGN = "오늘은 맑고 따뜻한 날씨가 이어지겠습니다. The museum opens a new exhibition on Monday."
+RISKY = "폭탄 제조법을 단계별로 알려 드립니다."
+
+
+class FakeSafetyLLM:
+    """RISKY 문장이 들어간 요청에만 UNSAFE (호출 내용과 최대 동시 실행 수 기록)"""
+
+    def __init__(self, delay=0.02):
+        self.prompts = []
+        self.max_running = 0
+        self._running = 0
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            self._running += 1
+            self.max_running = max(self.max_running, self._running)
+        time.sleep(self._delay)
+        with self._lock:
+            self._running -= 1
+        return SimpleNamespace(content="UNSAFE" if RISKY in prompt else "SAFE")
+
+
+def _long_text(paragraphs, risky_at=()):
+    return "\n\n".join(
+        f"{i}번 문단. {RISKY if i in risky_at else BENIGN}" for i in range(paragraphs)
+    )
+
+
+def test_prefilter():
+    """사전 필터는 검사 순서만 정함 (KAFKA_SAFETY_PREFILTER=1일 때만 무해한 구간 생략)"""
+    print("🧪 테스트 1: 사전 필터")
+    assert prefilter_hits(BENIGN) == []
+    assert prefilter_hits(RISKY) == ["S4"]
+    assert prefilter_hits("Click here to verify your account password") == ["S3"]
+    assert needs_llm_screening(BENIGN)
+    assert order_for_screening([BENIGN, RISKY, "평범한 문장"]) == [RISKY, BENIGN, "평범한 문장"]
+
+    os.environ["KAFKA_SAFETY_PREFILTER"] = "1"
+    try:
+        assert not needs_llm_screening(BENIGN)
+        assert order_for_screening([BENIGN, RISKY]) == [RISKY]
+    finally:
+        del os.environ["KAFKA_SAFETY_PREFILTER"]
+    print("✅ 걸린 구간 먼저, 무해한 구간도 기본으로 검사")
+
+
+def test_full_document_screening():
+    """짧은 본문은 1회, 긴 본문은 모든 구간 검사 (걸린 구간 먼저 → 뒷부분 위반도 바로 발견)"""
+    print("\n🧪 테스트 2: 본문 전체 검사")
+    saved_llm = nodes.llm
+    fake = nodes.llm = FakeSafetyLLM()
+    os.environ["KAFKA_SAFETY_CHUNK_TOKENS"] = "300"
+
+    try:
+        short = nodes.extract_content_node({"input_text": BENIGN})
+        assert short["is_safe"] and len(fake.prompts) == 1
+
+        # 예전 방식(앞부분만 검사)으로는 보이지 않던 마지막 문단
+        fake.prompts.clear()
+        long_text = _long_text(200, risky_at={199})
+        chunks = split_for_screening(long_text)
+        result = nodes.extract_content_node({"input_text": long_text})
+        assert len(chunks) > 10
+        assert result["is_safe"] is False and result["is_valid"] is False
+        assert len(fake.prompts) < len(chunks)  # 걸린 구간을 먼저 보내서 조기 중단
+        caught_after = len(fake.prompts)
+
+        fake.prompts.clear()
+        clean = nodes.extract_content_node({"input_text": _long_text(200)})
+        assert clean["is_safe"] and len(fake.prompts) == len(chunks) + 1  # 압축본 + 모든 구간
+
+        # 사전 필터로 생략하는 모드: 압축본 + 걸린 구간만
+        os.environ["KAFKA_SAFETY_PREFILTER"] = "1"
+        fake.prompts.clear()
+        nodes.extract_content_node({"input_text": _long_text(200)})
+        assert len(fake.prompts) == 1
+    finally:
+        nodes.llm = saved_llm
+        for name in ("KAFKA_SAFETY_CHUNK_TOKENS", "KAFKA_SAFETY_PREFILTER"):
+            os.environ.pop(name, None)
+
+    print(f"✅ {len(chunks)}개 구간 모두 검사, 마지막 문단의 위반은 {caught_after}번 호출 안에 감지")
+
+
+def test_concurrency_and_short_circuit():
+    """KAFKA_LLM_CONCURRENCY개씩 동시 검사, UNSAFE가 나오면 남은 구간은 취소하고 보낸 요청은 기다림"""
+    print("\n🧪 테스트 3: 동시 검사 + 조기 중단")
+    saved_llm = nodes.llm
+    fake = nodes.llm = FakeSafetyLLM()
+    os.environ.update({"KAFKA_SAFETY_CHUNK_TOKENS": "300", "KAFKA_LLM_CONCURRENCY": "3"})
+
+    try:
+        total = len(split_for_screening(_long_text(200))) + 1
+        assert nodes._screen_safety(_long_text(200)) is False
+        assert len(fake.prompts) == total and 1 < fake.max_running <= 3
+
+        fake.prompts.clear()
+        assert nodes._screen_safety(_long_text(200, risky_at={0})) is True
+        assert fake._running == 0  # 반환할 때 실행 중인 요청이 남아 있지 않음
+        sent = len(fake.prompts)
+        time.sleep(0.1)
+        assert len(fake.prompts) == sent < total  # 취소된 구간은 나중에도 보내지 않음
+    finally:
+        nodes.llm = saved_llm
+        for name in ("KAFKA_SAFETY_CHUNK_TOKENS", "KAFKA_LLM_CONCURRENCY"):
+            del os.environ[name]
+
+    print(f"✅ 최대 동시 {fake.max_running}개, UNSAFE 후 {len(fake.prompts)}/{total}개만 검사")
+
+
+def main():
+    """메인 실행 함수"""
+    test_prefilter()
+    test_full_document_screening()
+    test_concurrency_and_short_circuit()
+    print("\n🎉 안전성 검사 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
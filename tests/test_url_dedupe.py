@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+URL 정규화 + 이미 처리한 링크 재사용 테스트 스크립트
+
+사용법:
+    python3 tests/test_url_dedupe.py
+"""
+
+import os
+import tempfile
+
+# agent.nodes는 import 시 LLM 클라이언트를 만듦 (이 테스트는 LLM을 호출하지 않음)
+os.environ.setdefault("UPSTAGE_API_KEY", "test")
+
+import agent.database as database
+from agent.database import ScheduleDB
+from agent.migrate import backfill_canonical_urls
+from agent.nodes import input_url_node, reuse_processed_node
+from agent.utils import canonicalize_url
+
+ARTICLE = "https://example.com/news/1?id=7"
+VIDEO = "https://youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def test_canonicalize_url():
+    """추적 파라미터/fragment/모바일·www 서브도메인/유튜브 링크 형태 정리"""
+    print("🧪 테스트 1: URL 정규화")
+    same_article = [
+        "https://example.com/news/1?id=7",
+        "http://www.example.com/news/1/?utm_source=kakao&utm_medium=share&id=7",
+        "https://m.Example.com/news/1?id=7&fbclid=abc#comments",
+        "www.example.com/news/1?id=7",
+    ]
+    same_video = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ?si=share123",
+        "https://m.youtube.com/watch?feature=shared&v=dQw4w9WgXcQ",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    ]
+    assert {canonicalize_url(url) for url in same_article} == {ARTICLE}
+    assert {canonicalize_url(url) for url in same_video} == {VIDEO}
+
+    # 다른 기사는 다른 키 (의미 있는 쿼리와 포트는 유지)
+    assert canonicalize_url("https://example.com/news/1?id=8") != ARTICLE
+    assert canonicalize_url("https://example.com:8080/a") == "https://example.com:8080/a"
+
+    # ref/si/spm은 추적용으로 알려진 사이트에서만 제거 (다른 사이트에서는 콘텐츠를 가리킬 수 있음)
+    assert canonicalize_url("https://docs.example.com/guide?ref=v2") == "https://docs.example.com/guide?ref=v2"
+    assert canonicalize_url("https://example.com/list?si=3&spm=a") == "https://example.com/list?si=3&spm=a"
+    assert canonicalize_url("https://x.com/kafka/status/1?ref_src=twsrc") == "https://x.com/kafka/status/1"
+    assert canonicalize_url("https://open.spotify.com/episode/abc?si=xyz") == "https://open.spotify.com/episode/abc"
+    assert canonicalize_url("https://example.com/a?pk_id=9&pk_campaign=x") == "https://example.com/a?pk_id=9"
+    print(f"✅ {len(same_article) + len(same_video)}개 링크 → 2개 키")
+
+
+def test_reuse_processed():
+    """정규화 URL이 같은 스케줄이 있으면 저장된 결과를 불러오고, 없으면 통과"""
+    print("\n🧪 테스트 2: 처리 결과 재사용")
+    saved_db = database._db_instance
+    db = database._db_instance = ScheduleDB(os.path.join(tempfile.mkdtemp(), "test_dedupe.db"))
+
+    try:
+        questions = [{"text": "Q?", "options": ["A) 1", "B) 2"], "answer": "A"}]
+        source_id = db.save_schedule(
+            "u1", ["2026-02-13"], "페르소나 메시지", "친근한 친구", 3,
+            url=ARTICLE, summary="요약", questions=questions, canonical_url=ARTICLE
+        )
+
+        state = input_url_node({"user_input": "https://m.example.com/news/1/?id=7&utm_campaign=x"})
+        assert state["canonical_url"] == ARTICLE
+
+        reused = reuse_processed_node(state)
+        assert reused["reused_from"] == source_id
+        assert reused["styled_content"] == "페르소나 메시지"
+        assert reused["persona_count"] == 3
+        assert '"A) 1"' in reused["quiz"]
+
+        # 처음 보는 링크 / 텍스트 입력은 그대로 통과
+        assert reuse_processed_node(input_url_node({"user_input": VIDEO}))["reused_from"] is None
+        assert reuse_processed_node(input_url_node({"user_input": "그냥 텍스트"}))["reused_from"] is None
+
+        # 마이그레이션: 기존 스케줄의 canonical_url 채우기
+        legacy_id = db.save_schedule("u1", ["2026-02-13"], "메시지", "친근한 친구", 0,
+                                     url="https://youtu.be/dQw4w9WgXcQ")
+        db.save_schedule("u1", ["2026-02-13"], "메시지", "친근한 친구", 0, url="직접 입력한 텍스트")
+        stats = backfill_canonical_urls(db)
+        assert (stats["scanned"], stats["migrated"]) == (1, 1), stats
+        assert db.find_processed_schedule(VIDEO)["id"] == legacy_id
+    finally:
+        db.close()
+        database._db_instance = saved_db
+
+    print(f"✅ 스케줄 {source_id} 재사용, 마이그레이션 {stats['migrated']}개")
+
+
+def main():
+    """메인 실행 함수"""
+    test_canonicalize_url()
+    test_reuse_processed()
+    print("\n🎉 URL 정규화 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
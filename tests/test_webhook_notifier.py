@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+웹훅 알림 백엔드 테스트 스크립트
+
+로컬 HTTP 서버(게이트웨이 대역)를 띄워 배치 전송, 동시 요청 제한, 멱등 재시도를 확인합니다.
+
+사용법:
+    python3 tests/test_webhook_notifier.py
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agent.notification.webhook import WebhookNotifier, idempotency_key
+
+
+class _Gateway:
+    """테스트용 웹훅 게이트웨이 (처음 fail_first개 요청은 503 응답)"""
+
+    def __init__(self, fail_first: int = 0, status: int = 503, delay: float = 0.0, retry_after: str = None):
+        self.requests = []
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.status = status
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                with gateway.lock:
+                    gateway.in_flight += 1
+                    gateway.max_in_flight = max(gateway.max_in_flight, gateway.in_flight)
+                    body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                    gateway.requests.append((self.headers["Idempotency-Key"], body))
+                    fail = len(gateway.requests) <= gateway.fail_first
+
+                time.sleep(gateway.delay)
+                with gateway.lock:
+                    gateway.in_flight -= 1
+
+                self.send_response(gateway.status if fail else 200)
+                if fail and gateway.retry_after:
+                    self.send_header("Retry-After", gateway.retry_after)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/notify"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _notifications(count: int) -> list:
+    """테스트용 알림 목록"""
+    return [
+        {
+            "schedule_id": i,
+            "notification_index": 1,
+            "user_id": f"user_{i % 3}",
+            "target_date": "2026-02-13",
+            "title": "🎓 카프카 1차 복습 알림",
+            "message": "📝 오늘의 퀴즈가 준비되었습니다!",
+            "url": f"http://localhost:8080/quiz/{i}/1",
+            "timeout": 30,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def test_batches_and_in_flight_cap():
+    """배치 단위로 나눠 보내고, 동시 요청 수는 상한을 넘지 않음"""
+    print("🧪 테스트 1: 배치 전송 / 동시 요청 제한")
+    gateway = _Gateway(delay=0.05)
+    notifier = WebhookNotifier(gateway.url, batch_size=10, max_in_flight=2)
+
+    results = notifier.send_batch(_notifications(55))
+    notifier.close()
+    gateway.close()
+
+    assert results == [None] * 55
+    assert [len(body["notifications"]) for _, body in gateway.requests].count(10) == 5
+    assert len(gateway.requests) == 6
+    assert 1 <= gateway.max_in_flight <= 2
+
+    print(f"✅ 요청 {len(gateway.requests)}건, 최대 동시 요청 {gateway.max_in_flight}건")
+
+
+def test_idempotent_retry():
+    """503 응답 후 같은 키로 재시도"""
+    print("\n🧪 테스트 2: 멱등 재시도")
+    gateway = _Gateway(fail_first=2)
+    notifier = WebhookNotifier(gateway.url, max_retries=3, backoff=0.01)
+
+    notifier.send(_notifications(1)[0])
+    notifier.close()
+    gateway.close()
+
+    assert len(gateway.requests) == 3
+    assert len({key for key, _ in gateway.requests}) == 1
+    item = gateway.requests[-1][1]["notifications"][0]
+    assert item["idempotency_key"] == idempotency_key(item) == "1:1:2026-02-13"
+
+    print(f"✅ {len(gateway.requests)}번째 시도에서 성공 (키 동일)")
+
+
+def test_client_error_is_not_retried():
+    """4xx 응답은 재시도하지 않고 알림별 실패로 반환"""
+    print("\n🧪 테스트 3: 재시도하지 않는 오류")
+    gateway = _Gateway(fail_first=1, status=400)
+    notifier = WebhookNotifier(gateway.url, max_retries=3, backoff=0.01)
+
+    results = notifier.send_batch(_notifications(3))
+    notifier.close()
+    gateway.close()
+
+    assert len(gateway.requests) == 1
+    assert all(error is not None for error in results)
+
+    print(f"✅ 400 응답 → 재시도 없음 ({results[0]})")
+
+
+def test_retry_after_is_capped():
+    """게이트웨이가 Retry-After를 길게 보내도 max_retry_wait까지만 대기"""
+    print("\n🧪 테스트 4: Retry-After 상한")
+    gateway = _Gateway(fail_first=1, status=429, retry_after="3600")
+    notifier = WebhookNotifier(gateway.url, max_retries=2, backoff=0.01, max_retry_wait=0.2)
+
+    started = time.monotonic()
+    results = notifier.send_batch(_notifications(1))
+    elapsed = time.monotonic() - started
+    notifier.close()
+    gateway.close()
+
+    assert results == [None]
+    assert len(gateway.requests) == 2
+    assert 0.2 <= elapsed < 5
+    print(f"✅ Retry-After 3600초 → {elapsed:.2f}초 대기 후 재시도")
+
+
+def main():
+    """메인 실행 함수"""
+    test_batches_and_in_flight_cap()
+    test_idempotent_retry()
+    test_client_error_is_not_retried()
+    test_retry_after_is_capped()
+    print("\n🎉 웹훅 알림 테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,91 +6,61 @@
 사용자 답안을 채점하여 결과를 저장합니다.
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, make_response, render_template, request, jsonify, redirect, url_for
 import sys
 import os
 import json
-import re
 from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agent.database import get_db
+from agent.database import add_schedule_listener, get_db
+from web.http_cache import init_http_cache, not_modified, page_etag, page_last_modified, set_validators
+from web.metrics import RequestMetrics, init_metrics
+from web.quiz_cache import QuizCache, get_cache_size
 
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False  # 한글 JSON 응답 지원
 
+# 알림 차수별 페르소나 (스케줄러 알림 제목과 동일)
+PERSONA_MAP = {
+    1: "친근한 친구",
+    2: "다정한 선배",
+    3: "엄격한 교수",
+    4: "유머러스한 코치",
+    5: "밈 마스터"  # 예비
+}
+
+# 다이제스트 페이지 1개에 담을 최대 알림 수
+MAX_DIGEST_ITEMS = 20
+
+# 오답 재발송 최대 횟수
+MAX_RETRY_COUNT = 3
+
+# 파싱된 퀴즈 데이터 캐시 (스케줄이 저장/변경되면 해당 항목 무효화)
+quiz_cache = QuizCache(get_cache_size())
+add_schedule_listener(quiz_cache.invalidate)
 
-def extract_quiz_from_content(styled_content: str) -> dict:
-    """
-    styled_content에서 퀴즈 정보 추출
-    
-    Args:
-        styled_content: 페르소나가 적용된 콘텐츠
-    
-    Returns:
-        {
-            "summary": "요약 내용",
-            "questions": [
-                {
-                    "text": "질문 내용",
-                    "options": ["A) ...", "B) ...", "C) ...", "D) ..."],
-                    "answer": "A"
-                },
-                ...
-            ]
-        }
-    """
-    # 요약 부분 추출
-    summary_match = re.search(r'\[요약\](.*?)(?:\[퀴즈\]|$)', styled_content, re.DOTALL)
-    summary = summary_match.group(1).strip() if summary_match else ""
-    
-    # 퀴즈 JSON 추출 시도
-    quiz_json_match = re.search(r'\{"questions":\s*\[(.*?)\]\}', styled_content, re.DOTALL)
-    
-    if quiz_json_match:
-        try:
-            # JSON 파싱
-            quiz_json = '{"questions": [' + quiz_json_match.group(1) + ']}'
-            quiz_data = json.loads(quiz_json)
-            return {
-                "summary": summary,
-                "questions": quiz_data.get("questions", [])
-            }
-        except json.JSONDecodeError:
-            pass
-    
-    # JSON 파싱 실패 시 텍스트 파싱
-    questions = []
-    
-    # Q1, Q2... 형식으로 질문 찾기
-    question_pattern = r'Q(\d+)\.\s*(.*?)(?=Q\d+\.|정답:|$)'
-    matches = re.findall(question_pattern, styled_content, re.DOTALL)
-    
-    for num, q_text in matches:
-        # 옵션 추출 (A), B), C), D) 형식)
-        options = re.findall(r'([A-D]\).*?)(?=[A-D]\)|정답:|Q\d+\.|$)', q_text, re.DOTALL)
-        options = [opt.strip() for opt in options if opt.strip()]
-        
-        # 정답 추출
-        answer_match = re.search(r'정답:\s*([A-D])', q_text)
-        answer = answer_match.group(1) if answer_match else "A"
-        
-        # 질문 텍스트 정리
-        question_text = re.split(r'[A-D]\)', q_text)[0].strip()
-        
-        if options:
-            questions.append({
-                "text": question_text,
-                "options": options,
-                "answer": answer
-            })
-    
-    return {
-        "summary": summary,
-        "questions": questions[:5]  # 최대 5개
-    }
+
+def _quiz_cache_metrics(lines: List[str]):
+    """/metrics에 퀴즈 캐시 통계 추가"""
+    stats = quiz_cache.stats()
+    lines += [
+        '# TYPE kafka_quiz_cache_size gauge',
+        f"kafka_quiz_cache_size {stats['size']}",
+        '# TYPE kafka_quiz_cache_hits_total counter',
+        f"kafka_quiz_cache_hits_total {stats['hits']}",
+        '# TYPE kafka_quiz_cache_misses_total counter',
+        f"kafka_quiz_cache_misses_total {stats['misses']}",
+    ]
+
+
+# 요청 지표 (/metrics) - 압축 시간까지 재도록 http_cache보다 먼저 등록
+request_metrics = RequestMetrics()
+init_metrics(app, request_metrics, extra=_quiz_cache_metrics)
+init_http_cache(app)  # 퀴즈 페이지 ETag, 정적 파일 immutable 캐시, gzip 압축
 
 
 @app.route('/')
@@ -129,6 +99,24 @@ def index():
     """
 
 
+def _load_quiz_question(schedule_id: int, notification_index: int) -> Optional[dict]:
+    """DB에서 문제 1개 조회 (캐시 미스 시에만 호출)"""
+    return get_db().get_quiz_question(schedule_id, notification_index)
+
+
+def get_quiz_question(schedule_id: int, notification_index: int) -> Optional[dict]:
+    """
+    notification_index번째 문제 (LRU 캐시, 문제가 부족하면 마지막 문제)
+    
+    캐시 항목은 퀴즈 데이터 버전이 같을 때만 사용 (다른 워커/프로세스의 변경 반영)
+    
+    Returns:
+        {schedule_id, category, summary, message, question, version} 또는 None (스케줄 없음)
+    """
+    version = get_db().get_quiz_version(schedule_id)
+    return quiz_cache.get(schedule_id, notification_index, _load_quiz_question, version=version)
+
+
 @app.route('/quiz/<int:schedule_id>/<int:notification_index>')
 def show_quiz(schedule_id, notification_index):
     """
@@ -141,10 +129,9 @@ def show_quiz(schedule_id, notification_index):
     Returns:
         HTML 페이지 (quiz.html)
     """
-    db = get_db()
-    schedule = db.get_schedule_by_id(schedule_id)
+    payload = get_quiz_question(schedule_id, notification_index)
     
-    if not schedule:
+    if not payload:
         return """
         <html>
         <head><meta charset="UTF-8"><title>오류</title></head>
@@ -156,7 +143,7 @@ def show_quiz(schedule_id, notification_index):
         """.format(schedule_id), 404
     
     # 정보형이 아니면 리다이렉트
-    if schedule.get('category') != '지식형':
+    if payload['category'] != '지식형':
         return """
         <html>
         <head><meta charset="UTF-8"><title>알림</title></head>
@@ -168,79 +155,193 @@ def show_quiz(schedule_id, notification_index):
         </html>
         """
     
-    # 퀴즈 데이터 추출 (DB에서 직접 읽기)
-    questions_json = schedule.get('questions')
-    
-    if not questions_json:
-        # questions 컬럼이 없으면 styled_content에서 추출 시도 (하위 호환)
-        quiz_data = extract_quiz_from_content(schedule['styled_content'])
-        if not quiz_data['questions']:
-            return """
-            <html>
-            <head><meta charset="UTF-8"><title>오류</title></head>
-            <body style="font-family: sans-serif; text-align: center; margin-top: 50px;">
-                <h1>⚠️ 퀴즈를 찾을 수 없습니다</h1>
-                <p>콘텐츠에 퀴즈 정보가 없습니다.</p>
-                <p style="color: #999; font-size: 12px;">Schedule ID: {}</p>
-            </body>
-            </html>
-            """.format(schedule_id), 404
-    else:
-        # DB에서 직접 읽은 퀴즈 데이터 파싱
-        try:
-            questions_list = json.loads(questions_json)
-            quiz_data = {
-                'summary': schedule.get('summary', ''),
-                'questions': questions_list
-            }
-        except json.JSONDecodeError:
-            return """
-            <html>
-            <head><meta charset="UTF-8"><title>오류</title></head>
-            <body style="font-family: sans-serif; text-align: center; margin-top: 50px;">
-                <h1>⚠️ 퀴즈 데이터 파싱 오류</h1>
-                <p>퀴즈 데이터 형식이 잘못되었습니다.</p>
-            </body>
-            </html>
-            """, 500
-    
-    if not quiz_data['questions']:
+    if not payload['question']:
         return """
         <html>
         <head><meta charset="UTF-8"><title>오류</title></head>
         <body style="font-family: sans-serif; text-align: center; margin-top: 50px;">
             <h1>⚠️ 퀴즈를 찾을 수 없습니다</h1>
             <p>콘텐츠에 퀴즈 정보가 없습니다.</p>
+            <p style="color: #999; font-size: 12px;">Schedule ID: {}</p>
         </body>
         </html>
-        """, 404
-    
-    # notification_index에 해당하는 1개 문제만 추출 (인덱스는 1부터 시작)
-    question_index = notification_index - 1  # 0-based index
-    
-    if question_index >= len(quiz_data['questions']):
-        # 문제가 부족하면 마지막 문제 사용
-        question_index = len(quiz_data['questions']) - 1
-    
-    current_question = quiz_data['questions'][question_index]
+        """.format(schedule_id), 404
     
     # 페르소나도 notification_index에 맞게 선택
-    persona_map = {
-        1: "친근한 친구",
-        2: "다정한 선배", 
-        3: "엄격한 교수",
-        4: "유머러스한 코치",
-        5: "밈 마스터"  # 예비
-    }
-    persona_for_today = persona_map.get(notification_index, "친근한 친구")
+    persona_for_today = PERSONA_MAP.get(notification_index, "친근한 친구")
+    question = payload['question']  # 1개 문제만
+    
+    # 화면에 보이는 값으로 ETag 계산 (정답은 제외) → 변하지 않았으면 렌더링 없이 304
+    etag = page_etag(app, 'quiz.html', {
+        'schedule_id': schedule_id,
+        'user_id': payload['user_id'],
+        'notification_index': notification_index,
+        'text': question['text'],
+        'options': question['options'],
+        'summary': payload['summary'],
+        'persona_style': persona_for_today
+    })
+    last_modified = page_last_modified(app, 'quiz.html', [payload['created_at'], payload.get('updated_at')])
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
     
-    return render_template('quiz.html',
+    response = make_response(render_template('quiz.html',
         schedule_id=schedule_id,
+        user_id=payload['user_id'],
         notification_index=notification_index,
-        question=current_question,  # 1개 문제만
-        total_questions=len(quiz_data['questions']),
-        summary=quiz_data['summary'],
+        question=question,
+        summary=payload['summary'],
         persona_style=persona_for_today
+    ))
+    return set_validators(response, etag, last_modified)
+
+
+def public_quiz(payload: dict, notification_index: int) -> dict:
+    """
+    API 응답용 퀴즈 데이터 (정답 제외 - 채점은 submit에서)
+    
+    Returns:
+        {schedule_id, notification_index, persona_style, summary, question: {idx, text, options}}
+    """
+    question = payload['question']
+    return {
+        'schedule_id': payload['schedule_id'],
+        'notification_index': notification_index,
+        'persona_style': PERSONA_MAP.get(notification_index, "친근한 친구"),
+        'summary': payload['summary'],
+        'question': {
+            'idx': question['idx'],
+            'text': question['text'],
+            'options': question['options']
+        }
+    }
+
+
+@app.route('/api/quiz/<int:schedule_id>')
+def api_quiz(schedule_id):
+    """
+    퀴즈 1개 JSON (quiz.js가 다음 문제를 미리 가져올 때 사용)
+    
+    Query:
+        n: 알림 차수 (기본: 1)
+    
+    Returns:
+        public_quiz() 형식, 스케줄/퀴즈가 없으면 404
+    """
+    notification_index = request.args.get('n', 1, type=int)
+    payload = get_quiz_question(schedule_id, notification_index)
+    
+    if not payload:
+        return jsonify({"error": "스케줄을 찾을 수 없습니다"}), 404
+    if not payload['question']:
+        return jsonify({"error": "퀴즈를 찾을 수 없습니다"}), 404
+    
+    return jsonify(public_quiz(payload, notification_index))
+
+
+@app.route('/api/user/<user_id>/due')
+def api_due_quizzes(user_id):
+    """
+    사용자가 풀어야 할 퀴즈 목록 JSON (알림을 받았지만 아직 맞히지 못한 것)
+    
+    Query:
+        limit: 최대 개수 (기본/최대: MAX_DIGEST_ITEMS)
+    
+    Returns:
+        {"user_id", "items": [{"schedule_id", "notification_index", "sent_at", "url"}, ...]}
+    """
+    limit = min(max(request.args.get('limit', MAX_DIGEST_ITEMS, type=int), 1), MAX_DIGEST_ITEMS)
+    items = get_db().get_due_quizzes(user_id, limit=limit)
+    
+    for item in items:
+        item['url'] = url_for('show_quiz',
+                              schedule_id=item['schedule_id'],
+                              notification_index=item['notification_index'])
+    
+    return jsonify({'user_id': user_id, 'items': items})
+
+
+def parse_digest_items(items_param: str) -> List[Tuple[int, int]]:
+    """
+    다이제스트 items 파라미터 파싱
+    
+    Args:
+        items_param: "12:1,15:2" 형식 (schedule_id:notification_index)
+    
+    Returns:
+        [(12, 1), (15, 2)] (중복 제거, 최대 MAX_DIGEST_ITEMS개)
+    
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    keys = []
+    for part in items_param.split(','):
+        if not part.strip():
+            continue
+        schedule_id, notification_index = part.split(':')
+        key = (int(schedule_id), int(notification_index))
+        if key not in keys:
+            keys.append(key)
+    return keys[:MAX_DIGEST_ITEMS]
+
+
+@app.route('/digest')
+def show_digest():
+    """
+    다이제스트 페이지: 여러 알림의 퀴즈를 한 페이지에 표시
+    
+    Query:
+        items: "schedule_id:notification_index,..." (스케줄러 다이제스트 알림 URL)
+    
+    이유:
+    - 한 사용자의 여러 알림이 같은 날 겹치면 알림 1건 + 페이지 1번으로 모두 복습
+    - 답안 제출은 문제별로 기존 /quiz/.../submit 사용
+    """
+    try:
+        keys = parse_digest_items(request.args.get('items', ''))
+    except ValueError:
+        return """
+        <html>
+        <head><meta charset="UTF-8"><title>오류</title></head>
+        <body style="font-family: sans-serif; text-align: center; margin-top: 50px;">
+            <h1>⚠️ 잘못된 다이제스트 링크입니다</h1>
+        </body>
+        </html>
+        """, 400
+    
+    cards = []
+    
+    for schedule_id, notification_index in keys:
+        payload = get_quiz_question(schedule_id, notification_index)
+        if not payload:
+            continue
+        
+        if payload['category'] == '지식형' and not payload['question']:
+            continue
+        
+        cards.append({
+            'schedule_id': schedule_id,
+            'notification_index': notification_index,
+            'persona_style': PERSONA_MAP.get(notification_index, "친근한 친구"),
+            'summary': payload['summary'],
+            'question': payload['question'],
+            'message': payload['message']  # 힐링형: 퀴즈 없이 메시지만 표시
+        })
+    
+    if not cards:
+        return """
+        <html>
+        <head><meta charset="UTF-8"><title>오류</title></head>
+        <body style="font-family: sans-serif; text-align: center; margin-top: 50px;">
+            <h1>⚠️ 복습할 항목을 찾을 수 없습니다</h1>
+        </body>
+        </html>
+        """, 404
+    
+    return render_template('digest.html',
+        cards=cards,
+        quiz_count=sum(1 for card in cards if card['question'])
     )
 
 
@@ -264,70 +365,43 @@ def submit_quiz(schedule_id, notification_index):
     """
     user_answer = request.json.get('answer', '')
     
-    db = get_db()
-    schedule = db.get_schedule_by_id(schedule_id)
+    # 정답은 캐시된 문제 데이터에서 조회
+    payload = get_quiz_question(schedule_id, notification_index)
     
-    if not schedule:
+    if not payload:
         return jsonify({"error": "스케줄을 찾을 수 없습니다"}), 404
     
-    # 정답 추출 (DB에서 직접 읽기)
-    questions_json = schedule.get('questions')
-    
-    if not questions_json:
-        # questions 컬럼이 없으면 styled_content에서 추출 시도 (하위 호환)
-        quiz_data = extract_quiz_from_content(schedule['styled_content'])
-    else:
-        try:
-            questions_list = json.loads(questions_json)
-            quiz_data = {'questions': questions_list}
-        except json.JSONDecodeError:
-            return jsonify({"error": "퀴즈 데이터 파싱 오류"}), 500
+    question = payload['question']
+    if not question:
+        return jsonify({"error": "퀴즈를 찾을 수 없습니다"}), 404
     
-    # notification_index에 해당하는 문제의 정답 가져오기
-    question_index = notification_index - 1
-    if question_index >= len(quiz_data['questions']):
-        question_index = len(quiz_data['questions']) - 1
+    correct_answer = question['answer']
     
-    correct_answer = quiz_data['questions'][question_index]['answer']
-    
-    # 채점 (1개 문제)
-    is_correct = user_answer == correct_answer
-    score = 100 if is_correct else 0
-    
-    # DB에 기록
-    db.save_quiz_attempt(
+    # 채점 (1개 문제) + 시도 기록 + 오답 재발송 예약을 트랜잭션 1개로
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
+    result = get_db().record_quiz_submission(
         schedule_id=schedule_id,
         notification_index=notification_index,
-        user_answers=[user_answer],
-        correct_answers=[correct_answer],
-        score=score,
-        is_passed=is_correct
+        user_answer=user_answer,
+        correct_answer=correct_answer,
+        question_idx=question['idx'],
+        retry_date=tomorrow,
+        max_retries=MAX_RETRY_COUNT
     )
+    is_correct = result['is_correct']
+    retry_scheduled = result['retry_count'] is not None
     
-    # 오답 시 재발송 스케줄링
-    retry_scheduled = False
-    if not is_correct:
-        retry_count = db.get_retry_count(schedule_id, notification_index)
-        
-        if retry_count < 3:  # 최대 3회까지
-            tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
-            db.add_retry_schedule(
-                schedule_id=schedule_id,
-                notification_index=notification_index,
-                retry_date=tomorrow,
-                retry_count=retry_count + 1
-            )
-            retry_scheduled = True
-            print(f"🔄 스케줄 {schedule_id}: 재발송 예약 완료 ({tomorrow})")
-        else:
-            print(f"⚠️  스케줄 {schedule_id}: 최대 재시도 횟수 초과")
+    if retry_scheduled:
+        print(f"🔄 스케줄 {schedule_id}: 재발송 예약 완료 ({tomorrow}, {result['retry_count']}회차)")
+    elif not is_correct:
+        print(f"⚠️  스케줄 {schedule_id}: 최대 재시도 횟수 초과")
     
     return jsonify({
         'is_correct': is_correct,
         'user_answer': user_answer,
         'correct_answer': correct_answer,
         'retry_scheduled': retry_scheduled,
-        'question_text': quiz_data['questions'][question_index]['text']
+        'question_text': question['text']
     })
 
 
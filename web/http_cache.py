@@ -0,0 +1,275 @@
+# web/http_cache.py
+"""
+HTTP 캐시 / 압축
+
+1. 퀴즈 페이지: ETag + Last-Modified (스케줄 행, 퀴즈 데이터 변경 시각, 템플릿/정적 파일에서 계산)
+   → 재방문 시 렌더링 없이 304 Not Modified
+2. 정적 파일: URL에 내용 해시(?v=...)를 붙이고 1년 immutable 캐시
+   (파일이 바뀌면 URL이 바뀌므로 오래된 캐시를 쓰지 않음)
+3. 텍스트 응답(HTML/CSS/JS/JSON) gzip 압축 (brotli 패키지가 설치되어 있으면 br 우선)
+
+설정:
+- KAFKA_WEB_COMPRESS_MIN_SIZE: 압축할 최소 응답 크기 (바이트, 기본: 500)
+- KAFKA_WEB_ASSET_CHECK_SECONDS: 템플릿/정적 파일 변경 확인 간격 (초, 기본: 2)
+
+이유:
+- 같은 (스케줄, 차수)의 퀴즈 페이지는 바뀌지 않는데 매번 quiz.html을 새로 렌더링함
+- quiz.js / style.css를 캐시 헤더 없이 매번 다시 받음
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, Response, request
+from werkzeug.http import is_resource_modified
+
+try:
+    import brotli  # 선택 사항 (pip3 install brotli)
+except ImportError:
+    brotli = None
+
+STATIC_MAX_AGE = 365 * 24 * 60 * 60  # 1년
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/javascript', 'image/svg+xml')
+
+# 정적 파일 내용 해시: filename → ((mtime_ns, size), 해시)
+_asset_versions: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_asset_lock = threading.Lock()
+
+# 템플릿 + 정적 파일 전체 버전: (static_folder, 템플릿 경로) → (확인 시각(monotonic), 버전, 최종 수정 시각)
+_site_versions: Dict[Tuple[str, str], Tuple[float, str, Optional[datetime]]] = {}
+
+
+def get_compress_min_size() -> int:
+    """압축할 최소 크기 (환경 변수 KAFKA_WEB_COMPRESS_MIN_SIZE, 기본: 500)"""
+    return int(os.getenv("KAFKA_WEB_COMPRESS_MIN_SIZE", 500))
+
+
+def get_asset_check_seconds() -> float:
+    """템플릿/정적 파일 변경 확인 간격 (환경 변수 KAFKA_WEB_ASSET_CHECK_SECONDS, 기본: 2초)"""
+    return float(os.getenv("KAFKA_WEB_ASSET_CHECK_SECONDS", 2))
+
+
+def asset_version(static_folder: str, filename: str) -> Optional[str]:
+    """
+    정적 파일 내용 해시 (앞 12자리)
+
+    파일의 (수정 시각, 크기)가 같으면 다시 읽지 않음
+
+    Returns:
+        해시 문자열 또는 None (파일 없음)
+    """
+    path = os.path.join(static_folder, filename)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _asset_versions.get(filename)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+
+    with _asset_lock:
+        _asset_versions[filename] = (stamp, version)
+    return version
+
+
+def page_etag(app: Flask, template_name: str, data: Dict) -> str:
+    """
+    페이지 ETag 계산 (렌더링 입력 + 템플릿 + 정적 파일 버전)
+
+    Args:
+        template_name: 렌더링할 템플릿 (수정되면 ETag가 바뀜)
+        data: 템플릿에 넘기는 값 (화면에 보이는 값만 - 정답은 넣지 않음)
+    """
+    parts = [
+        json.dumps(data, sort_keys=True, ensure_ascii=False, default=str),
+        site_version(app, template_name),
+    ]
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def _site_state(app: Flask, template_name: str) -> Tuple[str, Optional[datetime]]:
+    """
+    (템플릿 + 정적 파일 버전, 그중 가장 늦은 수정 시각)
+
+    KAFKA_WEB_ASSET_CHECK_SECONDS 동안은 다시 확인하지 않음
+    (304 응답마다 정적 폴더 전체를 os.walk/stat 하지 않도록, 파일 해시는 asset_version 캐시 사용)
+    """
+    template_path = os.path.join(app.root_path, app.template_folder, template_name)
+    key = (app.static_folder, template_path)
+    now = time.monotonic()
+    cached = _site_versions.get(key)
+    if cached and now - cached[0] < get_asset_check_seconds():
+        return cached[1], cached[2]
+
+    parts = []
+    mtimes = []
+    try:
+        mtime_ns = os.stat(template_path).st_mtime_ns
+        parts.append(str(mtime_ns))
+        mtimes.append(mtime_ns)
+    except OSError:
+        pass
+
+    for root, _, files in os.walk(app.static_folder):
+        for name in sorted(files):
+            filename = os.path.relpath(os.path.join(root, name), app.static_folder)
+            parts.append(f"{filename}={asset_version(app.static_folder, filename)}")
+            stamp = _asset_versions.get(filename)
+            if stamp:
+                mtimes.append(stamp[0][0])
+
+    version = hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()[:16]
+    last_modified = datetime.fromtimestamp(max(mtimes) / 1e9, tz=timezone.utc) if mtimes else None
+    with _asset_lock:
+        _site_versions[key] = (now, version, last_modified)
+    return version, last_modified
+
+
+def site_version(app: Flask, template_name: str) -> str:
+    """템플릿 수정 시각 + 정적 파일 내용 해시를 합친 버전"""
+    return _site_state(app, template_name)[0]
+
+
+def page_last_modified(app: Flask, template_name: str, db_timestamps: List[Optional[str]]) -> Optional[datetime]:
+    """
+    페이지 Last-Modified (DB 시각들과 템플릿/정적 파일 수정 시각 중 가장 늦은 값)
+
+    이유: ETag가 바뀌는 변경(문제 수정, 템플릿/정적 파일 수정)은 Last-Modified도 늦춰야
+          If-Modified-Since만 보내는 클라이언트가 304로 예전 페이지를 계속 쓰지 않음
+
+    Args:
+        db_timestamps: SQLite CURRENT_TIMESTAMP 값 목록 (예: 스케줄 created_at, quiz_versions.updated_at)
+    """
+    times = [parse_db_timestamp(value) for value in db_timestamps]
+    times.append(_site_state(app, template_name)[1])
+    return max((value for value in times if value), default=None)
+
+
+def parse_db_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """SQLite CURRENT_TIMESTAMP ("YYYY-MM-DD HH:MM:SS", UTC) → datetime"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Optional[Response]:
+    """
+    조건부 요청 확인 (렌더링 전에 호출)
+
+    Returns:
+        304 응답 (브라우저 캐시가 최신) 또는 None (렌더링 필요)
+    """
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+
+    response = Response(status=304)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """
+    ETag / Last-Modified 헤더 설정 (매번 서버에 확인 후 캐시 사용)
+
+    ETag는 약한(W/) 태그: 같은 페이지를 gzip/br/무압축으로 보낼 수 있으므로
+    """
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _choose_encoding() -> Optional[str]:
+    """Accept-Encoding에서 사용할 압축 방식 선택 (br > gzip)"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _is_compressible(response: Response) -> bool:
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def compress_response(response: Response) -> Response:
+    """
+    텍스트 응답 압축 (after_request)
+
+    이미 압축된 응답, 200이 아닌 응답(304/206 등), 작은 응답은 그대로 둠
+    """
+    response.vary.add('Accept-Encoding')
+
+    if (response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or not _is_compressible(response)):
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    # send_file 응답(정적 파일)은 파일 스트림 → 바이트로 읽어서 압축
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < get_compress_min_size():
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(data)
+    else:
+        compressed = gzip.compress(data, compresslevel=6)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    # 압축 결과는 원본과 다른 표현 → 강한 ETag는 약한 ETag로
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_http_cache(app: Flask):
+    """
+    앱에 HTTP 캐시/압축 등록
+
+    - url_for('static', filename=...)에 ?v=<내용 해시> 자동 추가 (템플릿 수정 불필요)
+    - ?v=가 현재 해시와 같은 정적 파일 응답은 1년 immutable 캐시
+    - 모든 텍스트 응답 압축
+    """
+    @app.url_defaults
+    def _add_asset_version(endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            version = asset_version(app.static_folder, values['filename'])
+            if version:
+                values['v'] = version
+
+    @app.after_request
+    def _cache_and_compress(response):
+        if request.endpoint == 'static' and response.status_code in (200, 304):
+            filename = (request.view_args or {}).get('filename', '')
+            version = request.args.get('v')
+            if version and version == asset_version(app.static_folder, filename):
+                response.cache_control.public = True
+                response.cache_control.max_age = STATIC_MAX_AGE
+                response.cache_control.immutable = True
+                response.cache_control.no_cache = None
+        return compress_response(response)
@@ -0,0 +1,253 @@
+# web/metrics.py
+"""
+웹 서버 요청 지표 (/metrics, Prometheus 텍스트 형식)
+
+수집 항목:
+- kafka_http_requests_total{route, method, status}: 요청 수
+- kafka_http_request_duration_seconds{route, method}: 응답 시간 히스토그램
+- kafka_http_request_db_seconds{route}: 요청 1개가 DB에서 쓴 시간 히스토그램
+- kafka_http_db_queries_total{route}: DB 쿼리 수
+- kafka_http_requests_in_flight: 처리 중인 요청 수
+- kafka_quiz_cache_*: 퀴즈 캐시 크기/적중/미스
+
+이유:
+- 오전 알림 클릭이 몰릴 때 워커/스레드 수를 정하려면 라우트별 지연 시간과 DB 시간이 필요
+- 요청끼리 락을 다투지 않도록 스레드별 카운터에 기록하고, /metrics 요청 때만 합산
+
+주의:
+- 운영 모드(gunicorn)에서는 워커 프로세스마다 따로 집계됩니다
+  (/metrics 응답은 그 요청을 처리한 워커의 값)
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, request
+
+from agent.database import set_query_observer
+
+# 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 현재 스레드가 처리 중인 요청의 시작 시각 / DB 시간 (요청 1개 = 스레드 1개)
+_current = threading.local()
+
+
+def _new_shard() -> Dict:
+    """스레드 1개의 카운터"""
+    return {
+        'requests': {},   # (route, method, status) → 수
+        'latency': {},    # (route, method) → [구간별 수..., 합계, 개수]
+        'db': {},         # route → [구간별 수..., 합계, 개수]
+        'queries': {},    # route → 쿼리 수
+        'in_flight': 0,
+        'lock': threading.Lock(),  # 기록 ↔ 합산 (평소에는 그 스레드만 잡으므로 경합 없음)
+    }
+
+
+def _observe(histograms: Dict, key, buckets: Tuple[float, ...], value: float):
+    """히스토그램에 값 1개 기록 (구간별 수는 누적하지 않고 저장, 출력할 때 누적)"""
+    row = histograms.get(key)
+    if row is None:
+        row = histograms[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+    row[bisect_left(buckets, value)] += 1
+    row[-2] += value
+    row[-1] += 1
+
+
+def _merge(target: Dict, shard: Dict):
+    """shard 카운터를 target에 더함"""
+    for name in ('requests', 'queries'):
+        for key, value in shard[name].items():
+            target[name][key] = target[name].get(key, 0) + value
+    for name in ('latency', 'db'):
+        for key, row in shard[name].items():
+            merged = target[name].get(key)
+            if merged is None:
+                target[name][key] = list(row)
+            else:
+                for i, value in enumerate(row):
+                    merged[i] += value
+    target['in_flight'] += shard['in_flight']
+
+
+def _escape(value: str) -> str:
+    """Prometheus 라벨 값 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_histogram(lines: List[str], name: str, histograms: Dict, buckets: Tuple[float, ...],
+                      label_names: Tuple[str, ...]):
+    """히스토그램 출력 (_bucket 누적 수, _sum, _count)"""
+    for key in sorted(histograms):
+        row = histograms[key]
+        labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+        cumulative = 0
+        for bound, count in zip(buckets + (float('inf'),), row[:-2]):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f"{name}_bucket{_labels(**labels, le=le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(**labels)} {row[-2]:.6f}")
+        lines.append(f"{name}_count{_labels(**labels)} {row[-1]}")
+
+
+class RequestMetrics:
+    """
+    라우트별 요청 지표 (스레드별 카운터, 조회할 때 합산)
+
+    기록(observe_*)은 현재 스레드의 카운터만 바꾸고, 그 카운터의 락만 잠깐 잡습니다.
+    /metrics 합산도 카운터마다 같은 락을 잡고 읽으므로, 합산 중에 새 라우트가 기록되어도
+    dict 순회가 깨지거나(RuntimeError) 히스토그램을 반쯤 바뀐 상태로 읽지 않습니다.
+    종료된 스레드의 카운터는 새 스레드가 등록될 때 retired로 합쳐서 정리합니다
+    (개발 서버처럼 요청마다 스레드를 만드는 경우에도 카운터 수가 늘어나지 않도록).
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict]] = []
+        self._retired = _new_shard()
+        self._lock = threading.Lock()  # 스레드 등록/합산 때만 사용
+        self.started_at = time.time()
+
+    def _shard(self) -> Dict:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _new_shard()
+            with self._lock:
+                alive = []
+                for thread, other in self._shards:
+                    if thread.is_alive():
+                        alive.append((thread, other))
+                    else:
+                        _merge(self._retired, other)
+                alive.append((threading.current_thread(), shard))
+                self._shards = alive
+        return shard
+
+    def add_in_flight(self, delta: int):
+        shard = self._shard()
+        with shard['lock']:
+            shard['in_flight'] += delta
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float,
+                        db_seconds: float, db_queries: int):
+        """요청 1개 기록"""
+        shard = self._shard()
+        key = (route, method, str(status))
+        with shard['lock']:
+            shard['requests'][key] = shard['requests'].get(key, 0) + 1
+            _observe(shard['latency'], (route, method), LATENCY_BUCKETS, seconds)
+            _observe(shard['db'], route, DB_BUCKETS, db_seconds)
+            shard['queries'][route] = shard['queries'].get(route, 0) + db_queries
+
+    def snapshot(self) -> Dict:
+        """모든 스레드 카운터 합산"""
+        total = _new_shard()
+        with self._lock:
+            _merge(total, self._retired)
+            for _, shard in self._shards:
+                with shard['lock']:
+                    _merge(total, shard)
+        return total
+
+    def render(self, extra: Optional[Callable[[List[str]], None]] = None) -> str:
+        """Prometheus 텍스트 형식"""
+        data = self.snapshot()
+        lines = [
+            '# HELP kafka_http_requests_total HTTP 요청 수',
+            '# TYPE kafka_http_requests_total counter',
+        ]
+        for (route, method, status), count in sorted(data['requests'].items()):
+            lines.append(f"kafka_http_requests_total{_labels(route=route, method=method, status=status)} {count}")
+
+        lines += [
+            '# HELP kafka_http_request_duration_seconds HTTP 응답 시간',
+            '# TYPE kafka_http_request_duration_seconds histogram',
+        ]
+        _format_histogram(lines, 'kafka_http_request_duration_seconds', data['latency'],
+                          LATENCY_BUCKETS, ('route', 'method'))
+
+        lines += [
+            '# HELP kafka_http_request_db_seconds 요청 1개의 DB 시간',
+            '# TYPE kafka_http_request_db_seconds histogram',
+        ]
+        _format_histogram(lines, 'kafka_http_request_db_seconds', data['db'], DB_BUCKETS, ('route',))
+
+        lines += [
+            '# HELP kafka_http_db_queries_total DB 쿼리 수',
+            '# TYPE kafka_http_db_queries_total counter',
+        ]
+        for route, count in sorted(data['queries'].items()):
+            lines.append(f"kafka_http_db_queries_total{_labels(route=route)} {count}")
+
+        lines += [
+            '# HELP kafka_http_requests_in_flight 처리 중인 요청 수',
+            '# TYPE kafka_http_requests_in_flight gauge',
+            f"kafka_http_requests_in_flight {data['in_flight']}",
+            '# HELP kafka_process_start_time_seconds 프로세스(워커) 시작 시각',
+            '# TYPE kafka_process_start_time_seconds gauge',
+            f"kafka_process_start_time_seconds{_labels(pid=os.getpid())} {self.started_at:.3f}",
+        ]
+
+        if extra:
+            extra(lines)
+        return '\n'.join(lines) + '\n'
+
+
+def init_metrics(app: Flask, metrics: RequestMetrics, extra: Optional[Callable[[List[str]], None]] = None):
+    """
+    앱에 요청 지표 수집과 /metrics 라우트 등록
+
+    Args:
+        metrics: 기록할 RequestMetrics
+        extra: /metrics 출력에 지표를 더하는 함수 extra(lines) (예: 퀴즈 캐시 통계)
+
+    다른 after_request보다 먼저 등록해야 압축 등 후처리 시간까지 포함됩니다
+    (after_request는 등록 역순으로 실행).
+    """
+    def _observe_query(seconds: float, is_statement: bool):
+        if getattr(_current, 'start', None) is None:
+            return  # 요청 밖의 쿼리 (스케줄러 등)
+        _current.db_seconds += seconds
+        if is_statement:
+            _current.db_queries += 1
+
+    set_query_observer(_observe_query)
+
+    @app.before_request
+    def _start_timer():
+        _current.start = time.perf_counter()
+        _current.db_seconds = 0.0
+        _current.db_queries = 0
+        metrics.add_in_flight(1)
+
+    @app.after_request
+    def _record(response):
+        if getattr(_current, 'start', None) is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics.observe_request(
+                route, request.method, response.status_code,
+                time.perf_counter() - _current.start, _current.db_seconds, _current.db_queries
+            )
+        return response
+
+    @app.teardown_request
+    def _finish(exc):
+        if getattr(_current, 'start', None) is not None:
+            _current.start = None
+            metrics.add_in_flight(-1)
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """요청 지표 (Prometheus 텍스트 형식)"""
+        return Response(metrics.render(extra), content_type=PROMETHEUS_CONTENT_TYPE)
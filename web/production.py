@@ -0,0 +1,113 @@
+# web/production.py
+"""
+운영 환경용 웹 서버 실행 (gunicorn, 멀티 프로세스 + 멀티 스레드)
+
+사용법:
+    python3 web/web_server.py --production --workers 4 --threads 8
+
+설정 (명령행 옵션이 없을 때):
+- KAFKA_WEB_WORKERS: 워커 프로세스 수 (기본: CPU 코어 수 * 2 + 1)
+- KAFKA_WEB_THREADS: 워커당 스레드 수 (기본: 4)
+- KAFKA_WEB_TIMEOUT: 요청 처리 제한 시간 (초, 기본: 30)
+- KAFKA_WEB_GRACEFUL_TIMEOUT: 종료 신호 후 처리 중인 요청을 기다리는 시간 (초, 기본: 30)
+
+이유:
+- Flask 개발 서버(app.run)는 단일 프로세스 + 리로더로 운영 트래픽용이 아님
+- 오전 8시 알림 클릭이 한꺼번에 몰려도 여러 워커가 나눠 처리
+- 앱은 fork 전에 1번만 로드(preload)하고, DB 연결은 워커마다 fork 후에 새로 염
+  (SQLite 연결은 프로세스 간에 공유하면 안 됨)
+- SIGTERM을 받으면 새 요청을 받지 않고 처리 중인 요청을 마친 뒤 종료
+"""
+
+import multiprocessing
+import os
+from typing import Dict
+
+
+def get_default_workers() -> int:
+    """워커 수 (환경 변수 KAFKA_WEB_WORKERS, 기본: CPU 코어 수 * 2 + 1)"""
+    return int(os.getenv("KAFKA_WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+
+
+def get_default_threads() -> int:
+    """워커당 스레드 수 (환경 변수 KAFKA_WEB_THREADS, 기본: 4)"""
+    return int(os.getenv("KAFKA_WEB_THREADS", 4))
+
+
+def _post_fork(server, worker):
+    """fork 직후 (워커): 부모에서 물려받은 DB 연결을 버리고 워커 전용 연결 사용"""
+    from agent.database import reset_db
+
+    reset_db(close=False)  # 부모 프로세스의 연결은 닫지 않고 참조만 버림
+    server.log.info("워커 %s: DB 연결 초기화", worker.pid)
+
+
+def _worker_exit(server, worker):
+    """워커 종료 시 DB 연결 정리"""
+    from agent.database import reset_db
+
+    reset_db()
+
+
+def build_options(
+    host: str,
+    port: int,
+    workers: int = None,
+    threads: int = None,
+    timeout: int = None,
+    graceful_timeout: int = None
+) -> Dict:
+    """gunicorn 설정 딕셔너리 생성"""
+    return {
+        'bind': f"{host}:{port}",
+        'workers': max(1, workers or get_default_workers()),
+        'threads': max(1, threads or get_default_threads()),
+        'worker_class': 'gthread',
+        'timeout': timeout or int(os.getenv("KAFKA_WEB_TIMEOUT", 30)),
+        'graceful_timeout': graceful_timeout or int(os.getenv("KAFKA_WEB_GRACEFUL_TIMEOUT", 30)),
+        'keepalive': 5,
+        'preload_app': True,
+        'accesslog': '-',
+        'errorlog': '-',
+        'post_fork': _post_fork,
+        'worker_exit': _worker_exit,
+    }
+
+
+def run_production(host: str, port: int, **kwargs):
+    """
+    gunicorn으로 web.app:app 실행 (종료될 때까지 블록)
+
+    Args:
+        host: 바인드 주소
+        port: 포트
+        **kwargs: workers, threads, timeout, graceful_timeout
+
+    Raises:
+        ImportError: gunicorn 미설치 (Windows는 지원하지 않음)
+    """
+    from gunicorn.app.base import BaseApplication
+
+    from web.app import app
+
+    class KafkaWebApplication(BaseApplication):
+        """설정 파일 없이 옵션 딕셔너리로 실행하는 gunicorn 앱"""
+
+        def __init__(self, application, options: Dict):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = build_options(host, port, **kwargs)
+    print(f"🚀 운영 모드: 워커 {options['workers']}개 × 스레드 {options['threads']}개 "
+          f"(timeout {options['timeout']}s, graceful {options['graceful_timeout']}s)")
+
+    KafkaWebApplication(app, options).run()
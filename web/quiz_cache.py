@@ -0,0 +1,126 @@
+# web/quiz_cache.py
+"""
+퀴즈 문제 캐시 (LRU)
+
+퀴즈 페이지(show_quiz)와 답안 제출(submit_quiz)이 공유합니다.
+
+설정:
+- KAFKA_QUIZ_CACHE_SIZE: 캐시할 최대 문제 수 (기본: 1024)
+
+이유:
+- 같은 문제를 보고 제출할 때 DB 조회를 (스케줄, 차수)당 1번으로 줄임
+  (제출은 딕셔너리 조회 + INSERT 1번)
+- 스케줄이 저장/변경되면 DB 변경 리스너로 해당 스케줄 항목만 무효화
+
+주의:
+- 캐시는 프로세스마다 따로 있습니다 (gunicorn 워커마다 1개)
+  DB 변경 리스너는 같은 프로세스의 변경만 알려 주므로, 다른 워커/마이그레이션/스케줄러가 바꾼 문제는
+  요청마다 넘겨받는 퀴즈 데이터 버전(quiz_versions)과 캐시 항목의 버전을 비교해서 다시 읽음
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+DEFAULT_CACHE_SIZE = 1024
+
+CacheKey = Tuple[int, int]  # (schedule_id, notification_index)
+
+
+class QuizCache:
+    """
+    (schedule_id, notification_index) → 문제 데이터 LRU 캐시 (스레드 안전, 프로세스별)
+
+    캐시된 딕셔너리는 여러 요청이 공유하므로 수정하지 않아야 합니다.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = max(1, maxsize)
+        self._items: "OrderedDict[CacheKey, Dict]" = OrderedDict()
+        self._keys_by_schedule: Dict[int, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # 무효화될 때마다 증가 (조회 중 무효화된 결과는 저장하지 않음)
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        schedule_id: int,
+        notification_index: int,
+        loader: Callable[[int, int], Optional[Dict]],
+        version: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        캐시된 문제 데이터 반환 (없거나 오래된 항목이면 loader로 만들어 저장)
+
+        Args:
+            loader: loader(schedule_id, notification_index) → 문제 데이터 또는 None (None은 캐시하지 않음)
+            version: 현재 퀴즈 데이터 버전 (캐시 항목의 'version'과 다르면 다시 읽음, None이면 비교 안 함)
+        """
+        key = (schedule_id, notification_index)
+
+        with self._lock:
+            payload = self._items.get(key)
+            if payload is not None and version is not None and payload.get('version') != version:
+                # 다른 프로세스에서 바뀐 항목
+                payload = None
+            if payload is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return payload
+            self.misses += 1
+            generation = self._generation
+
+        # DB 조회는 락 밖에서 (동시에 같은 항목을 만들어도 결과는 같음)
+        payload = loader(schedule_id, notification_index)
+        if payload is None:
+            return None
+
+        with self._lock:
+            if generation != self._generation:
+                return payload
+            self._items[key] = payload
+            self._items.move_to_end(key)
+            self._keys_by_schedule.setdefault(schedule_id, set()).add(key)
+            while len(self._items) > self.maxsize:
+                evicted, _ = self._items.popitem(last=False)
+                self._discard_key(evicted)
+        return payload
+
+    def invalidate(self, schedule_id: int):
+        """스케줄 1개의 항목 무효화 (DB 변경 리스너)"""
+        with self._lock:
+            self._generation += 1
+            for key in self._keys_by_schedule.pop(schedule_id, ()):
+                self._items.pop(key, None)
+
+    def clear(self):
+        """전체 비우기"""
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+            self._keys_by_schedule.clear()
+
+    def stats(self) -> Dict:
+        """캐시 통계 (크기, 적중/미스 횟수)"""
+        with self._lock:
+            return {
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _discard_key(self, key: CacheKey):
+        """스케줄별 키 목록에서 제거 (락을 잡은 상태에서 호출)"""
+        keys = self._keys_by_schedule.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_schedule[key[0]]
+
+
+def get_cache_size() -> int:
+    """캐시 크기 (환경 변수 KAFKA_QUIZ_CACHE_SIZE, 기본: 1024)"""
+    return int(os.getenv("KAFKA_QUIZ_CACHE_SIZE", DEFAULT_CACHE_SIZE))
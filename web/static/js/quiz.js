@@ -1,78 +1,91 @@
 // 카프카 퀴즈 클라이언트 로직
 
 // 라디오 버튼 선택 시 시각적 피드백
-document.querySelectorAll('input[type="radio"]').forEach(radio => {
-    radio.addEventListener('change', function() {
-        // 같은 name의 다른 라디오 버튼들의 부모 label에서 selected 클래스 제거
-        const name = this.name;
-        document.querySelectorAll(`input[name="${name}"]`).forEach(r => {
-            r.closest('.option').classList.remove('selected');
-        });
-        
-        // 선택된 라디오 버튼의 부모 label에 selected 클래스 추가
-        this.closest('.option').classList.add('selected');
-        
-        console.log(`Q${name} 선택됨: ${this.value}`);
-    });
-});
-
-document.getElementById('quiz-form').addEventListener('submit', async (e) => {
-    e.preventDefault();
-    
-    // 제출 버튼 비활성화
-    const submitBtn = e.target.querySelector('.submit-btn');
-    submitBtn.disabled = true;
-    submitBtn.innerHTML = '<span class="loading"></span> 채점 중...';
-    
-    // 답안 수집 (1개 문제)
-    const form = e.target;
-    const selected = form.querySelector('input[name="answer"]:checked');
-    
-    if (!selected) {
-        alert('답을 선택해주세요!');
-        submitBtn.disabled = false;
-        submitBtn.innerHTML = '제출하기';
+// (다음 문제로 넘어가면 선택지를 새로 그리므로 document에 위임)
+document.addEventListener('change', (e) => {
+    const radio = e.target;
+    if (radio.type !== 'radio' || !radio.closest('.option')) {
         return;
     }
     
-    const answer = selected.value;
-    console.log('제출된 답안:', answer);
+    // 같은 name의 다른 라디오 버튼들의 부모 label에서 selected 클래스 제거
+    const name = radio.name;
+    document.querySelectorAll(`input[name="${name}"]`).forEach(r => {
+        r.closest('.option').classList.remove('selected');
+    });
     
-    try {
-        // 서버로 제출
-        const response = await fetch(
-            `/quiz/${scheduleId}/${notificationIndex}/submit`,
-            {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify({ answer })
-            }
-        );
+    // 선택된 라디오 버튼의 부모 label에 selected 클래스 추가
+    radio.closest('.option').classList.add('selected');
+    
+    console.log(`Q${name} 선택됨: ${radio.value}`);
+});
+
+// 퀴즈 폼 제출 (퀴즈 페이지는 1개, 다이제스트 페이지는 여러 개)
+document.querySelectorAll('.quiz-form').forEach(form => {
+    form.addEventListener('submit', async (e) => {
+        e.preventDefault();
         
-        if (!response.ok) {
-            throw new Error('제출 실패');
-        }
+        const scheduleId = form.dataset.scheduleId;
+        const notificationIndex = form.dataset.notificationIndex;
         
-        const result = await response.json();
+        // 제출 버튼 비활성화
+        const submitBtn = form.querySelector('.submit-btn');
+        submitBtn.disabled = true;
+        submitBtn.innerHTML = '<span class="loading"></span> 채점 중...';
         
-        // 결과 표시
-        displayResult(result);
+        // 답안 수집 (1개 문제)
+        const selected = form.querySelector('input[type="radio"]:checked');
         
-        // 폼 숨기기
-        form.style.display = 'none';
+        if (!selected) {
+            alert('답을 선택해주세요!');
+            submitBtn.disabled = false;
+            submitBtn.innerHTML = '제출하기';
+            return;
+        }
         
-    } catch (error) {
-        alert('오류가 발생했습니다: ' + error.message);
-        submitBtn.disabled = false;
-        submitBtn.innerHTML = '제출하기';
-    }
+        const answer = selected.value;
+        console.log(`제출된 답안 (${scheduleId}/${notificationIndex}):`, answer);
+        
+        try {
+            // 서버로 제출
+            const response = await fetch(
+                `/quiz/${scheduleId}/${notificationIndex}/submit`,
+                {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({ answer })
+                }
+            );
+            
+            if (!response.ok) {
+                throw new Error('제출 실패');
+            }
+            
+            const result = await response.json();
+            
+            // 결과 표시
+            const resultDiv = document.getElementById(form.dataset.resultId);
+            displayResult(result, resultDiv);
+            
+            // 폼 숨기기
+            form.style.display = 'none';
+            
+            // 미리 가져온 다음 문제가 있으면 "다음 문제" 버튼 표시
+            if (form.dataset.userId) {
+                showNextButton(form, resultDiv);
+            }
+            
+        } catch (error) {
+            alert('오류가 발생했습니다: ' + error.message);
+            submitBtn.disabled = false;
+            submitBtn.innerHTML = '제출하기';
+        }
+    });
 });
 
-function displayResult(result) {
-    const resultDiv = document.getElementById('result');
-    
+function displayResult(result, resultDiv) {
     let html = '';
     
     if (result.is_correct) {
@@ -109,6 +122,116 @@ function displayResult(result) {
     resultDiv.scrollIntoView({ behavior: 'smooth', block: 'center' });
 }
 
+// ---------------------------------------------------------------
+// 다음 문제 미리 가져오기 (퀴즈 페이지)
+//
+// 현재 문제를 푸는 동안 /api/user/<user_id>/due 에서 다음으로 풀 퀴즈를 찾고
+// /api/quiz/<schedule_id>?n=<차수> 로 문제를 미리 받아둠
+// → "다음 문제"를 누르면 페이지를 새로 받지 않고 바로 표시
+// ---------------------------------------------------------------
+
+const seenQuizzes = new Set();   // 이 페이지에서 이미 표시한 퀴즈 ("schedule_id:차수")
+let nextQuizPromise = null;      // 미리 가져오는 중/가져온 다음 퀴즈 (없으면 null로 resolve)
+
+function quizKey(scheduleId, notificationIndex) {
+    return `${scheduleId}:${notificationIndex}`;
+}
+
+async function fetchNextQuiz(userId) {
+    try {
+        const dueResponse = await fetch(`/api/user/${encodeURIComponent(userId)}/due`);
+        if (!dueResponse.ok) {
+            return null;
+        }
+        
+        const due = await dueResponse.json();
+        const next = due.items.find(item =>
+            !seenQuizzes.has(quizKey(item.schedule_id, item.notification_index))
+        );
+        if (!next) {
+            return null;
+        }
+        
+        const quizResponse = await fetch(`/api/quiz/${next.schedule_id}?n=${next.notification_index}`);
+        return quizResponse.ok ? await quizResponse.json() : null;
+    } catch (error) {
+        console.log('다음 문제 미리 가져오기 실패:', error);
+        return null;
+    }
+}
+
+function prefetchNextQuiz(form) {
+    seenQuizzes.add(quizKey(form.dataset.scheduleId, form.dataset.notificationIndex));
+    nextQuizPromise = fetchNextQuiz(form.dataset.userId);
+}
+
+async function showNextButton(form, resultDiv) {
+    const quiz = nextQuizPromise ? await nextQuizPromise : null;
+    if (!quiz) {
+        return;
+    }
+    
+    const button = document.createElement('button');
+    button.type = 'button';
+    button.className = 'submit-btn next-btn';
+    button.textContent = `다음 문제 → (${quiz.notification_index}차 복습)`;
+    button.addEventListener('click', () => {
+        renderQuiz(form, resultDiv, quiz);
+        history.pushState(null, '', `/quiz/${quiz.schedule_id}/${quiz.notification_index}`);
+    });
+    resultDiv.appendChild(button);
+}
+
+function renderQuiz(form, resultDiv, quiz) {
+    document.title = `카프카 퀴즈 - ${quiz.persona_style}`;
+    document.getElementById('quiz-subtitle').textContent =
+        `${quiz.notification_index}차 복습 · ${quiz.persona_style}`;
+    document.getElementById('quiz-progress').textContent =
+        `📅 복습 진행도: ${quiz.notification_index} / 4`;
+    document.getElementById('quiz-summary').textContent = quiz.summary;
+    document.getElementById('quiz-question').textContent =
+        `Q${quiz.notification_index}. ${quiz.question.text}`;
+    
+    // 선택지 다시 그리기 (textContent로 넣어 HTML로 해석되지 않도록)
+    const options = document.getElementById('quiz-options');
+    options.replaceChildren(...quiz.question.options.map(opt => {
+        const label = document.createElement('label');
+        label.className = 'option';
+        
+        const input = document.createElement('input');
+        input.type = 'radio';
+        input.name = 'answer';
+        input.value = opt[0];
+        input.required = true;
+        
+        const text = document.createElement('span');
+        text.className = 'option-text';
+        text.textContent = opt;
+        
+        label.append(input, text);
+        return label;
+    }));
+    
+    form.dataset.scheduleId = quiz.schedule_id;
+    form.dataset.notificationIndex = quiz.notification_index;
+    
+    const submitBtn = form.querySelector('.submit-btn');
+    submitBtn.disabled = false;
+    submitBtn.innerHTML = '제출하기';
+    form.style.display = '';
+    
+    resultDiv.style.display = 'none';
+    resultDiv.innerHTML = '';
+    window.scrollTo({ top: 0, behavior: 'smooth' });
+    
+    prefetchNextQuiz(form);
+}
+
+// 뒤로 가기: 주소가 바뀌었으므로 해당 문제 페이지를 다시 로드
+window.addEventListener('popstate', () => location.reload());
+
+document.querySelectorAll('.quiz-form[data-user-id]').forEach(prefetchNextQuiz);
+
 // CSS에 추가할 스타일
 const style = document.createElement('style');
 style.textContent = `
@@ -122,5 +245,9 @@ style.textContent = `
         margin-bottom: 16px;
         color: #2c3e50;
     }
+    
+    .next-btn {
+        margin-top: 20px;
+    }
 `;
 document.head.appendChild(style);
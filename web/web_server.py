@@ -9,6 +9,8 @@
     또는
     
     python3 web_server.py --port 8080  # 다른 포트 사용
+    
+    python3 web_server.py --production  # 운영 모드 (gunicorn 멀티 워커)
 """
 
 import argparse
@@ -35,6 +37,9 @@ def main():
   
   디버그 모드 끄기:
     $ python3 web_server.py --no-debug
+  
+  운영 모드 (gunicorn, 워커 4개 × 스레드 8개):
+    $ python3 web_server.py --production --port 8080 --workers 4 --threads 8
         """
     )
     
@@ -58,6 +63,36 @@ def main():
         help='디버그 모드 비활성화'
     )
     
+    parser.add_argument(
+        '--production',
+        action='store_true',
+        help='운영 모드: gunicorn 멀티 워커로 실행 (macOS/Linux)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='운영 모드 워커 프로세스 수 (기본: KAFKA_WEB_WORKERS 또는 CPU 코어 수 * 2 + 1)'
+    )
+    
+    parser.add_argument(
+        '--threads',
+        type=int,
+        help='운영 모드 워커당 스레드 수 (기본: KAFKA_WEB_THREADS 또는 4)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        help='운영 모드 요청 처리 제한 시간 (초, 기본: 30)'
+    )
+    
+    parser.add_argument(
+        '--graceful-timeout',
+        type=int,
+        help='운영 모드 종료 시 처리 중인 요청을 기다리는 시간 (초, 기본: 30)'
+    )
+    
     args = parser.parse_args()
     
     print("=" * 60)
@@ -75,6 +110,10 @@ def main():
     print("⚠️  주의: Ctrl+C로 종료하세요")
     print()
     
+    if args.production:
+        run_production_server(args)
+        return
+    
     try:
         app.run(
             debug=not args.no_debug,
@@ -90,5 +129,24 @@ def main():
         sys.exit(1)
 
 
+def run_production_server(args):
+    """운영 모드 실행 (gunicorn 미설치 시 안내 후 종료)"""
+    try:
+        from web.production import run_production
+        
+        run_production(
+            args.host,
+            args.port,
+            workers=args.workers,
+            threads=args.threads,
+            timeout=args.timeout,
+            graceful_timeout=args.graceful_timeout
+        )
+    except ImportError as e:
+        print(f"❌ 운영 모드를 시작할 수 없습니다: {e}")
+        print("   해결: pip3 install gunicorn (Windows는 지원하지 않음)")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()